@@ -3,13 +3,16 @@
 Provides functionality to:
 - Send Disconnect-Request to NADs to terminate user sessions
 - Send CoA-Request to NADs to modify session parameters
+- Send CoA/Disconnect to many sessions at once (bulk, streamed as NDJSON)
 - Check CoA configuration status
 """
 
+import json
 import logging
-from typing import Optional
+from typing import Literal, Optional
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 
@@ -401,6 +404,49 @@ class GroupPolicyCoARequest(BaseModel):
     )
 
 
+def group_policy_attributes(group_policy: str, vendor: str, remove_url_redirect: bool = True) -> dict:
+    """Build the vendor-specific attributes that apply a group policy.
+    
+    Args:
+        group_policy: Group policy (or role) name
+        vendor: meraki, cisco_aireos, cisco_ise or aruba (others get a
+            generic Cisco-AVPair)
+        remove_url_redirect: Also clear any captive-portal URL redirect
+        
+    Returns:
+        Attribute name to value(s) mapping for a CoA-Request
+    """
+    attributes = {}
+    vendor = vendor.lower()
+    
+    if vendor == "meraki":
+        # Meraki uses Filter-Id for group policy
+        attributes["Filter-Id"] = group_policy
+        if remove_url_redirect:
+            # Remove URL redirect by sending empty value
+            attributes["Cisco-AVPair"] = ["url-redirect=", "url-redirect-acl="]
+    elif vendor == "cisco_aireos":
+        # Cisco AireOS uses air-group-policy-name
+        avpairs = [f"air-group-policy-name={group_policy}"]
+        if remove_url_redirect:
+            avpairs.extend(["url-redirect=", "url-redirect-acl="])
+        attributes["Cisco-AVPair"] = avpairs
+    elif vendor == "cisco_ise":
+        # Cisco ISE uses ACS attributes
+        avpairs = [f"ACS:CiscoSecure-Group-Id={group_policy}"]
+        if remove_url_redirect:
+            avpairs.extend(["url-redirect=", "url-redirect-acl="])
+        attributes["Cisco-AVPair"] = avpairs
+    elif vendor == "aruba":
+        # Aruba uses Aruba-User-Role
+        attributes["Aruba-User-Role"] = group_policy
+    else:
+        # Default: Generic Cisco-AVPair
+        attributes["Cisco-AVPair"] = f"group-policy-name={group_policy}"
+    
+    return attributes
+
+
 @router.post("/api/coa/group-policy")
 async def send_group_policy_coa(
     request: GroupPolicyCoARequest,
@@ -434,34 +480,9 @@ async def send_group_policy_coa(
         f"user={request.user_name}, policy={request.group_policy}, vendor={request.vendor}"
     )
     
-    # Build vendor-specific attributes
-    attributes = {}
-    vendor = request.vendor.lower()
-    
-    if vendor == "meraki":
-        # Meraki uses Filter-Id for group policy
-        attributes["Filter-Id"] = request.group_policy
-        if request.remove_url_redirect:
-            # Remove URL redirect by sending empty value
-            attributes["Cisco-AVPair"] = ["url-redirect=", "url-redirect-acl="]
-    elif vendor == "cisco_aireos":
-        # Cisco AireOS uses air-group-policy-name
-        avpairs = [f"air-group-policy-name={request.group_policy}"]
-        if request.remove_url_redirect:
-            avpairs.extend(["url-redirect=", "url-redirect-acl="])
-        attributes["Cisco-AVPair"] = avpairs
-    elif vendor == "cisco_ise":
-        # Cisco ISE uses ACS attributes
-        avpairs = [f"ACS:CiscoSecure-Group-Id={request.group_policy}"]
-        if request.remove_url_redirect:
-            avpairs.extend(["url-redirect=", "url-redirect-acl="])
-        attributes["Cisco-AVPair"] = avpairs
-    elif vendor == "aruba":
-        # Aruba uses Aruba-User-Role
-        attributes["Aruba-User-Role"] = request.group_policy
-    else:
-        # Default: Generic Cisco-AVPair
-        attributes["Cisco-AVPair"] = f"group-policy-name={request.group_policy}"
+    attributes = group_policy_attributes(
+        request.group_policy, request.vendor, request.remove_url_redirect
+    )
     
     # Get NAD information
     nad_ip = request.nad_ip
@@ -744,6 +765,127 @@ async def send_sgt_coa(
         )
 
 
+class BulkSessionSelector(BaseModel):
+    """Which active sessions a bulk request targets (filters are combined)."""
+    
+    group_policy: Optional[str] = Field(
+        None, description="Sessions of devices registered with this group policy"
+    )
+    network_id: Optional[str] = Field(None, description="Sessions on NADs in this Meraki network")
+    macs: Optional[list[str]] = Field(None, description="Client MAC addresses")
+    user_names: Optional[list[str]] = Field(None, description="Session user names")
+    nad_ids: Optional[list[int]] = Field(None, description="Sessions on these NADs")
+
+
+class BulkCoARequest(BaseModel):
+    """Request to send CoA or Disconnect to many sessions."""
+    
+    selector: BulkSessionSelector
+    action: Literal["disconnect", "coa"] = Field(
+        default="coa", description="disconnect or coa"
+    )
+    attributes: dict = Field(default_factory=dict, description="Attributes for CoA-Requests")
+    new_group_policy: Optional[str] = Field(
+        None, description="Apply this group policy (adds vendor-specific attributes)"
+    )
+    vendor: str = Field(default="meraki", description="Vendor for new_group_policy mapping")
+    remove_url_redirect: bool = Field(default=True, description="Clear URL redirect with new_group_policy")
+    per_nad_concurrency: int = Field(default=16, ge=1, le=256, description="Max in-flight requests per NAD")
+    per_nad_rate: float = Field(default=50.0, gt=0, le=1000, description="Max requests per second per NAD")
+    dry_run: bool = Field(default=False, description="Only resolve and report the targeted sessions")
+
+
+@router.post("/api/coa/bulk")
+async def send_bulk_coa(
+    request: BulkCoARequest,
+    admin: AdminUser,
+    db: DbSession,
+) -> StreamingResponse:
+    """
+    Send CoA or Disconnect requests to every session matching a selector.
+    
+    NAD addresses, secrets and CoA ports are resolved once up front.
+    Requests fan out across NADs in parallel, with a concurrency cap and
+    token-bucket rate limit per NAD.
+    
+    Progress is streamed as NDJSON (one JSON object per line):
+    - {"type": "plan", ...} - sessions and NADs targeted
+    - {"type": "result", ...} - one per session as it completes
+    - {"type": "summary", ...} - totals at the end
+    
+    Args:
+        request: Selector, action and rate limits
+        admin: Authenticated admin user
+        db: Database session
+        
+    Returns:
+        Streaming NDJSON response
+        
+    Raises:
+        HTTPException: 400 if the selector is empty or no attributes are given
+    """
+    from radius_app.core.coa_bulk import BulkCoARunner, SessionSelector, resolve_bulk_plan
+    
+    selector = SessionSelector(**request.selector.model_dump())
+    if selector.is_empty():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Selector must include at least one filter",
+        )
+    
+    attributes = dict(request.attributes)
+    if request.new_group_policy:
+        attributes.update(group_policy_attributes(
+            request.new_group_policy, request.vendor, request.remove_url_redirect
+        ))
+    if request.action == "coa" and not attributes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Must provide attributes or new_group_policy for CoA",
+        )
+    
+    # Resolve everything before streaming - the DB session ends with the request
+    plan = resolve_bulk_plan(db, selector)
+    logger.info(
+        f"Bulk {request.action} by {admin['sub']}: {plan.session_count} sessions on "
+        f"{len(plan.by_nad)} NADs ({len(plan.unresolved)} unreachable)"
+    )
+    
+    plan_event = {
+        "type": "plan",
+        "action": request.action,
+        "sessions": plan.session_count,
+        "nads": len(plan.by_nad),
+        "unresolved": len(plan.unresolved),
+        "dry_run": request.dry_run,
+    }
+    
+    async def stream():
+        yield json.dumps(plan_event) + "\n"
+        if request.dry_run:
+            for endpoint, targets in plan.by_nad.values():
+                yield json.dumps({
+                    "type": "nad",
+                    "nad_id": endpoint.nad_id,
+                    "name": endpoint.name,
+                    "sessions": len(targets),
+                }) + "\n"
+            return
+        runner = BulkCoARunner(
+            per_nad_concurrency=request.per_nad_concurrency,
+            per_nad_rate=request.per_nad_rate,
+        )
+        async for event in runner.run(plan, request.action, attributes):
+            if event["type"] == "summary":
+                logger.info(
+                    f"✅ Bulk {request.action} finished: {event['succeeded']} succeeded, "
+                    f"{event['failed']} failed, {event['skipped']} skipped"
+                )
+            yield json.dumps(event, default=str) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.post("/api/coa/regenerate-config")
 async def regenerate_coa_config(
     admin: AdminUser,
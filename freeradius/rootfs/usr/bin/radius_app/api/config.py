@@ -32,7 +32,8 @@ async def reload_configuration(request: ReloadRequest, admin: AdminUser) -> Relo
     
     With shared database architecture, configuration is automatically
     regenerated when changes are detected. This endpoint allows manual
-    triggering if immediate reload is needed.
+    triggering if immediate reload is needed. The radiusd reload goes through
+    the shared reload scheduler and this call waits for its outcome.
     
     Args:
         request: Reload options
@@ -47,7 +48,7 @@ async def reload_configuration(request: ReloadRequest, admin: AdminUser) -> Relo
     
     try:
         watcher = DatabaseWatcher(poll_interval=5)
-        result = await watcher.check_and_regenerate(force=request.force)
+        result = await watcher.check_and_regenerate(force=request.force, wait_for_reload=True)
         
         # Check for validation failures
         if result.get("validation_failed", False):
@@ -98,6 +99,93 @@ async def reload_configuration(request: ReloadRequest, admin: AdminUser) -> Relo
         )
 
 
+class ReloadMetricsResponse(BaseModel):
+    """Reload scheduler metrics."""
+    requested: int = Field(description="Reloads requested by all callers")
+    executed: int = Field(description="SIGHUPs actually sent to radiusd")
+    coalesced: int = Field(description="Requests folded into another reload")
+    failed: int
+    pending: int
+    running: bool
+    last_reason: str | None = None
+    last_reload_at: float | None = Field(default=None, description="Unix time of the last reload")
+    last_duration_seconds: float | None = None
+    debounce_seconds: float
+    max_delay_seconds: float
+    pid_file: str
+
+
+@router.get("/api/reload/metrics", response_model=ReloadMetricsResponse)
+async def get_reload_metrics(admin: AdminUser) -> ReloadMetricsResponse:
+    """
+    Get reload scheduler metrics (reloads requested vs. executed).
+    
+    Args:
+        admin: Authenticated admin user
+        
+    Returns:
+        Reload counters and scheduler state
+    """
+    from radius_app.core.reload_scheduler import get_reload_scheduler
+    
+    return ReloadMetricsResponse(**get_reload_scheduler().get_metrics())
+
+
+class ChangeNotifyRequest(BaseModel):
+    """Notification that configuration tables were written."""
+    tables: list[str] = Field(
+        default_factory=list,
+        description="Tables that changed (e.g. udn_assignments, radius_clients)",
+    )
+
+
+class ChangeNotifyResponse(BaseModel):
+    """Response from change notification."""
+    accepted: bool
+    recorded: int = Field(default=0, description="Change-log rows written by this call")
+
+
+@router.post("/api/config/notify", response_model=ChangeNotifyResponse)
+async def notify_config_change(
+    request: ChangeNotifyRequest,
+    admin: AdminUser,
+    db: DbSession,
+) -> ChangeNotifyResponse:
+    """
+    Wake the database watcher after an external write.
+    
+    Used by the portal on MariaDB/SQLite (PostgreSQL uses NOTIFY). When the
+    database has change-log triggers this only wakes the watcher; otherwise
+    the listed tables are recorded in the change log first.
+    
+    Args:
+        request: Changed tables
+        admin: Authenticated admin user
+        db: Database session
+        
+    Returns:
+        Notification result
+    """
+    from radius_app.core.change_feed import (
+        WATCHED_TABLES,
+        get_change_notifier,
+        record_changes,
+        triggers_active,
+    )
+    
+    tables = [table for table in request.tables if table in WATCHED_TABLES]
+    recorded = 0
+    if tables and not triggers_active():
+        record_changes(db, tables)
+        db.commit()
+        recorded = len(tables)
+    
+    get_change_notifier().notify()
+    logger.debug(f"Change notification from {admin['ip']}: {request.tables}")
+    
+    return ChangeNotifyResponse(accepted=True, recorded=recorded)
+
+
 @router.get("/api/config/status")
 async def get_config_status(admin: AdminUser, db: DbSession) -> dict:
     """
@@ -1,13 +1,19 @@
 """API dependencies for authentication and database access."""
 
 import logging
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession
+except ImportError:  # greenlet not installed - get_async_db falls back to SyncSessionAdapter
+    AsyncSession = Any  # type: ignore[misc,assignment]
+
 from ..config import get_settings
+from ..db.database import get_async_db
 from ..db.database import get_db as get_database_session
 
 logger = logging.getLogger(__name__)
@@ -82,4 +88,6 @@ async def verify_admin_token(
 
 # Type aliases for dependency injection
 DbSession = Annotated[Session, Depends(get_database_session)]
+# AsyncSession, or a SyncSessionAdapter when no async driver is available
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db)]
 AdminUser = Annotated[dict, Depends(verify_admin_token)]
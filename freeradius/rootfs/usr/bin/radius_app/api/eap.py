@@ -538,6 +538,7 @@ async def force_certificate_sync(
             "certificates_updated": result.get("certificates_updated", 0),
             "certificates_revoked": result.get("certificates_revoked", 0),
             "total_synced": result.get("total_synced", 0),
+            "users_changed": result.get("users_changed", 0),
             "message": "Certificate synchronization completed"
         }
         
@@ -9,8 +9,9 @@ from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from sqlalchemy import select, func
 
-from radius_app.api.deps import AdminUser, DbSession
+from radius_app.api.deps import AdminUser, AsyncDbSession, DbSession
 from radius_app.config import get_settings
+from radius_app.db.database import get_pool_stats
 from radius_app.db.models import RadiusClient, UdnAssignment
 
 logger = logging.getLogger(__name__)
@@ -40,6 +41,21 @@ class ClientStatsResponse(BaseModel):
     assignments_count: int = Field(..., description="Number of UDN assignments for this client's network")
 
 
+class PoolStatsResponse(BaseModel):
+    """Database connection pool statistics."""
+    
+    role: str = Field(..., description="radius (main database) or portal")
+    url: str = Field(..., description="Database URL with password hidden")
+    pool_class: str
+    size: Optional[int] = Field(None, description="Configured pool size")
+    checked_out: Optional[int] = Field(None, description="Connections in use")
+    checked_in: Optional[int] = Field(None, description="Idle pooled connections")
+    overflow: Optional[int] = Field(None, description="Connections open beyond the pool size")
+    wait_count: int = Field(..., description="Checkouts timed")
+    wait_avg_ms: float = Field(..., description="Average checkout wait")
+    wait_max_ms: float = Field(..., description="Longest checkout wait")
+
+
 class LogEntry(BaseModel):
     """Single log entry."""
     
@@ -67,7 +83,7 @@ class ConfigFileResponse(BaseModel):
 @router.get("/api/stats", response_model=StatsResponse)
 async def get_stats(
     admin: AdminUser,
-    db: DbSession,
+    db: AsyncDbSession,
 ) -> StatsResponse:
     """
     Get overall statistics for RADIUS server.
@@ -82,16 +98,16 @@ async def get_stats(
     logger.info(f"Getting stats requested by {admin['sub']}")
     
     # Count clients
-    total_clients = db.execute(select(func.count(RadiusClient.id))).scalar()
-    active_clients = db.execute(
+    total_clients = (await db.execute(select(func.count(RadiusClient.id)))).scalar()
+    active_clients = (await db.execute(
         select(func.count(RadiusClient.id)).where(RadiusClient.is_active == True)  # noqa: E712
-    ).scalar()
+    )).scalar()
     
     # Count assignments
-    total_assignments = db.execute(select(func.count(UdnAssignment.id))).scalar()
-    active_assignments = db.execute(
+    total_assignments = (await db.execute(select(func.count(UdnAssignment.id)))).scalar()
+    active_assignments = (await db.execute(
         select(func.count(UdnAssignment.id)).where(UdnAssignment.is_active == True)  # noqa: E712
-    ).scalar()
+    )).scalar()
     
     # Calculate UDN utilization (max UDN is 16777200)
     udn_max = 16777200
@@ -99,11 +115,11 @@ async def get_stats(
     
     # Count recent authentications (last 24 hours)
     cutoff_time = datetime.now(UTC) - timedelta(hours=24)
-    recent_auth = db.execute(
+    recent_auth = (await db.execute(
         select(func.count(UdnAssignment.id)).where(
             UdnAssignment.last_auth_at >= cutoff_time
         )
-    ).scalar() or 0
+    )).scalar() or 0
     
     return StatsResponse(
         total_clients=total_clients,
@@ -118,7 +134,7 @@ async def get_stats(
 @router.get("/api/stats/clients", response_model=list[ClientStatsResponse])
 async def get_client_stats(
     admin: AdminUser,
-    db: DbSession,
+    db: AsyncDbSession,
 ) -> list[ClientStatsResponse]:
     """
     Get usage statistics for each client.
@@ -133,32 +149,46 @@ async def get_client_stats(
     logger.info(f"Getting client stats requested by {admin['sub']}")
     
     # Get all clients
-    clients = db.execute(select(RadiusClient)).scalars().all()
+    clients = (await db.execute(select(RadiusClient))).scalars().all()
+    
+    # Count assignments per network in one grouped query
+    assignment_counts = dict((await db.execute(
+        select(UdnAssignment.network_id, func.count(UdnAssignment.id))
+        .where(UdnAssignment.network_id.is_not(None))
+        .group_by(UdnAssignment.network_id)
+    )).tuples().all())
     
     stats = []
     for client in clients:
-        # Count assignments for this client's network
-        if client.network_id:
-            assignments_count = db.execute(
-                select(func.count(UdnAssignment.id)).where(
-                    UdnAssignment.network_id == client.network_id
-                )
-            ).scalar() or 0
-        else:
-            assignments_count = 0
-        
         stats.append(ClientStatsResponse(
             client_id=client.id,
             client_name=client.name,
             ipaddr=client.ipaddr,
             network_name=client.network_name,
             is_active=client.is_active,
-            assignments_count=assignments_count,
+            assignments_count=assignment_counts.get(client.network_id, 0) if client.network_id else 0,
         ))
     
     return stats
 
 
+@router.get("/api/stats/db-pools", response_model=list[PoolStatsResponse])
+async def get_db_pool_stats(
+    admin: AdminUser,
+) -> list[PoolStatsResponse]:
+    """
+    Get connection pool statistics for the database engines.
+    
+    Args:
+        admin: Authenticated admin user
+        
+    Returns:
+        Pool statistics per engine
+    """
+    logger.info(f"Getting database pool stats requested by {admin['sub']}")
+    return [PoolStatsResponse(**stats) for stats in get_pool_stats()]
+
+
 @router.get("/api/logs/recent", response_model=LogsResponse)
 async def get_recent_logs(
     admin: AdminUser,
@@ -8,11 +8,21 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from radius_app.api.deps import AdminUser, DbSession
+from radius_app.api.deps import AdminUser, AsyncDbSession, DbSession
+from radius_app.core.pagination import (
+    CountMode,
+    InvalidCursor,
+    after_cursor,
+    count_rows,
+    encode_cursor,
+    fetch_page,
+    order_newest_first,
+)
+from radius_app.core.search_index import search_clause
 from radius_app.db.models import RadiusClient, RadiusNadExtended, RadiusNadHealth
 from radius_app.schemas.nad import (
     NadCreate,
@@ -71,83 +81,101 @@ def _build_nad_response(
     return NadResponse(**nad_data)
 
 
+def _with_extended_and_health():
+    """Loader option eager-loading a client's extended info and health."""
+    return selectinload(RadiusClient.extended).selectinload(RadiusNadExtended.health)
+
+
 @router.get("/api/nads", response_model=NadListResponse)
 async def list_nads(
     admin: AdminUser,
-    db: DbSession,
-    page: int = Query(1, ge=1, description="Page number (1-indexed)"),
+    db: AsyncDbSession,
+    page: int = Query(1, ge=1, description="Page number (1-indexed; ignored when cursor is set)"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: CountMode = Query("exact", description="Total count: exact, estimated, or none"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search by name, vendor, or location"),
 ) -> NadListResponse:
     """
     List all Network Access Devices with health status.
     
+    Results are sorted newest first. Pass the returned ``next_cursor`` back
+    as ``cursor`` to fetch the next page without an OFFSET scan.
+    
     Args:
         admin: Authenticated admin user
         db: Database session
         page: Page number (1-indexed)
         page_size: Number of items per page
+        cursor: Keyset cursor from a previous response
+        count: How to compute the total (exact, estimated, or none)
         is_active: Filter by active status
         search: Search term
         
     Returns:
         Paginated list of NADs with health information
+        
+    Raises:
+        HTTPException: If the cursor is invalid
     """
     logger.info(f"Listing NADs requested by {admin['sub']} from {admin['ip']}")
     
-    # Build query with joins
-    query = select(RadiusClient).outerjoin(
-        RadiusNadExtended,
-        RadiusClient.id == RadiusNadExtended.radius_client_id
-    )
-    
-    # Apply filters
-    if is_active is not None:
-        query = query.where(RadiusClient.is_active == is_active)
-    
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            (RadiusClient.name.ilike(search_pattern)) |
-            (RadiusNadExtended.vendor.ilike(search_pattern)) |
-            (RadiusNadExtended.location.ilike(search_pattern))
+    def load_page(session: Session):
+        # Build query with joins
+        query = select(RadiusClient).outerjoin(
+            RadiusNadExtended,
+            RadiusClient.id == RadiusNadExtended.radius_client_id
         )
-    
-    # Get total count
-    total_query = select(func.count(RadiusClient.id)).select_from(query.subquery())
-    total = db.execute(total_query).scalar()
-    
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size).order_by(RadiusClient.created_at.desc())
-    
-    # Execute query
-    clients = db.execute(query).scalars().all()
-    
-    # Build response with extended info and health
-    nad_responses = []
-    for client in clients:
-        # Get extended info
-        extended = db.execute(
-            select(RadiusNadExtended).where(
-                RadiusNadExtended.radius_client_id == client.id
+        
+        # Apply filters
+        if is_active is not None:
+            query = query.where(RadiusClient.is_active == is_active)
+        
+        if search:
+            query = query.where(
+                search_clause(session, RadiusClient, search) |
+                search_clause(session, RadiusNadExtended, search)
             )
-        ).scalar_one_or_none()
         
-        # Get health info
-        health = None
-        if extended:
-            health = db.execute(
-                select(RadiusNadHealth).where(
-                    RadiusNadHealth.nad_id == extended.id
-                )
-            ).scalar_one_or_none()
+        # Get total count
+        total = count_rows(session, query, count)
         
-        nad_responses.append(_build_nad_response(client, extended, health))
+        # Apply pagination
+        # Extended and health rows load in two IN queries for the whole page
+        page_query = order_newest_first(query, RadiusClient.created_at, RadiusClient.id).options(
+            _with_extended_and_health()
+        )
+        if cursor:
+            page_query = after_cursor(page_query, RadiusClient.created_at, RadiusClient.id, cursor)
+        else:
+            page_query = page_query.offset((page - 1) * page_size)
+        
+        clients, next_cursor = fetch_page(
+            session, page_query, page_size, lambda row: encode_cursor(row.created_at, row.id)
+        )
+        return total, clients, next_cursor
+    
+    # Queries run on the async engine without blocking the event loop
+    try:
+        total, clients, next_cursor = await db.run_sync(load_page)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    
+    # Build response with extended info and health (already loaded)
+    nad_responses = [
+        _build_nad_response(
+            client,
+            client.extended,
+            client.extended.health if client.extended else None,
+        )
+        for client in clients
+    ]
     
     # Calculate pages
-    pages = math.ceil(total / page_size) if total > 0 else 1
+    pages = None
+    if total is not None:
+        pages = math.ceil(total / page_size) if total > 0 else 1
     
     return NadListResponse(
         items=nad_responses,
@@ -155,6 +183,7 @@ async def list_nads(
         page=page,
         page_size=page_size,
         pages=pages,
+        next_cursor=next_cursor,
     )
 
 
@@ -180,10 +209,12 @@ async def get_nad(
     """
     logger.info(f"Getting NAD {nad_id} requested by {admin['sub']}")
     
-    # Get client
+    # Get client with extended info and health in one query
     client = db.execute(
-        select(RadiusClient).where(RadiusClient.id == nad_id)
-    ).scalar_one_or_none()
+        select(RadiusClient)
+        .where(RadiusClient.id == nad_id)
+        .options(joinedload(RadiusClient.extended).joinedload(RadiusNadExtended.health))
+    ).unique().scalar_one_or_none()
     
     if not client:
         raise HTTPException(
@@ -191,23 +222,8 @@ async def get_nad(
             detail=f"NAD with ID {nad_id} not found",
         )
     
-    # Get extended info
-    extended = db.execute(
-        select(RadiusNadExtended).where(
-            RadiusNadExtended.radius_client_id == client.id
-        )
-    ).scalar_one_or_none()
-    
-    # Get health info
-    health = None
-    if extended:
-        health = db.execute(
-            select(RadiusNadHealth).where(
-                RadiusNadHealth.nad_id == extended.id
-            )
-        ).scalar_one_or_none()
-    
-    return _build_nad_response(client, extended, health)
+    extended = client.extended
+    return _build_nad_response(client, extended, extended.health if extended else None)
 
 
 @router.post("/api/nads", response_model=NadResponse, status_code=status.HTTP_201_CREATED)
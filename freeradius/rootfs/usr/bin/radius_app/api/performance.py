@@ -2,7 +2,7 @@
 
 import logging
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Literal
 
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
@@ -27,6 +27,18 @@ class PerformanceTestRequest(BaseModel):
     iterations: int = Field(1, ge=1, le=10, description="Number of test iterations")
     username_prefix: str = Field("testuser", description="Prefix for generated usernames")
     use_mac_addresses: bool = Field(False, description="Use MAC addresses as usernames")
+    engine: Literal["inprocess", "radclient"] = Field(
+        "inprocess", description="Load engine: in-process generator (per-request latency) or radclient"
+    )
+    mode: Literal["closed", "open"] = Field(
+        "closed", description="closed: fixed concurrency; open: fixed request rate"
+    )
+    concurrency: int = Field(32, ge=1, le=2048, description="Workers (closed) or max requests in flight (open)")
+    rate: Optional[float] = Field(None, gt=0, le=100000, description="Offered requests per second (open mode)")
+    duration_seconds: Optional[float] = Field(
+        None, gt=0, le=600, description="Run for this long, cycling users (default: each user once per iteration)"
+    )
+    timeout: float = Field(3.0, gt=0, le=30, description="Per-request timeout in seconds")
 
 
 class PerformanceTestResponse(BaseModel):
@@ -45,6 +57,14 @@ class PerformanceTestResponse(BaseModel):
     iterations: int
     output: Optional[str] = None
     error: Optional[str] = None
+    engine: str = "radclient"
+    mode: Optional[str] = None
+    p999_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    outcomes: Dict[str, int] = Field(default_factory=dict)
+    error_messages: Dict[str, int] = Field(default_factory=dict)
+    throughput: List[Dict[str, int]] = Field(default_factory=list, description="Completions per second by outcome")
+    histogram: List[Dict[str, float]] = Field(default_factory=list, description="Non-empty latency buckets")
 
 
 @router.post("/api/v1/performance/test", response_model=PerformanceTestResponse)
@@ -54,9 +74,12 @@ async def run_performance_test(
     db: DbSession
 ) -> PerformanceTestResponse:
     """
-    Run RADIUS performance test using radclient.
+    Run RADIUS performance test.
     
-    Generates test users and measures authentication throughput.
+    Generates test users and measures authentication throughput. The
+    default in-process engine times every Access-Request and reports real
+    percentiles, an outcome breakdown and per-second throughput; the
+    radclient engine only reports totals and the mean.
     
     Args:
         request: Performance test parameters
@@ -70,14 +93,20 @@ async def run_performance_test(
     
     tester = get_performance_tester()
     
-    if not tester.radclient_available:
+    if request.engine == "radclient" and not tester.radclient_available:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="radclient is not available - performance testing disabled"
         )
     
+    if request.engine == "inprocess" and request.mode == "open" and not request.rate:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Open-loop mode requires a rate"
+        )
+    
     # Get client configuration if client_id provided
-    server_host = request.server_host or "localhost"
+    server_host = request.server_host or ("127.0.0.1" if request.engine == "inprocess" else "localhost")
     server_port = request.server_port
     secret = request.secret or "testing123"
     
@@ -109,7 +138,23 @@ async def run_performance_test(
     
     try:
         # Run performance test
-        if request.iterations > 1:
+        if request.engine == "inprocess":
+            # Iterations are extra passes over the users in one run, so the
+            # histogram covers every request instead of averaging percentiles
+            result = await tester.run_load_test(
+                test_users=test_users,
+                server_host=server_host,
+                server_port=server_port,
+                secret=secret,
+                mode=request.mode,
+                concurrency=request.concurrency,
+                rate=request.rate,
+                total_requests=None if request.duration_seconds else len(test_users) * request.iterations,
+                duration=request.duration_seconds,
+                timeout=request.timeout,
+            )
+            iterations = request.iterations
+        elif request.iterations > 1:
             # Benchmark mode - multiple iterations
             benchmark_results = tester.benchmark_configuration(
                 test_users=test_users,
@@ -158,9 +203,22 @@ async def run_performance_test(
             p99_latency_ms=round(result.p99_latency_ms, 2),
             iterations=iterations,
             output=result.output[:1000] if result.output else None,  # Limit output length
-            error=result.error
+            error=result.error,
+            engine=result.engine,
+            mode=result.mode,
+            p999_latency_ms=round(result.p999_latency_ms, 2),
+            max_latency_ms=round(result.max_latency_ms, 2),
+            outcomes=result.outcomes,
+            error_messages=result.error_messages,
+            throughput=result.throughput,
+            histogram=result.histogram,
         )
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Performance test failed: {e}", exc_info=True)
         raise HTTPException(
@@ -185,12 +243,17 @@ async def get_performance_test_status(admin: AdminUser) -> dict:
     return {
         "radclient_available": tester.radclient_available,
         "capabilities": {
-            "single_test": tester.radclient_available,
-            "benchmark": tester.radclient_available,
+            "single_test": True,
+            "benchmark": True,
+            "engines": ["inprocess"] + (["radclient"] if tester.radclient_available else []),
+            "load_modes": ["closed", "open"],
+            "latency_histogram": True,
             "test_user_generation": True
         },
         "limits": {
             "max_users": 10000,
-            "max_iterations": 10
+            "max_iterations": 10,
+            "max_concurrency": 2048,
+            "max_duration_seconds": 600
         }
     }
@@ -2,7 +2,6 @@
 
 import logging
 import math
-import re
 from datetime import datetime, time, timezone
 from typing import Optional
 
@@ -11,14 +10,19 @@ from sqlalchemy import select, func
 from sqlalchemy.exc import IntegrityError
 
 from radius_app.api.deps import AdminUser, DbSession
+from radius_app.core.policy_evaluator import PolicyRequest, get_policy_set
 from radius_app.db.models import RadiusPolicy
 from radius_app.schemas.policy import (
     PolicyCreate,
     PolicyUpdate,
     PolicyResponse,
     PolicyListResponse,
+    PolicySimulationRequest,
+    PolicySimulationResponse,
+    PolicySimulationResult,
     PolicyTestRequest,
     PolicyTestResponse,
+    ReplyAttribute,
 )
 
 logger = logging.getLogger(__name__)
@@ -341,11 +345,13 @@ async def test_policy(
     """
     Test a policy against sample data.
     
-    Simulates policy evaluation without applying it.
+    Simulates policy evaluation without applying it, including time
+    restrictions, and reports which policy would actually win in priority
+    order.
     
     Args:
         policy_id: Policy ID to test
-        test_data: Test data (username, MAC, NAS info, etc.)
+        test_data: Test data (username, MAC, NAS info, request time, etc.)
         admin: Authenticated admin user
         db: Database session
         
@@ -377,64 +383,85 @@ async def test_policy(
             reason="Policy is not active",
         )
     
-    # Evaluate match conditions
-    matches = True
-    reasons = []
-    
-    # Username match
-    if policy.match_username:
-        pattern = policy.match_username
-        if not re.match(pattern, test_data.username):
-            matches = False
-            reasons.append(f"Username '{test_data.username}' does not match pattern '{pattern}'")
-    
-    # MAC address match
-    if policy.match_mac_address and test_data.mac_address:
-        pattern = policy.match_mac_address
-        if not re.match(pattern, test_data.mac_address):
-            matches = False
-            reasons.append(f"MAC address '{test_data.mac_address}' does not match pattern '{pattern}'")
-    
-    # NAS identifier match
-    if policy.match_nas_identifier and test_data.nas_identifier:
-        pattern = policy.match_nas_identifier
-        if not re.match(pattern, test_data.nas_identifier):
-            matches = False
-            reasons.append(f"NAS identifier '{test_data.nas_identifier}' does not match pattern '{pattern}'")
-    
-    # NAS IP match
-    if policy.match_nas_ip and test_data.nas_ip:
-        pattern = policy.match_nas_ip
-        if not re.match(pattern, test_data.nas_ip):
-            matches = False
-            reasons.append(f"NAS IP '{test_data.nas_ip}' does not match pattern '{pattern}'")
-    
-    # Time restrictions (basic check - just validate structure)
-    if policy.time_restrictions:
-        # Could add time-based evaluation here
-        pass
-    
-    # Build response
-    if matches:
-        # Convert stored reply attributes back to Pydantic models
-        from radius_app.schemas.policy import ReplyAttribute
-        reply_attrs = [ReplyAttribute(**attr) for attr in (policy.reply_attributes or [])]
+    policy_set = get_policy_set(db)
+    request = _policy_request(test_data)
+    compiled = policy_set.profile(policy.id)
+    reasons = compiled.mismatches(request.attributes(), request.when())
+    decision = policy_set.evaluate(request)
+    
+    return PolicyTestResponse(
+        matches=not reasons,
+        policy_id=policy.id,
+        policy_name=policy.name,
+        reply_attributes=[ReplyAttribute(**attr) for attr in compiled.reply_attributes] if not reasons else [],
+        reason="; ".join(reasons) or "All match conditions satisfied",
+        winning_policy_id=decision.profile_id,
+        winning_policy_name=decision.profile_name,
+        winning_unlang_policy_name=decision.unlang_policy_name,
+    )
+
+
+@router.post("/api/policies/simulate", response_model=PolicySimulationResponse)
+async def simulate_policies(
+    simulation: PolicySimulationRequest,
+    admin: AdminUser,
+    db: DbSession,
+) -> PolicySimulationResponse:
+    """
+    Evaluate a batch of simulated requests against all active policies.
+    
+    Policies are compiled once (and cached until they change), then each
+    request is run through unlang policies and authorization profiles in
+    priority order. Useful for regression-testing policy changes against
+    captured traffic samples.
+    
+    Args:
+        simulation: Simulated requests (username, MAC, NAS info, request time)
+        admin: Authenticated admin user
+        db: Database session
         
-        return PolicyTestResponse(
-            matches=True,
-            policy_id=policy.id,
-            policy_name=policy.name,
-            reply_attributes=reply_attrs,
-            reason="All match conditions satisfied",
-        )
-    else:
-        return PolicyTestResponse(
-            matches=False,
-            policy_id=policy.id,
-            policy_name=policy.name,
-            reply_attributes=[],
-            reason="; ".join(reasons),
-        )
+    Returns:
+        Winning policy per request plus a per-policy summary
+    """
+    logger.info(f"Simulating {len(simulation.requests)} requests by {admin['sub']}")
+    
+    policy_set = get_policy_set(db)
+    decisions = policy_set.evaluate_batch(_policy_request(item) for item in simulation.requests)
+    
+    results = []
+    summary: dict[str, int] = {}
+    for index, decision in enumerate(decisions):
+        results.append(PolicySimulationResult(
+            index=index,
+            outcome=decision.outcome,
+            unlang_policy_id=decision.unlang_policy_id,
+            unlang_policy_name=decision.unlang_policy_name,
+            profile_id=decision.profile_id,
+            profile_name=decision.profile_name,
+            reason=decision.reason,
+        ))
+        label = decision.profile_name or decision.unlang_policy_name or decision.outcome
+        summary[label] = summary.get(label, 0) + 1
+    
+    return PolicySimulationResponse(
+        total=len(results),
+        results=results,
+        summary=summary,
+        unsimulated_policies=policy_set.unsimulated,
+        errors=policy_set.errors,
+    )
+
+
+def _policy_request(data: PolicyTestRequest) -> PolicyRequest:
+    """Convert a test request into an evaluator request."""
+    return PolicyRequest(
+        username=data.username,
+        mac_address=data.mac_address,
+        nas_identifier=data.nas_identifier,
+        nas_ip=data.nas_ip,
+        timestamp=data.timestamp,
+        additional_attributes=data.additional_attributes,
+    )
 
 
 @router.get("/api/policies/groups")
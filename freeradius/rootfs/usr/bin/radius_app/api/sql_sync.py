@@ -5,6 +5,7 @@ for dynamic SQL-based authentication.
 """
 
 import logging
+from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, status
@@ -23,6 +24,7 @@ async def sync_psk_to_sql(
     admin: AdminUser,
     db: DbSession,
     portal_db_url: Optional[str] = None,
+    since: Optional[datetime] = None,
 ) -> dict:
     """Sync PSK data from portal database to radcheck/radreply tables.
     
@@ -31,11 +33,14 @@ async def sync_psk_to_sql(
     - radreply: Stores reply attributes (Cisco-AVPair with UDN, etc.)
     
     This allows FreeRADIUS to query PSK data directly from SQL at runtime.
+    Pass the ``cursor`` from a previous response as ``since`` to sync only
+    users changed after it.
     
     Args:
         admin: Admin user
         db: Database session
         portal_db_url: Portal database URL (optional, uses configured DB if not provided)
+        since: Only sync users changed after this time
         
     Returns:
         Sync statistics
@@ -44,7 +49,7 @@ async def sync_psk_to_sql(
     
     try:
         generator = SqlConfigGenerator()
-        stats = generator.sync_psk_to_radcheck(db, portal_db_url)
+        stats = generator.sync_psk_to_radcheck(db, portal_db_url, since=since)
         
         if stats["errors"]:
             logger.warning(f"PSK sync completed with {len(stats['errors'])} errors")
@@ -54,6 +59,10 @@ async def sync_psk_to_sql(
             "users_synced": stats["users_synced"],
             "radcheck_entries": stats["radcheck_entries"],
             "radreply_entries": stats["radreply_entries"],
+            "inserted": stats.get("inserted", 0),
+            "updated": stats.get("updated", 0),
+            "deleted": stats.get("deleted", 0),
+            "cursor": stats.get("cursor"),
             "errors": stats["errors"],
             "message": f"Synced {stats['users_synced']} users to radcheck/radreply tables",
         }
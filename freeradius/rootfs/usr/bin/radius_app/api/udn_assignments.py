@@ -1,15 +1,30 @@
 """UDN Assignment CRUD API endpoints."""
 
+import json
 import logging
 import math
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Literal, Optional
 
-from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import select, func
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
-from radius_app.api.deps import AdminUser, DbSession
+from radius_app.api.deps import AdminUser, AsyncDbSession, DbSession
+from radius_app.core.pagination import (
+    CountMode,
+    InvalidCursor,
+    after_cursor,
+    count_rows,
+    encode_cursor,
+    fetch_page,
+    order_newest_first,
+)
+from radius_app.core.search_index import search_clause
+from radius_app.core.udn_allocator import UDN_MAX, UDN_MIN, UdnAllocator, UdnPoolExhausted
 from radius_app.db.models import UdnAssignment
 from radius_app.schemas.udn_assignments import (
     UdnAssignmentCreate,
@@ -23,16 +38,16 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# UDN ID constants
-UDN_MIN = 2
-UDN_MAX = 16777200
+# Attempts to allocate an ID when a concurrent writer takes it first
+UDN_ALLOCATION_ATTEMPTS = 3
 
 
 def get_next_available_udn(db) -> int:
     """
     Get the next available UDN ID.
     
-    Finds the smallest unused UDN ID in the range 2-16777200.
+    Returns the smallest unused UDN ID in the range 2-16777200 from the
+    persistent free-range table (an indexed lookup, not a pool scan).
     
     Args:
         db: Database session
@@ -43,28 +58,17 @@ def get_next_available_udn(db) -> int:
     Raises:
         ValueError: If no UDN IDs are available
     """
-    # Get all assigned UDN IDs
-    assigned_udns = db.execute(
-        select(UdnAssignment.udn_id).order_by(UdnAssignment.udn_id)
-    ).scalars().all()
-    
-    assigned_set = set(assigned_udns)
-    
-    # Find first available ID
-    for udn_id in range(UDN_MIN, UDN_MAX + 1):
-        if udn_id not in assigned_set:
-            return udn_id
-    
-    # No available IDs (shouldn't happen with 16M+ range)
-    raise ValueError("No available UDN IDs - all allocated")
+    return UdnAllocator(db).peek()
 
 
 @router.get("/api/udn-assignments", response_model=UdnAssignmentListResponse)
 async def list_udn_assignments(
     admin: AdminUser,
-    db: DbSession,
-    page: int = Query(1, ge=1, description="Page number (1-indexed)"),
+    db: AsyncDbSession,
+    page: int = Query(1, ge=1, description="Page number (1-indexed; ignored when cursor is set)"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: CountMode = Query("exact", description="Total count: exact, estimated, or none"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search by MAC, user name, email, or unit"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
@@ -73,11 +77,17 @@ async def list_udn_assignments(
     """
     List all UDN assignments with pagination and filtering.
     
+    Results are sorted newest first. Pass the returned ``next_cursor`` back
+    as ``cursor`` to fetch the next page; cursor pages cost the same at any
+    depth, unlike ``page`` which skips rows with OFFSET.
+    
     Args:
         admin: Authenticated admin user
         db: Database session
         page: Page number (1-indexed)
         page_size: Number of items per page
+        cursor: Keyset cursor from a previous response
+        count: How to compute the total (exact, estimated, or none)
         is_active: Filter by active status
         search: Search term for MAC, user name, email, or unit
         user_id: Filter by user ID
@@ -85,44 +95,54 @@ async def list_udn_assignments(
         
     Returns:
         Paginated list of UDN assignments
+        
+    Raises:
+        HTTPException: If the cursor is invalid
     """
     logger.info(f"Listing UDN assignments requested by {admin['sub']} from {admin['ip']}")
     
-    # Build query
-    query = select(UdnAssignment)
-    
-    # Apply filters
-    if is_active is not None:
-        query = query.where(UdnAssignment.is_active == is_active)
-    
-    if user_id is not None:
-        query = query.where(UdnAssignment.user_id == user_id)
-    
-    if network_id:
-        query = query.where(UdnAssignment.network_id == network_id)
-    
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            (UdnAssignment.mac_address.ilike(search_pattern)) |
-            (UdnAssignment.user_name.ilike(search_pattern)) |
-            (UdnAssignment.user_email.ilike(search_pattern)) |
-            (UdnAssignment.unit.ilike(search_pattern))
+    def load_page(session: Session):
+        # Build query
+        query = select(UdnAssignment)
+        
+        # Apply filters
+        if is_active is not None:
+            query = query.where(UdnAssignment.is_active == is_active)
+        
+        if user_id is not None:
+            query = query.where(UdnAssignment.user_id == user_id)
+        
+        if network_id:
+            query = query.where(UdnAssignment.network_id == network_id)
+        
+        if search:
+            query = query.where(search_clause(session, UdnAssignment, search))
+        
+        # Get total count
+        total = count_rows(session, query, count)
+        
+        # Apply pagination
+        page_query = order_newest_first(query, UdnAssignment.created_at, UdnAssignment.id)
+        if cursor:
+            page_query = after_cursor(page_query, UdnAssignment.created_at, UdnAssignment.id, cursor)
+        else:
+            page_query = page_query.offset((page - 1) * page_size)
+        
+        assignments, next_cursor = fetch_page(
+            session, page_query, page_size, lambda row: encode_cursor(row.created_at, row.id)
         )
+        return total, assignments, next_cursor
     
-    # Get total count
-    total_query = select(func.count()).select_from(query.subquery())
-    total = db.execute(total_query).scalar()
-    
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size).order_by(UdnAssignment.created_at.desc())
-    
-    # Execute query
-    assignments = db.execute(query).scalars().all()
+    # Queries run on the async engine without blocking the event loop
+    try:
+        total, assignments, next_cursor = await db.run_sync(load_page)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
     
     # Calculate pages
-    pages = math.ceil(total / page_size) if total > 0 else 1
+    pages = None
+    if total is not None:
+        pages = math.ceil(total / page_size) if total > 0 else 1
     
     return UdnAssignmentListResponse(
         items=[UdnAssignmentResponse.model_validate(assignment) for assignment in assignments],
@@ -130,9 +150,48 @@ async def list_udn_assignments(
         page=page,
         page_size=page_size,
         pages=pages,
+        next_cursor=next_cursor,
     )
 
 
+@router.get("/api/udn-assignments/available-udn", response_model=AvailableUdnResponse)
+async def get_available_udn(
+    admin: AdminUser,
+    db: DbSession,
+) -> AvailableUdnResponse:
+    """
+    Get the next available UDN ID.
+    
+    Args:
+        admin: Authenticated admin user
+        db: Database session
+        
+    Returns:
+        Next available UDN ID and statistics
+    """
+    logger.info(f"Getting next available UDN requested by {admin['sub']}")
+    
+    try:
+        allocator = UdnAllocator(db)
+        next_udn = allocator.peek()
+        total_available = allocator.free_count()
+        total_assigned = (UDN_MAX - UDN_MIN + 1) - total_available
+        # Persist the free list if this call built or repaired it
+        db.commit()
+        
+        return AvailableUdnResponse(
+            udn_id=next_udn,
+            total_assigned=total_assigned,
+            total_available=total_available,
+        )
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
+            detail=str(e),
+        )
+
+
 @router.get("/api/udn-assignments/{assignment_id}", response_model=UdnAssignmentResponse)
 async def get_udn_assignment(
     assignment_id: int,
@@ -210,41 +269,6 @@ async def get_udn_assignment_by_mac(
     return UdnAssignmentResponse.model_validate(assignment)
 
 
-@router.get("/api/udn-assignments/available-udn", response_model=AvailableUdnResponse)
-async def get_available_udn(
-    admin: AdminUser,
-    db: DbSession,
-) -> AvailableUdnResponse:
-    """
-    Get the next available UDN ID.
-    
-    Args:
-        admin: Authenticated admin user
-        db: Database session
-        
-    Returns:
-        Next available UDN ID and statistics
-    """
-    logger.info(f"Getting next available UDN requested by {admin['sub']}")
-    
-    try:
-        next_udn = get_next_available_udn(db)
-        total_assigned = db.execute(select(func.count(UdnAssignment.id))).scalar()
-        total_available = (UDN_MAX - UDN_MIN + 1) - total_assigned
-        
-        return AvailableUdnResponse(
-            udn_id=next_udn,
-            total_assigned=total_assigned,
-            total_available=total_available,
-        )
-        
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
-            detail=str(e),
-        )
-
-
 @router.post("/api/udn-assignments", response_model=UdnAssignmentResponse, status_code=status.HTTP_201_CREATED)
 async def create_udn_assignment(
     assignment_data: UdnAssignmentCreate,
@@ -304,16 +328,8 @@ async def create_udn_assignment(
     
     # Auto-assign UDN ID if not provided
     udn_id = assignment_data.udn_id
-    if udn_id is None:
-        try:
-            udn_id = get_next_available_udn(db)
-            logger.info(f"Auto-assigned UDN ID: {udn_id}")
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
-                detail=str(e),
-            )
-    else:
+    auto_assign = udn_id is None
+    if not auto_assign:
         # Check if UDN ID is already assigned
         existing_udn = db.execute(
             select(UdnAssignment).where(UdnAssignment.udn_id == udn_id)
@@ -326,14 +342,29 @@ async def create_udn_assignment(
                 detail=f"UDN ID {udn_id} is already assigned to User {existing_udn.user_id} ({mac_str})",
             )
     
-    # Create assignment
-    assignment = UdnAssignment(
-        **assignment_data.model_dump(exclude={"udn_id"}),
-        udn_id=udn_id,
-    )
-    
+    allocator = UdnAllocator(db)
     try:
-        db.add(assignment)
+        for attempt in range(1, UDN_ALLOCATION_ATTEMPTS + 1):
+            try:
+                # Savepoint per attempt: a unique-index conflict rolls back
+                # both the insert and the free-list change
+                with db.begin_nested():
+                    if auto_assign:
+                        udn_id = allocator.allocate()
+                    else:
+                        allocator.claim(udn_id)
+                    assignment = UdnAssignment(
+                        **assignment_data.model_dump(exclude={"udn_id"}),
+                        udn_id=udn_id,
+                    )
+                    db.add(assignment)
+                break
+            except IntegrityError:
+                if not auto_assign or attempt == UDN_ALLOCATION_ATTEMPTS:
+                    raise
+                logger.warning(f"⚠️  UDN ID {udn_id} was taken concurrently, retrying ({attempt})")
+        if auto_assign:
+            logger.info(f"Auto-assigned UDN ID: {udn_id}")
         db.commit()
         db.refresh(assignment)
         
@@ -342,6 +373,12 @@ async def create_udn_assignment(
         
         return UdnAssignmentResponse.model_validate(assignment)
         
+    except UdnPoolExhausted as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
+            detail=str(e),
+        )
     except IntegrityError as e:
         db.rollback()
         logger.error(f"Database integrity error creating UDN assignment: {e}")
@@ -358,6 +395,103 @@ async def create_udn_assignment(
         )
 
 
+@router.post("/api/udn-assignments/import")
+async def import_udn_assignments(
+    request: Request,
+    admin: AdminUser,
+    db: DbSession,
+    import_format: Optional[Literal["csv", "ndjson"]] = Query(
+        None, alias="format", description="Input format (default: from Content-Type)"
+    ),
+    atomic: bool = Query(False, description="Insert nothing if any row fails"),
+) -> StreamingResponse:
+    """
+    Bulk-create UDN assignments from a CSV or NDJSON request body.
+    
+    CSV needs a header row with UdnAssignmentCreate field names (user_id
+    required); NDJSON has one object per line. Rows without a udn_id get
+    the lowest free IDs, reserved in one batch. Everything is written in a
+    single transaction and the users file is regenerated once afterwards.
+    
+    Results are streamed as NDJSON:
+    - {"type": "result", "line", "status", ...} - one per input row
+      (status created, failed or skipped)
+    - {"type": "summary", ...} - totals at the end
+    
+    Args:
+        request: Request whose body is the import file
+        admin: Authenticated admin user
+        db: Database session
+        import_format: csv or ndjson (overrides Content-Type)
+        atomic: Abort the whole import if any row fails
+        
+    Returns:
+        Streaming NDJSON response
+        
+    Raises:
+        HTTPException: 400 for unreadable input, 409 on a concurrent
+            conflict, 507 if the UDN pool can't hold the import
+    """
+    from radius_app.core.change_feed import get_change_notifier, record_changes, triggers_active
+    from radius_app.core.udn_bulk_import import UdnImportError, detect_format
+    from radius_app.core.udn_bulk_import import import_udn_assignments as run_import
+    
+    fmt = import_format or detect_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson",
+        )
+    try:
+        payload = (await request.body()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Import must be UTF-8")
+    
+    logger.info(f"UDN import ({fmt}, atomic={atomic}) requested by {admin.get('sub', 'unknown')}")
+    started = time.perf_counter()
+    try:
+        report = run_import(db, payload, fmt, atomic=atomic)
+        if report.created:
+            if not triggers_active():
+                # Bulk inserts bypass the ORM change hooks
+                record_changes(db, ["udn_assignments"])
+            db.commit()
+            # One wake-up, so the watcher regenerates the users file once
+            get_change_notifier().notify()
+        else:
+            db.rollback()
+    except UdnImportError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except UdnPoolExhausted as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_507_INSUFFICIENT_STORAGE, detail=str(e))
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"Database integrity error importing UDN assignments: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="UDN import conflicted with a concurrent change - nothing was imported",
+        )
+    
+    summary = {
+        "type": "summary",
+        **report.summary(),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(
+        f"✅ UDN import finished: {summary['created']} created, {summary['failed']} failed, "
+        f"{summary['skipped']} skipped in {summary['elapsed_ms']}ms"
+    )
+    
+    def stream():
+        for result in report.results:
+            yield json.dumps({"type": "result", **result.to_dict()}) + "\n"
+        yield json.dumps(summary) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.put("/api/udn-assignments/{assignment_id}", response_model=UdnAssignmentResponse)
 async def update_udn_assignment(
     assignment_id: int,
@@ -415,11 +549,17 @@ async def update_udn_assignment(
             )
     
     # Update fields
+    old_udn_id = assignment.udn_id
     update_data = assignment_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(assignment, field, value)
     
     try:
+        if assignment.udn_id != old_udn_id:
+            db.flush()
+            allocator = UdnAllocator(db)
+            allocator.claim(assignment.udn_id)
+            allocator.release(old_udn_id)
         db.commit()
         db.refresh(assignment)
         
@@ -475,6 +615,9 @@ async def delete_udn_assignment(
     try:
         if hard_delete:
             db.delete(assignment)
+            db.flush()
+            # Soft-deleted rows keep their ID (unique index); hard deletes free it
+            UdnAllocator(db).release(assignment.udn_id)
             logger.info(f"✅ UDN assignment {assignment_id} permanently deleted")
         else:
             assignment.is_active = False
@@ -69,6 +69,110 @@ def get_database_url() -> str:
     return db_url
 
 
+def get_users_shard_count() -> int:
+    """Get the number of shard files used for users-format config files.
+    
+    Read from RADIUS_USERS_SHARDS. 0 (the default) writes single files;
+    N > 0 splits ``users`` and ``users-mac-bypass`` into N include shards.
+    """
+    raw = os.getenv("RADIUS_USERS_SHARDS", "0")
+    try:
+        shard_count = int(raw)
+    except ValueError:
+        logger.warning(f"Invalid RADIUS_USERS_SHARDS={raw!r} - using single users files")
+        return 0
+    return max(shard_count, 0)
+
+
+def get_reload_timing() -> tuple[float, float]:
+    """Get the radiusd reload debounce window and max delay (seconds).
+
+    Read from RADIUS_RELOAD_DEBOUNCE_SECONDS (default 2) and
+    RADIUS_RELOAD_MAX_DELAY_SECONDS (default 10). The max delay is never
+    shorter than the debounce window.
+    """
+    timing = []
+    for name, default in (
+        ("RADIUS_RELOAD_DEBOUNCE_SECONDS", 2.0),
+        ("RADIUS_RELOAD_MAX_DELAY_SECONDS", 10.0),
+    ):
+        raw = os.getenv(name, str(default))
+        try:
+            value = float(raw)
+        except ValueError:
+            logger.warning(f"Invalid {name}={raw!r} - using {default}")
+            value = default
+        timing.append(max(value, 0.0))
+    debounce, max_delay = timing
+    return debounce, max(max_delay, debounce)
+
+
+NAD_PROBE_MODES = ("tcp", "status-server")
+
+
+def get_nad_probe_settings() -> tuple[str, int]:
+    """Get the NAD health probe mode and concurrency limit.
+
+    Read from RADIUS_NAD_PROBE_MODE ("tcp", the default, or "status-server"
+    for RFC 5997 probes) and RADIUS_NAD_PROBE_CONCURRENCY (default 64).
+    """
+    mode = os.getenv("RADIUS_NAD_PROBE_MODE", "tcp").lower()
+    if mode not in NAD_PROBE_MODES:
+        logger.warning(f"Invalid RADIUS_NAD_PROBE_MODE={mode!r} - using tcp")
+        mode = "tcp"
+    raw = os.getenv("RADIUS_NAD_PROBE_CONCURRENCY", "64")
+    try:
+        concurrency = int(raw)
+    except ValueError:
+        logger.warning(f"Invalid RADIUS_NAD_PROBE_CONCURRENCY={raw!r} - using 64")
+        concurrency = 64
+    return mode, max(concurrency, 1)
+
+
+def get_portal_pool_settings() -> tuple[int, int, int, float]:
+    """Get connection pool sizing for portal database engines.
+
+    Read from RADIUS_PORTAL_POOL_SIZE (default 5),
+    RADIUS_PORTAL_POOL_MAX_OVERFLOW (default 10),
+    RADIUS_PORTAL_POOL_RECYCLE_SECONDS (default 3600) and
+    RADIUS_PORTAL_POOL_TIMEOUT_SECONDS (default 30).
+
+    Returns:
+        (pool_size, max_overflow, pool_recycle, pool_timeout)
+    """
+    values = []
+    for name, default, minimum in (
+        ("RADIUS_PORTAL_POOL_SIZE", 5, 1),
+        ("RADIUS_PORTAL_POOL_MAX_OVERFLOW", 10, 0),
+        ("RADIUS_PORTAL_POOL_RECYCLE_SECONDS", 3600, -1),
+        ("RADIUS_PORTAL_POOL_TIMEOUT_SECONDS", 30, 1),
+    ):
+        raw = os.getenv(name, str(default))
+        try:
+            value = int(raw)
+        except ValueError:
+            logger.warning(f"Invalid {name}={raw!r} - using {default}")
+            value = default
+        values.append(max(value, minimum))
+    pool_size, max_overflow, pool_recycle, pool_timeout = values
+    return pool_size, max_overflow, pool_recycle, float(pool_timeout)
+
+
+def get_database_async_enabled() -> bool:
+    """Whether API handlers may use an async database engine.
+
+    Read from RADIUS_DATABASE_ASYNC (default true). The async engine is
+    only used when the driver for DATABASE_URL (asyncpg, aiomysql or
+    aiosqlite) is installed.
+    """
+    return os.getenv("RADIUS_DATABASE_ASYNC", "true").lower() not in ("0", "false", "no", "off")
+
+
+def get_radiusd_pid_file() -> Path:
+    """Get the radiusd pidfile path (RADIUSD_PID_FILE)."""
+    return Path(os.getenv("RADIUSD_PID_FILE", "/var/run/radiusd/radiusd.pid"))
+
+
 class Settings(BaseSettings):
     """Application settings from environment variables."""
     
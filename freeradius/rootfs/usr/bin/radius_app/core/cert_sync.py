@@ -2,23 +2,66 @@
 
 Syncs user certificates from Portal database to FreeRADIUS for EAP-TLS validation.
 Watches for changes and automatically updates FreeRADIUS configuration.
+
+Syncs are incremental: portal certificates are read in (updated_at, id)
+order after a high-water mark kept in ``radius_sync_state``, so a poll
+with nothing new costs one indexed query. The first sync (no mark yet)
+walks every certificate by id.
 """
 
 import asyncio
 import logging
-from datetime import datetime, timezone
+import os
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import DateTime, Integer, String, Text, and_, column, or_, select, table
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
 
 from radius_app.config import get_settings
 from radius_app.core.eap_config_generator import EapConfigGenerator
-from radius_app.db.database import get_engine, get_session_local
-from radius_app.db.models import RadiusUserCertificate
+from radius_app.db.database import get_engine, get_portal_engine, get_session_local
+from radius_app.db.models import RadiusSyncState, RadiusUserCertificate
 
 logger = logging.getLogger(__name__)
 
+# Portal tables, declared here to avoid importing portal models
+user_certificates = table(
+    "user_certificates",
+    column("id", Integer),
+    column("user_id", Integer),
+    column("subject_common_name", String),
+    column("subject_distinguished_name", String),
+    column("certificate_fingerprint", String),
+    column("serial_number", String),
+    column("valid_from", DateTime(timezone=True)),
+    column("valid_until", DateTime(timezone=True)),
+    column("status", String),
+    column("certificate", Text),
+    column("updated_at", DateTime(timezone=True)),
+)
+portal_users = table("users", column("id", Integer), column("email", String))
+
+SYNC_STATE_NAME = "portal_certificates"
+BATCH_SIZE = 500
+
+# Re-read this far behind the mark so rows committed late with an older
+# updated_at aren't skipped; reprocessing an unchanged row is a no-op
+CURSOR_LOOKBACK = timedelta(seconds=5)
+
+# Statuses that create a RADIUS row for a certificate not seen before
+SYNCED_STATUSES = ("active", "revoked")
+
+
+def _cert_file_name(user_email: str) -> str:
+    return user_email.replace("@", "_at_").replace(".", "_") + ".pem"
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
 
 class CertificateSyncService:
     """Synchronize user certificates from portal to FreeRADIUS.
@@ -82,138 +125,97 @@ class CertificateSyncService:
                 # Continue running despite errors
 
     async def sync_certificates(self) -> dict:
-        """Synchronize certificates from portal database.
+        """Synchronize certificates changed in the portal since the last sync.
+        
+        Each batch is applied in one transaction together with the advanced
+        high-water mark, after the PEM files of its dirty users have been
+        written. Config is regenerated and FreeRADIUS reloaded only if some
+        user's active certificates changed.
         
         Returns:
             Dictionary with sync statistics
         """
         logger.info("Starting certificate synchronization...")
         
+        SessionLocal = get_session_local()
+        db = SessionLocal()
+        
         try:
-            SessionLocal = get_session_local()
-            db = SessionLocal()
-            
-            # Get portal database connection string
-            settings = get_settings()
-            portal_db_url = settings.database_url
+            portal_engine = get_portal_engine(get_settings().database_url)
+            state = db.get(RadiusSyncState, SYNC_STATE_NAME)
+            if state is None:
+                state = RadiusSyncState(name=SYNC_STATE_NAME, cursor_at=None, cursor_id=0)
+                db.add(state)
+            full = state.cursor_at is None
             
-            # Connect to portal database
-            portal_engine = create_engine(portal_db_url)
+            added = updated = revoked = processed = 0
+            all_dirty: set[str] = set()
             
-            with Session(portal_engine) as portal_db:
-                # Query portal for active user certificates
-                # Note: We need to import UserCertificate from portal models
-                # For now, use raw SQL to avoid circular dependencies
+            with portal_engine.connect() as portal_conn:
+                # Keyset position within this sync (not the stored mark)
+                position: tuple[datetime | None, int] = (None, 0)
+                if not full:
+                    position = (_as_utc(state.cursor_at) - CURSOR_LOOKBACK, 0)
                 
-                result = portal_db.execute("""
-                    SELECT 
-                        id as portal_certificate_id,
-                        user_id,
-                        (SELECT email FROM users WHERE id = user_certificates.user_id) as user_email,
-                        subject_common_name,
-                        subject_distinguished_name,
-                        certificate_fingerprint,
-                        serial_number,
-                        valid_from,
-                        valid_until,
-                        status,
-                        certificate
-                    FROM user_certificates
-                    WHERE status IN ('active', 'revoked')
-                    ORDER BY user_email
-                """)
-                
-                portal_certs = result.fetchall()
-                
-                logger.info(f"Found {len(portal_certs)} certificates in portal database")
-                
-                # Sync each certificate
-                added = 0
-                updated = 0
-                revoked = 0
-                
-                for portal_cert in portal_certs:
-                    try:
-                        # Check if certificate exists in RADIUS database
-                        radius_cert = db.query(RadiusUserCertificate).filter_by(
-                            portal_certificate_id=portal_cert.portal_certificate_id
-                        ).first()
-                        
-                        if radius_cert:
-                            # Update existing certificate
-                            if radius_cert.status != portal_cert.status:
-                                radius_cert.status = portal_cert.status
-                                radius_cert.last_updated_at = datetime.now(timezone.utc)
-                                
-                                if portal_cert.status == "revoked":
-                                    revoked += 1
-                                    logger.info(
-                                        f"Revoked certificate: {portal_cert.user_email} "
-                                        f"(serial: {portal_cert.serial_number})"
-                                    )
-                                else:
-                                    updated += 1
-                        else:
-                            # Add new certificate
-                            radius_cert = RadiusUserCertificate(
-                                portal_certificate_id=portal_cert.portal_certificate_id,
-                                user_email=portal_cert.user_email,
-                                subject_common_name=portal_cert.subject_common_name,
-                                subject_distinguished_name=portal_cert.subject_distinguished_name,
-                                certificate_fingerprint=portal_cert.certificate_fingerprint,
-                                serial_number=portal_cert.serial_number,
-                                valid_from=portal_cert.valid_from,
-                                valid_until=portal_cert.valid_until,
-                                status=portal_cert.status,
-                                synced_at=datetime.now(timezone.utc)
-                            )
-                            db.add(radius_cert)
-                            added += 1
-                            
-                            logger.info(
-                                f"Added certificate: {portal_cert.user_email} "
-                                f"(serial: {portal_cert.serial_number})"
-                            )
-                            
-                            # Write certificate file to disk
-                            await self._write_certificate_file(
-                                portal_cert.user_email,
-                                portal_cert.certificate
-                            )
+                while True:
+                    rows = self._fetch_changed(portal_conn, position, full)
+                    if not rows:
+                        break
+                    processed += len(rows)
+                    last = rows[-1]
+                    position = (last.updated_at, last.portal_certificate_id)
                     
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to sync certificate {portal_cert.portal_certificate_id}: {e}"
-                        )
-                        continue
-                
-                # Commit all changes
-                db.commit()
-                
-                # Regenerate FreeRADIUS configuration
-                if added > 0 or updated > 0 or revoked > 0:
-                    logger.info("Regenerating FreeRADIUS configuration...")
-                    await self._regenerate_config(db)
-                
-                self._last_sync = datetime.now(timezone.utc)
-                
-                stats = {
-                    "success": True,
-                    "certificates_added": added,
-                    "certificates_updated": updated,
-                    "certificates_revoked": revoked,
-                    "total_synced": len(portal_certs),
-                    "last_sync": self._last_sync.isoformat()
-                }
-                
-                logger.info(
-                    f"✅ Certificate sync complete: "
-                    f"+{added} ~{updated} -{revoked} (total: {len(portal_certs)})"
-                )
-                
-                return stats
+                    counts, dirty = self._apply_batch(db, rows)
+                    added += counts["added"]
+                    updated += counts["updated"]
+                    revoked += counts["revoked"]
+                    
+                    # Advance the mark to the newest row applied so far
+                    for row in rows:
+                        if row.updated_at is None:
+                            continue
+                        mark = (_as_utc(row.updated_at), row.portal_certificate_id)
+                        if state.cursor_at is None or mark > (_as_utc(state.cursor_at), state.cursor_id):
+                            state.cursor_at, state.cursor_id = mark
+                    
+                    # Files first: if the commit fails they are rewritten next time
+                    if dirty:
+                        pems = self._fetch_active_pems(portal_conn, dirty)
+                        await asyncio.to_thread(self._write_certificate_files, dirty, pems)
+                        all_dirty |= dirty
+                    db.commit()
+                    
+                    if len(rows) < BATCH_SIZE:
+                        break
+            
+            # Regenerate FreeRADIUS configuration only when a user's certificates changed
+            if all_dirty:
+                logger.info(f"Regenerating FreeRADIUS configuration ({len(all_dirty)} users changed)...")
+                await self._regenerate_config(db)
+            
+            self._last_sync = datetime.now(timezone.utc)
+            
+            stats = {
+                "success": True,
+                "certificates_added": added,
+                "certificates_updated": updated,
+                "certificates_revoked": revoked,
+                "total_synced": processed,
+                "users_changed": len(all_dirty),
+                "full_sync": full,
+                "cursor": state.cursor_at.isoformat() if state.cursor_at else None,
+                "last_sync": self._last_sync.isoformat()
+            }
+            
+            logger.info(
+                f"✅ Certificate sync complete: "
+                f"+{added} ~{updated} -{revoked} (processed: {processed})"
+            )
+            
+            return stats
                 
         except Exception as e:
+            db.rollback()
             logger.error(f"Certificate sync failed: {e}", exc_info=True)
             return {
                 "success": False,
@@ -223,25 +225,151 @@ class CertificateSyncService:
         finally:
             db.close()
 
-    async def _write_certificate_file(self, user_email: str, certificate_pem: str):
-        """Write certificate to disk for FreeRADIUS.
+    def _fetch_changed(
+        self, portal_conn: Connection, position: tuple[datetime | None, int], full: bool
+    ) -> list:
+        """Fetch the next batch of portal certificates after ``position``.
         
-        Args:
-            user_email: User's email address
-            certificate_pem: Certificate in PEM format
+        Full syncs walk by id; incremental syncs by (updated_at, id).
         """
-        try:
-            # Sanitize filename
-            safe_filename = user_email.replace("@", "_at_").replace(".", "_")
-            cert_file = self.certs_path / f"{safe_filename}.pem"
-            
-            # Write certificate
-            cert_file.write_text(certificate_pem)
+        cert = user_certificates.c
+        query = select(
+            cert.id.label("portal_certificate_id"),
+            cert.user_id,
+            portal_users.c.email.label("user_email"),
+            cert.subject_common_name,
+            cert.subject_distinguished_name,
+            cert.certificate_fingerprint,
+            cert.serial_number,
+            cert.valid_from,
+            cert.valid_until,
+            cert.status,
+            cert.updated_at,
+        ).select_from(
+            user_certificates.outerjoin(portal_users, portal_users.c.id == cert.user_id)
+        )
+        
+        after_at, after_id = position
+        if full:
+            query = query.where(cert.id > after_id).order_by(cert.id)
+        else:
+            query = query.where(or_(
+                cert.updated_at > after_at,
+                and_(cert.updated_at == after_at, cert.id > after_id),
+            )).order_by(cert.updated_at, cert.id)
+        return portal_conn.execute(query.limit(BATCH_SIZE)).fetchall()
+
+    def _apply_batch(self, db: Session, rows: list) -> tuple[dict, set[str]]:
+        """Apply a batch of portal certificates to the RADIUS database.
+        
+        Existing rows are prefetched in one query, matched by portal id or
+        (for re-issued rows) fingerprint.
+        
+        Returns:
+            (counts, emails of users whose active certificates changed)
+        """
+        counts = {"added": 0, "updated": 0, "revoked": 0}
+        dirty: set[str] = set()
+        
+        existing = db.execute(select(RadiusUserCertificate).where(or_(
+            RadiusUserCertificate.portal_certificate_id.in_([row.portal_certificate_id for row in rows]),
+            RadiusUserCertificate.certificate_fingerprint.in_([row.certificate_fingerprint for row in rows]),
+        ))).scalars().all()
+        by_portal_id = {cert.portal_certificate_id: cert for cert in existing}
+        by_fingerprint = {cert.certificate_fingerprint: cert for cert in existing}
+        
+        now = datetime.now(timezone.utc)
+        for portal_cert in rows:
+            radius_cert = (
+                by_portal_id.get(portal_cert.portal_certificate_id)
+                or by_fingerprint.get(portal_cert.certificate_fingerprint)
+            )
             
-            logger.debug(f"Wrote certificate file: {cert_file}")
+            if radius_cert is None:
+                if portal_cert.status not in SYNCED_STATUSES or not portal_cert.user_email:
+                    continue
+                radius_cert = RadiusUserCertificate(
+                    portal_certificate_id=portal_cert.portal_certificate_id,
+                    user_email=portal_cert.user_email,
+                    subject_common_name=portal_cert.subject_common_name,
+                    subject_distinguished_name=portal_cert.subject_distinguished_name,
+                    certificate_fingerprint=portal_cert.certificate_fingerprint,
+                    serial_number=portal_cert.serial_number,
+                    valid_from=portal_cert.valid_from,
+                    valid_until=portal_cert.valid_until,
+                    status=portal_cert.status,
+                    cert_file_path=str(self.certs_path / _cert_file_name(portal_cert.user_email)),
+                    synced_at=now,
+                )
+                db.add(radius_cert)
+                by_portal_id[portal_cert.portal_certificate_id] = radius_cert
+                by_fingerprint[portal_cert.certificate_fingerprint] = radius_cert
+                counts["added"] += 1
+                if portal_cert.status == "active":
+                    dirty.add(portal_cert.user_email)
+                logger.info(
+                    f"Added certificate: {portal_cert.user_email} "
+                    f"(serial: {portal_cert.serial_number})"
+                )
+                continue
             
-        except Exception as e:
-            logger.error(f"Failed to write certificate file: {e}")
+            radius_cert.portal_certificate_id = portal_cert.portal_certificate_id
+            if radius_cert.status != portal_cert.status:
+                radius_cert.status = portal_cert.status
+                radius_cert.last_updated_at = now
+                dirty.add(radius_cert.user_email)
+                
+                if portal_cert.status == "revoked":
+                    counts["revoked"] += 1
+                    logger.info(
+                        f"Revoked certificate: {radius_cert.user_email} "
+                        f"(serial: {portal_cert.serial_number})"
+                    )
+                else:
+                    counts["updated"] += 1
+        
+        return counts, dirty
+
+    def _fetch_active_pems(self, portal_conn: Connection, emails: set[str]) -> dict[str, list[str]]:
+        """Active certificate PEMs for each user, oldest first."""
+        cert = user_certificates.c
+        pems: dict[str, list[str]] = {}
+        ordered = sorted(emails)
+        for start in range(0, len(ordered), BATCH_SIZE):
+            result = portal_conn.execute(
+                select(portal_users.c.email, cert.certificate)
+                .select_from(user_certificates.join(portal_users, portal_users.c.id == cert.user_id))
+                .where(portal_users.c.email.in_(ordered[start:start + BATCH_SIZE]), cert.status == "active")
+                .order_by(cert.id)
+            )
+            for email, pem in result:
+                pems.setdefault(email, []).append(pem)
+        return pems
+
+    def _write_certificate_files(self, emails: set[str], pems: dict[str, list[str]]) -> None:
+        """Write (or remove) the PEM file of each dirty user.
+        
+        Each file holds the user's active certificates and is replaced
+        atomically; users with none left have their file removed.
+        
+        Args:
+            emails: Users whose certificates changed
+            pems: Active certificate PEMs per user
+        """
+        for email in emails:
+            cert_file = self.certs_path / _cert_file_name(email)
+            try:
+                user_pems = pems.get(email)
+                if not user_pems:
+                    cert_file.unlink(missing_ok=True)
+                    logger.debug(f"Removed certificate file: {cert_file}")
+                    continue
+                staged = cert_file.with_name(f".{cert_file.name}.tmp")
+                staged.write_text("\n".join(pem.strip() for pem in user_pems) + "\n")
+                os.replace(staged, cert_file)
+                logger.debug(f"Wrote certificate file: {cert_file}")
+            except Exception as e:
+                logger.error(f"Failed to write certificate file {cert_file}: {e}")
 
     async def _regenerate_config(self, db: Session):
         """Regenerate FreeRADIUS configuration files.
@@ -258,8 +386,12 @@ class CertificateSyncService:
             from radius_app.config import get_settings
             settings = get_settings()
             users_file = Path(settings.radius_config_path) / "users"
-            users_file.write_text(users_config)
-            
+            if users_file.exists() and users_file.read_text() == users_config:
+                logger.info("FreeRADIUS users file unchanged - skipping reload")
+                return
+            staged = users_file.with_name(f".{users_file.name}.tmp")
+            staged.write_text(users_config)
+            os.replace(staged, users_file)
             logger.info("✅ Regenerated FreeRADIUS users file")
             
             # Signal FreeRADIUS to reload configuration
@@ -268,43 +400,21 @@ class CertificateSyncService:
         except Exception as e:
             logger.error(f"Failed to regenerate config: {e}", exc_info=True)
 
-    async def _reload_freeradius(self):
+    async def _reload_freeradius(self) -> bool:
         """Signal FreeRADIUS to reload configuration.
         
-        Sends HUP signal to FreeRADIUS daemon to reload without dropping connections.
+        Goes through the shared reload scheduler so certificate syncs are
+        coalesced with config-watcher reloads.
+        
+        Returns:
+            True if the reload succeeded
         """
-        try:
-            import subprocess
-            
-            # Try to reload via systemd first
-            result = subprocess.run(
-                ["systemctl", "reload", "freeradius"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                logger.info("✅ FreeRADIUS reloaded via systemctl")
-                return
-            
-            # Fall back to direct signal
-            result = subprocess.run(
-                ["killall", "-HUP", "radiusd"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                logger.info("✅ FreeRADIUS reloaded via HUP signal")
-            else:
-                logger.warning(f"Failed to reload FreeRADIUS: {result.stderr}")
-                
-        except subprocess.TimeoutExpired:
-            logger.error("FreeRADIUS reload timeout")
-        except Exception as e:
-            logger.error(f"Failed to reload FreeRADIUS: {e}")
+        from radius_app.core.reload_scheduler import get_reload_scheduler
+        
+        success = await get_reload_scheduler().reload("certificate sync")
+        if not success:
+            logger.warning("Failed to reload FreeRADIUS after certificate sync")
+        return success
 
     async def get_sync_status(self) -> dict:
         """Get current synchronization status.
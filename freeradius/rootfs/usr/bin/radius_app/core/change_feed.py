@@ -0,0 +1,457 @@
+"""Event-driven change feed for configuration tables.
+
+Every insert/update/delete on a table that feeds generated FreeRADIUS config
+is appended to ``radius_config_changes`` by database triggers. The
+DatabaseWatcher consumes that log by cursor instead of polling
+``MAX(updated_at)``, so deletes and in-place updates are never missed.
+
+Writers wake the watcher immediately:
+- PostgreSQL: the trigger function issues ``pg_notify`` and the API process
+  LISTENs on a dedicated connection.
+- MariaDB/SQLite: the portal calls ``POST /api/config/notify`` and in-process
+  ORM commits signal the watcher directly.
+
+If triggers cannot be installed (e.g. MariaDB without TRIGGER privilege), ORM
+hooks write the change rows instead so the feed keeps working for writes made
+through this API.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, event, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from radius_app.db.models import RadiusConfigChange
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL NOTIFY channel used by the change-log trigger function
+NOTIFY_CHANNEL = "radius_config_changes"
+
+# Tables whose changes require config regeneration
+WATCHED_TABLES = (
+    "radius_clients",
+    "udn_assignments",
+    "radius_policies",
+    "radius_radsec_configs",
+    "radius_mac_bypass_configs",
+)
+
+_OPERATIONS = ("INSERT", "UPDATE", "DELETE")
+
+# How long a missing change id may stay unfilled before it is treated as a
+# rolled-back transaction (sequence gaps are permanent) and skipped
+CHANGE_GAP_TIMEOUT_SECONDS = 300
+
+# Set once triggers have been installed in the current database
+_triggers_active = False
+
+
+def triggers_active() -> bool:
+    """Return True if database triggers are populating the change log."""
+    return _triggers_active
+
+
+def _trigger_name(table: str, operation: str | None = None) -> str:
+    suffix = f"_{operation.lower()}" if operation else ""
+    return f"trg_{table}{suffix}_changes"
+
+
+def _sqlite_trigger_statements(table: str) -> list[str]:
+    statements = []
+    for operation in _OPERATIONS:
+        ref = "OLD" if operation == "DELETE" else "NEW"
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, operation)} "
+            f"AFTER {operation} ON {table} "
+            f"BEGIN "
+            f"INSERT INTO radius_config_changes (table_name, row_id, operation, changed_at) "
+            f"VALUES ('{table}', {ref}.id, '{operation}', CURRENT_TIMESTAMP); "
+            f"END"
+        )
+    return statements
+
+
+def _mysql_trigger_statements(table: str) -> list[str]:
+    statements = []
+    for operation in _OPERATIONS:
+        ref = "OLD" if operation == "DELETE" else "NEW"
+        name = _trigger_name(table, operation)
+        statements.append(f"DROP TRIGGER IF EXISTS {name}")
+        statements.append(
+            f"CREATE TRIGGER {name} AFTER {operation} ON {table} FOR EACH ROW "
+            f"INSERT INTO radius_config_changes (table_name, row_id, operation, changed_at) "
+            f"VALUES ('{table}', {ref}.id, '{operation}', CURRENT_TIMESTAMP)"
+        )
+    return statements
+
+
+_POSTGRES_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION radius_log_config_change() RETURNS trigger AS $$
+DECLARE
+    changed_id integer;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_id := OLD.id;
+    ELSE
+        changed_id := NEW.id;
+    END IF;
+    INSERT INTO radius_config_changes (table_name, row_id, operation, changed_at)
+    VALUES (TG_TABLE_NAME, changed_id, TG_OP, now());
+    PERFORM pg_notify('{NOTIFY_CHANNEL}', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _postgres_trigger_statements(table: str) -> list[str]:
+    name = _trigger_name(table)
+    return [
+        f"DROP TRIGGER IF EXISTS {name} ON {table}",
+        f"CREATE TRIGGER {name} AFTER INSERT OR UPDATE OR DELETE ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION radius_log_config_change()",
+    ]
+
+
+def install_change_triggers(engine: Engine) -> bool:
+    """Install change-log triggers on all watched tables.
+
+    Idempotent - safe to call on every startup.
+
+    Args:
+        engine: SQLAlchemy engine for the shared database
+
+    Returns:
+        True if triggers are active, False if the ORM fallback is in use
+    """
+    global _triggers_active
+
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            existing = {
+                table for table in WATCHED_TABLES
+                if engine.dialect.has_table(conn, table)
+            }
+            if dialect == "postgresql":
+                conn.execute(text(_POSTGRES_FUNCTION))
+            for table in WATCHED_TABLES:
+                if table not in existing:
+                    continue
+                if dialect == "sqlite":
+                    statements = _sqlite_trigger_statements(table)
+                elif dialect == "postgresql":
+                    statements = _postgres_trigger_statements(table)
+                elif dialect in ("mysql", "mariadb"):
+                    statements = _mysql_trigger_statements(table)
+                else:
+                    logger.warning(f"Change-log triggers not supported on {dialect}")
+                    _triggers_active = False
+                    return False
+                for statement in statements:
+                    conn.execute(text(statement))
+        _triggers_active = True
+        logger.info(f"✅ Change-log triggers installed on {len(existing)} tables ({dialect})")
+    except Exception as e:
+        _triggers_active = False
+        logger.warning(f"⚠️  Could not install change-log triggers ({e}) - using ORM change hooks")
+    return _triggers_active
+
+
+def get_latest_change_id(db: Session) -> int:
+    """Get the newest change-log id (0 if the log is empty)."""
+    return db.execute(select(func.max(RadiusConfigChange.id))).scalar() or 0
+
+
+class ChangeCursor:
+    """Change-log position that tolerates out-of-order commits.
+
+    Change ids are allocated when a row is inserted, not when its transaction
+    commits, so id 11 can become visible before id 10. Instead of jumping to
+    the highest id seen, the cursor only advances past a contiguous run of
+    consumed ids; everything above ``position`` is re-read on every poll and
+    rows already consumed are skipped. A missing id still unfilled after
+    ``gap_timeout`` seconds belonged to a rolled-back transaction and is
+    skipped so the cursor doesn't stall.
+    """
+
+    def __init__(self, position: int = 0, gap_timeout: float = CHANGE_GAP_TIMEOUT_SECONDS):
+        """Initialize cursor.
+
+        Args:
+            position: Every change id up to this one has been consumed
+            gap_timeout: Seconds to wait for a missing id before skipping it
+        """
+        self.position = position
+        self.gap_timeout = gap_timeout
+        self._consumed: set[int] = set()  # Consumed ids above position
+        self._gaps: dict[int, float] = {}  # Missing id -> when first noticed
+
+    def read(self, db: Session) -> list[RadiusConfigChange]:
+        """Read committed changes not consumed yet, oldest first."""
+        stmt = (
+            select(RadiusConfigChange)
+            .where(RadiusConfigChange.id > self.position)
+            .order_by(RadiusConfigChange.id)
+        )
+        return [
+            change for change in db.execute(stmt).scalars()
+            if change.id not in self._consumed
+        ]
+
+    def advance(self, change_ids: set[int], now: float | None = None) -> int:
+        """Mark changes consumed and move past every id that is settled.
+
+        Args:
+            change_ids: Ids of the changes just applied
+            now: Monotonic time (defaults to ``time.monotonic()``)
+
+        Returns:
+            New cursor position
+        """
+        now = time.monotonic() if now is None else now
+        self._consumed.update(change_id for change_id in change_ids if change_id > self.position)
+        while self._consumed:
+            next_id = self.position + 1
+            if next_id in self._consumed:
+                self._consumed.discard(next_id)
+            elif now - self._gaps.setdefault(next_id, now) < self.gap_timeout:
+                break  # Possibly still uncommitted - re-read it next poll
+            else:
+                logger.debug(f"Skipping change #{next_id} (never committed)")
+            self._gaps.pop(next_id, None)
+            self.position = next_id
+        return self.position
+
+
+def record_changes(
+    db: Session | Connection,
+    tables: list[str],
+    operation: str = "NOTIFY",
+    row_ids: list[int | None] | None = None,
+) -> None:
+    """Append change rows for watched tables (used when triggers are unavailable).
+
+    Args:
+        db: Database session or connection
+        tables: Table names that changed
+        operation: Operation label stored in the log
+        row_ids: Optional row ids matching ``tables``
+    """
+    ids = row_ids or [None] * len(tables)
+    rows = [
+        {
+            "table_name": table,
+            "row_id": row_id,
+            "operation": operation,
+            "changed_at": datetime.now(timezone.utc),
+        }
+        for table, row_id in zip(tables, ids)
+        if table in WATCHED_TABLES
+    ]
+    if rows:
+        db.execute(insert(RadiusConfigChange), rows)
+
+
+def prune_changes(db: Session, up_to_id: int, retention: timedelta = timedelta(hours=1)) -> int:
+    """Delete consumed change rows older than the retention window.
+
+    The newest row is always kept: tables created without AUTOINCREMENT
+    (SQLite before it was declared) hand out ids again from the current
+    maximum, which would land below the watcher's cursor.
+
+    Args:
+        db: Database session
+        up_to_id: Cursor position - only rows at or below it are deleted
+        retention: Keep consumed rows this long for troubleshooting
+
+    Returns:
+        Number of rows deleted
+    """
+    cutoff = datetime.now(timezone.utc) - retention
+    up_to_id = min(up_to_id, get_latest_change_id(db) - 1)
+    result = db.execute(
+        delete(RadiusConfigChange).where(
+            RadiusConfigChange.id <= up_to_id,
+            RadiusConfigChange.changed_at < cutoff,
+        ).execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount or 0
+
+
+class ChangeNotifier:
+    """Wakes the DatabaseWatcher when configuration tables change.
+
+    ``notify()`` is safe to call from any thread; ``wait()`` must be awaited
+    from the watcher's event loop.
+    """
+
+    def __init__(self):
+        """Initialize change notifier."""
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._event: asyncio.Event | None = None
+        self._pending = False
+        self.notifications = 0
+
+    def notify(self) -> None:
+        """Signal that configuration tables changed."""
+        self.notifications += 1
+        if self._loop is None or self._event is None:
+            self._pending = True
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._event.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._event.set)
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a change notification.
+
+        Args:
+            timeout: Maximum seconds to wait (fallback poll interval)
+
+        Returns:
+            True if woken by a notification, False on timeout
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._event is None:
+            self._loop = loop
+            self._event = asyncio.Event()
+        if self._pending:
+            self._pending = False
+            return True
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._event.clear()
+
+
+_notifier: ChangeNotifier | None = None
+
+
+def get_change_notifier() -> ChangeNotifier:
+    """Get the process-wide change notifier."""
+    global _notifier
+    if _notifier is None:
+        _notifier = ChangeNotifier()
+    return _notifier
+
+
+class PostgresChangeListener:
+    """LISTENs for trigger NOTIFY events on a dedicated PostgreSQL connection."""
+
+    def __init__(self, engine: Engine, notifier: ChangeNotifier | None = None):
+        """Initialize listener.
+
+        Args:
+            engine: PostgreSQL engine
+            notifier: Notifier to wake (defaults to process-wide notifier)
+        """
+        self.engine = engine
+        self.notifier = notifier or get_change_notifier()
+        self._conn = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def start(self) -> bool:
+        """Start listening on the running event loop.
+
+        Returns:
+            True if listening, False if the driver doesn't support async notifies
+        """
+        raw = self.engine.raw_connection()
+        raw.detach()  # Dedicated connection, never returned to the pool
+        conn = raw.driver_connection
+        if not hasattr(conn, "poll") or not hasattr(conn, "notifies"):
+            logger.warning("PostgreSQL driver doesn't support LISTEN polling - using fallback poll")
+            raw.close()
+            return False
+
+        conn.set_session(autocommit=True)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+
+        self._conn = conn
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(conn.fileno(), self._on_readable)
+        logger.info(f"✅ Listening for PostgreSQL notifications on '{NOTIFY_CHANNEL}'")
+        return True
+
+    def _on_readable(self) -> None:
+        try:
+            self._conn.poll()
+        except Exception as e:
+            logger.error(f"PostgreSQL LISTEN connection failed: {e}")
+            self.stop()
+            return
+        if self._conn.notifies:
+            self._conn.notifies.clear()
+            self.notifier.notify()
+
+    def stop(self) -> None:
+        """Stop listening and close the dedicated connection."""
+        if self._conn is None:
+            return
+        try:
+            if self._loop and not self._loop.is_closed():
+                self._loop.remove_reader(self._conn.fileno())
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+_SESSION_FLAG = "radius_config_tables"
+
+
+def _on_after_flush(session: Session, flush_context) -> None:
+    changed: list[tuple[str, int | None, str]] = []
+    for operation, objects in (
+        ("INSERT", session.new),
+        ("UPDATE", session.dirty),
+        ("DELETE", session.deleted),
+    ):
+        for obj in objects:
+            table = getattr(obj, "__tablename__", None)
+            if table not in WATCHED_TABLES:
+                continue
+            if operation == "UPDATE" and not session.is_modified(obj):
+                continue
+            changed.append((table, getattr(obj, "id", None), operation))
+    if not changed:
+        return
+
+    session.info[_SESSION_FLAG] = True
+    if not _triggers_active:
+        # No triggers - record the changes ourselves in the same transaction
+        for table, row_id, operation in changed:
+            record_changes(session.connection(), [table], operation, [row_id])
+
+
+def _on_after_commit(session: Session) -> None:
+    if session.info.pop(_SESSION_FLAG, False):
+        get_change_notifier().notify()
+
+
+def _on_after_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(_SESSION_FLAG, None)
+
+
+def register_session_hooks() -> None:
+    """Wake the watcher (and log changes if needed) on in-process ORM commits."""
+    if not event.contains(Session, "after_flush", _on_after_flush):
+        event.listen(Session, "after_flush", _on_after_flush)
+        event.listen(Session, "after_commit", _on_after_commit)
+        event.listen(Session, "after_soft_rollback", _on_after_rollback)
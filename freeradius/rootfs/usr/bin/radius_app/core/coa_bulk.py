@@ -0,0 +1,387 @@
+"""Bulk CoA / Disconnect fan-out.
+
+Resolves a session selector (group policy, network, MACs, users, NADs) to
+active sessions with a handful of queries, looks every NAD's address,
+secret and CoA port up once, then sends requests through the shared
+asyncio RADIUS client. Each NAD gets its own concurrency cap and token
+bucket so a mass change can't flood a single access point, while
+different NADs proceed in parallel.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from radius_app.core.coa_config_generator import CoAClient
+from radius_app.db.models import (
+    DeviceRegistration,
+    RadiusClient,
+    RadiusClientExtended,
+    RadiusSession,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COA_PORT = 3799
+
+# Bound IN-clause sizes when matching MAC lists
+MAC_QUERY_CHUNK_SIZE = 500
+
+
+@dataclass
+class SessionSelector:
+    """Which active sessions a bulk request targets (filters are ANDed)."""
+
+    group_policy: str | None = None
+    network_id: str | None = None
+    macs: list[str] | None = None
+    user_names: list[str] | None = None
+    nad_ids: list[int] | None = None
+
+    def is_empty(self) -> bool:
+        """True if no filter was given (refuse to target every session)."""
+        return not any([self.group_policy, self.network_id, self.macs, self.user_names, self.nad_ids])
+
+
+@dataclass
+class NadEndpoint:
+    """Resolved CoA destination for one NAD."""
+
+    nad_id: int
+    name: str
+    ip: str
+    port: int
+    secret: str
+    network_id: str | None = None
+    coa_enabled: bool = True
+
+
+@dataclass
+class CoATarget:
+    """One session to send a request for."""
+
+    session_id: str
+    user_name: str
+    calling_station_id: str | None
+    nas_ip: str
+    nas_port: int | None = None
+
+
+@dataclass
+class BulkPlan:
+    """Sessions grouped by NAD, plus sessions that can't be reached."""
+
+    by_nad: dict[int, tuple[NadEndpoint, list[CoATarget]]] = field(default_factory=dict)
+    unresolved: list[tuple[CoATarget, str]] = field(default_factory=list)
+
+    @property
+    def session_count(self) -> int:
+        """Number of sessions that will be sent a request."""
+        return sum(len(targets) for _, targets in self.by_nad.values())
+
+
+def mac_variants(mac: str) -> list[str]:
+    """Spellings a MAC may have in Calling-Station-Id.
+
+    Args:
+        mac: MAC address in any common format
+
+    Returns:
+        Colon, dash and bare forms in lower and upper case (empty if invalid)
+    """
+    clean = mac.replace(":", "").replace("-", "").replace(".", "").lower()
+    if len(clean) != 12 or any(c not in "0123456789abcdef" for c in clean):
+        return []
+    pairs = [clean[i:i + 2] for i in range(0, 12, 2)]
+    forms = [":".join(pairs), "-".join(pairs), clean]
+    return forms + [form.upper() for form in forms]
+
+
+def _normalize_mac(mac: str) -> str | None:
+    variants = mac_variants(mac)
+    return variants[0] if variants else None
+
+
+class _NadIndex:
+    """Maps a session's NAS-IP to the NAD that owns it (exact IP or CIDR)."""
+
+    def __init__(self, db: Session, nad_ids: list[int] | None = None):
+        """Load NAD addresses, secrets and CoA settings in one query.
+
+        Args:
+            db: Database session
+            nad_ids: Restrict to these NADs
+        """
+        self.by_ip: dict[str, NadEndpoint] = {}
+        self.networks: list[tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, NadEndpoint]] = []
+
+        stmt = (
+            select(RadiusClient, RadiusClientExtended)
+            .outerjoin(RadiusClientExtended, RadiusClientExtended.radius_client_id == RadiusClient.id)
+            .where(RadiusClient.is_active == True)  # noqa: E712
+        )
+        if nad_ids:
+            stmt = stmt.where(RadiusClient.id.in_(nad_ids))
+
+        for client, extended in db.execute(stmt).all():
+            try:
+                network = ipaddress.ip_network(client.ipaddr, strict=False)
+            except ValueError:
+                continue
+            endpoint = NadEndpoint(
+                nad_id=client.id,
+                name=client.name,
+                ip=str(network.network_address),
+                port=extended.coa_port if extended and extended.coa_port else DEFAULT_COA_PORT,
+                secret=client.secret,
+                network_id=client.network_id,
+                coa_enabled=extended.coa_enabled if extended else True,
+            )
+            if network.num_addresses == 1:
+                self.by_ip[endpoint.ip] = endpoint
+            else:
+                self.networks.append((network, endpoint))
+
+    def lookup(self, nas_ip: str) -> NadEndpoint | None:
+        """Find the NAD for a session's NAS-IP-Address."""
+        try:
+            address = ipaddress.ip_address(nas_ip)
+        except ValueError:
+            return None
+        endpoint = self.by_ip.get(str(address))
+        if endpoint is not None:
+            return endpoint
+        for network, candidate in self.networks:
+            if address.version == network.version and address in network:
+                return candidate
+        return None
+
+
+def resolve_bulk_plan(db: Session, selector: SessionSelector) -> BulkPlan:
+    """Resolve a selector to active sessions grouped by NAD.
+
+    Args:
+        db: Database session
+        selector: Session filters
+
+    Returns:
+        Plan with per-NAD targets and unreachable sessions
+    """
+    stmt = select(RadiusSession).where(RadiusSession.is_active == True)  # noqa: E712
+    if selector.user_names:
+        stmt = stmt.where(RadiusSession.username.in_(selector.user_names))
+
+    macs = list(selector.macs or [])
+    if selector.group_policy:
+        group_macs = db.execute(
+            select(DeviceRegistration.mac_address).where(
+                DeviceRegistration.group_policy == selector.group_policy,
+                DeviceRegistration.is_active == True,  # noqa: E712
+            )
+        ).scalars().all()
+        if selector.macs:
+            wanted = {_normalize_mac(mac) for mac in selector.macs}
+            group_macs = [mac for mac in group_macs if _normalize_mac(mac) in wanted]
+        macs = list(group_macs)
+        if not macs:
+            return BulkPlan()
+
+    sessions: list[RadiusSession] = []
+    if macs:
+        variants = [v for mac in macs for v in mac_variants(mac)]
+        for start in range(0, len(variants), MAC_QUERY_CHUNK_SIZE):
+            chunk = variants[start:start + MAC_QUERY_CHUNK_SIZE]
+            sessions.extend(db.execute(
+                stmt.where(RadiusSession.calling_station_id.in_(chunk))
+            ).scalars().all())
+    elif selector.macs is None:
+        sessions = list(db.execute(stmt).scalars().all())
+
+    index = _NadIndex(db, selector.nad_ids)
+    # With NAD or network filters, sessions on other NADs aren't targets at all
+    nad_filtered = bool(selector.nad_ids or selector.network_id)
+
+    plan = BulkPlan()
+    seen: set[str] = set()
+    for session in sessions:
+        if session.session_id in seen:
+            continue
+        seen.add(session.session_id)
+        target = CoATarget(
+            session_id=session.session_id,
+            user_name=session.username,
+            calling_station_id=session.calling_station_id,
+            nas_ip=session.nas_ip,
+            nas_port=session.nas_port,
+        )
+        endpoint = index.lookup(session.nas_ip)
+        if endpoint is None:
+            if not nad_filtered:
+                plan.unresolved.append((target, f"No active NAD for {session.nas_ip}"))
+            continue
+        if selector.network_id and endpoint.network_id != selector.network_id:
+            continue
+        if not endpoint.coa_enabled:
+            plan.unresolved.append((target, f"CoA is not enabled for NAD {endpoint.name}"))
+            continue
+        plan.by_nad.setdefault(endpoint.nad_id, (endpoint, []))[1].append(target)
+    return plan
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` requests per second, bursts up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        """Initialize bucket (starts full).
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+        """
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class BulkCoARunner:
+    """Fans requests out across NADs with per-NAD concurrency and rate limits."""
+
+    def __init__(
+        self,
+        coa_client: CoAClient | None = None,
+        per_nad_concurrency: int = 16,
+        per_nad_rate: float = 50.0,
+    ):
+        """Initialize runner.
+
+        Args:
+            coa_client: CoA client (defaults to one on the shared UDP client)
+            per_nad_concurrency: Maximum requests in flight per NAD
+            per_nad_rate: Maximum requests per second per NAD
+        """
+        self.coa_client = coa_client or CoAClient()
+        self.per_nad_concurrency = per_nad_concurrency
+        self.per_nad_rate = per_nad_rate
+
+    async def _send(self, action: str, endpoint: NadEndpoint, target: CoATarget, attributes: dict) -> dict:
+        if action == "disconnect":
+            result = await self.coa_client.send_disconnect_request(
+                nad_ip=endpoint.ip,
+                nad_port=endpoint.port,
+                shared_secret=endpoint.secret,
+                user_name=target.user_name,
+                session_id=target.session_id,
+                calling_station_id=target.calling_station_id,
+            )
+        else:
+            result = await self.coa_client.send_coa_request(
+                nad_ip=endpoint.ip,
+                nad_port=endpoint.port,
+                shared_secret=endpoint.secret,
+                user_name=target.user_name,
+                session_id=target.session_id,
+                attributes=attributes,
+            )
+        return {
+            "type": "result",
+            "nad_id": endpoint.nad_id,
+            "session_id": target.session_id,
+            "user_name": target.user_name,
+            "calling_station_id": target.calling_station_id,
+            **{k: v for k, v in result.items() if k not in ("nad_ip", "nad_port")},
+        }
+
+    async def run(self, plan: BulkPlan, action: str, attributes: dict | None = None) -> AsyncIterator[dict]:
+        """Send requests for every planned session, yielding results as they finish.
+
+        Args:
+            plan: Resolved bulk plan
+            action: "disconnect" or "coa"
+            attributes: Attributes to send with CoA-Requests
+
+        Yields:
+            One "result" event per session (unresolved sessions first), then
+            a "summary" event
+        """
+        started = time.perf_counter()
+        succeeded = failed = 0
+        queue: asyncio.Queue = asyncio.Queue()
+
+        for target, reason in plan.unresolved:
+            yield {
+                "type": "result",
+                "nad_id": None,
+                "session_id": target.session_id,
+                "user_name": target.user_name,
+                "calling_station_id": target.calling_station_id,
+                "success": False,
+                "skipped": True,
+                "error": reason,
+            }
+
+        async def drain_nad(endpoint: NadEndpoint, targets: list[CoATarget]) -> None:
+            semaphore = asyncio.Semaphore(self.per_nad_concurrency)
+            bucket = TokenBucket(self.per_nad_rate, self.per_nad_concurrency)
+
+            async def one(target: CoATarget) -> None:
+                async with semaphore:
+                    await bucket.acquire()
+                    try:
+                        event = await self._send(action, endpoint, target, attributes or {})
+                    except Exception as e:
+                        event = {
+                            "type": "result",
+                            "nad_id": endpoint.nad_id,
+                            "session_id": target.session_id,
+                            "success": False,
+                            "error": str(e),
+                        }
+                    await queue.put(event)
+
+            await asyncio.gather(*(one(target) for target in targets))
+
+        tasks = [
+            asyncio.create_task(drain_nad(endpoint, targets))
+            for endpoint, targets in plan.by_nad.values()
+        ]
+        try:
+            for _ in range(plan.session_count):
+                event = await queue.get()
+                if event.get("success"):
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        yield {
+            "type": "summary",
+            "sessions": plan.session_count,
+            "succeeded": succeeded,
+            "failed": failed,
+            "skipped": len(plan.unresolved),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
@@ -14,6 +14,19 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from radius_app.config import get_settings
+from radius_app.core.radius_client import (
+    RadiusTimeoutError,
+    RadiusUdpClient,
+    describe_response,
+    get_radius_client,
+)
+from radius_app.core.radius_packet import (
+    COA_ACK,
+    COA_REQUEST,
+    DISCONNECT_ACK,
+    DISCONNECT_REQUEST,
+    RadiusPacketError,
+)
 from radius_app.db.models import RadiusClient, RadiusClientExtended
 
 logger = logging.getLogger(__name__)
@@ -202,12 +215,51 @@ class CoAClient:
     """Client for sending CoA/DM requests to NADs.
     
     Used to disconnect users or change session parameters on NADs.
+    Packets are built and sent in-process over the shared asyncio RADIUS
+    client (RFC 5176), so concurrent requests don't fork radclient.
     """
     
-    def __init__(self):
-        """Initialize CoA client."""
+    def __init__(self, radius_client: RadiusUdpClient | None = None):
+        """Initialize CoA client.
+        
+        Args:
+            radius_client: UDP client to send through (defaults to the shared one)
+        """
         self.settings = get_settings()
-        logger.info("CoA client initialized")
+        self.radius_client = radius_client or get_radius_client()
+    
+    async def _send(
+        self,
+        code: int,
+        ack_code: int,
+        nad_ip: str,
+        nad_port: int,
+        shared_secret: str,
+        attributes: list[tuple[str, object]],
+    ) -> dict:
+        """Send a request and convert the outcome to the API result shape."""
+        result = {"nad_ip": nad_ip, "nad_port": nad_port}
+        try:
+            response = await self.radius_client.send(
+                nad_ip.split("/")[0], nad_port, shared_secret, code, attributes
+            )
+        except RadiusTimeoutError:
+            return {"success": False, "error": "Timeout waiting for NAD response", **result}
+        except (RadiusPacketError, ValueError) as e:
+            # Unknown attribute, oversized value or invalid NAD address
+            return {"success": False, "error": str(e), **result}
+        
+        success = response.code == ack_code
+        result.update({
+            "success": success,
+            "response": response.code_name,
+            "error_cause": response.error_cause,
+            "attempts": response.attempts,
+            "latency_ms": round(response.latency_ms, 2),
+        })
+        if not success:
+            result["error"] = describe_response(response)
+        return result
     
     async def send_disconnect_request(
         self,
@@ -233,75 +285,25 @@ class CoAClient:
         Returns:
             Response dictionary with success status and details
         """
-        import subprocess
-        
         if not user_name and not session_id and not calling_station_id:
             return {
                 "success": False,
                 "error": "Must provide user_name, session_id, or calling_station_id"
             }
         
-        # Build radclient command
-        cmd = [
-            "radclient",
-            "-t", "3",  # 3 second timeout
-            "-r", "3",  # 3 retries
-            "-x",       # Debug output
-            f"{nad_ip}:{nad_port}",
-            "disconnect",
-            shared_secret,
-        ]
-        
-        # Build attributes
-        attrs = []
+        attributes = []
         if user_name:
-            attrs.append(f"User-Name = \"{user_name}\"")
+            attributes.append(("User-Name", user_name))
         if session_id:
-            attrs.append(f"Acct-Session-Id = \"{session_id}\"")
+            attributes.append(("Acct-Session-Id", session_id))
         if nas_port:
-            attrs.append(f"NAS-Port = {nas_port}")
+            attributes.append(("NAS-Port", nas_port))
         if calling_station_id:
-            attrs.append(f"Calling-Station-Id = \"{calling_station_id}\"")
-        
-        # Add NAS-Identifier
-        attrs.append(f"NAS-Identifier = \"{self.settings.server_name if hasattr(self.settings, 'server_name') else 'freeradius'}\"")
-        
-        attrs_input = "\n".join(attrs)
+            attributes.append(("Calling-Station-Id", calling_station_id))
         
-        try:
-            result = subprocess.run(
-                cmd,
-                input=attrs_input,
-                capture_output=True,
-                text=True,
-                timeout=15,
-            )
-            
-            success = result.returncode == 0 and "Received Disconnect-ACK" in result.stdout
-            
-            return {
-                "success": success,
-                "returncode": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "nad_ip": nad_ip,
-                "nad_port": nad_port,
-            }
-            
-        except subprocess.TimeoutExpired:
-            return {
-                "success": False,
-                "error": "Timeout waiting for NAD response",
-                "nad_ip": nad_ip,
-                "nad_port": nad_port,
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "nad_ip": nad_ip,
-                "nad_port": nad_port,
-            }
+        return await self._send(
+            DISCONNECT_REQUEST, DISCONNECT_ACK, nad_ip, nad_port, shared_secret, attributes
+        )
     
     async def send_coa_request(
         self,
@@ -320,78 +322,26 @@ class CoAClient:
             shared_secret: Shared secret for authentication
             user_name: User to modify
             session_id: Session ID to modify
-            attributes: Dictionary of attributes to change
+            attributes: Dictionary of attributes to change (list values are
+                sent as repeated attributes, e.g. several Cisco-AVPairs)
             
         Returns:
             Response dictionary with success status and details
         """
-        import subprocess
-        
         if not user_name and not session_id:
             return {
                 "success": False,
                 "error": "Must provide user_name or session_id"
             }
         
-        # Build radclient command
-        cmd = [
-            "radclient",
-            "-t", "3",
-            "-r", "3",
-            "-x",
-            f"{nad_ip}:{nad_port}",
-            "coa",
-            shared_secret,
-        ]
-        
-        # Build attributes
-        attrs = []
+        request_attributes = []
         if user_name:
-            attrs.append(f"User-Name = \"{user_name}\"")
+            request_attributes.append(("User-Name", user_name))
         if session_id:
-            attrs.append(f"Acct-Session-Id = \"{session_id}\"")
-        
-        # Add custom attributes
+            request_attributes.append(("Acct-Session-Id", session_id))
         if attributes:
-            for attr_name, attr_value in attributes.items():
-                if isinstance(attr_value, str):
-                    attrs.append(f"{attr_name} = \"{attr_value}\"")
-                else:
-                    attrs.append(f"{attr_name} = {attr_value}")
-        
-        attrs_input = "\n".join(attrs)
+            request_attributes.extend(attributes.items())
         
-        try:
-            result = subprocess.run(
-                cmd,
-                input=attrs_input,
-                capture_output=True,
-                text=True,
-                timeout=15,
-            )
-            
-            success = result.returncode == 0 and "Received CoA-ACK" in result.stdout
-            
-            return {
-                "success": success,
-                "returncode": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "nad_ip": nad_ip,
-                "nad_port": nad_port,
-            }
-            
-        except subprocess.TimeoutExpired:
-            return {
-                "success": False,
-                "error": "Timeout waiting for NAD response",
-                "nad_ip": nad_ip,
-                "nad_port": nad_port,
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "nad_ip": nad_ip,
-                "nad_port": nad_port,
-            }
+        return await self._send(
+            COA_REQUEST, COA_ACK, nad_ip, nad_port, shared_secret, request_attributes
+        )
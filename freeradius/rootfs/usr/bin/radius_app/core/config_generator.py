@@ -8,7 +8,7 @@ from pathlib import Path
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from radius_app.config import get_settings
+from radius_app.config import get_settings, get_users_shard_count
 from radius_app.db.models import RadiusClient, UdnAssignment
 
 logger = logging.getLogger(__name__)
@@ -17,6 +17,9 @@ logger = logging.getLogger(__name__)
 UDN_VSA_ATTRIBUTE = "Cisco-AVPair"
 UDN_VSA_FORMAT = "udn:private-group-id={udn_id}"
 
+# Max assignments loaded per query when re-rendering users file entries
+FRAGMENT_FETCH_BATCH_SIZE = 500
+
 
 class ConfigGenerator:
     """Generates FreeRADIUS configuration files from database."""
@@ -27,6 +30,13 @@ class ConfigGenerator:
         self.clients_path = Path(self.settings.radius_clients_path)
         self.config_path = Path(self.settings.radius_config_path)
         
+        # Rendered users file entries: assignment id -> (updated_at, shard key, fragment)
+        self._users_fragments: dict[int, tuple[datetime, str, str]] = {}
+        
+        # Shard mode (RADIUS_USERS_SHARDS) and timings of the last sharded write
+        self.users_shard_count = get_users_shard_count()
+        self.last_shard_timings: dict[str, float] = {}
+        
         # Ensure directories exist
         self.clients_path.mkdir(parents=True, exist_ok=True)
         logger.info(f"Config generator initialized: {self.clients_path}")
@@ -84,70 +94,170 @@ class ConfigGenerator:
         logger.info(f"✅ Generated clients.conf with {len(clients)} clients")
         return output_path
     
-    def generate_users_file(self, db: Session) -> Path:
+    def generate_users_file(self, db: Session, changed_ids: set[int] | None = None) -> Path:
         """Generate users file from UDN assignments.
         
+        Each assignment's entry is rendered once and cached by id and
+        updated_at. Later calls only fetch and re-render assignments that are
+        new or changed, splice them between the cached entries, and stream
+        the result to disk. With RADIUS_USERS_SHARDS set, entries go to
+        hash-partitioned include shards and only changed shards are rewritten.
+        
         Args:
             db: Database session
+            changed_ids: Assignment ids known to have changed (e.g. from the
+                change log); re-rendered even if updated_at didn't move
             
         Returns:
             Path to generated users file
         """
-        # Query active UDN assignments
-        stmt = select(UdnAssignment).where(UdnAssignment.is_active == True).order_by(UdnAssignment.udn_id)  # noqa: E712
-        assignments = db.execute(stmt).scalars().all()
-        
-        # Generate users file content
-        users_file = "# Auto-generated RADIUS users for WPN UDN assignment\n"
-        users_file += "# Generated from shared database\n"
-        users_file += f"# Timestamp: {datetime.now(UTC).isoformat()}\n"
-        users_file += f"# Total assignments: {len(assignments)}\n"
-        users_file += "# DO NOT EDIT MANUALLY - Changes will be overwritten\n\n"
-        
-        for assignment in assignments:
-            # User comment
-            user_info = f"User ID: {assignment.user_id}"
-            if assignment.user_name:
-                user_info += f" - {assignment.user_name}"
-            if assignment.unit:
-                user_info += f" - Unit {assignment.unit}"
-            users_file += f"# {user_info}\n"
+        # Light skeleton query - full rows are only loaded for stale entries
+        stmt = (
+            select(UdnAssignment.id, UdnAssignment.updated_at)
+            .where(UdnAssignment.is_active == True)  # noqa: E712
+            .order_by(UdnAssignment.udn_id)
+        )
+        skeleton = db.execute(stmt).all()
+        
+        cache = self._users_fragments
+        changed_ids = changed_ids or set()
+        stale_ids = [
+            assignment_id
+            for assignment_id, updated_at in skeleton
+            if assignment_id in changed_ids
+            or cache.get(assignment_id, (None,))[0] != updated_at
+        ]
+        
+        for start in range(0, len(stale_ids), FRAGMENT_FETCH_BATCH_SIZE):
+            batch = stale_ids[start:start + FRAGMENT_FETCH_BATCH_SIZE]
+            rows = db.execute(select(UdnAssignment).where(UdnAssignment.id.in_(batch))).scalars()
+            for assignment in rows:
+                cache[assignment.id] = (
+                    assignment.updated_at,
+                    self._users_shard_key(assignment),
+                    self._render_users_entry(assignment),
+                )
+        
+        # Drop fragments for assignments that were deleted or deactivated
+        self._users_fragments = {
+            assignment_id: cache[assignment_id] for assignment_id, _ in skeleton
+        }
+        
+        output_path = self.config_path / "users"
+        if self.users_shard_count > 0:
+            return self._write_sharded_users_file(output_path, skeleton, len(stale_ids))
+        
+        def users_file_chunks():
+            yield "# Auto-generated RADIUS users for WPN UDN assignment\n"
+            yield "# Generated from shared database\n"
+            yield f"# Timestamp: {datetime.now(UTC).isoformat()}\n"
+            yield f"# Total assignments: {len(skeleton)}\n"
+            yield "# DO NOT EDIT MANUALLY - Changes will be overwritten\n\n"
             
-            # UDN assignment entry
-            # Note: UDN is assigned to USER, not MAC. MAC is optional.
-            # For PSK authentication, the user will authenticate with PSK and UDN will be looked up via USER->PSK
-            # For MAC-based auth (if MAC provided), include MAC entry
-            cisco_avpair = UDN_VSA_FORMAT.format(udn_id=assignment.udn_id)
-            reply_message = f"WPN Access - User {assignment.user_id}"
-            if assignment.user_name:
-                reply_message += f" - {assignment.user_name}"
-            if assignment.unit:
-                reply_message += f" - Unit {assignment.unit}"
+            for assignment_id, _ in skeleton:
+                yield self._users_fragments[assignment_id][2]
             
-            if assignment.mac_address:
-                # MAC-based authentication entry (if MAC provided)
-                users_file += f'{assignment.mac_address} Cleartext-Password := ""\n'
-                users_file += f'    {UDN_VSA_ATTRIBUTE} := "{cisco_avpair}",\n'
-                users_file += f'    Reply-Message := "{reply_message}"\n\n'
-            else:
-                # User-based entry (no MAC) - PSK authentication will handle UDN lookup
-                # This is a placeholder - actual PSK entries are generated by PSK config generator
-                users_file += f'# User {assignment.user_id} - UDN {assignment.udn_id} (PSK authentication)\n'
-                users_file += f'# PSK entries are generated separately by PSK config generator\n\n'
-        
-        # Add default deny at the end
-        users_file += "# Default deny for non-registered MACs\n"
-        users_file += "DEFAULT Auth-Type := Reject\n"
-        users_file += '    Reply-Message := "Access denied - Device not registered"\n'
+            # Add default deny at the end
+            yield "# Default deny for non-registered MACs\n"
+            yield "DEFAULT Auth-Type := Reject\n"
+            yield '    Reply-Message := "Access denied - Device not registered"\n'
         
         # Validate and write safely - prevents invalid configs
-        from radius_app.core.config_validator import safe_write_config_file
-        output_path = self.config_path / "users"
-        safe_write_config_file(output_path, users_file, file_type="users")
+        from radius_app.core.config_validator import safe_write_config_chunks
+        from radius_app.core.users_shards import remove_shards
+        safe_write_config_chunks(output_path, users_file_chunks(), file_type="users")
+        remove_shards(output_path)
         
-        logger.info(f"✅ Generated users file with {len(assignments)} assignments")
+        logger.info(
+            f"✅ Generated users file with {len(skeleton)} assignments "
+            f"({len(stale_ids)} re-rendered)"
+        )
         return output_path
     
+    def _write_sharded_users_file(self, output_path: Path, skeleton, rendered: int) -> Path:
+        """Write the users file as an include index plus hash-partitioned shards.
+        
+        Args:
+            output_path: Path of the top-level users file
+            skeleton: (id, updated_at) rows of active assignments in output order
+            rendered: Number of entries re-rendered this run (for logging)
+            
+        Returns:
+            Path to the users index file
+        """
+        from radius_app.core.users_shards import write_sharded_users_file
+        
+        entries = (
+            self._users_fragments[assignment_id][1:] for assignment_id, _ in skeleton
+        )
+        self.last_shard_timings = write_sharded_users_file(
+            output_path,
+            entries,
+            self.users_shard_count,
+            title="Auto-generated RADIUS users for WPN UDN assignment",
+            footer=(
+                "# Default deny for non-registered MACs\n"
+                "DEFAULT Auth-Type := Reject\n"
+                '    Reply-Message := "Access denied - Device not registered"\n'
+            ),
+        )
+        
+        logger.info(
+            f"✅ Generated sharded users file with {len(skeleton)} assignments "
+            f"({rendered} re-rendered, {len(self.last_shard_timings)} shards rewritten)"
+        )
+        return output_path
+    
+    @staticmethod
+    def _users_shard_key(assignment: UdnAssignment) -> str:
+        """Get the shard key of an assignment - its MAC, or its user if it has none."""
+        return assignment.mac_address or f"user:{assignment.user_id}"
+    
+    def invalidate_users_fragments(self) -> None:
+        """Drop all cached users file entries so the next run renders every assignment."""
+        self._users_fragments = {}
+    
+    @staticmethod
+    def _render_users_entry(assignment: UdnAssignment) -> str:
+        """Render the users file entry for a single UDN assignment.
+        
+        Args:
+            assignment: UDN assignment to render
+            
+        Returns:
+            Users file fragment, including its comment and trailing blank line
+        """
+        # User comment
+        user_info = f"User ID: {assignment.user_id}"
+        if assignment.user_name:
+            user_info += f" - {assignment.user_name}"
+        if assignment.unit:
+            user_info += f" - Unit {assignment.unit}"
+        entry = f"# {user_info}\n"
+        
+        # UDN assignment entry
+        # Note: UDN is assigned to USER, not MAC. MAC is optional.
+        # For PSK authentication, the user will authenticate with PSK and UDN will be looked up via USER->PSK
+        # For MAC-based auth (if MAC provided), include MAC entry
+        cisco_avpair = UDN_VSA_FORMAT.format(udn_id=assignment.udn_id)
+        reply_message = f"WPN Access - User {assignment.user_id}"
+        if assignment.user_name:
+            reply_message += f" - {assignment.user_name}"
+        if assignment.unit:
+            reply_message += f" - Unit {assignment.unit}"
+        
+        if assignment.mac_address:
+            # MAC-based authentication entry (if MAC provided)
+            entry += f'{assignment.mac_address} Cleartext-Password := ""\n'
+            entry += f'    {UDN_VSA_ATTRIBUTE} := "{cisco_avpair}",\n'
+            entry += f'    Reply-Message := "{reply_message}"\n\n'
+        else:
+            # User-based entry (no MAC) - PSK authentication will handle UDN lookup
+            # This is a placeholder - actual PSK entries are generated by PSK config generator
+            entry += f'# User {assignment.user_id} - UDN {assignment.udn_id} (PSK authentication)\n'
+            entry += f'# PSK entries are generated separately by PSK config generator\n\n'
+        return entry
+    
     
     def generate_all(self, db: Session) -> dict[str, Path]:
         """Generate all configuration files including PSK and MAC bypass.
@@ -0,0 +1,333 @@
+"""Streaming parser for the FreeRADIUS file formats we generate.
+
+A fast, in-process pre-validator for ``users``-format files (users, policies,
+MAC bypass, PSK users) and ``clients.conf``-style configuration sections.
+It checks the grammar the generators emit and reports the first error with
+its line and column, so radiusd -XC only has to run as the final gate.
+
+Per FreeRADIUS documentation:
+https://www.freeradius.org/documentation/freeradius-server/4.0~alpha1/raddb/format.html
+
+Both parsers consume an iterable of lines, so a file object can be passed
+directly without reading the whole file into memory.
+"""
+
+import re
+from collections.abc import Iterable
+
+# Operators accepted in users-file check and reply items
+USERS_OPERATORS = frozenset({
+    "=", ":=", "==", "+=", "-=", "!=", ">", ">=", "<", "<=", "=~", "!~", "=*", "!*",
+})
+
+# Operators accepted in configuration section assignments
+CONFIG_OPERATORS = frozenset({"=", ":=", "+="})
+
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>[ \t\r\n]+)
+  | (?P<comment>\#.*)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|`(?:[^`\\\n]|\\.)*`)
+  | (?P<op>:=|==|\+=|-=|!=|>=|<=|=~|!~|=\*|!\*|[=<>])
+  | (?P<comma>,)
+  | (?P<lbrace>\{)
+  | (?P<rbrace>\})
+  | (?P<word>(?:[^\s"'`,{}\#=<>!:+\-]|:(?!=)|\+(?!=)|-(?!=))+)
+""", re.VERBOSE)
+
+_ATTRIBUTE_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.:-]*\Z")
+
+_INCLUDE_DIRECTIVES = ("$INCLUDE", "$-INCLUDE")
+
+# Token kinds
+WORD = "word"
+STRING = "string"
+OP = "op"
+COMMA = "comma"
+LBRACE = "lbrace"
+RBRACE = "rbrace"
+
+
+class ConfigSyntaxError(ValueError):
+    """Raised when a configuration file doesn't match the expected grammar."""
+
+    def __init__(self, message: str, line: int, column: int):
+        self.message = message
+        self.line = line
+        self.column = column
+        super().__init__(f"line {line}, column {column}: {message}")
+
+
+def tokenize_line(line: str, line_number: int) -> list[tuple[str, str, int]]:
+    """Split one line into tokens, dropping whitespace and comments.
+
+    Args:
+        line: Line of text
+        line_number: 1-based line number (for errors)
+
+    Returns:
+        List of (kind, text, 1-based column) tuples
+
+    Raises:
+        ConfigSyntaxError: On an unterminated string or unexpected character
+    """
+    tokens = []
+    position = 0
+    length = len(line)
+    match = _TOKEN_RE.match
+    while position < length:
+        m = match(line, position)
+        if m is None:
+            char = line[position]
+            if char in "\"'`":
+                raise ConfigSyntaxError("unterminated string", line_number, position + 1)
+            raise ConfigSyntaxError(f"unexpected character {char!r}", line_number, position + 1)
+        kind = m.lastgroup
+        if kind == "comment":
+            break
+        if kind != "ws":
+            tokens.append((kind, m.group(), position + 1))
+        position = m.end()
+    return tokens
+
+
+def _include_directive(line: str, line_number: int) -> bool:
+    """Check a line for an $INCLUDE directive and validate its argument."""
+    stripped = line.lstrip()
+    if not stripped.startswith("$"):
+        return False
+    for directive in _INCLUDE_DIRECTIVES:
+        if stripped.startswith(directive):
+            if not stripped[len(directive):].strip():
+                column = len(line) - len(stripped) + 1
+                raise ConfigSyntaxError(f"{directive} needs a file name", line_number, column)
+            return True
+    return False
+
+
+def _describe(token: tuple[str, str, int] | None) -> str:
+    return "end of line" if token is None else repr(token[1])
+
+
+def _parse_items(
+    tokens: list[tuple[str, str, int]],
+    start: int,
+    line_number: int,
+    line_length: int,
+) -> bool:
+    """Parse a comma-separated list of ``Attribute op value`` items.
+
+    Args:
+        tokens: Tokens of the line
+        start: Index of the first item token
+        line_number: Line number (for errors)
+        line_length: Line length (for end-of-line error columns)
+
+    Returns:
+        True if the list ends with a trailing comma (continues on the next line)
+
+    Raises:
+        ConfigSyntaxError: If an item is malformed
+    """
+    count = len(tokens)
+    index = start
+    while True:
+        attr = tokens[index] if index < count else None
+        if attr is None or attr[0] != WORD or not _ATTRIBUTE_RE.match(attr[1]):
+            column = attr[2] if attr else line_length + 1
+            raise ConfigSyntaxError(
+                f"expected attribute name, got {_describe(attr)}", line_number, column
+            )
+        op = tokens[index + 1] if index + 1 < count else None
+        if op is None or op[0] != OP or op[1] not in USERS_OPERATORS:
+            column = op[2] if op else line_length + 1
+            raise ConfigSyntaxError(
+                f"expected operator after {attr[1]}, got {_describe(op)}", line_number, column
+            )
+        value = tokens[index + 2] if index + 2 < count else None
+        if value is None or value[0] not in (WORD, STRING):
+            column = value[2] if value else line_length + 1
+            raise ConfigSyntaxError(
+                f"expected value for {attr[1]}, got {_describe(value)}", line_number, column
+            )
+        index += 3
+        if index == count:
+            return False
+        separator = tokens[index]
+        if separator[0] != COMMA:
+            raise ConfigSyntaxError(
+                f"expected ',' between items, got {separator[1]!r}", line_number, separator[2]
+            )
+        index += 1
+        if index == count:
+            return True
+
+
+def parse_users_file(lines: Iterable[str]) -> int:
+    """Parse a users-format file.
+
+    Each entry is a name (bare or quoted) at column 1 followed by optional
+    comma-separated check items, then indented reply item lines. Every reply
+    line except the last ends with a comma.
+
+    Args:
+        lines: File lines (a list, a generator or an open file object)
+
+    Returns:
+        Number of entries parsed
+
+    Raises:
+        ConfigSyntaxError: On the first syntax error
+    """
+    entries = 0
+    in_entry = False
+    reply_open = False       # Previous reply line ended with ','
+    reply_closed = False     # Previous reply line ended without ','
+    last_reply_line = 0
+    line_number = 0
+
+    for line_number, raw in enumerate(lines, 1):
+        line = raw.rstrip("\r\n")
+        stripped = line.lstrip()
+        if not stripped or stripped[0] == "#":
+            continue  # Fast path for blank and comment lines
+        if _include_directive(line, line_number):
+            if reply_open:
+                raise ConfigSyntaxError(
+                    f"expected reply item after ',' on line {last_reply_line}", line_number, 1
+                )
+            in_entry = False
+            continue
+
+        tokens = tokenize_line(line, line_number)
+        if not tokens:
+            continue
+
+        if line[0] not in " \t":
+            # New entry: name followed by optional check items
+            if reply_open:
+                raise ConfigSyntaxError(
+                    f"expected reply item after ',' on line {last_reply_line}", line_number, 1
+                )
+            name = tokens[0]
+            if name[0] not in (WORD, STRING):
+                raise ConfigSyntaxError(f"expected entry name, got {name[1]!r}", line_number, name[2])
+            if len(tokens) > 1 and _parse_items(tokens, 1, line_number, len(line)):
+                raise ConfigSyntaxError(
+                    "check items can't continue on the next line", line_number, tokens[-1][2]
+                )
+            entries += 1
+            in_entry = True
+            reply_closed = False
+            continue
+
+        # Indented line: reply items of the current entry
+        if not in_entry:
+            raise ConfigSyntaxError("reply item outside of an entry", line_number, tokens[0][2])
+        if reply_closed:
+            raise ConfigSyntaxError(
+                f"missing ',' at the end of line {last_reply_line}", line_number, tokens[0][2]
+            )
+        reply_open = _parse_items(tokens, 0, line_number, len(line))
+        reply_closed = not reply_open
+        last_reply_line = line_number
+
+    if reply_open:
+        raise ConfigSyntaxError(
+            f"expected reply item after ',' on line {last_reply_line}", line_number + 1, 1
+        )
+    return entries
+
+
+def parse_config_sections(lines: Iterable[str]) -> int:
+    """Parse a configuration-section file such as clients.conf.
+
+    Statements are ``name [instance] {`` section openers, ``}`` closers,
+    ``key = value`` assignments, bare words and $INCLUDE directives.
+
+    Args:
+        lines: File lines (a list, a generator or an open file object)
+
+    Returns:
+        Number of top-level sections parsed
+
+    Raises:
+        ConfigSyntaxError: On the first syntax error, or for a section that
+            is never closed (reported at the line that opened it)
+    """
+    sections = 0
+    stack: list[tuple[str, int, int]] = []
+    line_number = 0
+
+    for line_number, raw in enumerate(lines, 1):
+        line = raw.rstrip("\r\n")
+        stripped = line.lstrip()
+        if not stripped or stripped[0] == "#":
+            continue  # Fast path for blank and comment lines
+        if _include_directive(line, line_number):
+            continue
+
+        tokens = tokenize_line(line, line_number)
+        count = len(tokens)
+        index = 0
+        while index < count:
+            kind, text, column = tokens[index]
+
+            if kind == RBRACE:
+                if not stack:
+                    raise ConfigSyntaxError("unexpected '}'", line_number, column)
+                stack.pop()
+                index += 1
+                continue
+
+            if kind != WORD:
+                raise ConfigSyntaxError(f"expected a name, got {text!r}", line_number, column)
+
+            following = tokens[index + 1] if index + 1 < count else None
+
+            if following is not None and following[0] == OP:
+                if following[1] not in CONFIG_OPERATORS:
+                    raise ConfigSyntaxError(
+                        f"unexpected operator {following[1]!r}", line_number, following[2]
+                    )
+                value = tokens[index + 2] if index + 2 < count else None
+                if value is None or value[0] not in (WORD, STRING):
+                    value_column = value[2] if value else len(line) + 1
+                    raise ConfigSyntaxError(
+                        f"expected value for {text}, got {_describe(value)}", line_number, value_column
+                    )
+                index += 3
+                continue
+
+            # Section opener: name [instance] {
+            opener = index + 1
+            if following is not None and following[0] in (WORD, STRING):
+                opener += 1
+            if opener < count and tokens[opener][0] == LBRACE:
+                if not stack:
+                    sections += 1
+                stack.append((" ".join(t[1] for t in tokens[index:opener]), line_number, column))
+                index = opener + 1
+                continue
+
+            if following is None or following[0] == RBRACE:
+                # Bare word (e.g. a module name inside a section)
+                index += 1
+                continue
+
+            raise ConfigSyntaxError(
+                f"expected '=' or '{{' after {text}, got {following[1]!r}", line_number, following[2]
+            )
+
+    if stack:
+        name, opened_line, opened_column = stack[-1]
+        raise ConfigSyntaxError(f"section '{name}' is never closed", opened_line, opened_column)
+    return sections
+
+
+# Parser per validator file type
+PARSERS = {
+    "users": parse_users_file,
+    "policy": parse_users_file,
+    "include": parse_users_file,
+    "clients": parse_config_sections,
+}
@@ -6,18 +6,40 @@ they don't break the FreeRADIUS system.
 Per FreeRADIUS documentation:
 https://www.freeradius.org/documentation/freeradius-server/4.0~alpha1/howto/modules/configuring_modules.html
 
-Uses radiusd -XC to validate configuration files.
+Files are first checked in-process by the grammar parser in config_parser,
+then by radiusd -XC as the final gate. Files are checked through a
+ValidationSession, which stages every file into one shadow raddb and runs
+radiusd once; verdicts are cached by content hash so unchanged files are
+never parsed twice. Inside a ConfigWriteBatch, safe writes are only staged,
+so a whole regeneration is validated in one session and swapped in together.
 """
 
+import hashlib
 import logging
+import os
+import shutil
 import subprocess
 import tempfile
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from radius_app.core.config_parser import PARSERS, ConfigSyntaxError
+
 logger = logging.getLogger(__name__)
 
 
+# Max validation verdicts kept in the content-hash cache
+VERDICT_CACHE_SIZE = 512
+
+# File types parsed as users-format files; "clients" is $INCLUDEd into
+# radiusd.conf, anything else only gets the basic syntax check
+USERS_FORMAT_TYPES = ("users", "policy")
+
+
 class ConfigValidationError(Exception):
     """Raised when configuration validation fails."""
     pass
@@ -29,6 +51,10 @@ class ConfigValidator:
     def __init__(self):
         """Initialize config validator."""
         self.radiusd_available = self._check_radiusd_available()
+        # Number of radiusd -XC processes spawned for validation
+        self.parser_runs = 0
+        # Verdicts by content digest so unchanged files are never re-parsed
+        self._verdicts: OrderedDict[str, tuple[bool, Optional[str]]] = OrderedDict()
         if not self.radiusd_available:
             logger.warning("⚠️  FreeRADIUS not available - config validation will be limited")
     
@@ -49,6 +75,14 @@ class ConfigValidator:
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
     
+    def session(self) -> "ValidationSession":
+        """Start a validation session for checking several files at once.
+        
+        Returns:
+            New ValidationSession bound to this validator
+        """
+        return ValidationSession(self)
+    
     def validate_users_file(
         self,
         users_file_content: str,
@@ -63,79 +97,25 @@ class ConfigValidator:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        if not self.radiusd_available:
-            # Basic syntax check if radiusd not available
-            return self._basic_syntax_check(users_file_content)
+        session = self.session()
+        session.add_content("users", users_file_content, file_type="users")
+        return session.run()["users"]
+    
+    def validate_users_file_path(self, users_path: Path) -> tuple[bool, Optional[str]]:
+        """Validate a users file that has already been staged on disk.
         
-        # ALWAYS use temp directory for validation to avoid overwriting real config
-        temp_dir = tempfile.mkdtemp(prefix="radius_validate_")
-        validation_dir = Path(temp_dir) / "raddb"
+        Used for large, streamed files so the content never has to be held
+        in memory as a single string.
         
-        try:
-            validation_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Create minimal radiusd.conf for validation
-            radiusd_conf = validation_dir / "radiusd.conf"
-            radiusd_conf.write_text(f"""
-prefix = /usr
-exec_prefix = /usr
-sysconfdir = /etc
-localstatedir = /var
-logdir = {validation_dir}/log
-raddbdir = {validation_dir}
-
-modules {{
-}}
-""")
-            
-            # Create default.conf with server block (FreeRADIUS includes this automatically)
-            # Minimal server config for validation - just needs a listen section
-            default_conf = validation_dir / "default.conf"
-            default_conf.write_text(f"""
-server default {{
-    listen {{
-        type = auth
-        ipaddr = 127.0.0.1
-        port = 0
-    }}
-}}
-""")
-            
-            # Create users file with content to validate
-            users_file = validation_dir / "users"
-            users_file.write_text(users_file_content)
-            
-            # Validate with radiusd -XC
-            result = subprocess.run(
-                ["radiusd", "-XC", "-d", str(validation_dir), "-n", "default"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                cwd=str(validation_dir)
-            )
-            
-            success_message = "Configuration appears to be OK"
+        Args:
+            users_path: Path to the staged users file
             
-            if result.returncode == 0 and success_message in result.stdout:
-                return True, None
-            else:
-                # Extract error message from stderr or stdout
-                error_output = result.stderr if result.stderr else result.stdout
-                error_msg = f"FreeRADIUS validation failed:\n{error_output}"
-                return False, error_msg
-                
-        except subprocess.TimeoutExpired:
-            return False, "Validation timeout - FreeRADIUS parser took too long"
-        except Exception as e:
-            logger.error(f"Validation error: {e}", exc_info=True)
-            return False, f"Validation error: {str(e)}"
-        finally:
-            # Clean up temp directory
-            import shutil
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception:
-                pass
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        session = self.session()
+        session.add_file("users", users_path, file_type="users")
+        return session.run()["users"]
     
     def validate_clients_conf(
         self,
@@ -151,20 +131,36 @@ server default {{
         Returns:
             Tuple of (is_valid, error_message)
         """
-        if not self.radiusd_available:
-            # Basic syntax check if radiusd not available
-            return self._basic_syntax_check(clients_content)
-        
-        # ALWAYS use temp directory for validation to avoid overwriting real config
-        temp_dir = tempfile.mkdtemp(prefix="radius_validate_")
-        validation_dir = Path(temp_dir) / "raddb"
+        session = self.session()
+        session.add_content("clients.conf", clients_content, file_type="clients")
+        return session.run()["clients.conf"]
+    
+    def _get_cached_verdict(self, digest: str) -> Optional[tuple[bool, Optional[str]]]:
+        """Get a cached validation verdict by content digest."""
+        verdict = self._verdicts.get(digest)
+        if verdict is not None:
+            self._verdicts.move_to_end(digest)
+        return verdict
+    
+    def _cache_verdict(self, digest: str, verdict: tuple[bool, Optional[str]]) -> None:
+        """Cache a validation verdict by content digest (LRU bounded)."""
+        self._verdicts[digest] = verdict
+        self._verdicts.move_to_end(digest)
+        while len(self._verdicts) > VERDICT_CACHE_SIZE:
+            self._verdicts.popitem(last=False)
+    
+    def _write_shadow_raddb(self, validation_dir: Path) -> Path:
+        """Write the minimal radiusd.conf and default server used for validation.
         
-        try:
-            validation_dir.mkdir(parents=True, exist_ok=True)
+        Args:
+            validation_dir: Empty shadow raddb directory
             
-            # Create minimal radiusd.conf
-            radiusd_conf = validation_dir / "radiusd.conf"
-            radiusd_conf.write_text(f"""
+        Returns:
+            Path to the shadow radiusd.conf
+        """
+        # Create minimal radiusd.conf for validation
+        radiusd_conf = validation_dir / "radiusd.conf"
+        radiusd_conf.write_text(f"""
 prefix = /usr
 exec_prefix = /usr
 sysconfdir = /etc
@@ -175,11 +171,11 @@ raddbdir = {validation_dir}
 modules {{
 }}
 """)
-            
-            # Create default.conf with server block (FreeRADIUS includes this automatically)
-            # Minimal server config for validation - just needs a listen section
-            default_conf = validation_dir / "default.conf"
-            default_conf.write_text(f"""
+        
+        # Create default.conf with server block (FreeRADIUS includes this automatically)
+        # Minimal server config for validation - just needs a listen section
+        default_conf = validation_dir / "default.conf"
+        default_conf.write_text(f"""
 server default {{
     listen {{
         type = auth
@@ -188,16 +184,19 @@ server default {{
     }}
 }}
 """)
+        return radiusd_conf
+    
+    def _run_parser(self, validation_dir: Path) -> tuple[bool, Optional[str]]:
+        """Run radiusd -XC once against a shadow raddb.
+        
+        Args:
+            validation_dir: Shadow raddb directory with staged files
             
-            # Create clients.conf with content to validate
-            clients_file = validation_dir / "clients.conf"
-            clients_file.write_text(clients_content)
-            
-            # Include clients.conf in radiusd.conf
-            radiusd_conf_content = radiusd_conf.read_text()
-            radiusd_conf.write_text(radiusd_conf_content + f"\n$INCLUDE {clients_file}\n")
-            
-            # Validate with radiusd -XC
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        self.parser_runs += 1
+        try:
             result = subprocess.run(
                 ["radiusd", "-XC", "-d", str(validation_dir), "-n", "default"],
                 capture_output=True,
@@ -205,29 +204,17 @@ server default {{
                 timeout=10,
                 cwd=str(validation_dir)
             )
-            
-            success_message = "Configuration appears to be OK"
-            
-            if result.returncode == 0 and success_message in result.stdout:
-                return True, None
-            else:
-                # Extract error message from stderr or stdout
-                error_output = result.stderr if result.stderr else result.stdout
-                error_msg = f"FreeRADIUS validation failed:\n{error_output}"
-                return False, error_msg
-                
         except subprocess.TimeoutExpired:
             return False, "Validation timeout - FreeRADIUS parser took too long"
-        except Exception as e:
-            logger.error(f"Validation error: {e}", exc_info=True)
-            return False, f"Validation error: {str(e)}"
-        finally:
-            # Clean up temp directory
-            import shutil
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception:
-                pass
+        
+        success_message = "Configuration appears to be OK"
+        
+        if result.returncode == 0 and success_message in result.stdout:
+            return True, None
+        
+        # Extract error message from stderr or stdout
+        error_output = result.stderr if result.stderr else result.stdout
+        return False, f"FreeRADIUS validation failed:\n{error_output}"
     
     def validate_policy_file(
         self,
@@ -252,32 +239,38 @@ server default {{
         Args:
             content: File content to check
             
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        return self._basic_syntax_check_lines(content.split('\n'))
+    
+    def _basic_syntax_check_lines(self, lines: Iterable[str]) -> tuple[bool, Optional[str]]:
+        """Perform basic syntax checks over a stream of lines.
+        
+        Args:
+            lines: File lines (a list or an open file object)
+            
         Returns:
             Tuple of (is_valid, error_message)
         """
         errors = []
+        open_brackets = 0
+        close_brackets = 0
+        quote_count = 0
+        
+        for line in lines:
+            open_brackets += line.count("{")
+            close_brackets += line.count("}")
+            quote_count += line.count('"')
         
         # Check for balanced brackets
-        if content.count("{") != content.count("}"):
+        if open_brackets != close_brackets:
             errors.append("Unbalanced curly brackets")
         
         # Check for balanced quotes (should be even number)
-        quote_count = content.count('"')
         if quote_count % 2 != 0:
             errors.append("Unbalanced quotes")
         
-        # Check for basic FreeRADIUS syntax
-        lines = content.split('\n')
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if stripped and not stripped.startswith('#'):
-                # Check for common syntax errors
-                if '=' in stripped and '==' not in stripped:
-                    # Should have space around = or :=
-                    if '= ' not in stripped and ' :=' not in stripped and ' +=' not in stripped:
-                        # This is a warning, not an error
-                        pass
-        
         if errors:
             return False, "; ".join(errors)
         
@@ -304,17 +297,40 @@ server default {{
         Raises:
             ConfigValidationError: If validation fails
         """
-        # Always use temp directory for validation to avoid issues with
-        # missing includes in the actual config directory
-        config_dir = None
-        
-        if file_type == "users" or file_type == "policy":
-            is_valid, error = self.validate_users_file(content, config_dir)
-        elif file_type == "clients":
-            is_valid, error = self.validate_clients_conf(content, config_dir)
-        else:
-            # Unknown type - do basic check
-            is_valid, error = self._basic_syntax_check(content)
+        session = self.session()
+        session.add_content(file_path.name, content, file_type=file_type)
+        is_valid, error = session.run()[file_path.name]
+        
+        if not is_valid:
+            error_msg = f"Configuration validation failed for {file_path}:\n{error}"
+            logger.error(f"❌ {error_msg}")
+            raise ConfigValidationError(error_msg)
+        
+        logger.debug(f"✅ Configuration validated: {file_path}")
+        return True
+    
+    def validate_file_before_write(
+        self,
+        file_path: Path,
+        staged_path: Path,
+        file_type: str = "users"
+    ) -> bool:
+        """Validate a staged configuration file before it replaces file_path.
+        
+        Args:
+            file_path: Path the staged file will be moved to
+            staged_path: Path of the fully written staged file
+            file_type: Type of file ("users", "clients", "policy")
+            
+        Returns:
+            True if valid, raises ConfigValidationError if invalid
+            
+        Raises:
+            ConfigValidationError: If validation fails
+        """
+        session = self.session()
+        session.add_file(file_path.name, staged_path, file_type=file_type)
+        is_valid, error = session.run()[file_path.name]
         
         if not is_valid:
             error_msg = f"Configuration validation failed for {file_path}:\n{error}"
@@ -369,6 +385,194 @@ server default {{
             return False, f"Validation error: {str(e)}"
 
 
+@dataclass
+class _StagedFile:
+    """A file queued in a ValidationSession."""
+    name: str
+    file_type: str
+    digest: str
+    content: Optional[str] = None
+    source_path: Optional[Path] = None
+    
+    def write_to(self, target: Path) -> None:
+        if self.source_path is not None:
+            shutil.copyfile(self.source_path, target)
+        else:
+            target.write_text(self.content)
+    
+    def lines(self) -> Iterable[str]:
+        if self.source_path is not None:
+            with open(self.source_path, encoding="utf-8") as f:
+                yield from f
+        else:
+            yield from self.content.split('\n')
+
+
+class ValidationSession:
+    """Validates a batch of config files with a single radiusd -XC run.
+    
+    Files are added by content or by path, then run() stages every file whose
+    verdict isn't cached into one shadow raddb and spawns the parser once.
+    
+    Example:
+        >>> session = get_validator().session()
+        >>> session.add_file("users", config_path / "users")
+        >>> session.add_file("clients.conf", clients_path / "clients.conf", "clients")
+        >>> errors = session.errors()
+    """
+    
+    def __init__(self, validator: ConfigValidator):
+        """Initialize validation session.
+        
+        Args:
+            validator: Validator providing the parser and verdict cache
+        """
+        self.validator = validator
+        self._files: dict[str, _StagedFile] = {}
+    
+    def add_content(self, name: str, content: str, file_type: str = "users") -> None:
+        """Queue file content for validation.
+        
+        Args:
+            name: File name (unique within the session)
+            content: File content
+            file_type: Type of file ("users", "clients", "policy")
+        """
+        digest = hashlib.sha256(f"{file_type}\0".encode() + content.encode()).hexdigest()
+        self._files[name] = _StagedFile(name, file_type, digest, content=content)
+    
+    def add_file(self, name: str, path: Path, file_type: str = "users") -> None:
+        """Queue a file on disk for validation.
+        
+        Args:
+            name: File name (unique within the session)
+            path: Path to the file
+            file_type: Type of file ("users", "clients", "policy")
+        """
+        sha = hashlib.sha256(f"{file_type}\0".encode())
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+        self._files[name] = _StagedFile(name, file_type, sha.hexdigest(), source_path=path)
+    
+    def run(self) -> dict[str, tuple[bool, Optional[str]]]:
+        """Validate all queued files.
+        
+        Returns:
+            Mapping of file name to (is_valid, error_message)
+        """
+        validator = self.validator
+        verdicts: dict[str, tuple[bool, Optional[str]]] = {}
+        pending: list[_StagedFile] = []
+        
+        for staged in self._files.values():
+            cached = validator._get_cached_verdict(staged.digest)
+            if cached is not None:
+                verdicts[staged.name] = cached
+                continue
+            
+            # In-process grammar check first - radiusd is only the final gate
+            parser = PARSERS.get(staged.file_type)
+            if parser is not None:
+                try:
+                    parser(staged.lines())
+                    verdict = (True, None)
+                except ConfigSyntaxError as e:
+                    verdict = (False, f"Syntax error at {e}")
+            else:
+                verdict = validator._basic_syntax_check_lines(staged.lines())
+            
+            if verdict[0] and validator.radiusd_available and staged.file_type in (*USERS_FORMAT_TYPES, "clients"):
+                pending.append(staged)
+            else:
+                validator._cache_verdict(staged.digest, verdict)
+                verdicts[staged.name] = verdict
+        
+        if pending:
+            verdicts.update(self._parse(pending))
+        
+        return verdicts
+    
+    def errors(self) -> dict[str, str]:
+        """Validate all queued files and return only the failures.
+        
+        Returns:
+            Mapping of file name to error message (empty if all valid)
+        """
+        return {
+            name: error or "validation failed"
+            for name, (is_valid, error) in self.run().items()
+            if not is_valid
+        }
+    
+    def _parse(self, pending: list[_StagedFile]) -> dict[str, tuple[bool, Optional[str]]]:
+        """Stage files into one shadow raddb and run the parser once.
+        
+        Args:
+            pending: Files without a cached verdict
+            
+        Returns:
+            Verdicts for the pending files
+        """
+        validator = self.validator
+        
+        # ALWAYS use temp directory for validation to avoid overwriting real config
+        temp_dir = tempfile.mkdtemp(prefix="radius_validate_")
+        validation_dir = Path(temp_dir) / "raddb"
+        
+        try:
+            validation_dir.mkdir(parents=True, exist_ok=True)
+            radiusd_conf = validator._write_shadow_raddb(validation_dir)
+            
+            includes = ""
+            staged_paths: dict[str, Path] = {}
+            for staged in pending:
+                # Batched files are named by full path - flatten to stay unique
+                target = validation_dir / staged.name.strip("/").replace("/", "_")
+                staged.write_to(target)
+                staged_paths[staged.name] = target
+                if staged.file_type == "clients":
+                    includes += f"\n$INCLUDE {target}\n"
+            if includes:
+                with open(radiusd_conf, "a") as f:
+                    f.write(includes)
+            
+            is_valid, error = validator._run_parser(validation_dir)
+        except Exception as e:
+            logger.error(f"Validation error: {e}", exc_info=True)
+            return {staged.name: (False, f"Validation error: {str(e)}") for staged in pending}
+        finally:
+            # Clean up temp directory
+            try:
+                shutil.rmtree(temp_dir)
+            except Exception:
+                pass
+        
+        if is_valid:
+            for staged in pending:
+                validator._cache_verdict(staged.digest, (True, None))
+            return {staged.name: (True, None) for staged in pending}
+        
+        # Attribute the failure to the files named in the parser output. The
+        # parser stops at the first error, so the rest are re-checked on their
+        # own. If no file can be singled out, fail them all without caching.
+        blamed = [
+            staged for staged in pending
+            if len(pending) == 1 or str(staged_paths[staged.name]) in (error or "")
+        ]
+        if not blamed:
+            return {staged.name: (False, error) for staged in pending}
+        
+        verdicts = {}
+        for staged in blamed:
+            validator._cache_verdict(staged.digest, (False, error))
+            verdicts[staged.name] = (False, error)
+        remaining = [staged for staged in pending if staged.name not in verdicts]
+        if remaining:
+            verdicts.update(self._parse(remaining))
+        return verdicts
+
+
 # Global validator instance
 _validator: Optional[ConfigValidator] = None
 
@@ -385,6 +589,119 @@ def get_validator() -> ConfigValidator:
     return _validator
 
 
+# Write batch active in the current context, if any
+_active_batch: ContextVar[Optional["ConfigWriteBatch"]] = ContextVar("config_write_batch", default=None)
+
+
+def _staged_path(file_path: Path) -> Path:
+    """Get the staging file written next to a config file."""
+    return file_path.with_name(f".{file_path.name}.tmp")
+
+
+class ConfigWriteBatch:
+    """Stages config writes so a whole regeneration is validated at once.
+    
+    While the batch is active, safe_write_config_file and
+    safe_write_config_chunks only write a staging file next to the target.
+    The caller validates every staged file in one session, then applies the
+    batch (all files move into place together) or discards it (no live file
+    is touched).
+    
+    Example:
+        >>> with ConfigWriteBatch() as batch:
+        ...     generator.generate_clients_conf(db)
+        ...     generator.generate_users_file(db)
+        >>> batch.validate()
+        >>> batch.apply()
+    """
+    
+    def __init__(self, on_discard: Optional[Callable[[list[Path]], None]] = None):
+        """Initialize an empty write batch.
+        
+        Args:
+            on_discard: Called with the target paths whenever staged files are discarded
+        """
+        # Target path -> (staging path, file type)
+        self._staged: dict[Path, tuple[Path, str]] = {}
+        self._on_discard = on_discard
+        self._token = None
+    
+    def __enter__(self) -> "ConfigWriteBatch":
+        self._token = _active_batch.set(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _active_batch.reset(self._token)
+        if exc_type is not None:
+            self.discard()
+    
+    def __contains__(self, file_path: Path) -> bool:
+        return file_path in self._staged
+    
+    def __len__(self) -> int:
+        return len(self._staged)
+    
+    def stage(self, file_path: Path, staged_path: Path, file_type: str) -> None:
+        """Record a fully written staging file for file_path.
+        
+        Args:
+            file_path: Path the staged file will be moved to
+            staged_path: Path of the staged file
+            file_type: Type of file ("users", "clients", "policy", "include")
+        """
+        self._staged[file_path] = (staged_path, file_type)
+    
+    def add_to(self, session: ValidationSession) -> None:
+        """Queue every staged file in a validation session, named by target path.
+        
+        Args:
+            session: Session to add the staged files to
+        """
+        for file_path, (staged_path, file_type) in self._staged.items():
+            session.add_file(str(file_path), staged_path, file_type=file_type)
+    
+    def validate(self) -> None:
+        """Validate every staged file with a single parser run.
+        
+        Raises:
+            ConfigValidationError: If any staged file is invalid
+        """
+        session = get_validator().session()
+        self.add_to(session)
+        errors = session.errors()
+        if errors:
+            details = "\n".join(f"{name}: {error}" for name, error in errors.items())
+            raise ConfigValidationError(f"Configuration validation failed:\n{details}")
+    
+    def apply(self) -> list[Path]:
+        """Move every staged file into place.
+        
+        Returns:
+            Paths of the files written
+        """
+        written = list(self._staged)
+        for file_path, (staged_path, _) in self._staged.items():
+            os.replace(staged_path, file_path)
+        self._staged.clear()
+        if written:
+            logger.info(f"✅ Safely wrote {len(written)} validated config file(s)")
+        return written
+    
+    def discard(self) -> list[Path]:
+        """Delete every staged file, leaving the live files untouched.
+        
+        Returns:
+            Paths of the files that were NOT written
+        """
+        discarded = list(self._staged)
+        for staged_path, _ in self._staged.values():
+            staged_path.unlink(missing_ok=True)
+        self._staged.clear()
+        if discarded and self._on_discard is not None:
+            self._on_discard(discarded)
+        return discarded
+
+
 def safe_write_config_file(
     file_path: Path,
     content: str,
@@ -395,6 +712,8 @@ def safe_write_config_file(
     
     This function ensures that NO invalid configuration file can ever be written.
     If validation fails, the file is NOT written and an exception is raised.
+    Inside a ConfigWriteBatch the file is only staged (see
+    safe_write_config_chunks).
     
     Args:
         file_path: Path where file will be written
@@ -409,6 +728,12 @@ def safe_write_config_file(
         >>> safe_write_config_file(Path("/etc/raddb/users"), content, "users")
         >>> # File is only written if validation passes
     """
+    batch = _active_batch.get()
+    if batch is not None:
+        # Validated and moved into place with the rest of the batch
+        safe_write_config_chunks(file_path, [content], file_type, chmod)
+        return
+    
     validator = get_validator()
     
     # ALWAYS validate before writing - this prevents invalid configs
@@ -419,3 +744,53 @@ def safe_write_config_file(
     file_path.chmod(chmod)
     
     logger.info(f"✅ Safely wrote validated config file: {file_path}")
+
+
+# Buffer size for streamed config writes
+STREAM_WRITE_BUFFER_SIZE = 256 * 1024
+
+
+def safe_write_config_chunks(
+    file_path: Path,
+    chunks: Iterable[str],
+    file_type: str = "users",
+    chmod: int = 0o644
+) -> None:
+    """Stream a configuration file to disk with mandatory validation.
+    
+    Chunks are written through a buffered writer to a staging file next to
+    file_path, validated there, and atomically moved into place. The live
+    file is never left half-written, and an invalid file never replaces it.
+    Inside a ConfigWriteBatch the staging file is left for the batch to
+    validate and move into place.
+    
+    Args:
+        file_path: Path where file will be written
+        chunks: Iterable of text chunks making up the file
+        file_type: Type of file ("users", "clients", "policy")
+        chmod: File permissions (default: 0o644)
+        
+    Raises:
+        ConfigValidationError: If validation fails - file will NOT be written
+    """
+    batch = _active_batch.get()
+    staged_path = _staged_path(file_path)
+    
+    try:
+        with open(staged_path, "w", encoding="utf-8", buffering=STREAM_WRITE_BUFFER_SIZE) as f:
+            f.writelines(chunks)
+        staged_path.chmod(chmod)
+        
+        if batch is not None:
+            # Validated and moved into place with the rest of the batch
+            batch.stage(file_path, staged_path, file_type)
+            logger.debug(f"Staged config file for batch validation: {file_path}")
+            return
+        
+        get_validator().validate_file_before_write(file_path, staged_path, file_type)
+        os.replace(staged_path, file_path)
+    except BaseException:
+        staged_path.unlink(missing_ok=True)
+        raise
+    
+    logger.info(f"✅ Safely wrote validated config file: {file_path}")
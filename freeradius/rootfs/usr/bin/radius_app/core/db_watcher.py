@@ -2,115 +2,143 @@
 
 import asyncio
 import logging
-import subprocess
-from datetime import datetime
+import time
 from pathlib import Path
 
-from sqlalchemy import select, func
 from sqlalchemy.orm import Session
 
 from radius_app.config import get_settings
+from radius_app.core.change_feed import (
+    WATCHED_TABLES,
+    ChangeCursor,
+    ChangeNotifier,
+    get_change_notifier,
+    get_latest_change_id,
+    prune_changes,
+)
 from radius_app.core.config_generator import ConfigGenerator
+from radius_app.core.config_validator import ConfigWriteBatch
 from radius_app.core.policy_generator import PolicyGenerator
 from radius_app.core.radsec_config_generator import RadSecConfigGenerator
+from radius_app.core.reload_scheduler import get_reload_scheduler
+from radius_app.core.users_shards import forget_written_digests
 from radius_app.db.database import get_db
-from radius_app.db.models import RadiusClient, UdnAssignment, RadiusPolicy, RadiusRadSecConfig
 
 logger = logging.getLogger(__name__)
 
+# How often consumed change-log rows are pruned
+PRUNE_INTERVAL_SECONDS = 600
+
 
 class DatabaseWatcher:
-    """Watches database for changes and regenerates configuration."""
+    """Watches database for changes and regenerates configuration.
+    
+    Changes are consumed from the ``radius_config_changes`` log by cursor.
+    The watch loop sleeps until a writer signals the change notifier
+    (PostgreSQL NOTIFY, portal notify endpoint, in-process ORM commit) and
+    only falls back to polling the log every ``poll_interval`` seconds.
+    """
     
-    def __init__(self, poll_interval: int = 5):
+    def __init__(self, poll_interval: int = 30, notifier: ChangeNotifier | None = None):
         """Initialize database watcher.
         
         Args:
-            poll_interval: How often to check for changes (seconds)
+            poll_interval: Fallback interval for checking the change log (seconds)
+            notifier: Change notifier to wait on (defaults to process-wide notifier)
         """
         self.poll_interval = poll_interval
+        self.notifier = notifier or get_change_notifier()
         self.config_generator = ConfigGenerator()
         self.policy_generator = PolicyGenerator()
         self.radsec_generator = RadSecConfigGenerator()
-        self.last_clients_update: datetime | None = None
-        self.last_assignments_update: datetime | None = None
-        self.last_policies_update: datetime | None = None
-        self.last_radsec_update: datetime | None = None
-        self.last_mac_bypass_update: datetime | None = None
+        self.change_cursor: ChangeCursor | None = None
+        self.last_pruned_at: float = 0.0
+        # Per-shard write times (seconds) from the last sharded regeneration
+        self.last_shard_timings: dict[str, dict[str, float]] = {}
         self.running = False
         self._initialized = False  # Track if we've done initial sync
-        logger.info(f"Database watcher initialized (poll interval: {poll_interval}s)")
+        logger.info(f"Database watcher initialized (fallback poll interval: {poll_interval}s)")
     
-    def _initialize_timestamps(self, db: Session) -> None:
-        """Initialize timestamps from database without regenerating.
+    @property
+    def last_change_id(self) -> int | None:
+        """Change id up to which the log has been fully consumed."""
+        return self.change_cursor.position if self.change_cursor else None
+
+    @last_change_id.setter
+    def last_change_id(self, value: int | None) -> None:
+        self.change_cursor = ChangeCursor(value) if value is not None else None
+
+    def _initialize_cursor(self, db: Session) -> None:
+        """Initialize change-log cursor from database without regenerating.
         
         Called on first poll to establish baseline state.
         """
-        self.last_clients_update = self._get_last_update_timestamp(db, RadiusClient)
-        self.last_assignments_update = self._get_last_update_timestamp(db, UdnAssignment)
-        self.last_policies_update = self._get_last_update_timestamp(db, RadiusPolicy)
-        self.last_radsec_update = self._get_last_update_timestamp(db, RadiusRadSecConfig)
-        
-        from radius_app.db.models import RadiusMacBypassConfig
-        self.last_mac_bypass_update = self._get_last_update_timestamp(db, RadiusMacBypassConfig)
-        
+        self.last_change_id = get_latest_change_id(db)
         self._initialized = True
-        logger.info("📊 Database watcher initialized timestamps (no regeneration needed)")
+        logger.info(f"📊 Database watcher initialized at change #{self.last_change_id} (no regeneration needed)")
     
-    def _get_last_update_timestamp(self, db: Session, table_class) -> datetime | None:
-        """Get the most recent update timestamp from a table.
+    def _prune_change_log(self, db: Session) -> None:
+        """Periodically delete consumed change-log rows."""
+        now = time.monotonic()
+        if self.last_change_id is None or now - self.last_pruned_at < PRUNE_INTERVAL_SECONDS:
+            return
+        self.last_pruned_at = now
+        try:
+            deleted = prune_changes(db, self.last_change_id)
+            if deleted:
+                logger.debug(f"Pruned {deleted} consumed change-log rows")
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to prune change log: {e}")
+    
+    def _report_shard_timings(self, file_name: str, timings: dict[str, float]) -> None:
+        """Record and log per-shard write times for a sharded users-format file.
         
         Args:
-            db: Database session
-            table_class: SQLAlchemy model class
-            
-        Returns:
-            Most recent updated_at timestamp or None
+            file_name: Top-level file name (e.g. "users")
+            timings: Seconds spent per rewritten shard, keyed by shard name
         """
-        try:
-            stmt = select(func.max(table_class.updated_at))
-            result = db.execute(stmt).scalar()
-            return result
-        except Exception as e:
-            logger.error(f"Failed to get last update timestamp: {e}")
-            return None
+        if not timings:
+            return
+        self.last_shard_timings[file_name] = dict(timings)
+        details = ", ".join(
+            f"{shard} {seconds * 1000:.1f}ms" for shard, seconds in sorted(timings.items())
+        )
+        logger.info(f"🧩 {file_name}: rewrote {len(timings)} shard(s) - {details}")
     
-    def _reload_radiusd(self) -> bool:
-        """Reload FreeRADIUS daemon to apply configuration changes.
+    async def _reload_radiusd(self, wait: bool = False) -> bool:
+        """Ask the reload scheduler to reload FreeRADIUS.
+        
+        Reloads are debounced and coalesced by the scheduler, so a burst of
+        regenerations results in a single SIGHUP.
+        
+        Args:
+            wait: Wait for the coalesced reload to run and report its outcome
         
         Returns:
-            True if reload successful
+            True if the reload was scheduled (or, with wait, succeeded)
         """
-        try:
-            # Send HUP signal to radiusd to reload config
-            result = subprocess.run(
-                ["killall", "-HUP", "radiusd"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                logger.info("✅ FreeRADIUS daemon reloaded successfully")
-                return True
-            else:
-                logger.warning(f"Failed to reload radiusd: {result.stderr}")
-                return False
-                
-        except subprocess.TimeoutExpired:
-            logger.error("Timeout while reloading radiusd")
-            return False
-        except Exception as e:
-            logger.error(f"Error reloading radiusd: {e}")
-            return False
+        request = get_reload_scheduler().request_reload("config watcher")
+        if not wait:
+            return True
+        return await request
     
-    def _validate_all_configs(self) -> bool:
+    def _validate_all_configs(self, batch: ConfigWriteBatch | None = None) -> bool:
         """Validate all generated configuration files before reloading.
         
+        The files staged by this cycle's batch and the live files they sit
+        beside go into one validation session, so a cycle costs at most one
+        radiusd -XC run, and files whose content was already validated are
+        not parsed again.
+        
+        Args:
+            batch: Files staged by this cycle, validated in place of the live ones
+        
         Returns:
             True if all configs are valid, False otherwise
         """
         from radius_app.core.config_validator import get_validator
+        from radius_app.core.users_shards import shard_dir
         from radius_app.config import get_settings
         
         validator = get_validator()
@@ -118,52 +146,35 @@ class DatabaseWatcher:
         config_path = Path(settings.radius_config_path)
         clients_path = Path(settings.radius_clients_path)
         
-        validation_errors = []
+        session = validator.session()
         
-        # Validate clients.conf if it exists
-        clients_file = clients_path / "clients.conf"
-        if clients_file.exists():
-            try:
-                validator.validate_clients_conf(clients_file.read_text(), config_path)
-                logger.debug("✅ clients.conf validated")
-            except Exception as e:
-                validation_errors.append(f"clients.conf: {e}")
+        staged = batch if batch is not None else ConfigWriteBatch()
+        staged.add_to(session)
         
-        # Validate users file if it exists
-        users_file = config_path / "users"
-        if users_file.exists():
-            try:
-                validator.validate_users_file(users_file.read_text(), config_path)
-                logger.debug("✅ users file validated")
-            except Exception as e:
-                validation_errors.append(f"users: {e}")
-        
-        # Validate policy file if it exists
-        policy_file = config_path / "policies"
-        if policy_file.exists():
-            try:
-                validator.validate_policy_file(policy_file.read_text(), config_path)
-                logger.debug("✅ policies file validated")
-            except Exception as e:
-                validation_errors.append(f"policies: {e}")
+        clients_file = clients_path / "clients.conf"
+        if clients_file.exists() and clients_file not in staged:
+            session.add_file("clients.conf", clients_file, file_type="clients")
         
-        # Validate MAC bypass file if it exists
-        mac_bypass_file = config_path / "users-mac-bypass"
-        if mac_bypass_file.exists():
-            try:
-                validator.validate_users_file(mac_bypass_file.read_text(), config_path)
-                logger.debug("✅ MAC bypass file validated")
-            except Exception as e:
-                validation_errors.append(f"users-mac-bypass: {e}")
+        # Live shards were validated when they were written
+        for name, file_type in (
+            ("users", "users"),
+            ("policies", "policy"),
+            ("users-mac-bypass", "users"),
+            ("users-psk", "users"),
+        ):
+            config_file = config_path / name
+            if (
+                config_file.exists()
+                and config_file not in staged
+                and not shard_dir(config_file).exists()
+            ):
+                session.add_file(name, config_file, file_type=file_type)
         
-        # Validate PSK users file if it exists
-        psk_users_file = config_path / "users-psk"
-        if psk_users_file.exists():
-            try:
-                validator.validate_users_file(psk_users_file.read_text(), config_path)
-                logger.debug("✅ PSK users file validated")
-            except Exception as e:
-                validation_errors.append(f"users-psk: {e}")
+        parser_runs = validator.parser_runs
+        validation_errors = [
+            f"{name}: {error}" for name, error in session.errors().items()
+        ]
+        logger.debug(f"Validation session used {validator.parser_runs - parser_runs} parser run(s)")
         
         if validation_errors:
             logger.error("❌ Configuration validation errors:")
@@ -174,11 +185,16 @@ class DatabaseWatcher:
         logger.info("✅ All configuration files validated successfully")
         return True
     
-    async def check_and_regenerate(self, force: bool = False) -> dict[str, bool]:
+    async def check_and_regenerate(
+        self,
+        force: bool = False,
+        wait_for_reload: bool = False,
+    ) -> dict[str, bool]:
         """Check for database changes and regenerate config if needed.
         
         Args:
-            force: Force regeneration regardless of timestamps
+            force: Force regeneration regardless of the change log
+            wait_for_reload: Wait for the scheduled radiusd reload to complete
             
         Returns:
             Dictionary with regeneration status
@@ -197,7 +213,7 @@ class DatabaseWatcher:
         
         try:
             # On first run, check if config files already exist
-            # If they do, just initialize timestamps without regenerating
+            # If they do, just initialize the change-log cursor without regenerating
             settings = get_settings()
             config_path = Path(settings.radius_config_path)
             clients_path = Path(settings.radius_clients_path)
@@ -209,96 +225,110 @@ class DatabaseWatcher:
             )
             
             if not self._initialized and configs_exist and not force:
-                # Config files exist - just initialize timestamps, don't regenerate
-                self._initialize_timestamps(db)
+                # Config files exist - just initialize cursor, don't regenerate
+                self._initialize_cursor(db)
                 return result
             
-            # Check RADIUS clients
-            current_clients_update = self._get_last_update_timestamp(db, RadiusClient)
-            
-            if force or self.last_clients_update is None or (
-                current_clients_update and self.last_clients_update and 
-                current_clients_update > self.last_clients_update
-            ):
-                logger.info("🔄 Regenerating clients.conf (database changed)")
-                self.config_generator.generate_clients_conf(db)
-                self.last_clients_update = current_clients_update
-                result["clients_regenerated"] = True
-            elif self.last_clients_update is None:
-                # First run - just set timestamp
-                self.last_clients_update = current_clients_update
-            
-            # Check UDN assignments
-            current_assignments_update = self._get_last_update_timestamp(db, UdnAssignment)
-            
-            if force or (
-                current_assignments_update and self.last_assignments_update and 
-                current_assignments_update > self.last_assignments_update
-            ):
-                logger.info("🔄 Regenerating users file (database changed)")
-                self.config_generator.generate_users_file(db)
-                self.last_assignments_update = current_assignments_update
-                result["users_regenerated"] = True
-            elif self.last_assignments_update is None:
-                self.last_assignments_update = current_assignments_update
-            
-            # Check policies
-            current_policies_update = self._get_last_update_timestamp(db, RadiusPolicy)
-            
-            if force or (
-                current_policies_update and self.last_policies_update and 
-                current_policies_update > self.last_policies_update
-            ):
-                logger.info("🔄 Regenerating policy file (database changed)")
-                self.policy_generator.generate_policy_file(db)
-                self.policy_generator.generate_policy_include()
-                self.last_policies_update = current_policies_update
-                result["policies_regenerated"] = True
-            elif self.last_policies_update is None:
-                self.last_policies_update = current_policies_update
-            
-            # Check MAC bypass configs
-            from radius_app.db.models import RadiusMacBypassConfig
-            current_mac_bypass_update = self._get_last_update_timestamp(db, RadiusMacBypassConfig)
+            # Consume the change log from our cursor position
+            changes = []
+            if force or self.change_cursor is None:
+                latest_change_id = get_latest_change_id(db)
+                changed_tables = set(WATCHED_TABLES)
+            else:
+                changes = self.change_cursor.read(db)
+                changed_tables = {change.table_name for change in changes}
             
-            if force or (
-                current_mac_bypass_update and self.last_mac_bypass_update and 
-                current_mac_bypass_update > self.last_mac_bypass_update
-            ):
-                logger.info("🔄 Regenerating MAC bypass file (database changed)")
-                from radius_app.core.psk_config_generator import PskConfigGenerator
-                psk_generator = PskConfigGenerator()
-                psk_generator.generate_mac_bypass_file(db)
-                self.last_mac_bypass_update = current_mac_bypass_update
-                result["mac_bypass_regenerated"] = True
-            elif self.last_mac_bypass_update is None:
-                self.last_mac_bypass_update = current_mac_bypass_update
+            if changed_tables and not force:
+                logger.info(
+                    f"📥 Change log: {sorted(changed_tables)} "
+                    f"({len(changes)} changes after #{self.last_change_id})"
+                )
             
-            # Generate PSK users file only if force or assignments changed
-            if force or result.get("users_regenerated"):
-                try:
+            # Stage every config write so the cycle is validated once and
+            # swapped in together
+            batch = ConfigWriteBatch(on_discard=forget_written_digests)
+            with batch:
+                # Check RADIUS clients
+                if "radius_clients" in changed_tables:
+                    logger.info("🔄 Regenerating clients.conf (database changed)")
+                    self.config_generator.generate_clients_conf(db)
+                    result["clients_regenerated"] = True
+                
+                # Check UDN assignments
+                if "udn_assignments" in changed_tables:
+                    logger.info("🔄 Regenerating users file (database changed)")
+                    changed_ids = None
+                    if changes:
+                        row_ids = {
+                            change.row_id for change in changes
+                            if change.table_name == "udn_assignments"
+                        }
+                        # A change not tied to a row (e.g. portal NOTIFY) means the whole table
+                        changed_ids = None if None in row_ids else row_ids
+                    if changed_ids is None:
+                        # Unknown scope - re-render every entry
+                        self.config_generator.invalidate_users_fragments()
+                    self.config_generator.generate_users_file(db, changed_ids=changed_ids)
+                    self._report_shard_timings("users", self.config_generator.last_shard_timings)
+                    result["users_regenerated"] = True
+                
+                # Check policies
+                if "radius_policies" in changed_tables:
+                    logger.info("🔄 Regenerating policy file (database changed)")
+                    self.policy_generator.generate_policy_file(db)
+                    self.policy_generator.generate_policy_include()
+                    result["policies_regenerated"] = True
+                
+                # Check MAC bypass configs
+                if "radius_mac_bypass_configs" in changed_tables:
+                    logger.info("🔄 Regenerating MAC bypass file (database changed)")
                     from radius_app.core.psk_config_generator import PskConfigGenerator
                     psk_generator = PskConfigGenerator()
-                    psk_generator.generate_psk_users_file(db)
-                    result["psk_users_regenerated"] = True
-                except Exception as e:
-                    logger.warning(f"Failed to generate PSK users file: {e}")
-            
-            # Check RadSec configurations
-            current_radsec_update = self._get_last_update_timestamp(db, RadiusRadSecConfig)
+                    psk_generator.generate_mac_bypass_file(db)
+                    self._report_shard_timings("users-mac-bypass", psk_generator.last_shard_timings)
+                    result["mac_bypass_regenerated"] = True
+                
+                # Generate PSK users file only if force or assignments changed
+                if force or result.get("users_regenerated"):
+                    try:
+                        from radius_app.core.psk_config_generator import PskConfigGenerator
+                        psk_generator = PskConfigGenerator()
+                        psk_generator.generate_psk_users_file(db)
+                        result["psk_users_regenerated"] = True
+                    except Exception as e:
+                        logger.warning(f"Failed to generate PSK users file: {e}")
+                
+                # Check RadSec configurations
+                if "radius_radsec_configs" in changed_tables:
+                    logger.info("🔄 Regenerating RadSec configuration (database changed)")
+                    self.radsec_generator.generate_radsec_conf(db)
+                    self.radsec_generator.generate_radsec_include()
+                    result["radsec_regenerated"] = True
             
-            if force or (
-                current_radsec_update and self.last_radsec_update and 
-                current_radsec_update > self.last_radsec_update
-            ):
-                logger.info("🔄 Regenerating RadSec configuration (database changed)")
-                self.radsec_generator.generate_radsec_conf(db)
-                self.radsec_generator.generate_radsec_include()
-                self.last_radsec_update = current_radsec_update
-                result["radsec_regenerated"] = True
-            elif self.last_radsec_update is None:
-                self.last_radsec_update = current_radsec_update
+            regenerated = any([
+                result["clients_regenerated"],
+                result["users_regenerated"],
+                result["policies_regenerated"],
+                result["radsec_regenerated"],
+                result.get("mac_bypass_regenerated", False),
+                result.get("psk_users_regenerated", False)
+            ])
+            if regenerated or len(batch):
+                # One validation session over the staged and the live files
+                if not self._validate_all_configs(batch):
+                    batch.discard()
+                    logger.error("❌ Configuration validation failed - NOT reloading FreeRADIUS")
+                    logger.error("⚠️  FreeRADIUS will continue using previous configuration")
+                    # Cursor not advanced - the changes are retried next cycle
+                    result["validation_failed"] = True
+                    return result
+                batch.apply()
             
+            # Everything up to here has been applied - advance the cursor
+            if changes:
+                self.change_cursor.advance({change.id for change in changes})
+            elif force or self.change_cursor is None:
+                self.last_change_id = latest_change_id
             self._initialized = True
             
             # Generate/enable all virtual servers (always regenerate on force/initial)
@@ -350,27 +380,12 @@ class DatabaseWatcher:
                 except Exception as e:
                     logger.warning(f"Failed to generate inner-tunnel: {e}", exc_info=True)
             
-            # Validate all config files before reloading
-            if any([
-                result["clients_regenerated"],
-                result["users_regenerated"],
-                result["policies_regenerated"],
-                result["radsec_regenerated"],
-                result.get("mac_bypass_regenerated", False),
-                result.get("psk_users_regenerated", False)
-            ]):
-                # Validate all generated files before reloading
-                validation_passed = self._validate_all_configs()
-                
-                if not validation_passed:
-                    logger.error("❌ Configuration validation failed - NOT reloading FreeRADIUS")
-                    logger.error("⚠️  FreeRADIUS will continue using previous configuration")
-                    result["reloaded"] = False
-                    result["validation_failed"] = True
-                else:
-                    # All validations passed - safe to reload
-                    result["reloaded"] = self._reload_radiusd()
-                    result["validation_failed"] = False
+            # Regenerated files were validated with the batch - safe to reload
+            if regenerated:
+                result["reloaded"] = await self._reload_radiusd(wait=wait_for_reload)
+                result["validation_failed"] = False
+            
+            self._prune_change_log(db)
             
         except Exception as e:
             logger.error(f"Error checking/regenerating config: {e}", exc_info=True)
@@ -397,16 +412,16 @@ class DatabaseWatcher:
         )
         
         if configs_exist:
-            logger.info("📊 Config files exist - initializing timestamps only")
+            logger.info("📊 Config files exist - initializing change-log cursor only")
             await self.check_and_regenerate(force=False)
         else:
             logger.info("⚠️ Config files missing - performing initial generation")
             await self.check_and_regenerate(force=True)
         
-        # Watch loop
+        # Watch loop - wake on change notifications, poll the log as a fallback
         while self.running:
             try:
-                await asyncio.sleep(self.poll_interval)
+                await self.notifier.wait(self.poll_interval)
                 await self.check_and_regenerate()
                 
             except asyncio.CancelledError:
@@ -239,14 +239,18 @@ class EapConfigGenerator:
                 f"# Serial: {cert.serial_number}",
                 f"# Valid until: {cert.valid_until.date()}",
                 f"{cert.subject_common_name}",
-                f"    TLS-Client-Cert-Subject := \"CN={cert.subject_common_name}\"",
-                f"    Reply-Message := \"EAP-TLS Authentication Successful\"",
             ])
+            reply_items = [
+                f"TLS-Client-Cert-Subject := \"CN={cert.subject_common_name}\"",
+                f"Reply-Message := \"EAP-TLS Authentication Successful\"",
+            ]
             
             # Add UDN ID if present
             if cert.udn_id:
-                lines.append(f"    Cisco-AVPair := \"udn-id={cert.udn_id}\"")
+                reply_items.append(f"Cisco-AVPair := \"udn-id={cert.udn_id}\"")
             
+            # Reply items are comma-separated; the last has no comma
+            lines.append(",\n".join(f"    {item}" for item in reply_items))
             lines.extend(["", ""])
         
         return "\n".join(lines)
@@ -2,34 +2,63 @@
 
 import asyncio
 import logging
-import socket
+import random
 import time
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
+from radius_app.config import get_nad_probe_settings
+from radius_app.core.nad_prober import NadProber, ProbeResult, ProbeTarget, probe_tcp
 from radius_app.db.database import get_db
 from radius_app.db.models import RadiusClient, RadiusNadExtended, RadiusNadHealth
 
 logger = logging.getLogger(__name__)
 
+# Each NAD is re-probed every check_interval +/- this fraction
+JITTER_FRACTION = 0.1
+
+# The loop wakes this many times per check interval to probe the NADs due
+SCHEDULER_TICKS_PER_INTERVAL = 6
+
 
 class HealthMonitor:
-    """Monitors NAD health and connectivity."""
+    """Monitors NAD health and connectivity.
+    
+    Probes run concurrently on the event loop (bounded by the prober's
+    concurrency limit). Each NAD has its own jittered due time, so a large
+    fleet is probed in a steady trickle rather than one burst per interval.
+    Every sweep loads NAD state with a single query and writes all results
+    in one transaction.
+    """
     
-    def __init__(self, check_interval: int = 60):
+    def __init__(
+        self,
+        check_interval: int = 60,
+        prober: NadProber | None = None,
+    ):
         """Initialize health monitor.
         
         Args:
-            check_interval: How often to check health (seconds)
+            check_interval: How often to check each NAD (seconds)
+            prober: NAD prober (defaults to RADIUS_NAD_PROBE_MODE/_CONCURRENCY)
         """
         self.check_interval = check_interval
+        if prober is None:
+            mode, concurrency = get_nad_probe_settings()
+            prober = NadProber(mode=mode, concurrency=concurrency)
+        self.prober = prober
         self.running = False
-        logger.info(f"Health monitor initialized (check interval: {check_interval}s)")
+        # Monotonic time each NAD (by client id) is next due for a probe
+        self._next_due: dict[int, float] = {}
+        logger.info(
+            f"Health monitor initialized (check interval: {check_interval}s, "
+            f"probe: {prober.mode}, concurrency: {prober.concurrency})"
+        )
     
     def _test_nad_connectivity(self, ip_addr: str) -> tuple[bool, float | None]:
-        """Test connectivity to a NAD.
+        """Test connectivity to a NAD (blocking, for use outside the event loop).
         
         Args:
             ip_addr: IP address to test
@@ -37,114 +66,118 @@ class HealthMonitor:
         Returns:
             Tuple of (is_reachable, latency_ms)
         """
-        # Extract IP if CIDR notation
-        ip_addr = ip_addr.split('/')[0]
-        
-        # Try connecting to RADIUS authentication port
-        start_time = time.time()
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(3)
-            result = sock.connect_ex((ip_addr, 1812))
-            sock.close()
-            
-            latency_ms = (time.time() - start_time) * 1000
-            
-            # Port open or connection refused both mean host is reachable
-            is_reachable = result in (0, 111)  # 0 = connected, 111 = connection refused (but host alive)
-            
-            return is_reachable, latency_ms if is_reachable else None
-            
-        except socket.timeout:
-            return False, None
-        except Exception as e:
-            logger.debug(f"Connection test failed for {ip_addr}: {e}")
-            return False, None
+        return asyncio.run(probe_tcp(ip_addr, self.prober.port, self.prober.timeout))
+    
+    def _schedule_next(self, client_id: int, now: float) -> None:
+        jitter = random.uniform(1 - JITTER_FRACTION, 1 + JITTER_FRACTION)
+        self._next_due[client_id] = now + self.check_interval * jitter
     
-    async def check_all_nads(self, db: Session) -> int:
-        """Check health of all active NADs.
+    async def check_all_nads(self, db: Session, due_only: bool = False) -> int:
+        """Check health of active NADs.
         
         Args:
             db: Database session
+            due_only: Only probe NADs whose jittered due time has passed
+                (NADs seen for the first time get a random offset within
+                one check interval)
             
         Returns:
             Number of NADs checked
         """
-        checked_count = 0
-        
         try:
-            # Get all active clients with extended info
-            stmt = select(RadiusClient).where(RadiusClient.is_active == True)
-            clients = db.execute(stmt).scalars().all()
+            rows = db.execute(
+                select(
+                    RadiusClient.id,
+                    RadiusClient.ipaddr,
+                    RadiusClient.secret,
+                    RadiusNadExtended.id,
+                    RadiusNadHealth.id,
+                    RadiusNadHealth.avg_response_time_ms,
+                )
+                .outerjoin(RadiusNadExtended, RadiusNadExtended.radius_client_id == RadiusClient.id)
+                .outerjoin(RadiusNadHealth, RadiusNadHealth.nad_id == RadiusNadExtended.id)
+                .where(RadiusClient.is_active == True)  # noqa: E712
+            ).all()
             
-            for client in clients:
-                try:
-                    # Get or create extended info
-                    extended = db.execute(
-                        select(RadiusNadExtended).where(
-                            RadiusNadExtended.radius_client_id == client.id
-                        )
-                    ).scalar_one_or_none()
-                    
-                    if not extended:
-                        # Create extended record for backward compatibility
-                        extended = RadiusNadExtended(
-                            radius_client_id=client.id,
-                        )
-                        db.add(extended)
-                        db.flush()
-                    
-                    # Get or create health record
-                    health = db.execute(
-                        select(RadiusNadHealth).where(
-                            RadiusNadHealth.nad_id == extended.id
-                        )
-                    ).scalar_one_or_none()
-                    
-                    if not health:
-                        health = RadiusNadHealth(
-                            nad_id=extended.id,
-                            is_reachable=False,
-                            request_count=0,
-                            success_count=0,
-                            failure_count=0,
-                        )
-                        db.add(health)
-                        db.flush()
-                    
-                    # Test connectivity
-                    is_reachable, latency_ms = self._test_nad_connectivity(client.ipaddr)
-                    
-                    # Update health record
-                    health.is_reachable = is_reachable
-                    health.checked_at = datetime.now(timezone.utc)
-                    
-                    if is_reachable:
-                        health.last_seen = datetime.now(timezone.utc)
-                        
-                        # Update average response time (simple moving average)
-                        if health.avg_response_time_ms is None:
-                            health.avg_response_time_ms = latency_ms
-                        else:
-                            # Weighted average (70% old, 30% new)
-                            health.avg_response_time_ms = (
-                                health.avg_response_time_ms * 0.7 + latency_ms * 0.3
-                            )
-                    
-                    checked_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error checking NAD {client.id} ({client.name}): {e}")
-                    continue
+            now = time.monotonic()
+            active_ids = {row[0] for row in rows}
+            for client_id in self._next_due.keys() - active_ids:
+                del self._next_due[client_id]
+            if due_only:
+                for client_id in active_ids - self._next_due.keys():
+                    self._next_due[client_id] = now + random.uniform(0, self.check_interval)
+                rows = [row for row in rows if self._next_due[row[0]] <= now]
+            if not rows:
+                return 0
+            
+            results = await self.prober.probe_many(
+                [ProbeTarget(client_id, ipaddr, secret) for client_id, ipaddr, secret, *_ in rows]
+            )
             
-            # Commit all changes
+            self._store_results(db, rows, results)
             db.commit()
             
+            now = time.monotonic()
+            for row in rows:
+                self._schedule_next(row[0], now)
+            return len(rows)
+            
         except Exception as e:
             logger.error(f"Error in NAD health check: {e}", exc_info=True)
             db.rollback()
+            return 0
+    
+    def _store_results(self, db: Session, rows: list, results: list[ProbeResult]) -> None:
+        """Bulk-upsert extended and health rows for one sweep.
         
-        return checked_count
+        Args:
+            db: Database session
+            rows: (client_id, ipaddr, secret, extended_id, health_id, avg_ms) rows
+            results: Probe results in the same order as ``rows``
+        """
+        # Create missing extended records (older NADs) in one batch
+        missing = [row[0] for row in rows if row[3] is None]
+        extended_ids = {row[0]: row[3] for row in rows if row[3] is not None}
+        if missing:
+            db.execute(insert(RadiusNadExtended), [{"radius_client_id": cid} for cid in missing])
+            extended_ids.update(db.execute(
+                select(RadiusNadExtended.radius_client_id, RadiusNadExtended.id)
+                .where(RadiusNadExtended.radius_client_id.in_(missing))
+            ).tuples().all())
+        
+        checked_at = datetime.now(timezone.utc)
+        inserts = []
+        updates = []
+        for row, result in zip(rows, results):
+            client_id, _, _, _, health_id, avg_ms = row
+            values = {"is_reachable": result.is_reachable, "checked_at": checked_at}
+            if result.is_reachable:
+                values["last_seen"] = checked_at
+                if result.latency_ms is not None:
+                    # Weighted average (70% old, 30% new)
+                    values["avg_response_time_ms"] = (
+                        result.latency_ms if avg_ms is None
+                        else avg_ms * 0.7 + result.latency_ms * 0.3
+                    )
+            if health_id is None:
+                inserts.append({
+                    "nad_id": extended_ids[client_id],
+                    "request_count": 0,
+                    "success_count": 0,
+                    "failure_count": 0,
+                    **values,
+                })
+            else:
+                updates.append({"id": health_id, **values})
+        
+        if inserts:
+            db.execute(insert(RadiusNadHealth), inserts)
+        # Rows differ in which columns change, so group them for executemany
+        groups: dict[tuple[str, ...], list[dict]] = {}
+        for values in updates:
+            groups.setdefault(tuple(sorted(values)), []).append(values)
+        for group in groups.values():
+            db.execute(update(RadiusNadHealth), group)
     
     async def monitor_loop(self):
         """Main monitoring loop - runs continuously."""
@@ -162,14 +195,14 @@ class HealthMonitor:
                 db = next(db_generator)
                 
                 try:
-                    checked = await self.check_all_nads(db)
+                    checked = await self.check_all_nads(db, due_only=True)
                     if checked > 0:
                         logger.debug(f"Health check completed for {checked} NADs")
                 finally:
                     db.close()
                 
-                # Wait for next check
-                await asyncio.sleep(self.check_interval)
+                # Wake again for the next batch of due NADs
+                await asyncio.sleep(self.check_interval / SCHEDULER_TICKS_PER_INTERVAL)
                 
             except asyncio.CancelledError:
                 logger.info("Health monitoring loop cancelled")
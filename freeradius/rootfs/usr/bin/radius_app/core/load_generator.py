@@ -0,0 +1,384 @@
+"""In-process RADIUS authentication load generator.
+
+Sends Access-Requests from the event loop through the asyncio RADIUS client
+instead of shelling out to radclient, so every request is timed on its own.
+Two load models are supported:
+
+- closed-loop: a fixed number of workers each keep one request in flight,
+  which measures the throughput the server sustains at that concurrency.
+- open-loop: requests are issued on a fixed schedule (``rate`` per second)
+  whether or not earlier ones have been answered. Latency is measured from
+  the scheduled send time, so a stalled server shows up in the tail instead
+  of silently lowering the offered load (coordinated omission).
+
+Latencies go into a log-linear, HDR-style histogram with bounded relative
+error, so percentiles are real rather than estimated from the average.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from radius_app.core.radius_client import RadiusTimeoutError, RadiusUdpClient
+from radius_app.core.radius_packet import (
+    ACCESS_ACCEPT,
+    ACCESS_CHALLENGE,
+    ACCESS_REJECT,
+    ACCESS_REQUEST,
+    RadiusPacketError,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED_LOOP = "closed"
+OPEN_LOOP = "open"
+
+OUTCOMES = ("accept", "reject", "challenge", "timeout", "error")
+
+_CODE_OUTCOMES = {
+    ACCESS_ACCEPT: "accept",
+    ACCESS_REJECT: "reject",
+    ACCESS_CHALLENGE: "challenge",
+}
+
+# RADIUS identifiers are 8 bits, so each socket carries at most 256
+# outstanding requests to one server
+REQUESTS_PER_SOCKET = 256
+
+# Distinct error messages kept per run (the rest are still counted)
+MAX_ERROR_MESSAGES = 10
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the style of HdrHistogram.
+
+    Values are recorded in microseconds. Below ``2**significant_bits`` each
+    microsecond has its own bucket; above that, every power-of-two range is
+    split into ``2**(significant_bits - 1)`` linear buckets, so the relative
+    error stays under ``2**-(significant_bits - 1)`` (under 1% by default)
+    while memory grows only with the log of the largest value.
+    """
+
+    def __init__(self, significant_bits: int = 8):
+        """Initialize an empty histogram.
+
+        Args:
+            significant_bits: Bits of precision kept per value
+        """
+        self.significant_bits = significant_bits
+        self.sub_bucket_count = 1 << significant_bits
+        self.half_count = self.sub_bucket_count // 2
+        self.counts: dict[int, int] = {}
+        self.total_count = 0
+        self.total_us = 0
+        self.min_us: int | None = None
+        self.max_us = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.significant_bits
+        return shift * self.half_count + (value >> shift)
+
+    def _bounds(self, index: int) -> tuple[int, int]:
+        if index < self.sub_bucket_count:
+            return index, index
+        shift = (index - self.half_count) // self.half_count
+        mantissa = index - shift * self.half_count
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, latency_ms: float, count: int = 1) -> None:
+        """Record a latency.
+
+        Args:
+            latency_ms: Latency in milliseconds (negative values count as 0)
+            count: Number of identical samples
+        """
+        value = max(0, int(round(latency_ms * 1000)))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += count
+        self.total_us += value * count
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = max(self.max_us, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's samples (must use the same precision)."""
+        if other.significant_bits != self.significant_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, percent: float) -> float:
+        """Latency at or below which ``percent`` of samples fall.
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Latency in milliseconds (upper bound of the matching bucket,
+            capped at the largest recorded value); 0 if empty
+        """
+        if self.total_count == 0:
+            return 0.0
+        if percent <= 0:
+            return (self.min_us or 0) / 1000
+        target = max(1, math.ceil(percent / 100 * self.total_count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._bounds(index)[1], self.max_us) / 1000
+        return self.max_us / 1000
+
+    @property
+    def mean_ms(self) -> float:
+        """Mean latency in milliseconds (exact, not bucketed)."""
+        return self.total_us / self.total_count / 1000 if self.total_count else 0.0
+
+    def buckets(self) -> list[dict]:
+        """Non-empty buckets as ``{"le_ms", "count"}`` rows in ascending order."""
+        return [
+            {"le_ms": self._bounds(index)[1] / 1000, "count": self.counts[index]}
+            for index in sorted(self.counts)
+        ]
+
+    def summary(self) -> dict:
+        """Count, min/mean/max and the usual percentiles in milliseconds."""
+        return {
+            "count": self.total_count,
+            "min_ms": (self.min_us or 0) / 1000,
+            "mean_ms": round(self.mean_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "p999_ms": self.percentile(99.9),
+            "max_ms": self.max_us / 1000,
+        }
+
+
+@dataclass
+class LoadTestReport:
+    """Outcome of one load generator run."""
+
+    mode: str
+    sent: int = 0
+    elapsed_time: float = 0.0
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    outcomes: Counter = field(default_factory=Counter)
+    error_messages: Counter = field(default_factory=Counter)
+    timeline: dict[int, Counter] = field(default_factory=dict)
+
+    def record(self, outcome: str, offset: float, latency_ms: float | None = None, error: str | None = None) -> None:
+        """Record one finished request.
+
+        Args:
+            outcome: One of OUTCOMES
+            offset: Seconds since the run started when the request finished
+            latency_ms: Latency for answered requests
+            error: Error message for failed requests
+        """
+        self.outcomes[outcome] += 1
+        self.timeline.setdefault(int(offset), Counter())[outcome] += 1
+        if latency_ms is not None:
+            self.histogram.record(latency_ms)
+        if error is not None and (error in self.error_messages or len(self.error_messages) < MAX_ERROR_MESSAGES):
+            self.error_messages[error] += 1
+
+    @property
+    def completed(self) -> int:
+        """Requests that finished with any outcome."""
+        return sum(self.outcomes.values())
+
+    @property
+    def requests_per_second(self) -> float:
+        """Completed requests per second over the whole run."""
+        return self.completed / self.elapsed_time if self.elapsed_time > 0 else 0.0
+
+    def throughput(self) -> list[dict]:
+        """Per-second completions broken down by outcome, gaps filled with zeros."""
+        if not self.timeline:
+            return []
+        rows = []
+        for second in range(max(self.timeline) + 1):
+            counts = self.timeline.get(second, Counter())
+            rows.append({
+                "second": second,
+                "completed": sum(counts.values()),
+                **{outcome: counts.get(outcome, 0) for outcome in OUTCOMES},
+            })
+        return rows
+
+
+class AccessRequestLoadGenerator:
+    """Drives Access-Request load at a RADIUS server."""
+
+    def __init__(
+        self,
+        server_host: str,
+        server_port: int = 1812,
+        secret: str = "testing123",
+        timeout: float = 3.0,
+        nas_identifier: str = "radius-perf-test",
+    ):
+        """Initialize generator.
+
+        Args:
+            server_host: RADIUS server IP address
+            server_port: Authentication port
+            secret: Shared secret
+            timeout: Seconds before an unanswered request counts as a timeout
+            nas_identifier: NAS-Identifier sent with every request
+        """
+        self.server_host = server_host
+        self.server_port = server_port
+        self.secret = secret
+        self.timeout = timeout
+        self.nas_identifier = nas_identifier
+
+    def _attributes(self, user: dict) -> list[tuple[str, object]]:
+        return [
+            ("User-Name", user.get("username", "")),
+            ("User-Password", user.get("password", "")),
+            ("NAS-Identifier", self.nas_identifier),
+            ("NAS-Port-Type", "Wireless-802.11"),
+        ]
+
+    async def _one(
+        self,
+        client: RadiusUdpClient,
+        user: dict,
+        report: LoadTestReport,
+        run_started: float,
+        timed_from: float,
+    ) -> None:
+        try:
+            response = await client.send(
+                self.server_host, self.server_port, self.secret, ACCESS_REQUEST, self._attributes(user)
+            )
+        except RadiusTimeoutError:
+            report.record("timeout", time.perf_counter() - run_started)
+            return
+        except (RadiusPacketError, OSError, RuntimeError) as e:
+            report.record("error", time.perf_counter() - run_started, error=str(e))
+            return
+        finished = time.perf_counter()
+        outcome = _CODE_OUTCOMES.get(response.code)
+        if outcome is None:
+            report.record("error", finished - run_started, error=f"Unexpected response {response.code_name}")
+            return
+        report.record(outcome, finished - run_started, latency_ms=(finished - timed_from) * 1000)
+
+    async def run(
+        self,
+        users: list[dict],
+        mode: str = CLOSED_LOOP,
+        concurrency: int = 32,
+        rate: float | None = None,
+        total_requests: int | None = None,
+        duration: float | None = None,
+    ) -> LoadTestReport:
+        """Send Access-Requests until ``total_requests`` or ``duration`` is reached.
+
+        Users are cycled in order, so ``total_requests`` may exceed their number.
+
+        Args:
+            users: Dicts with 'username' and 'password' keys
+            mode: CLOSED_LOOP or OPEN_LOOP
+            concurrency: Workers (closed-loop) or maximum requests in flight (open-loop)
+            rate: Requests per second to offer (open-loop only)
+            total_requests: Stop after this many requests (default: one per user)
+            duration: Stop issuing new requests after this many seconds
+
+        Returns:
+            Report with latency histogram, outcome counts and per-second throughput
+
+        Raises:
+            ValueError: If the parameters don't describe a bounded run
+        """
+        if not users:
+            raise ValueError("At least one test user is required")
+        if mode not in (CLOSED_LOOP, OPEN_LOOP):
+            raise ValueError(f"Unknown load mode: {mode}")
+        if mode == OPEN_LOOP and not rate:
+            raise ValueError("Open-loop mode needs a target rate")
+        if total_requests is None and duration is None:
+            total_requests = len(users)
+        concurrency = max(1, concurrency)
+
+        socket_count = math.ceil(concurrency / REQUESTS_PER_SOCKET)
+        clients = [RadiusUdpClient(timeout=self.timeout, retries=0) for _ in range(socket_count)]
+        report = LoadTestReport(mode=mode)
+        started = time.perf_counter()
+        deadline = started + duration if duration else None
+        counter = itertools.count()
+
+        def next_request() -> int | None:
+            index = next(counter)
+            if total_requests is not None and index >= total_requests:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            return index
+
+        logger.info(
+            f"🚀 Load test ({mode}-loop) against {self.server_host}:{self.server_port}: "
+            f"concurrency={concurrency}, rate={rate}, requests={total_requests}, duration={duration}"
+        )
+        try:
+            if mode == CLOSED_LOOP:
+                async def worker() -> None:
+                    while (index := next_request()) is not None:
+                        report.sent += 1
+                        await self._one(
+                            clients[index % socket_count], users[index % len(users)],
+                            report, started, time.perf_counter(),
+                        )
+
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+            else:
+                in_flight = asyncio.Semaphore(concurrency)
+                tasks: set[asyncio.Task] = set()
+                interval = 1.0 / rate
+
+                async def scheduled(index: int, due: float) -> None:
+                    async with in_flight:
+                        await self._one(
+                            clients[index % socket_count], users[index % len(users)], report, started, due
+                        )
+
+                while (index := next_request()) is not None:
+                    due = started + index * interval
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        if deadline is not None and time.perf_counter() >= deadline:
+                            break
+                    report.sent += 1
+                    task = asyncio.create_task(scheduled(index, due))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if tasks:
+                    await asyncio.gather(*tasks)
+        finally:
+            for client in clients:
+                client.close()
+
+        report.elapsed_time = time.perf_counter() - started
+        summary = report.histogram.summary()
+        logger.info(
+            f"✅ Load test finished: {report.completed} requests in {report.elapsed_time:.2f}s "
+            f"({report.requests_per_second:.1f} req/s), p50={summary['p50_ms']}ms "
+            f"p99={summary['p99_ms']}ms, outcomes={dict(report.outcomes)}"
+        )
+        return report
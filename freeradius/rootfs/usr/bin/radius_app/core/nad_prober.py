@@ -0,0 +1,223 @@
+"""Non-blocking NAD reachability probes.
+
+Two probe styles run directly on the event loop:
+
+- ``tcp``: connect to the NAD's RADIUS port. An accepted or refused
+  connection both prove the host is up.
+- ``status-server``: send an RFC 5997 Status-Server request over UDP and
+  wait for an authenticated reply. Only useful for NADs that implement it
+  (RADIUS proxies, some controllers), but it checks the shared secret too.
+
+``NadProber`` bounds how many probes are in flight so a sweep over hundreds
+of NADs doesn't exhaust sockets.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import secrets
+import time
+from dataclasses import dataclass
+
+from radius_app.core.radius_packet import build_status_server, verify_response
+
+logger = logging.getLogger(__name__)
+
+RADIUS_AUTH_PORT = 1812
+DEFAULT_PROBE_TIMEOUT = 3.0
+
+
+@dataclass
+class ProbeTarget:
+    """What a probe needs to know about one NAD."""
+
+    client_id: int
+    ipaddr: str
+    secret: str = ""
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one probe."""
+
+    client_id: int
+    is_reachable: bool
+    latency_ms: float | None = None
+    error: str | None = None
+
+
+def normalize_probe_address(ip_addr: str) -> str | None:
+    """Strip CIDR notation and validate a NAD address.
+
+    Args:
+        ip_addr: IP address or network in CIDR notation
+
+    Returns:
+        Host address, or None if it isn't a valid IP
+    """
+    host = (ip_addr or "").split("/")[0].strip()
+    try:
+        return str(ipaddress.ip_address(host))
+    except ValueError:
+        return None
+
+
+async def probe_tcp(
+    ip_addr: str,
+    port: int = RADIUS_AUTH_PORT,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> tuple[bool, float | None]:
+    """Probe a NAD with a TCP connect.
+
+    Args:
+        ip_addr: NAD address (CIDR notation allowed)
+        port: Port to connect to
+        timeout: Seconds to wait for the connection
+
+    Returns:
+        Tuple of (is_reachable, latency_ms)
+    """
+    host = normalize_probe_address(ip_addr)
+    if host is None:
+        return False, None
+
+    started = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except ConnectionRefusedError:
+        # Refused means the host answered - it's alive without a TCP listener
+        return True, (time.perf_counter() - started) * 1000
+    except (asyncio.TimeoutError, OSError) as e:
+        logger.debug(f"TCP probe to {host}:{port} failed: {e!r}")
+        return False, None
+
+    latency_ms = (time.perf_counter() - started) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True, latency_ms
+
+
+class _StatusServerProtocol(asyncio.DatagramProtocol):
+    """Resolves a future with the first datagram that authenticates."""
+
+    def __init__(self, request: bytes, secret: str, future: asyncio.Future):
+        self.request = request
+        self.secret = secret
+        self.future = future
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        if not self.future.done() and verify_response(data, self.request, self.secret):
+            self.future.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+async def probe_status_server(
+    ip_addr: str,
+    secret: str,
+    port: int = RADIUS_AUTH_PORT,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> tuple[bool, float | None]:
+    """Probe a NAD with an RFC 5997 Status-Server request.
+
+    Args:
+        ip_addr: NAD address (CIDR notation allowed)
+        secret: Shared secret used to sign the request and check the reply
+        port: RADIUS port on the NAD
+        timeout: Seconds to wait for a reply
+
+    Returns:
+        Tuple of (is_reachable, latency_ms)
+    """
+    host = normalize_probe_address(ip_addr)
+    if host is None or not secret:
+        return False, None
+
+    loop = asyncio.get_running_loop()
+    request = build_status_server(secrets.randbelow(256), secret)
+    future = loop.create_future()
+    started = time.perf_counter()
+    transport = None
+    try:
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _StatusServerProtocol(request, secret, future),
+            remote_addr=(host, port),
+        )
+        transport.sendto(request)
+        await asyncio.wait_for(future, timeout)
+    except (asyncio.TimeoutError, OSError) as e:
+        logger.debug(f"Status-Server probe to {host}:{port} failed: {e!r}")
+        return False, None
+    finally:
+        if transport is not None:
+            transport.close()
+    return True, (time.perf_counter() - started) * 1000
+
+
+class NadProber:
+    """Runs NAD probes concurrently with a bound on in-flight probes."""
+
+    def __init__(
+        self,
+        mode: str = "tcp",
+        concurrency: int = 64,
+        timeout: float = DEFAULT_PROBE_TIMEOUT,
+        port: int = RADIUS_AUTH_PORT,
+    ):
+        """Initialize prober.
+
+        Args:
+            mode: "tcp" or "status-server"
+            concurrency: Maximum probes in flight
+            timeout: Per-probe timeout (seconds)
+            port: RADIUS port probed on each NAD
+        """
+        if mode not in ("tcp", "status-server"):
+            raise ValueError(f"Unknown probe mode: {mode}")
+        self.mode = mode
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.port = port
+
+    async def probe(self, target: ProbeTarget) -> ProbeResult:
+        """Probe one NAD.
+
+        Args:
+            target: NAD to probe
+
+        Returns:
+            Probe result (never raises)
+        """
+        try:
+            if self.mode == "status-server":
+                reachable, latency_ms = await probe_status_server(
+                    target.ipaddr, target.secret, self.port, self.timeout
+                )
+            else:
+                reachable, latency_ms = await probe_tcp(target.ipaddr, self.port, self.timeout)
+        except Exception as e:
+            logger.debug(f"Probe for NAD {target.client_id} failed: {e}")
+            return ProbeResult(target.client_id, False, None, str(e))
+        return ProbeResult(target.client_id, reachable, latency_ms)
+
+    async def probe_many(self, targets: list[ProbeTarget]) -> list[ProbeResult]:
+        """Probe many NADs concurrently.
+
+        Args:
+            targets: NADs to probe
+
+        Returns:
+            Results in the same order as ``targets``
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(target: ProbeTarget) -> ProbeResult:
+            async with semaphore:
+                return await self.probe(target)
+
+        return await asyncio.gather(*(bounded(target) for target in targets))
@@ -0,0 +1,145 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+OFFSET pagination makes the database walk and discard every row before the
+requested page, so page 2,000 of a 100k-row table is far slower than page 1.
+Keyset pagination instead remembers the sort key of the last row returned
+(``created_at``, ``id``) and asks for rows strictly after it, which is a
+single range scan on the matching composite index at any depth.
+
+Cursors are opaque, URL-safe tokens; clients pass ``next_cursor`` back
+unchanged. Counting every matching row is often the slowest part of a list
+request, so callers can ask for an exact count, a planner estimate
+(PostgreSQL) or no count at all.
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Literal
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CountMode = Literal["exact", "estimated", "none"]
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor can't be decoded."""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Build an opaque cursor for the row a page ended on.
+
+    Args:
+        created_at: Sort timestamp of the last row
+        row_id: Primary key of the last row
+
+    Returns:
+        URL-safe cursor token
+    """
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Cursor token
+
+    Returns:
+        (created_at, id) of the last row already returned
+
+    Raises:
+        InvalidCursor: If the token is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(row_id, int):
+            raise ValueError("cursor id must be an integer")
+        return datetime.fromisoformat(created_at), row_id
+    except (ValueError, TypeError, json.JSONDecodeError) as e:
+        raise InvalidCursor(f"Invalid pagination cursor: {e}") from e
+
+
+def order_newest_first(query: Select, created_col, id_col) -> Select:
+    """Sort newest first with the primary key as tie-breaker."""
+    return query.order_by(created_col.desc(), id_col.desc())
+
+
+def after_cursor(query: Select, created_col, id_col, cursor: str) -> Select:
+    """Restrict a newest-first query to rows after ``cursor``.
+
+    Args:
+        query: Query to restrict
+        created_col: Timestamp column the list is sorted by
+        id_col: Primary key column (tie-breaker)
+        cursor: Cursor from a previous page
+
+    Returns:
+        Query returning only rows that sort after the cursor
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return query.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+
+
+def fetch_page(db: Session, query: Select, page_size: int, cursor_of) -> tuple[list[Any], str | None]:
+    """Fetch one page plus a cursor for the next one.
+
+    Args:
+        db: Database session
+        query: Ordered (and, for later pages, cursor-restricted) query
+        page_size: Rows per page
+        cursor_of: Callable building the cursor for a row
+
+    Returns:
+        (rows, next cursor or None on the last page)
+    """
+    rows = db.execute(query.limit(page_size + 1)).scalars().all()
+    if len(rows) <= page_size:
+        return list(rows), None
+    rows = rows[:page_size]
+    return list(rows), cursor_of(rows[-1])
+
+
+def _estimate_postgres(db: Session, query: Select) -> int:
+    bind = db.get_bind()
+    compiled = query.compile(dialect=bind.dialect)
+    params = compiled.params
+    if compiled.positiontup is not None:
+        # asyncpg uses positional ($1) parameters
+        params = tuple(params[name] for name in compiled.positiontup)
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(db: Session, query: Select, mode: CountMode = "exact") -> int | None:
+    """Count the rows a (filtered, unpaginated) query returns.
+
+    Args:
+        db: Database session
+        query: Filtered query without ordering or limits
+        mode: "exact" (COUNT(*)), "estimated" (planner estimate on
+            PostgreSQL, exact elsewhere) or "none"
+
+    Returns:
+        Row count, or None for mode "none"
+    """
+    if mode == "none":
+        return None
+    if mode == "estimated" and db.get_bind().dialect.name == "postgresql":
+        try:
+            return _estimate_postgres(db, query)
+        except Exception as e:
+            logger.debug(f"Row estimate failed, counting exactly: {e}")
+    return db.execute(select(func.count()).select_from(query.order_by(None).subquery())).scalar()
+
@@ -0,0 +1,397 @@
+"""Compiled policy evaluation for what-if simulation.
+
+Compiles every active unlang policy (authorize section) and authorization
+profile into an ordered decision list with precompiled regexes and parsed
+time restrictions, so simulated requests can be evaluated in bulk without
+touching the database or recompiling patterns per request.
+
+Evaluation mirrors the generated configuration:
+
+1. Unlang policies in priority order (lower first, then id). ``reject``
+   stops immediately; the first ``accept`` or ``apply_profile`` wins.
+   ``continue`` and ``call_module`` fall through, as does an unmatched
+   condition without an else action. Conditions that need the live server
+   (``sql_lookup``, ``module_call``, ``custom``) can't be simulated; those
+   policies are skipped and reported.
+2. If no unlang policy decided, the first authorization profile (same
+   ordering) whose match patterns and time restrictions hold wins.
+
+Compiled sets are cached per engine and rebuilt when either table's row
+count, highest id or latest ``updated_at`` changes.
+"""
+
+import logging
+import re
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime, time, timezone
+from typing import Callable, Iterable, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from radius_app.db.models import RadiusPolicy, RadiusUnlangPolicy
+
+logger = logging.getLogger(__name__)
+
+ACCEPT = "accept"
+REJECT = "reject"
+APPLY_PROFILE = "apply_profile"
+NO_MATCH = "no_match"
+
+# Unlang condition types that depend on the running server
+UNSIMULATED_CONDITIONS = ("sql_lookup", "module_call", "custom")
+
+# Profile match fields: (model column, request attribute, checked when absent from request)
+PROFILE_MATCHERS = (
+    ("match_username", "User-Name", True),
+    ("match_mac_address", "Calling-Station-Id", False),
+    ("match_calling_station", "Calling-Station-Id", False),
+    ("match_nas_identifier", "NAS-Identifier", False),
+    ("match_nas_ip", "NAS-IP-Address", False),
+)
+
+# Compiled policy set per engine (tests use several in-memory engines)
+_cache: "weakref.WeakKeyDictionary[Engine, PolicySet]" = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class PolicyRequest:
+    """A simulated access request."""
+
+    username: str
+    mac_address: Optional[str] = None
+    nas_identifier: Optional[str] = None
+    nas_ip: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    additional_attributes: Optional[dict] = None
+
+    def attributes(self) -> dict[str, str]:
+        """RADIUS attributes carried by the request."""
+        attrs = {
+            "User-Name": self.username,
+            "Calling-Station-Id": self.mac_address,
+            "NAS-Identifier": self.nas_identifier,
+            "NAS-IP-Address": self.nas_ip,
+        }
+        attrs.update(self.additional_attributes or {})
+        return {name: str(value) for name, value in attrs.items() if value is not None}
+
+    def when(self) -> datetime:
+        """Request time as an aware datetime (now when not given)."""
+        if self.timestamp is None:
+            return datetime.now(timezone.utc)
+        if self.timestamp.tzinfo is None:
+            return self.timestamp.replace(tzinfo=timezone.utc)
+        return self.timestamp
+
+
+@dataclass
+class PolicyDecision:
+    """Outcome of evaluating one request."""
+
+    outcome: str
+    unlang_policy_id: Optional[int] = None
+    unlang_policy_name: Optional[str] = None
+    profile_id: Optional[int] = None
+    profile_name: Optional[str] = None
+    reply_attributes: list[dict] = field(default_factory=list)
+    reason: Optional[str] = None
+
+
+@dataclass
+class TimeWindow:
+    """Parsed time restriction."""
+
+    days: Optional[frozenset[int]]
+    start: Optional[time]
+    end: Optional[time]
+    tz: ZoneInfo
+
+    def allows(self, when: datetime) -> bool:
+        local = when.astimezone(self.tz)
+        if self.days is not None and local.weekday() not in self.days:
+            return False
+        now = local.time().replace(tzinfo=None)
+        if self.start and self.end and self.start > self.end:
+            # Window wraps past midnight, e.g. 22:00-06:00
+            return now >= self.start or now < self.end
+        if self.start and now < self.start:
+            return False
+        if self.end and now >= self.end:
+            return False
+        return True
+
+
+@dataclass
+class CompiledProfile:
+    """An authorization profile with precompiled match patterns."""
+
+    id: int
+    name: str
+    matchers: list[tuple[str, str, bool, re.Pattern]]
+    window: Optional[TimeWindow]
+    reply_attributes: list[dict]
+    error: Optional[str] = None
+
+    def mismatches(self, attrs: dict[str, str], when: datetime) -> list[str]:
+        """Reasons the request doesn't match; empty when it does."""
+        if self.error:
+            return [self.error]
+        reasons = []
+        for _column, attribute, required, pattern in self.matchers:
+            value = attrs.get(attribute)
+            if value is None:
+                if required:
+                    reasons.append(f"{attribute} is missing")
+                continue
+            if not pattern.match(value):
+                reasons.append(f"{attribute} '{value}' does not match pattern '{pattern.pattern}'")
+        if self.window and not self.window.allows(when):
+            reasons.append(f"Outside time restrictions at {when.isoformat()}")
+        return reasons
+
+    def matches(self, attrs: dict[str, str], when: datetime) -> bool:
+        if self.error:
+            return False
+        for _, attribute, required, pattern in self.matchers:
+            value = attrs.get(attribute)
+            if value is None:
+                if required:
+                    return False
+            elif not pattern.match(value):
+                return False
+        return self.window is None or self.window.allows(when)
+
+
+@dataclass
+class CompiledUnlangPolicy:
+    """An unlang policy reduced to a predicate and its actions."""
+
+    id: int
+    name: str
+    condition: Callable[[dict[str, str]], bool]
+    action: str
+    profile_id: Optional[int]
+    else_action: Optional[str]
+    else_profile_id: Optional[int]
+    reply_message: Optional[str]
+    reject_reason: Optional[str]
+    else_reply_message: Optional[str]
+
+
+def _compile_condition(attribute: str, operator: str, value: Optional[str]) -> Callable[[dict[str, str]], bool]:
+    """Predicate for one ``attribute operator value`` unlang condition."""
+    if operator == "exists":
+        return lambda attrs: bool(attrs.get(attribute))
+    if operator == "notexists":
+        return lambda attrs: not attrs.get(attribute)
+    if operator in ("=~", "!~"):
+        search = re.compile(value or "").search
+        if operator == "=~":
+            return lambda attrs: attribute in attrs and search(attrs[attribute]) is not None
+        return lambda attrs: attribute not in attrs or search(attrs[attribute]) is None
+    if operator == "==":
+        return lambda attrs: attrs.get(attribute) == value
+    if operator == "!=":
+        return lambda attrs: attrs.get(attribute) != value
+    raise ValueError(f"Unsupported operator '{operator}'")
+
+
+def _compile_unlang(policy: RadiusUnlangPolicy) -> Callable[[dict[str, str]], bool]:
+    """Combine the primary and additional conditions of an attribute policy."""
+    predicates = [
+        _compile_condition(policy.condition_attribute, policy.condition_operator, policy.condition_value)
+    ]
+    for cond in policy.additional_conditions or []:
+        predicates.append(
+            _compile_condition(cond["attribute"], cond.get("operator", "=="), cond.get("value"))
+        )
+    if len(predicates) == 1:
+        return predicates[0]
+    if (policy.condition_logic or "AND").upper() == "OR":
+        return lambda attrs: any(predicate(attrs) for predicate in predicates)
+    return lambda attrs: all(predicate(attrs) for predicate in predicates)
+
+
+def _parse_time(value) -> Optional[time]:
+    if value is None or isinstance(value, time):
+        return value
+    return time.fromisoformat(value)
+
+
+def _compile_window(restrictions: Optional[dict]) -> Optional[TimeWindow]:
+    if not restrictions:
+        return None
+    days = restrictions.get("days_of_week")
+    tz_name = restrictions.get("timezone") or "UTC"
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown timezone '{tz_name}'") from e
+    window = TimeWindow(
+        days=frozenset(days) if days else None,
+        start=_parse_time(restrictions.get("time_start")),
+        end=_parse_time(restrictions.get("time_end")),
+        tz=tz,
+    )
+    if window.days is None and window.start is None and window.end is None:
+        return None
+    return window
+
+
+def _compile_profile(profile: RadiusPolicy) -> CompiledProfile:
+    compiled = CompiledProfile(
+        id=profile.id,
+        name=profile.name,
+        matchers=[],
+        window=None,
+        reply_attributes=list(profile.reply_attributes or []),
+    )
+    try:
+        for column, attribute, required in PROFILE_MATCHERS:
+            pattern = getattr(profile, column)
+            if pattern:
+                compiled.matchers.append((column, attribute, required, re.compile(pattern)))
+        compiled.window = _compile_window(profile.time_restrictions)
+    except (re.error, ValueError, TypeError) as e:
+        compiled.error = f"Profile '{profile.name}' can't be compiled: {e}"
+        logger.warning(compiled.error)
+    return compiled
+
+
+class PolicySet:
+    """Ordered, precompiled unlang policies and authorization profiles."""
+
+    def __init__(self, version: tuple, unlang: Iterable[RadiusUnlangPolicy], profiles: Iterable[RadiusPolicy]):
+        self.version = version
+        self.errors: list[str] = []
+        self.unsimulated: list[str] = []
+        self.profiles = [_compile_profile(profile) for profile in profiles]
+        self.errors.extend(profile.error for profile in self.profiles if profile.error)
+        self._profiles_by_id = {profile.id: profile for profile in self.profiles}
+        self.unlang: list[CompiledUnlangPolicy] = []
+        for policy in unlang:
+            self._add_unlang(policy)
+
+    def _add_unlang(self, policy: RadiusUnlangPolicy) -> None:
+        if policy.condition_type in UNSIMULATED_CONDITIONS:
+            self.unsimulated.append(policy.name)
+            return
+        try:
+            condition = _compile_unlang(policy)
+        except (re.error, ValueError, KeyError, TypeError) as e:
+            self.errors.append(f"Unlang policy '{policy.name}' can't be compiled: {e}")
+            logger.warning(self.errors[-1])
+            return
+        self.unlang.append(CompiledUnlangPolicy(
+            id=policy.id,
+            name=policy.name,
+            condition=condition,
+            action=policy.action_type,
+            profile_id=policy.authorization_profile_id,
+            else_action=policy.else_action_type,
+            else_profile_id=policy.else_profile_id,
+            reply_message=policy.reply_message,
+            reject_reason=policy.reject_reason,
+            else_reply_message=policy.else_reply_message,
+        ))
+
+    def profile(self, profile_id: int) -> Optional[CompiledProfile]:
+        """Compiled active profile by id."""
+        return self._profiles_by_id.get(profile_id)
+
+    def _unlang_decision(self, policy: CompiledUnlangPolicy, action: str, profile_id: Optional[int],
+                         message: Optional[str]) -> PolicyDecision:
+        decision = PolicyDecision(
+            outcome=action,
+            unlang_policy_id=policy.id,
+            unlang_policy_name=policy.name,
+            reason=message,
+        )
+        if action == APPLY_PROFILE:
+            profile = self._profiles_by_id.get(profile_id)
+            if profile:
+                decision.profile_id = profile.id
+                decision.profile_name = profile.name
+                decision.reply_attributes = profile.reply_attributes
+        return decision
+
+    def evaluate(self, request: PolicyRequest) -> PolicyDecision:
+        """Decide which policy wins for a request."""
+        attrs = request.attributes()
+        when = request.when()
+
+        for policy in self.unlang:
+            if policy.condition(attrs):
+                if policy.action == REJECT:
+                    return self._unlang_decision(policy, REJECT, None, policy.reject_reason or "Access Denied")
+                if policy.action in (ACCEPT, APPLY_PROFILE):
+                    return self._unlang_decision(policy, policy.action, policy.profile_id, policy.reply_message)
+            elif policy.else_action == REJECT:
+                return self._unlang_decision(
+                    policy, REJECT, None, policy.else_reply_message or "Access Denied - Condition not met"
+                )
+            elif policy.else_action == APPLY_PROFILE:
+                return self._unlang_decision(policy, APPLY_PROFILE, policy.else_profile_id, policy.else_reply_message)
+
+        for profile in self.profiles:
+            if profile.matches(attrs, when):
+                return PolicyDecision(
+                    outcome=APPLY_PROFILE,
+                    profile_id=profile.id,
+                    profile_name=profile.name,
+                    reply_attributes=profile.reply_attributes,
+                    reason="All match conditions satisfied",
+                )
+
+        return PolicyDecision(outcome=NO_MATCH, reason="No policy matched")
+
+    def evaluate_batch(self, requests: Iterable[PolicyRequest]) -> list[PolicyDecision]:
+        """Evaluate many requests against the same compiled set."""
+        return [self.evaluate(request) for request in requests]
+
+
+def _policy_version(db: Session) -> tuple:
+    """Cheap fingerprint of both policy tables; changes on insert, update or delete."""
+    return tuple(
+        tuple(db.execute(
+            select(func.count(model.id), func.max(model.id), func.max(model.updated_at))
+        ).one())
+        for model in (RadiusUnlangPolicy, RadiusPolicy)
+    )
+
+
+def compile_policies(db: Session, version: Optional[tuple] = None) -> PolicySet:
+    """Load and compile all active policies."""
+    if version is None:
+        version = _policy_version(db)
+    unlang = db.execute(
+        select(RadiusUnlangPolicy)
+        .where(RadiusUnlangPolicy.is_active == True)  # noqa: E712
+        .where(RadiusUnlangPolicy.section == "authorize")
+        .order_by(RadiusUnlangPolicy.priority, RadiusUnlangPolicy.id)
+    ).scalars().all()
+    profiles = db.execute(
+        select(RadiusPolicy)
+        .where(RadiusPolicy.is_active == True)  # noqa: E712
+        .order_by(RadiusPolicy.priority, RadiusPolicy.id)
+    ).scalars().all()
+    return PolicySet(version, unlang, profiles)
+
+
+def get_policy_set(db: Session) -> PolicySet:
+    """Compiled policies for the session's engine, recompiled only after changes."""
+    engine = db.get_bind()
+    cached = _cache.get(engine)
+    version = _policy_version(db)
+    if cached is not None and cached.version == version:
+        return cached
+    policy_set = compile_policies(db, version)
+    _cache[engine] = policy_set
+    logger.debug(
+        f"Compiled {len(policy_set.unlang)} unlang policies and {len(policy_set.profiles)} profiles"
+    )
+    return policy_set
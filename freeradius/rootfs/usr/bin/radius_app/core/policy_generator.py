@@ -55,8 +55,8 @@ class PolicyGenerator:
         Returns:
             Formatted check item string
         """
-        # Handle regex operator
-        if operator == "=~":
+        # Handle regex operator and values that can't be bare words
+        if operator == "=~" or not value or any(c.isspace() for c in value):
             return f'{attribute} {operator} "{value}"'
         return f'{attribute} {operator} {value}'
     
@@ -327,6 +327,9 @@ class PolicyGenerator:
         for policy in policies:
             check_items = self._build_check_items(policy)
             reply_items = self._build_reply_items(policy, db)
+            # Comments can't sit between comma-separated reply items
+            reply_comments = [item.strip() for item in reply_items if item.lstrip().startswith("#")]
+            reply_items = [item for item in reply_items if not item.lstrip().startswith("#")]
             policies_data.append({
                 "name": policy.name,
                 "priority": policy.priority,
@@ -336,6 +339,7 @@ class PolicyGenerator:
                 "include_udn": policy.include_udn,
                 "check_items": check_items,
                 "reply_items": reply_items,
+                "reply_comments": reply_comments,
             })
         
         # Build template context
@@ -394,6 +398,8 @@ class PolicyGenerator:
         
         for policy in policies_data:
             policy_file += f"# Policy: {policy['name']} (Priority: {policy['priority']})\n"
+            for comment in policy.get("reply_comments", []):
+                policy_file += f"{comment}\n"
             
             if policy["check_items"]:
                 check_line = "DEFAULT " + ", ".join(policy["check_items"])
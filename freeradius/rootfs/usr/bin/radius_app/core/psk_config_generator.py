@@ -15,7 +15,8 @@ from typing import Optional
 from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 
-from radius_app.config import get_settings
+from radius_app.config import get_settings, get_users_shard_count
+from radius_app.db.database import get_portal_engine
 from radius_app.db.models import UdnAssignment
 
 logger = logging.getLogger(__name__)
@@ -29,6 +30,9 @@ class PskConfigGenerator:
         self.settings = get_settings()
         self.config_path = Path(self.settings.radius_config_path)
         
+        # Timings of the last sharded MAC bypass write, keyed by shard name
+        self.last_shard_timings: dict[str, float] = {}
+        
         # Ensure directory exists
         self.config_path.mkdir(parents=True, exist_ok=True)
         logger.info(f"PSK config generator initialized: {self.config_path}")
@@ -84,9 +88,7 @@ class PskConfigGenerator:
         try:
             # Try to query portal database directly if URL provided
             if portal_db_url:
-                from sqlalchemy import create_engine
-                portal_engine = create_engine(portal_db_url)
-                with portal_engine.connect() as portal_conn:
+                with get_portal_engine(portal_db_url).connect() as portal_conn:
                     # Query users with PSK
                     result = portal_conn.execute(text("""
                         SELECT 
@@ -144,16 +146,18 @@ class PskConfigGenerator:
                         username = ipsk_id or email
                         
                         users_file += f'"{username}" Cleartext-Password := "{passphrase}"\n'
-                        users_file += "    Auth-Type := Accept\n"
+                        reply_items = ["Auth-Type := Accept"]
                         
                         # Add UDN ID if available
                         if udn_assignment:
-                            users_file += f'    Cisco-AVPair := "udn:private-group-id={udn_assignment.udn_id}"\n'
+                            reply_items.append(f'Cisco-AVPair := "udn:private-group-id={udn_assignment.udn_id}"')
                         
                         # Add SSID name if available
                         if ssid_name:
-                            users_file += f'    Reply-Message := "SSID: {ssid_name}"\n'
+                            reply_items.append(f'Reply-Message := "SSID: {ssid_name}"')
                         
+                        # Reply items are comma-separated; the last has no comma
+                        users_file += ",\n".join(f"    {item}" for item in reply_items) + "\n"
                         users_file += "\n"
             
             else:
@@ -194,7 +198,7 @@ class PskConfigGenerator:
         if generic_psk:
             users_file += "# Generic PSK (allows all MAC addresses)\n"
             users_file += f'"generic-psk" Cleartext-Password := "{generic_psk}"\n'
-            users_file += "    Auth-Type := Accept\n"
+            users_file += "    Auth-Type := Accept,\n"
             users_file += '    Reply-Message := "Generic PSK Access"\n'
             users_file += "\n"
         
@@ -222,6 +226,26 @@ class PskConfigGenerator:
         )
         bypass_configs = db.execute(stmt).scalars().all()
         
+        output_path = self.config_path / "users-mac-bypass"
+        shard_count = get_users_shard_count()
+        if shard_count > 0:
+            from radius_app.core.users_shards import write_sharded_users_file
+            
+            # One entry per MAC so each lands in its own hash shard
+            entries = [
+                (mac, self._render_mac_bypass_entry(config, mac))
+                for config in bypass_configs
+                for mac in config.mac_addresses or []
+            ]
+            self.last_shard_timings = write_sharded_users_file(
+                output_path,
+                entries,
+                shard_count,
+                title="Auto-generated MAC bypass configuration",
+            )
+            logger.info(f"✅ Generated sharded MAC bypass file: {output_path}")
+            return output_path
+        
         bypass_file = "# Auto-generated MAC bypass configuration\n"
         bypass_file += f"# Timestamp: {datetime.now(UTC).isoformat()}\n"
         bypass_file += f"# Total bypass configs: {len(bypass_configs)}\n"
@@ -241,8 +265,26 @@ class PskConfigGenerator:
         
         # Validate and write safely - prevents invalid configs
         from radius_app.core.config_validator import safe_write_config_file
-        output_path = self.config_path / "users-mac-bypass"
+        from radius_app.core.users_shards import remove_shards
         safe_write_config_file(output_path, bypass_file, file_type="users")
+        remove_shards(output_path)
         
         logger.info(f"✅ Generated MAC bypass file: {output_path}")
         return output_path
+    
+    @staticmethod
+    def _render_mac_bypass_entry(config, mac: str) -> str:
+        """Render the users-format entry for one bypassed MAC address.
+        
+        Args:
+            config: MAC bypass configuration the MAC belongs to
+            mac: MAC address
+            
+        Returns:
+            Users file fragment, including its comment and trailing blank line
+        """
+        entry = f"# Bypass Config: {config.name} (Mode: {config.bypass_mode})\n"
+        entry += f'"{mac}" Auth-Type := Accept\n'
+        entry += f'    Reply-Message := "MAC Bypass: {config.name}"\n'
+        entry += "\n"
+        return entry
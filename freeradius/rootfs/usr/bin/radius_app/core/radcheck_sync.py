@@ -0,0 +1,285 @@
+"""Set-based sync of portal PSK users into radcheck/radreply.
+
+Instead of deleting and re-inserting every user's rows, a sync loads the
+desired ``(username, attribute, op, value)`` rows and the current table
+contents in bulk, diffs them, and applies only the changes (executemany
+INSERT/UPDATE plus one DELETE per table) in a single transaction.
+
+Only usernames owned by portal users are touched, so rows added to
+radcheck/radreply by hand or by other tools are left alone. Deactivated
+users, or users whose PSK was removed, lose their rows on the next sync.
+
+Passing ``since`` restricts a sync to portal users updated after that time
+(plus users whose local UDN assignment changed), so periodic syncs cost
+O(changes) rather than O(users). The returned cursor is the newest
+``updated_at`` the sync saw, not the local clock, and the next sync reads a
+little behind it so rows committed late with an older timestamp are kept.
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import DateTime, bindparam, column, delete, insert, select, table, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from radius_app.db.models import UdnAssignment
+
+logger = logging.getLogger(__name__)
+
+# (username, attribute, op, value)
+Row = tuple[str, str, str, str]
+
+# Keep IN lists well under SQLite's bound-parameter limit
+CHUNK_SIZE = 500
+
+# Re-read this far behind the cursor so rows committed late with an older
+# updated_at aren't skipped; re-syncing an unchanged user is a no-op
+CURSOR_LOOKBACK = timedelta(seconds=5)
+
+radcheck = table(
+    "radcheck", column("id"), column("username"), column("attribute"), column("op"), column("value")
+)
+radreply = table(
+    "radreply", column("id"), column("username"), column("attribute"), column("op"), column("value")
+)
+
+
+@dataclass
+class RowDiff:
+    """Changes needed to turn a table's current rows into the desired ones."""
+
+    inserts: list[Row] = field(default_factory=list)
+    updates: list[tuple[int, str, str]] = field(default_factory=list)  # (id, op, value)
+    deletes: list[int] = field(default_factory=list)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _chunks(items: list, size: int = CHUNK_SIZE) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def diff_rows(current: Iterable[tuple[int, str, str, str, str]], desired: Iterable[Row]) -> RowDiff:
+    """Diff current table rows against the desired rows.
+
+    Rows that only differ in op/value for the same (username, attribute) are
+    updated in place rather than deleted and re-inserted. Duplicate rows are
+    reduced to the desired multiplicity.
+
+    Args:
+        current: (id, username, attribute, op, value) rows now in the table
+        desired: (username, attribute, op, value) rows that should exist
+
+    Returns:
+        RowDiff to apply
+    """
+    wanted = Counter(desired)
+    stale: list[tuple[int, Row]] = []
+    for row_id, *values in current:
+        row = tuple(values)
+        if wanted[row] > 0:
+            wanted[row] -= 1
+        else:
+            stale.append((row_id, row))
+
+    missing = list(wanted.elements())
+    diff = RowDiff()
+    reusable: dict[tuple[str, str], list[int]] = {}
+    for row_id, (username, attribute, _, _) in stale:
+        reusable.setdefault((username, attribute), []).append(row_id)
+    for username, attribute, op, value in missing:
+        ids = reusable.get((username, attribute))
+        if ids:
+            diff.updates.append((ids.pop(), op, value))
+        else:
+            diff.inserts.append((username, attribute, op, value))
+    diff.deletes = [row_id for ids in reusable.values() for row_id in ids]
+    return diff
+
+
+def _load_current(db: Session, tbl, usernames: set[str], full: bool) -> list[tuple]:
+    columns = (tbl.c.id, tbl.c.username, tbl.c.attribute, tbl.c.op, tbl.c.value)
+    if full:
+        # One scan beats thousands of IN lookups; keep only managed usernames
+        return [row for row in db.execute(select(*columns)) if row[1] in usernames]
+    rows = []
+    for chunk in _chunks(sorted(usernames)):
+        rows.extend(db.execute(select(*columns).where(tbl.c.username.in_(chunk))).tuples())
+    return rows
+
+
+def _load_udn_ids(db: Session, user_ids: list[int], full: bool) -> dict[int, int]:
+    query = select(UdnAssignment.user_id, UdnAssignment.udn_id).where(
+        UdnAssignment.is_active == True  # noqa: E712
+    )
+    if full:
+        return dict(db.execute(query).tuples().all())
+    udn_ids = {}
+    for chunk in _chunks(user_ids):
+        udn_ids.update(db.execute(query.where(UdnAssignment.user_id.in_(chunk))).tuples().all())
+    return udn_ids
+
+
+def _apply(db: Session, tbl, diff: RowDiff) -> None:
+    if diff.deletes:
+        for chunk in _chunks(diff.deletes):
+            db.execute(delete(tbl).where(tbl.c.id.in_(chunk)))
+    if diff.updates:
+        db.execute(
+            update(tbl)
+            .where(tbl.c.id == bindparam("row_id"))
+            .values(op=bindparam("new_op"), value=bindparam("new_value")),
+            [{"row_id": row_id, "new_op": op, "new_value": value} for row_id, op, value in diff.updates],
+        )
+    if diff.inserts:
+        db.execute(
+            insert(tbl),
+            [
+                {"username": username, "attribute": attribute, "op": op, "value": value}
+                for username, attribute, op, value in diff.inserts
+            ],
+        )
+
+
+def _fetch_portal_users(
+    portal_conn: Connection, since: Optional[datetime], extra_user_ids: set[int]
+) -> list:
+    query = """
+        SELECT
+            id,
+            email,
+            ipsk_id,
+            ipsk_passphrase_encrypted,
+            ssid_name,
+            is_active,
+            updated_at
+        FROM users
+    """
+    if since is None:
+        stmt = text(query + " ORDER BY email")
+        params = {}
+    elif extra_user_ids:
+        stmt = text(query + " WHERE updated_at > :since OR id IN :user_ids ORDER BY email").bindparams(
+            bindparam("user_ids", expanding=True)
+        )
+        params = {"since": since, "user_ids": sorted(extra_user_ids)}
+    else:
+        stmt = text(query + " WHERE updated_at > :since ORDER BY email")
+        params = {"since": since}
+    return portal_conn.execute(stmt.columns(updated_at=DateTime), params).fetchall()
+
+
+def sync_psk_users(
+    db: Session,
+    portal_conn: Connection,
+    decrypt: Callable[[str], Optional[str]],
+    since: Optional[datetime] = None,
+) -> dict:
+    """Sync portal PSK users into radcheck/radreply.
+
+    Args:
+        db: FreeRADIUS database session (radcheck/radreply must exist)
+        portal_conn: Connection to the portal database
+        decrypt: Returns the cleartext passphrase, or None if it can't
+        since: Only sync users changed after this time (full sync if None)
+
+    Returns:
+        Sync statistics, including ``cursor`` to pass as ``since`` next time
+        (the newest ``updated_at`` seen; unchanged if nothing was)
+    """
+    full = since is None
+    stats = {
+        "users_synced": 0,
+        "radcheck_entries": 0,
+        "radreply_entries": 0,
+        "inserted": 0,
+        "updated": 0,
+        "deleted": 0,
+        "errors": [],
+        "cursor": since.isoformat() if since else None,
+    }
+
+    # Users whose UDN changed locally need their reply rows refreshed too
+    udn_changed: dict[int, datetime] = {}
+    read_from = None
+    if not full:
+        read_from = since - CURSOR_LOOKBACK
+        udn_changed = dict(db.execute(
+            select(UdnAssignment.user_id, UdnAssignment.updated_at)
+            .where(UdnAssignment.updated_at > read_from)
+        ).tuples().all())
+
+    users = _fetch_portal_users(portal_conn, read_from, set(udn_changed))
+    if not users:
+        return stats
+
+    udn_by_user = _load_udn_ids(db, [user.id for user in users], full)
+
+    managed: set[str] = set()
+    skipped: set[str] = set()
+    check_rows: list[Row] = []
+    reply_rows: list[Row] = []
+    for user in users:
+        username = user.ipsk_id or user.email
+        # An ipsk_id replaces email as username; clear rows left under either
+        managed.update(name for name in (user.ipsk_id, user.email) if name)
+
+        if not user.is_active or not user.ipsk_passphrase_encrypted:
+            continue
+        passphrase = decrypt(user.ipsk_passphrase_encrypted)
+        if not passphrase:
+            logger.warning(f"Could not decrypt passphrase for user {user.email}")
+            stats["errors"].append(f"User {user.email}: Could not decrypt passphrase")
+            # Leave whatever is there now rather than locking the user out
+            skipped.add(username)
+            continue
+
+        # Per FreeRADIUS SQL docs: operator := means "always matches and replaces"
+        check_rows.append((username, "Cleartext-Password", ":=", passphrase))
+        udn_id = udn_by_user.get(user.id)
+        if udn_id is not None:
+            reply_rows.append((username, "Cisco-AVPair", ":=", f"udn:private-group-id={udn_id}"))
+        if user.ssid_name:
+            reply_rows.append((username, "Reply-Message", ":=", f"SSID: {user.ssid_name}"))
+        stats["users_synced"] += 1
+
+    managed -= skipped
+    check_rows = [row for row in check_rows if row[0] in managed]
+    reply_rows = [row for row in reply_rows if row[0] in managed]
+    stats["radcheck_entries"] = len(check_rows)
+    stats["radreply_entries"] = len(reply_rows)
+
+    try:
+        for tbl, desired in ((radcheck, check_rows), (radreply, reply_rows)):
+            diff = diff_rows(_load_current(db, tbl, managed, full), desired)
+            _apply(db, tbl, diff)
+            stats["inserted"] += len(diff.inserts)
+            stats["updated"] += len(diff.updates)
+            stats["deleted"] += len(diff.deletes)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    # Only advance once the rows are committed
+    seen = [
+        _as_utc(updated_at)
+        for updated_at in (*udn_changed.values(), *(user.updated_at for user in users))
+        if updated_at is not None
+    ]
+    if seen and (since is None or max(seen) > _as_utc(since)):
+        stats["cursor"] = max(seen).isoformat()
+
+    logger.info(
+        f"✅ Synced {stats['users_synced']} users to radcheck/radreply "
+        f"(+{stats['inserted']} ~{stats['updated']} -{stats['deleted']})"
+    )
+    return stats
@@ -0,0 +1,235 @@
+"""Asyncio RADIUS client for CoA, Disconnect and Access requests.
+
+One UDP socket per address family is shared by all requests. Requests are
+matched to responses by (NAD address, port, identifier), so hundreds of
+concurrent requests to many NADs need neither a process nor a socket each.
+Unanswered requests are retransmitted unchanged (same identifier and
+authenticator, as RFC 5176 requires) until the retry budget runs out.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import time
+from dataclasses import dataclass, field
+
+from radius_app.core.radius_packet import (
+    ACCESS_REQUEST,
+    CODE_NAMES,
+    ERROR_CAUSES,
+    HEADER_LENGTH,
+    RadiusPacketError,
+    build_access_request,
+    build_request,
+    decode_named_attributes,
+    parse_header,
+    verify_response,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 3.0
+DEFAULT_RETRIES = 2
+
+# Identifiers are 8 bits, so at most 256 requests can be outstanding per NAD
+MAX_IN_FLIGHT_PER_DESTINATION = 256
+
+
+@dataclass
+class RadiusResponse:
+    """Decoded reply to a request."""
+
+    code: int
+    attributes: list[tuple[str, object]] = field(default_factory=list)
+    attempts: int = 1
+    latency_ms: float = 0.0
+
+    @property
+    def code_name(self) -> str:
+        """Packet type name (e.g. "Disconnect-ACK")."""
+        return CODE_NAMES.get(self.code, f"Code-{self.code}")
+
+    @property
+    def error_cause(self) -> int | None:
+        """RFC 5176 Error-Cause from a NAK, if present."""
+        for name, value in self.attributes:
+            if name == "Error-Cause":
+                return value
+        return None
+
+
+class RadiusTimeoutError(Exception):
+    """Raised when a NAD doesn't answer within the retry budget."""
+
+
+@dataclass
+class _Pending:
+    request: bytes
+    secret: str
+    future: asyncio.Future
+
+
+class _ClientProtocol(asyncio.DatagramProtocol):
+    """Routes datagrams to the request waiting for them."""
+
+    def __init__(self, client: "RadiusUdpClient"):
+        self.client = client
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.client._on_datagram(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP errors aren't tied to a request; the retransmit timer handles them
+        logger.debug(f"RADIUS client socket error: {exc!r}")
+
+
+class RadiusUdpClient:
+    """Sends RADIUS requests over shared asyncio UDP endpoints."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES):
+        """Initialize client.
+
+        Args:
+            timeout: Seconds to wait for a reply before retransmitting
+            retries: Retransmissions after the first attempt
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._transports: dict[int, asyncio.DatagramTransport] = {}
+        self._pending: dict[tuple[str, int, int], _Pending] = {}
+        self._next_id: dict[tuple[str, int], int] = {}
+        self._slots: dict[tuple[str, int], asyncio.Semaphore] = {}
+
+    async def _transport(self, family_version: int) -> asyncio.DatagramTransport:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self.close()
+            self._loop = loop
+        transport = self._transports.get(family_version)
+        if transport is None or transport.is_closing():
+            local = ("0.0.0.0", 0) if family_version == 4 else ("::", 0)
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _ClientProtocol(self), local_addr=local
+            )
+            self._transports[family_version] = transport
+        return transport
+
+    def _allocate_id(self, destination: tuple[str, int]) -> int:
+        start = self._next_id.get(destination, 0)
+        for offset in range(256):
+            identifier = (start + offset) % 256
+            if (*destination, identifier) not in self._pending:
+                self._next_id[destination] = (identifier + 1) % 256
+                return identifier
+        raise RuntimeError(f"No free RADIUS identifiers for {destination}")
+
+    def _on_datagram(self, data: bytes, addr) -> None:
+        try:
+            _, identifier, _, _ = parse_header(data)
+        except RadiusPacketError as e:
+            logger.debug(f"Ignoring malformed RADIUS packet from {addr}: {e}")
+            return
+        host = str(ipaddress.ip_address(addr[0].split("%")[0]))
+        pending = self._pending.get((host, addr[1], identifier))
+        if pending is None or pending.future.done():
+            return
+        if not verify_response(data, pending.request, pending.secret):
+            logger.warning(f"Ignoring RADIUS response from {host} with invalid authenticator")
+            return
+        pending.future.set_result(data)
+
+    async def send(
+        self,
+        host: str,
+        port: int,
+        secret: str,
+        code: int,
+        attributes: list[tuple[str, object]],
+    ) -> RadiusResponse:
+        """Send a request and wait for the authenticated reply.
+
+        Args:
+            host: NAD IP address
+            port: NAD CoA port (typically 3799) or server auth port
+            secret: Shared secret
+            code: Request code (e.g. DISCONNECT_REQUEST or ACCESS_REQUEST)
+            attributes: (name, value) pairs
+
+        Returns:
+            Decoded response
+
+        Raises:
+            RadiusPacketError: If the request can't be encoded
+            RadiusTimeoutError: If no valid reply arrives
+            ValueError: If ``host`` isn't an IP address
+        """
+        address = ipaddress.ip_address(host)
+        host = str(address)
+        transport = await self._transport(address.version)
+        destination = (host, port)
+        slots = self._slots.setdefault(destination, asyncio.Semaphore(MAX_IN_FLIGHT_PER_DESTINATION))
+
+        async with slots:
+            identifier = self._allocate_id(destination)
+            if code == ACCESS_REQUEST:
+                request = build_access_request(identifier, secret, attributes)
+            else:
+                request = build_request(code, identifier, secret, attributes)
+            key = (*destination, identifier)
+            future = self._loop.create_future()
+            self._pending[key] = _Pending(request, secret, future)
+            started = time.perf_counter()
+            try:
+                for attempt in range(1, self.retries + 2):
+                    transport.sendto(request, destination)
+                    try:
+                        data = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+                    except asyncio.TimeoutError:
+                        continue
+                    code, _, length, _ = parse_header(data)
+                    return RadiusResponse(
+                        code=code,
+                        attributes=decode_named_attributes(data[HEADER_LENGTH:length]),
+                        attempts=attempt,
+                        latency_ms=(time.perf_counter() - started) * 1000,
+                    )
+            finally:
+                # close() may already have cleared it
+                self._pending.pop(key, None)
+                if not future.done():
+                    future.cancel()
+
+        raise RadiusTimeoutError(
+            f"No response from {host}:{port} after {self.retries + 1} attempts"
+        )
+
+    def close(self) -> None:
+        """Close the shared sockets and fail outstanding requests."""
+        for transport in self._transports.values():
+            transport.close()
+        self._transports.clear()
+        for pending in self._pending.values():
+            if not pending.future.done():
+                pending.future.cancel()
+        self._pending.clear()
+        self._slots.clear()
+
+
+def describe_response(response: RadiusResponse) -> str:
+    """Format a response for logs and API errors (e.g. NAK with Error-Cause)."""
+    cause = response.error_cause
+    if cause is None:
+        return response.code_name
+    return f"{response.code_name} (Error-Cause {cause}: {ERROR_CAUSES.get(cause, 'unknown')})"
+
+
+_client: RadiusUdpClient | None = None
+
+
+def get_radius_client() -> RadiusUdpClient:
+    """Get the process-wide RADIUS client."""
+    global _client
+    if _client is None:
+        _client = RadiusUdpClient()
+    return _client
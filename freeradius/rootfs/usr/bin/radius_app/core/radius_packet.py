@@ -0,0 +1,528 @@
+"""Minimal RADIUS packet encoding for the probes and requests we send.
+
+Implements just enough of RFC 2865 (packet format, Access-Request and
+User-Password hiding, Response Authenticator),
+RFC 3579 (Message-Authenticator), RFC 5176 (CoA/Disconnect) and RFC 5997
+(Status-Server) to talk to NADs directly from the event loop without
+shelling out to radclient.
+
+Attributes are looked up by name in a small built-in dictionary covering
+the identification and authorization attributes we send, plus the
+Cisco/Aruba/Meraki vendor-specific attributes used for policy changes.
+"""
+
+import hashlib
+import hmac
+import ipaddress
+import os
+import struct
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Packet codes
+ACCESS_REQUEST = 1
+ACCESS_ACCEPT = 2
+ACCESS_REJECT = 3
+ACCOUNTING_RESPONSE = 5
+ACCESS_CHALLENGE = 11
+STATUS_SERVER = 12
+DISCONNECT_REQUEST = 40
+DISCONNECT_ACK = 41
+DISCONNECT_NAK = 42
+COA_REQUEST = 43
+COA_ACK = 44
+COA_NAK = 45
+
+CODE_NAMES = {
+    ACCESS_REQUEST: "Access-Request",
+    ACCESS_ACCEPT: "Access-Accept",
+    ACCESS_REJECT: "Access-Reject",
+    ACCOUNTING_RESPONSE: "Accounting-Response",
+    ACCESS_CHALLENGE: "Access-Challenge",
+    STATUS_SERVER: "Status-Server",
+    DISCONNECT_REQUEST: "Disconnect-Request",
+    DISCONNECT_ACK: "Disconnect-ACK",
+    DISCONNECT_NAK: "Disconnect-NAK",
+    COA_REQUEST: "CoA-Request",
+    COA_ACK: "CoA-ACK",
+    COA_NAK: "CoA-NAK",
+}
+
+# Attribute types
+ATTR_USER_NAME = 1
+ATTR_USER_PASSWORD = 2
+ATTR_VENDOR_SPECIFIC = 26
+ATTR_NAS_IDENTIFIER = 32
+ATTR_MESSAGE_AUTHENTICATOR = 80
+ATTR_ERROR_CAUSE = 101
+
+HEADER_LENGTH = 20
+AUTHENTICATOR_LENGTH = 16
+MAX_PACKET_LENGTH = 4096
+MAX_ATTRIBUTE_LENGTH = 253
+
+_HEADER = struct.Struct("!BBH16s")
+
+
+class RadiusPacketError(ValueError):
+    """Raised for malformed RADIUS packets or attributes."""
+
+
+@dataclass(frozen=True)
+class AttributeDef:
+    """Dictionary entry for one attribute."""
+
+    name: str
+    type: int
+    data_type: str  # string, octets, integer, ipaddr, date
+    vendor: int = 0
+    tagged: bool = False
+    values: tuple[tuple[str, int], ...] = ()
+
+
+VENDOR_CISCO = 9
+VENDOR_AIRESPACE = 14179
+VENDOR_ARUBA = 14823
+VENDOR_MERAKI = 29671
+
+ATTRIBUTES = {
+    definition.name.lower(): definition
+    for definition in (
+        AttributeDef("User-Name", 1, "string"),
+        AttributeDef("NAS-IP-Address", 4, "ipaddr"),
+        AttributeDef("NAS-Port", 5, "integer"),
+        AttributeDef("Framed-IP-Address", 8, "ipaddr"),
+        AttributeDef("Filter-Id", 11, "string"),
+        AttributeDef("Reply-Message", 18, "string"),
+        AttributeDef("State", 24, "octets"),
+        AttributeDef("Class", 25, "octets"),
+        AttributeDef("Session-Timeout", 27, "integer"),
+        AttributeDef("Idle-Timeout", 28, "integer"),
+        AttributeDef("Called-Station-Id", 30, "string"),
+        AttributeDef("Calling-Station-Id", 31, "string"),
+        AttributeDef("NAS-Identifier", 32, "string"),
+        AttributeDef("Acct-Session-Id", 44, "string"),
+        AttributeDef("Acct-Multi-Session-Id", 50, "string"),
+        AttributeDef("Event-Timestamp", 55, "date"),
+        AttributeDef("Tunnel-Type", 64, "integer", tagged=True, values=(("VLAN", 13),)),
+        AttributeDef("Tunnel-Medium-Type", 65, "integer", tagged=True, values=(("IEEE-802", 6),)),
+        AttributeDef("Tunnel-Private-Group-Id", 81, "string", tagged=True),
+        AttributeDef("NAS-Port-Type", 61, "integer", values=(("Virtual", 5), ("Wireless-802.11", 19))),
+        AttributeDef("NAS-Port-Id", 87, "string"),
+        AttributeDef("Error-Cause", 101, "integer"),
+        AttributeDef("Cisco-AVPair", 1, "string", vendor=VENDOR_CISCO),
+        AttributeDef("Airespace-ACL-Name", 6, "string", vendor=VENDOR_AIRESPACE),
+        AttributeDef("Aruba-User-Role", 1, "string", vendor=VENDOR_ARUBA),
+        AttributeDef("Aruba-User-Vlan", 2, "integer", vendor=VENDOR_ARUBA),
+        AttributeDef("Meraki-Device-Name", 1, "string", vendor=VENDOR_MERAKI),
+    )
+}
+
+_ATTRIBUTES_BY_CODE = {
+    (definition.vendor, definition.type): definition for definition in ATTRIBUTES.values()
+}
+
+# RFC 5176 Error-Cause values
+ERROR_CAUSES = {
+    201: "Residual Session Context Removed",
+    202: "Invalid EAP Packet (Ignored)",
+    401: "Unsupported Attribute",
+    402: "Missing Attribute",
+    403: "NAS Identification Mismatch",
+    404: "Invalid Request",
+    405: "Unsupported Service",
+    406: "Unsupported Extension",
+    407: "Invalid Attribute Value",
+    501: "Administratively Prohibited",
+    502: "Request Not Routable (Proxy)",
+    503: "Session Context Not Found",
+    504: "Session Context Not Removable",
+    505: "Other Proxy Processing Error",
+    506: "Resources Unavailable",
+    507: "Request Initiated",
+    508: "Multiple Session Selection Unsupported",
+}
+
+
+def encode_attribute(attr_type: int, value: bytes | str) -> bytes:
+    """Encode one attribute as type-length-value.
+
+    Args:
+        attr_type: Attribute type number
+        value: Raw value (strings are UTF-8 encoded)
+
+    Returns:
+        Encoded attribute
+
+    Raises:
+        RadiusPacketError: If the value is longer than 253 bytes
+    """
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    if len(value) > MAX_ATTRIBUTE_LENGTH:
+        raise RadiusPacketError(f"attribute {attr_type} value too long ({len(value)} bytes)")
+    return struct.pack("!BB", attr_type, len(value) + 2) + value
+
+
+def _encode_value(definition: AttributeDef, value) -> bytes:
+    """Encode a Python value according to the attribute's data type."""
+    data_type = definition.data_type
+    if data_type == "integer":
+        if isinstance(value, str):
+            named = dict((n.lower(), v) for n, v in definition.values)
+            if value.lower() in named:
+                value = named[value.lower()]
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise RadiusPacketError(f"{definition.name} needs an integer, got {value!r}") from None
+        if not 0 <= number <= 0xFFFFFFFF:
+            raise RadiusPacketError(f"{definition.name} value {number} out of range")
+        encoded = struct.pack("!I", number)
+        # Tagged integers carry the tag in the first octet (RFC 2868)
+        return encoded if not definition.tagged else b"\x00" + encoded[1:]
+    if data_type == "date":
+        return struct.pack("!I", int(value))
+    if data_type == "ipaddr":
+        try:
+            return ipaddress.IPv4Address(str(value)).packed
+        except ValueError:
+            raise RadiusPacketError(f"{definition.name} needs an IPv4 address, got {value!r}") from None
+    if data_type == "octets":
+        if isinstance(value, bytes):
+            return value
+        text = str(value)
+        if text.startswith("0x"):
+            try:
+                return bytes.fromhex(text[2:])
+            except ValueError:
+                raise RadiusPacketError(f"{definition.name} has invalid hex {text!r}") from None
+        return text.encode("utf-8")
+    encoded = value if isinstance(value, bytes) else str(value).encode("utf-8")
+    # Tag 0 is left implicit for tagged strings unless the value could be
+    # mistaken for a tag, as FreeRADIUS does
+    if definition.tagged and encoded and encoded[0] <= 0x1F:
+        encoded = b"\x00" + encoded
+    return encoded
+
+
+def encode_named_attribute(name: str, value) -> bytes:
+    """Encode an attribute by dictionary name, wrapping VSAs in type 26.
+
+    Args:
+        name: Attribute name (case-insensitive, e.g. "Cisco-AVPair")
+        value: Value; lists encode one attribute per element
+
+    Returns:
+        Encoded attribute(s)
+
+    Raises:
+        RadiusPacketError: For unknown attributes or invalid values
+    """
+    definition = ATTRIBUTES.get(name.lower())
+    if definition is None:
+        raise RadiusPacketError(f"Unknown attribute: {name}")
+    if isinstance(value, (list, tuple)):
+        return b"".join(encode_named_attribute(name, item) for item in value)
+
+    encoded = _encode_value(definition, value)
+    if not definition.vendor:
+        return encode_attribute(definition.type, encoded)
+    if len(encoded) > MAX_ATTRIBUTE_LENGTH - 6:
+        raise RadiusPacketError(f"{definition.name} value too long ({len(encoded)} bytes)")
+    vsa = struct.pack("!IBB", definition.vendor, definition.type, len(encoded) + 2) + encoded
+    return encode_attribute(ATTR_VENDOR_SPECIFIC, vsa)
+
+
+def decode_named_attributes(data: bytes) -> list[tuple[str, object]]:
+    """Decode attributes into (name, value) pairs using the dictionary.
+
+    Unknown attributes are named ``Attr-N`` / ``Vendor-V-Attr-N`` and keep
+    their raw bytes. Vendor-Specific attributes are unpacked.
+
+    Args:
+        data: Attribute bytes
+
+    Returns:
+        List of (name, value) pairs in packet order
+    """
+    decoded = []
+    for attr_type, value in decode_attributes(data):
+        if attr_type == ATTR_VENDOR_SPECIFIC and len(value) >= 6:
+            vendor = struct.unpack("!I", value[:4])[0]
+            position = 4
+            while position + 2 <= len(value):
+                vendor_type, length = value[position], value[position + 1]
+                if length < 2 or position + length > len(value):
+                    break
+                decoded.append(_decode_value(vendor, vendor_type, value[position + 2:position + length]))
+                position += length
+            continue
+        decoded.append(_decode_value(0, attr_type, value))
+    return decoded
+
+
+def _decode_value(vendor: int, attr_type: int, value: bytes) -> tuple[str, object]:
+    definition = _ATTRIBUTES_BY_CODE.get((vendor, attr_type))
+    if definition is None:
+        name = f"Vendor-{vendor}-Attr-{attr_type}" if vendor else f"Attr-{attr_type}"
+        return name, value
+    if definition.data_type in ("integer", "date") and len(value) == 4:
+        raw = value if not definition.tagged else b"\x00" + value[1:]
+        return definition.name, struct.unpack("!I", raw)[0]
+    if definition.data_type == "ipaddr" and len(value) == 4:
+        return definition.name, str(ipaddress.IPv4Address(value))
+    if definition.data_type == "string":
+        return definition.name, value.decode("utf-8", errors="replace")
+    return definition.name, value
+
+
+def decode_attributes(data: bytes) -> list[tuple[int, bytes]]:
+    """Decode a run of attributes.
+
+    Args:
+        data: Attribute bytes (the packet after its header)
+
+    Returns:
+        List of (type, value) tuples in packet order
+
+    Raises:
+        RadiusPacketError: If an attribute length is invalid
+    """
+    attributes = []
+    position = 0
+    while position < len(data):
+        if position + 2 > len(data):
+            raise RadiusPacketError("truncated attribute header")
+        attr_type, length = data[position], data[position + 1]
+        if length < 2 or position + length > len(data):
+            raise RadiusPacketError(f"invalid length {length} for attribute {attr_type}")
+        attributes.append((attr_type, data[position + 2:position + length]))
+        position += length
+    return attributes
+
+
+def parse_header(data: bytes) -> tuple[int, int, int, bytes]:
+    """Parse and sanity-check a packet header.
+
+    Args:
+        data: Received datagram
+
+    Returns:
+        Tuple of (code, identifier, length, authenticator)
+
+    Raises:
+        RadiusPacketError: If the packet is shorter than its declared length
+    """
+    if len(data) < HEADER_LENGTH:
+        raise RadiusPacketError(f"packet too short ({len(data)} bytes)")
+    code, identifier, length, authenticator = _HEADER.unpack_from(data)
+    if length < HEADER_LENGTH or length > len(data) or length > MAX_PACKET_LENGTH:
+        raise RadiusPacketError(f"invalid packet length {length}")
+    return code, identifier, length, authenticator
+
+
+def _message_authenticator(packet: bytes, secret: bytes) -> bytes:
+    return hmac.new(secret, packet, hashlib.md5).digest()
+
+
+def build_status_server(identifier: int, secret: str, nas_identifier: str | None = None) -> bytes:
+    """Build an RFC 5997 Status-Server request.
+
+    The Request Authenticator is random and a Message-Authenticator
+    attribute is included, as RFC 5997 requires.
+
+    Args:
+        identifier: Packet identifier (0-255)
+        secret: Shared secret
+        nas_identifier: Optional NAS-Identifier attribute
+
+    Returns:
+        Encoded packet
+    """
+    attributes = b""
+    if nas_identifier:
+        attributes += encode_attribute(ATTR_NAS_IDENTIFIER, nas_identifier)
+    placeholder = encode_attribute(ATTR_MESSAGE_AUTHENTICATOR, bytes(AUTHENTICATOR_LENGTH))
+    attributes += placeholder
+
+    length = HEADER_LENGTH + len(attributes)
+    packet = _HEADER.pack(STATUS_SERVER, identifier, length, os.urandom(AUTHENTICATOR_LENGTH)) + attributes
+    signature = _message_authenticator(packet, secret.encode("utf-8"))
+    return packet[:-AUTHENTICATOR_LENGTH] + signature
+
+
+def hide_user_password(password: str, secret: str, request_authenticator: bytes) -> bytes:
+    """Obfuscate a User-Password value as RFC 2865 section 5.2 describes.
+
+    The password is padded to a multiple of 16 octets and XORed block by
+    block with MD5(secret + previous block), starting from the Request
+    Authenticator.
+
+    Args:
+        password: Cleartext password (at most 128 octets)
+        secret: Shared secret
+        request_authenticator: The request's 16-octet authenticator
+
+    Returns:
+        Hidden attribute value
+
+    Raises:
+        RadiusPacketError: If the password is longer than 128 octets
+    """
+    data = password.encode("utf-8")
+    if len(data) > 128:
+        raise RadiusPacketError(f"User-Password too long ({len(data)} bytes)")
+    blocks = max(1, -(-len(data) // AUTHENTICATOR_LENGTH))
+    padded = data.ljust(blocks * AUTHENTICATOR_LENGTH, b"\x00")
+    secret_bytes = secret.encode("utf-8")
+    hidden = b""
+    previous = request_authenticator
+    for start in range(0, len(padded), AUTHENTICATOR_LENGTH):
+        key = hashlib.md5(secret_bytes + previous).digest()
+        previous = bytes(a ^ b for a, b in zip(padded[start:start + AUTHENTICATOR_LENGTH], key))
+        hidden += previous
+    return hidden
+
+
+def build_access_request(
+    identifier: int,
+    secret: str,
+    attributes: Iterable[tuple[str, object]],
+    message_authenticator: bool = True,
+) -> bytes:
+    """Build an RFC 2865 Access-Request.
+
+    The Request Authenticator is random. A ``User-Password`` entry in
+    ``attributes`` is hidden with the shared secret rather than sent in the
+    clear; everything else is encoded through the dictionary.
+
+    Args:
+        identifier: Packet identifier (0-255)
+        secret: Shared secret
+        attributes: (name, value) pairs, optionally including User-Password
+        message_authenticator: Include a Message-Authenticator attribute
+
+    Returns:
+        Encoded packet
+
+    Raises:
+        RadiusPacketError: For unknown attributes or an oversized packet
+    """
+    request_authenticator = os.urandom(AUTHENTICATOR_LENGTH)
+    body = b""
+    for name, value in attributes:
+        if name.lower() == "user-password":
+            body += encode_attribute(
+                ATTR_USER_PASSWORD, hide_user_password(str(value), secret, request_authenticator)
+            )
+        else:
+            body += encode_named_attribute(name, value)
+    if message_authenticator:
+        body += encode_attribute(ATTR_MESSAGE_AUTHENTICATOR, bytes(AUTHENTICATOR_LENGTH))
+
+    length = HEADER_LENGTH + len(body)
+    if length > MAX_PACKET_LENGTH:
+        raise RadiusPacketError(f"packet too large ({length} bytes)")
+    packet = _HEADER.pack(ACCESS_REQUEST, identifier, length, request_authenticator) + body
+    if message_authenticator:
+        signature = _message_authenticator(packet, secret.encode("utf-8"))
+        packet = packet[:-AUTHENTICATOR_LENGTH] + signature
+    return packet
+
+
+def build_request(
+    code: int,
+    identifier: int,
+    secret: str,
+    attributes: Iterable[tuple[str, object]],
+    message_authenticator: bool = True,
+    event_timestamp: bool = True,
+) -> bytes:
+    """Build an RFC 5176 CoA-Request or Disconnect-Request.
+
+    The Request Authenticator is MD5(Code+Identifier+Length+16 zero
+    octets+Attributes+Secret). A Message-Authenticator, if requested, is
+    computed first over the packet with a zero Request Authenticator.
+
+    Args:
+        code: DISCONNECT_REQUEST or COA_REQUEST
+        identifier: Packet identifier (0-255)
+        secret: Shared secret
+        attributes: (name, value) pairs; list values repeat the attribute
+        message_authenticator: Include a Message-Authenticator attribute
+        event_timestamp: Add Event-Timestamp (replay protection, RFC 5176 3.5)
+
+    Returns:
+        Encoded packet
+
+    Raises:
+        RadiusPacketError: For unknown attributes or an oversized packet
+    """
+    body = b"".join(encode_named_attribute(name, value) for name, value in attributes)
+    if event_timestamp:
+        body += encode_named_attribute("Event-Timestamp", int(time.time()))
+    if message_authenticator:
+        body += encode_attribute(ATTR_MESSAGE_AUTHENTICATOR, bytes(AUTHENTICATOR_LENGTH))
+
+    length = HEADER_LENGTH + len(body)
+    if length > MAX_PACKET_LENGTH:
+        raise RadiusPacketError(f"packet too large ({length} bytes)")
+    header = struct.pack("!BBH", code, identifier, length)
+    secret_bytes = secret.encode("utf-8")
+
+    if message_authenticator:
+        unsigned = header + bytes(AUTHENTICATOR_LENGTH) + body
+        body = body[:-AUTHENTICATOR_LENGTH] + _message_authenticator(unsigned, secret_bytes)
+
+    authenticator = hashlib.md5(header + bytes(AUTHENTICATOR_LENGTH) + body + secret_bytes).digest()
+    return header + authenticator + body
+
+
+def verify_response(response: bytes, request: bytes, secret: str) -> bool:
+    """Check that a response answers ``request`` and is signed with ``secret``.
+
+    Verifies the identifier, the Response Authenticator
+    (MD5(Code+ID+Length+RequestAuth+Attributes+Secret)) and, when present,
+    the response's Message-Authenticator.
+
+    Args:
+        response: Received datagram
+        request: Request packet that was sent
+        secret: Shared secret
+
+    Returns:
+        True if the response is authentic
+    """
+    try:
+        _, identifier, length, authenticator = parse_header(response)
+        attributes = decode_attributes(response[HEADER_LENGTH:length])
+    except RadiusPacketError:
+        return False
+    if identifier != request[1]:
+        return False
+
+    secret_bytes = secret.encode("utf-8")
+    request_authenticator = request[4:HEADER_LENGTH]
+    expected = hashlib.md5(
+        response[:4] + request_authenticator + response[HEADER_LENGTH:length] + secret_bytes
+    ).digest()
+    if not hmac.compare_digest(expected, authenticator):
+        return False
+
+    offset = HEADER_LENGTH
+    for attr_type, value in attributes:
+        if attr_type == ATTR_MESSAGE_AUTHENTICATOR:
+            # Recompute over the packet with the Request Authenticator and a zeroed MA
+            value_offset = offset + 2
+            signed = (
+                response[:4]
+                + request_authenticator
+                + response[HEADER_LENGTH:value_offset]
+                + bytes(AUTHENTICATOR_LENGTH)
+                + response[value_offset + len(value):length]
+            )
+            return hmac.compare_digest(_message_authenticator(signed, secret_bytes), value)
+        offset += len(value) + 2
+    return True
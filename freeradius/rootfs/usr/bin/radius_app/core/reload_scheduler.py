@@ -0,0 +1,288 @@
+"""Debounced, single-flight reload scheduler for radiusd.
+
+Every component that needs radiusd to pick up new configuration (config
+watcher, certificate sync, manual ``/api/reload``) asks this scheduler
+instead of signalling the daemon itself. Requests are coalesced:
+
+- A reload fires once no new request arrived for ``debounce_seconds``...
+- ...but never later than ``max_delay_seconds`` after the first pending
+  request, so a steady stream of changes can't postpone it forever.
+- Only one reload runs at a time. Requests that arrive while a reload is
+  running are served by a trailing reload, so no change is left unapplied.
+
+The daemon is signalled with SIGHUP using the pid from radiusd's pidfile
+(run.sh starts radiusd with ``-P`` so the pidfile is written in foreground
+mode too). If the pidfile is missing or stale, /proc is scanned for the
+radiusd process instead.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from radius_app.config import get_radiusd_pid_file, get_reload_timing
+
+logger = logging.getLogger(__name__)
+
+RADIUSD_PROCESS_NAME = "radiusd"
+
+
+@dataclass
+class ReloadMetrics:
+    """Counters for reloads requested vs. actually executed."""
+
+    requested: int = 0
+    executed: int = 0
+    coalesced: int = 0
+    failed: int = 0
+    last_reason: str | None = None
+    last_reload_at: float | None = None
+    last_duration_seconds: float | None = None
+
+    def to_dict(self) -> dict:
+        """Return metrics as a plain dictionary."""
+        return asdict(self)
+
+
+class ReloadScheduler:
+    """Coalesces reload requests into as few radiusd SIGHUPs as possible.
+
+    ``request_reload()`` must be called from the event loop; the SIGHUP
+    itself runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: float | None = None,
+        max_delay_seconds: float | None = None,
+        pid_file: Path | str | None = None,
+    ):
+        """Initialize reload scheduler.
+
+        Args:
+            debounce_seconds: Quiet period before a reload fires
+                (defaults to RADIUS_RELOAD_DEBOUNCE_SECONDS)
+            max_delay_seconds: Upper bound between the first pending request
+                and the reload (defaults to RADIUS_RELOAD_MAX_DELAY_SECONDS)
+            pid_file: radiusd pidfile (defaults to RADIUSD_PID_FILE)
+        """
+        default_debounce, default_max_delay = get_reload_timing()
+        self.debounce_seconds = default_debounce if debounce_seconds is None else debounce_seconds
+        self.max_delay_seconds = max(
+            default_max_delay if max_delay_seconds is None else max_delay_seconds,
+            self.debounce_seconds,
+        )
+        self.pid_file = Path(pid_file) if pid_file is not None else get_radiusd_pid_file()
+        self.metrics = ReloadMetrics()
+        self._pid: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._waiters: list[asyncio.Future] = []
+        self._reasons: list[str] = []
+        self._first_request_at: float | None = None
+        self._last_request_at: float | None = None
+        self._driver: asyncio.Task | None = None
+        self._running = False
+
+    @property
+    def pending(self) -> int:
+        """Number of requests waiting for the next reload."""
+        return len(self._waiters)
+
+    @property
+    def running(self) -> bool:
+        """True while a reload is being executed."""
+        return self._running
+
+    def request_reload(self, reason: str = "unspecified") -> asyncio.Future:
+        """Ask for radiusd to be reloaded.
+
+        Args:
+            reason: Short description of the caller (for logs and metrics)
+
+        Returns:
+            Future resolving to True once the reload covering this request
+            succeeded, or False if it failed. Callers that don't need the
+            outcome can ignore it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Bound to a new event loop (e.g. app restart in tests)
+            self._loop = loop
+            self._waiters = []
+            self._reasons = []
+            self._first_request_at = None
+            self._driver = None
+            self._running = False
+
+        now = time.monotonic()
+        self.metrics.requested += 1
+        if not self._waiters:
+            self._first_request_at = now
+        self._last_request_at = now
+
+        future = loop.create_future()
+        self._waiters.append(future)
+        self._reasons.append(reason)
+
+        if self._driver is None or self._driver.done():
+            self._driver = loop.create_task(self._drive())
+        return future
+
+    async def reload(self, reason: str = "unspecified") -> bool:
+        """Request a reload and wait for its outcome.
+
+        Args:
+            reason: Short description of the caller
+
+        Returns:
+            True if the reload succeeded
+        """
+        return await self.request_reload(reason)
+
+    def _deadline(self) -> float:
+        return min(
+            self._last_request_at + self.debounce_seconds,
+            self._first_request_at + self.max_delay_seconds,
+        )
+
+    async def _drive(self) -> None:
+        """Run reloads until no requests are pending (single flight)."""
+        while self._waiters:
+            while True:
+                remaining = self._deadline() - time.monotonic()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(remaining)
+
+            waiters, self._waiters = self._waiters, []
+            reasons, self._reasons = self._reasons, []
+            self._first_request_at = None
+
+            self.metrics.executed += 1
+            self.metrics.coalesced += len(waiters) - 1
+            self.metrics.last_reason = ", ".join(sorted(set(reasons)))
+
+            self._running = True
+            started = time.monotonic()
+            try:
+                success = await asyncio.to_thread(self._signal_radiusd)
+            except Exception as e:
+                logger.error(f"Error reloading radiusd: {e}")
+                success = False
+            finally:
+                self._running = False
+            self.metrics.last_duration_seconds = time.monotonic() - started
+            self.metrics.last_reload_at = time.time()
+
+            if success:
+                logger.info(
+                    f"✅ FreeRADIUS daemon reloaded ({len(waiters)} request(s): "
+                    f"{self.metrics.last_reason})"
+                )
+            else:
+                self.metrics.failed += 1
+
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(success)
+
+    def _signal_radiusd(self) -> bool:
+        """Send SIGHUP to radiusd.
+
+        Returns:
+            True if the signal was delivered
+        """
+        pid = self._resolve_pid()
+        if pid is None:
+            logger.warning(f"Failed to reload radiusd: no running process (pidfile {self.pid_file})")
+            return False
+        try:
+            os.kill(pid, signal.SIGHUP)
+        except ProcessLookupError:
+            self._pid = None
+            logger.warning(f"Failed to reload radiusd: pid {pid} exited")
+            return False
+        return True
+
+    def _resolve_pid(self) -> int | None:
+        """Find the radiusd pid: pidfile first, then a /proc scan.
+
+        Returns:
+            radiusd pid, or None if radiusd isn't running
+        """
+        pid = self._read_pid_file()
+        if pid is not None and _is_radiusd(pid):
+            self._pid = pid
+            return pid
+        if self._pid is not None and _is_radiusd(self._pid):
+            return self._pid
+        self._pid = _find_radiusd_pid()
+        return self._pid
+
+    def _read_pid_file(self) -> int | None:
+        try:
+            return int(self.pid_file.read_text().strip())
+        except (OSError, ValueError):
+            return None
+
+    def get_metrics(self) -> dict:
+        """Get reload metrics and scheduler state.
+
+        Returns:
+            Dictionary of counters, last reload details and configuration
+        """
+        return {
+            **self.metrics.to_dict(),
+            "pending": self.pending,
+            "running": self.running,
+            "debounce_seconds": self.debounce_seconds,
+            "max_delay_seconds": self.max_delay_seconds,
+            "pid_file": str(self.pid_file),
+        }
+
+
+def _is_radiusd(pid: int) -> bool:
+    """Check that pid is alive and (where /proc is available) is radiusd."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Alive, owned by another user
+    comm = Path(f"/proc/{pid}/comm")
+    try:
+        return comm.read_text().strip() == RADIUSD_PROCESS_NAME
+    except OSError:
+        return not Path("/proc/self").exists()
+
+
+def _find_radiusd_pid() -> int | None:
+    """Scan /proc for a radiusd process."""
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            if Path(f"/proc/{entry}/comm").read_text().strip() == RADIUSD_PROCESS_NAME:
+                return int(entry)
+        except OSError:
+            continue
+    return None
+
+
+_scheduler: ReloadScheduler | None = None
+
+
+def get_reload_scheduler() -> ReloadScheduler:
+    """Get the process-wide reload scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ReloadScheduler()
+    return _scheduler
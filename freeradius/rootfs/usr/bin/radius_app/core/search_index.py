@@ -0,0 +1,157 @@
+"""Substring search indexes for list endpoints.
+
+``col ILIKE '%term%'`` can't use a B-tree index, so every search on a list
+endpoint scans the table. This module installs a per-dialect index that
+answers substring searches directly:
+
+- PostgreSQL: ``pg_trgm`` GIN indexes on each searchable column. ILIKE
+  queries are unchanged and the planner picks the trigram index up.
+- SQLite: an FTS5 external-content table per searchable table using the
+  ``trigram`` tokenizer, kept in sync by triggers (so rows written by the
+  portal or raw SQL are indexed too). Searches become a MATCH lookup.
+- MariaDB/MySQL, or when installation fails: plain ILIKE scans.
+
+Trigram indexes need at least three characters; shorter terms fall back to
+ILIKE. Installation is idempotent and runs at startup next to the
+change-log triggers.
+"""
+
+import logging
+import weakref
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Table -> columns covered by substring search
+SEARCH_COLUMNS = {
+    "udn_assignments": ("mac_address", "user_name", "user_email", "unit"),
+    "radius_clients": ("name",),
+    "radius_nad_extended": ("vendor", "location"),
+}
+
+# Shortest term the trigram indexes can answer
+MIN_INDEXED_TERM = 3
+
+TRIGRAM = "trigram"
+FTS5 = "fts5"
+
+# Search backend installed per engine (tests use several in-memory engines)
+_backends: "weakref.WeakKeyDictionary[Engine, str]" = weakref.WeakKeyDictionary()
+
+
+def _fts_table(table: str) -> str:
+    return f"{table}_search"
+
+
+def _sqlite_statements(table: str, columns: tuple[str, ...]) -> list[str]:
+    fts = _fts_table(table)
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{col}" for col in columns)
+    old_values = ", ".join(f"old.{col}" for col in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def _postgres_statements(table: str, columns: tuple[str, ...]) -> list[str]:
+    return [
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_{col}_trgm ON {table} USING gin ({col} gin_trgm_ops)"
+        for col in columns
+    ]
+
+
+def install_search_indexes(engine: Engine) -> str | None:
+    """Install substring search indexes on all searchable tables.
+
+    Idempotent - safe to call on every startup.
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        "trigram", "fts5", or None if searches fall back to ILIKE scans
+    """
+    dialect = engine.dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        logger.info(f"Substring search indexes not supported on {dialect} - using ILIKE")
+        return None
+
+    try:
+        with engine.begin() as conn:
+            existing = {table for table in SEARCH_COLUMNS if engine.dialect.has_table(conn, table)}
+            if dialect == "postgresql":
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for table in existing:
+                columns = SEARCH_COLUMNS[table]
+                if dialect == "postgresql":
+                    for statement in _postgres_statements(table, columns):
+                        conn.execute(text(statement))
+                    continue
+                created = not engine.dialect.has_table(conn, _fts_table(table))
+                for statement in _sqlite_statements(table, columns):
+                    conn.execute(text(statement))
+                if created:
+                    # Index rows that existed before the triggers
+                    fts = _fts_table(table)
+                    conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        backend = TRIGRAM if dialect == "postgresql" else FTS5
+        _backends[engine] = backend
+        logger.info(f"✅ Search indexes installed on {len(existing)} tables ({backend})")
+        return backend
+    except Exception as e:
+        _backends.pop(engine, None)
+        logger.warning(f"⚠️  Could not install search indexes ({e}) - using ILIKE scans")
+        return None
+
+
+def register_search_backend(engine: Engine, backend: str) -> None:
+    """Record a backend installed through another engine on the same database.
+
+    The async engine wraps its own sync Engine, so indexes installed via
+    get_engine() must be registered for it too.
+    """
+    _backends[engine] = backend
+
+
+def search_backend(db: Session) -> str | None:
+    """Search backend installed for the session's engine, if any."""
+    return _backends.get(db.get_bind())
+
+
+def search_clause(db: Session, model, term: str):
+    """WHERE clause matching ``term`` as a substring of the model's searchable columns.
+
+    Args:
+        db: Database session (selects the backend)
+        model: ORM model whose table is listed in SEARCH_COLUMNS
+        term: Search text
+
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    table = model.__tablename__
+    columns = SEARCH_COLUMNS[table]
+    if search_backend(db) == FTS5 and len(term) >= MIN_INDEXED_TERM:
+        fts = _fts_table(table)
+        param = f"{table}_term"
+        # Quoted FTS5 string: a trigram phrase, i.e. a case-insensitive substring
+        phrase = '"' + term.replace('"', '""') + '"'
+        matches = (
+            select(text("rowid"))
+            .select_from(text(fts))
+            .where(text(f"{fts} MATCH :{param}").bindparams(**{param: phrase}))
+        )
+        return model.id.in_(matches)
+    pattern = f"%{term}%"
+    return or_(*(getattr(model, column).ilike(pattern) for column in columns))
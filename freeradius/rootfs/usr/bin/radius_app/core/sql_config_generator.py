@@ -11,6 +11,7 @@ Uses Jinja2 templates for clean, maintainable configuration generation.
 """
 
 import logging
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -18,6 +19,8 @@ from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 from sqlalchemy.orm import Session
 
 from radius_app.config import get_settings
+from radius_app.core.radcheck_sync import sync_psk_users
+from radius_app.db.database import get_portal_engine
 
 logger = logging.getLogger(__name__)
 
@@ -420,7 +423,12 @@ CREATE TABLE IF NOT EXISTS radpostauth (
         
         return schema
     
-    def sync_psk_to_radcheck(self, db: Session, portal_db_url: Optional[str] = None) -> dict:
+    def sync_psk_to_radcheck(
+        self,
+        db: Session,
+        portal_db_url: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> dict:
         """Sync PSK data from portal database to radcheck/radreply tables.
         
         Per FreeRADIUS SQL documentation:
@@ -428,10 +436,13 @@ CREATE TABLE IF NOT EXISTS radpostauth (
         - radreply: Reply attributes (e.g., Cisco-AVPair := "udn:private-group-id=100")
         
         This allows FreeRADIUS to query PSK data directly from SQL at runtime.
+        Only rows that differ from the portal are written (see radcheck_sync).
         
         Args:
             db: FreeRADIUS database session
             portal_db_url: Portal database URL (if different)
+            since: Only sync users changed after this time (cursor from a
+                previous sync); full sync if None
             
         Returns:
             Dictionary with sync statistics
@@ -466,120 +477,13 @@ CREATE TABLE IF NOT EXISTS radpostauth (
             
             # Query users with PSK from portal database
             if portal_db_url:
-                from sqlalchemy import create_engine
-                portal_engine = create_engine(portal_db_url)
-                with portal_engine.connect() as portal_conn:
-                    result = portal_conn.execute(text("""
-                        SELECT 
-                            id,
-                            email,
-                            ipsk_id,
-                            ipsk_passphrase_encrypted,
-                            ipsk_name,
-                            ssid_name,
-                            unit
-                        FROM users
-                        WHERE ipsk_passphrase_encrypted IS NOT NULL
-                          AND ipsk_passphrase_encrypted != ''
-                          AND is_active = true
-                        ORDER BY email
-                    """))
-                    
-                    users = result.fetchall()
-                    logger.info(f"Found {len(users)} users with PSK")
-                    
-                    for user in users:
-                        user_id = user[0]
-                        email = user[1]
-                        ipsk_id = user[2]
-                        encrypted_passphrase = user[3]
-                        ipsk_name = user[4]
-                        ssid_name = user[5]
-                        unit = user[6]
-                        
-                        # Decrypt passphrase
-                        passphrase = self._decrypt_passphrase(encrypted_passphrase, portal_db_url)
-                        if not passphrase:
-                            logger.warning(f"Could not decrypt passphrase for user {email}")
-                            stats["errors"].append(f"User {email}: Could not decrypt passphrase")
-                            continue
-                        
-                        # Username for RADIUS (use ipsk_id or email)
-                        username = ipsk_id or email
-                        
-                        # Look up UDN ID for this user
-                        from sqlalchemy import select
-                        from radius_app.db.models import UdnAssignment
-                        udn_stmt = select(UdnAssignment).where(
-                            UdnAssignment.user_id == user_id,
-                            UdnAssignment.is_active == True
-                        )
-                        udn_assignment = db.execute(udn_stmt).scalar_one_or_none()
-                        
-                        # Insert into radcheck (authentication)
-                        # Per FreeRADIUS SQL docs: operator := means "always matches and replaces"
-                        try:
-                            # Delete existing entries for this username
-                            db.execute(text("""
-                                DELETE FROM radcheck WHERE username = :username
-                            """), {"username": username})
-                            db.execute(text("""
-                                DELETE FROM radreply WHERE username = :username
-                            """), {"username": username})
-                            
-                            # Insert Cleartext-Password check attribute
-                            # Operator := means "always matches"
-                            db.execute(text("""
-                                INSERT INTO radcheck (username, attribute, op, value)
-                                VALUES (:username, 'Cleartext-Password', ':=', :password)
-                            """), {"username": username, "password": passphrase})
-                            stats["radcheck_entries"] += 1
-                            
-                            # Insert reply attributes into radreply
-                            # Operator := means "add to reply list"
-                            reply_attrs = []
-                            
-                            # UDN ID reply attribute
-                            if udn_assignment:
-                                reply_attrs.append((
-                                    username,
-                                    "Cisco-AVPair",
-                                    ":=",
-                                    f"udn:private-group-id={udn_assignment.udn_id}"
-                                ))
-                            
-                            # SSID name reply attribute
-                            if ssid_name:
-                                reply_attrs.append((
-                                    username,
-                                    "Reply-Message",
-                                    ":=",
-                                    f"SSID: {ssid_name}"
-                                ))
-                            
-                            # Insert reply attributes
-                            for attr_username, attr_name, attr_op, attr_value in reply_attrs:
-                                db.execute(text("""
-                                    INSERT INTO radreply (username, attribute, op, value)
-                                    VALUES (:username, :attribute, :op, :value)
-                                """), {
-                                    "username": attr_username,
-                                    "attribute": attr_name,
-                                    "op": attr_op,
-                                    "value": attr_value
-                                })
-                                stats["radreply_entries"] += 1
-                            
-                            stats["users_synced"] += 1
-                            
-                        except Exception as e:
-                            logger.error(f"Failed to sync user {email}: {e}")
-                            stats["errors"].append(f"User {email}: {str(e)}")
-                            db.rollback()
-                            continue
-                    
-                    db.commit()
-                    logger.info(f"✅ Synced {stats['users_synced']} users to radcheck/radreply")
+                with get_portal_engine(portal_db_url).connect() as portal_conn:
+                    stats = sync_psk_users(
+                        db,
+                        portal_conn,
+                        lambda encrypted: self._decrypt_passphrase(encrypted, portal_db_url),
+                        since=since,
+                    )
             
         except Exception as e:
             logger.error(f"Failed to sync PSK to radcheck: {e}", exc_info=True)
@@ -0,0 +1,309 @@
+"""Persistent UDN ID allocator.
+
+Free UDN IDs are kept as inclusive, non-overlapping intervals in the
+``udn_free_ranges`` table, keyed by their first ID. The primary key B-tree is
+the summary index: the lowest free ID, or the interval containing a given ID,
+is a single indexed lookup, so allocation is O(log n) in the number of free
+intervals instead of a scan over the whole 16.7M ID pool.
+
+Concurrency: every mutation selects the interval it changes ``FOR UPDATE``,
+so concurrent transactions on PostgreSQL/MySQL serialize on that row (SQLite
+serializes writers anyway). IDs written without going through the allocator
+(imports, other services, raw SQL) are caught optimistically: allocated IDs
+are checked against the unique ``udn_assignments.udn_id`` index and any that
+are already taken are dropped from the free list and replaced.
+
+The table is built lazily from ``udn_assignments`` the first time it is
+needed (one ordered index scan). An empty sentinel interval just past the
+pool (``max_id + 1 .. max_id``) marks the table as built, so an exhausted
+pool isn't mistaken for a missing free list. The allocator never commits;
+changes become visible with the caller's transaction.
+"""
+
+import logging
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from radius_app.db.models import UdnAssignment, UdnFreeRange
+
+logger = logging.getLogger(__name__)
+
+# UDN ID range (ID 1 is reserved by Meraki)
+UDN_MIN = 2
+UDN_MAX = 16777200
+
+# Assigned IDs fetched per round trip while rebuilding the free list
+REBUILD_BATCH_SIZE = 10_000
+
+# Bound IN-clause sizes when checking allocated IDs against assignments
+VERIFY_CHUNK_SIZE = 500
+
+
+class UdnPoolExhausted(ValueError):
+    """Raised when no UDN IDs are left to allocate."""
+
+
+class UdnAllocator:
+    """Allocates UDN IDs from the persistent free-range table."""
+
+    def __init__(self, db: Session, min_id: int = UDN_MIN, max_id: int = UDN_MAX):
+        """Initialize allocator.
+
+        Args:
+            db: Database session (the caller commits)
+            min_id: Lowest allocatable ID
+            max_id: Highest allocatable ID
+        """
+        self.db = db
+        self.min_id = min_id
+        self.max_id = max_id
+
+    def ensure_initialized(self) -> bool:
+        """Build the free list from assignments if it doesn't exist yet.
+
+        Returns:
+            True if the free list was (re)built
+        """
+        if self.db.execute(select(UdnFreeRange.start_id).limit(1)).first() is not None:
+            return False
+        try:
+            with self.db.begin_nested():
+                self.rebuild()
+        except IntegrityError:
+            # Another transaction built it concurrently
+            logger.debug("UDN free list was initialized concurrently")
+        return True
+
+    def rebuild(self) -> int:
+        """Recompute the free list from ``udn_assignments``.
+
+        Inactive assignments keep their ID (the unique index covers them), so
+        only IDs with no row at all are free.
+
+        Returns:
+            Number of free ranges written
+        """
+        self.db.execute(delete(UdnFreeRange))
+        assigned = self.db.execute(
+            select(UdnAssignment.udn_id)
+            .where(UdnAssignment.udn_id.between(self.min_id, self.max_id))
+            .order_by(UdnAssignment.udn_id)
+            .execution_options(yield_per=REBUILD_BATCH_SIZE)
+        ).scalars()
+
+        ranges = []
+        next_free = self.min_id
+        for udn_id in assigned:
+            if udn_id > next_free:
+                ranges.append({"start_id": next_free, "end_id": udn_id - 1})
+            next_free = max(next_free, udn_id + 1)
+        if next_free <= self.max_id:
+            ranges.append({"start_id": next_free, "end_id": self.max_id})
+        # Sentinel: empty interval that survives exhaustion
+        ranges.append({"start_id": self.max_id + 1, "end_id": self.max_id})
+
+        for start in range(0, len(ranges), REBUILD_BATCH_SIZE):
+            self.db.execute(insert(UdnFreeRange), ranges[start:start + REBUILD_BATCH_SIZE])
+        logger.info(f"✅ Rebuilt UDN free list: {len(ranges) - 1} free ranges")
+        return len(ranges) - 1
+
+    def _lowest_range(self) -> tuple[int, int] | None:
+        query = (
+            select(UdnFreeRange.start_id, UdnFreeRange.end_id)
+            .where(UdnFreeRange.start_id <= self.max_id)
+            .order_by(UdnFreeRange.start_id)
+            .limit(1)
+        )
+        while True:
+            row = self.db.execute(query.with_for_update()).first()
+            if row is not None:
+                return row[0], row[1]
+            # On PostgreSQL (READ COMMITTED) the locked read comes back empty
+            # when the row it waited for was deleted by a concurrent
+            # allocation; only an unlocked read tells whether the free list
+            # is really empty. Each empty locked read means another
+            # transaction committed, so retrying makes progress.
+            if self.db.execute(query).first() is None:
+                return None
+
+    def _range_containing(self, udn_id: int) -> tuple[int, int] | None:
+        row = self.db.execute(
+            select(UdnFreeRange.start_id, UdnFreeRange.end_id)
+            .where(UdnFreeRange.start_id <= udn_id)
+            .order_by(UdnFreeRange.start_id.desc())
+            .limit(1)
+            .with_for_update()
+        ).first()
+        if row is None or row[1] < udn_id:
+            return None
+        return row[0], row[1]
+
+    def _take(self, count: int) -> list[int]:
+        """Remove up to ``count`` of the lowest free IDs from the free list."""
+        taken: list[int] = []
+        while len(taken) < count:
+            lowest = self._lowest_range()
+            if lowest is None:
+                break
+            start, end = lowest
+            n = min(count - len(taken), end - start + 1)
+            taken.extend(range(start, start + n))
+            if start + n > end:
+                self.db.execute(delete(UdnFreeRange).where(UdnFreeRange.start_id == start))
+            else:
+                self.db.execute(
+                    update(UdnFreeRange).where(UdnFreeRange.start_id == start).values(start_id=start + n)
+                )
+        return taken
+
+    def _already_assigned(self, udn_ids: list[int]) -> set[int]:
+        used: set[int] = set()
+        for start in range(0, len(udn_ids), VERIFY_CHUNK_SIZE):
+            chunk = udn_ids[start:start + VERIFY_CHUNK_SIZE]
+            used.update(self.db.execute(
+                select(UdnAssignment.udn_id).where(UdnAssignment.udn_id.in_(chunk))
+            ).scalars())
+        return used
+
+    def allocate_many(self, count: int) -> list[int]:
+        """Allocate ``count`` IDs, lowest first.
+
+        Contiguous runs are taken a whole range at a time, so a batch costs
+        one indexed lookup per free range it touches plus one verification
+        query per VERIFY_CHUNK_SIZE IDs.
+
+        Args:
+            count: Number of IDs to allocate
+
+        Returns:
+            Allocated IDs in ascending order
+
+        Raises:
+            UdnPoolExhausted: If fewer than ``count`` IDs are free
+        """
+        if count <= 0:
+            return []
+        self.ensure_initialized()
+
+        allocated: list[int] = []
+        while len(allocated) < count:
+            candidates = self._take(count - len(allocated))
+            if not candidates:
+                raise UdnPoolExhausted(
+                    f"No available UDN IDs - all {self.max_id - self.min_id + 1} allocated"
+                )
+            used = self._already_assigned(candidates)
+            if used:
+                logger.warning(f"⚠️  Skipping {len(used)} UDN IDs assigned outside the allocator")
+            allocated.extend(udn_id for udn_id in candidates if udn_id not in used)
+        return allocated
+
+    def allocate(self) -> int:
+        """Allocate the lowest free ID.
+
+        Raises:
+            UdnPoolExhausted: If no IDs are free
+        """
+        return self.allocate_many(1)[0]
+
+    def peek(self) -> int:
+        """Lowest free ID, without allocating it.
+
+        IDs found to be assigned outside the allocator are dropped from the
+        free list on the way.
+
+        Raises:
+            UdnPoolExhausted: If no IDs are free
+        """
+        self.ensure_initialized()
+        while True:
+            lowest = self._lowest_range()
+            if lowest is None:
+                raise UdnPoolExhausted(
+                    f"No available UDN IDs - all {self.max_id - self.min_id + 1} allocated"
+                )
+            if not self._already_assigned([lowest[0]]):
+                return lowest[0]
+            self._take(1)
+
+    def claim(self, udn_id: int) -> bool:
+        """Remove a specific ID from the free list (explicit assignments).
+
+        Args:
+            udn_id: ID being assigned
+
+        Returns:
+            True if the ID was free
+        """
+        self.ensure_initialized()
+        found = self._range_containing(udn_id)
+        if found is None:
+            return False
+        start, end = found
+        if start == end:
+            self.db.execute(delete(UdnFreeRange).where(UdnFreeRange.start_id == start))
+        elif udn_id == start:
+            self.db.execute(
+                update(UdnFreeRange).where(UdnFreeRange.start_id == start).values(start_id=start + 1)
+            )
+        else:
+            self.db.execute(
+                update(UdnFreeRange).where(UdnFreeRange.start_id == start).values(end_id=udn_id - 1)
+            )
+            if udn_id < end:
+                self.db.execute(insert(UdnFreeRange).values(start_id=udn_id + 1, end_id=end))
+        return True
+
+    def release(self, udn_id: int) -> None:
+        """Return an ID to the free list, merging with adjacent ranges.
+
+        Call after the assignment holding the ID has been deleted or moved
+        (and flushed). Releasing an ID that is already free is a no-op.
+
+        Args:
+            udn_id: ID no longer in use
+        """
+        if not self.min_id <= udn_id <= self.max_id:
+            return
+        if self.ensure_initialized():
+            # A fresh rebuild already reflects the current assignments
+            return
+        before = self.db.execute(
+            select(UdnFreeRange.start_id, UdnFreeRange.end_id)
+            .where(UdnFreeRange.start_id <= udn_id)
+            .order_by(UdnFreeRange.start_id.desc())
+            .limit(1)
+            .with_for_update()
+        ).first()
+        if before is not None and before[1] >= udn_id:
+            return
+        after = self.db.execute(
+            select(UdnFreeRange.end_id)
+            .where(UdnFreeRange.start_id == udn_id + 1, UdnFreeRange.start_id <= self.max_id)
+            .with_for_update()
+        ).scalar_one_or_none()
+
+        if before is not None and before[1] == udn_id - 1:
+            self.db.execute(
+                update(UdnFreeRange)
+                .where(UdnFreeRange.start_id == before[0])
+                .values(end_id=after if after is not None else udn_id)
+            )
+            if after is not None:
+                self.db.execute(delete(UdnFreeRange).where(UdnFreeRange.start_id == udn_id + 1))
+        elif after is not None:
+            self.db.execute(
+                update(UdnFreeRange).where(UdnFreeRange.start_id == udn_id + 1).values(start_id=udn_id)
+            )
+        else:
+            self.db.execute(insert(UdnFreeRange).values(start_id=udn_id, end_id=udn_id))
+
+    def free_count(self) -> int:
+        """Number of free IDs (sum over free ranges)."""
+        self.ensure_initialized()
+        total = self.db.execute(
+            select(func.coalesce(func.sum(UdnFreeRange.end_id - UdnFreeRange.start_id + 1), 0))
+        ).scalar()
+        return int(total)
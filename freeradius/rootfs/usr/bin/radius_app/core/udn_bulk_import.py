@@ -0,0 +1,284 @@
+"""Bulk UDN assignment import.
+
+Onboarding a building through ``POST /api/udn-assignments`` costs an
+existence check, an allocation and a commit per user. The importer does the
+same work set-wise for a whole CSV or NDJSON file:
+
+- rows are validated with the create schema, duplicates inside the file are
+  rejected up front
+- conflicts with existing assignments are found with chunked IN queries
+- auto-assigned IDs are reserved from the free list in one
+  ``allocate_many()`` call, explicit IDs are claimed
+- rows are written with executemany in batches, in the caller's transaction
+
+The caller commits once and wakes the DatabaseWatcher, which regenerates the
+users file once for the whole import.
+"""
+
+import csv
+import io
+import json
+import logging
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from radius_app.core.udn_allocator import UdnAllocator
+from radius_app.db.models import UdnAssignment
+from radius_app.schemas.udn_assignments import UdnAssignmentCreate
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Refuse larger files - split them into several imports
+MAX_IMPORT_ROWS = 50_000
+
+# Rows per executemany batch
+INSERT_BATCH_SIZE = 1_000
+
+# Bound IN-clause sizes when checking for existing assignments
+LOOKUP_CHUNK_SIZE = 500
+
+CREATED = "created"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class UdnImportError(ValueError):
+    """Raised when an import file can't be processed at all."""
+
+
+@dataclass
+class ImportRowResult:
+    """Outcome for one input row."""
+
+    line: int
+    status: str
+    user_id: int | None = None
+    udn_id: int | None = None
+    mac_address: str | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        """Result as a JSON-ready dict (without empty fields)."""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass
+class ImportReport:
+    """Per-row results of one import."""
+
+    results: list[ImportRowResult] = field(default_factory=list)
+
+    def count(self, status: str) -> int:
+        """Number of rows with ``status``."""
+        return sum(1 for result in self.results if result.status == status)
+
+    @property
+    def created(self) -> int:
+        """Rows inserted."""
+        return self.count(CREATED)
+
+    def summary(self) -> dict:
+        """Totals by status."""
+        return {
+            "rows": len(self.results),
+            "created": self.created,
+            "failed": self.count(FAILED),
+            "skipped": self.count(SKIPPED),
+        }
+
+
+def detect_format(content_type: str | None) -> str | None:
+    """Guess the import format from a Content-Type header.
+
+    Args:
+        content_type: Request Content-Type
+
+    Returns:
+        "csv", "ndjson" or None if unknown
+    """
+    content_type = (content_type or "").lower()
+    if "csv" in content_type:
+        return "csv"
+    if "ndjson" in content_type or "jsonl" in content_type or "json-seq" in content_type:
+        return "ndjson"
+    return None
+
+
+def parse_rows(payload: str, fmt: str) -> Iterator[tuple[int, dict | str]]:
+    """Split an import file into rows.
+
+    CSV files need a header row naming UdnAssignmentCreate fields; empty
+    cells are treated as missing. NDJSON files have one JSON object per line.
+
+    Args:
+        payload: File content
+        fmt: "csv" or "ndjson"
+
+    Yields:
+        (line number, field dict) or (line number, error message)
+
+    Raises:
+        UdnImportError: If the format is unknown or the CSV has no header
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(payload))
+        if not reader.fieldnames or "user_id" not in [name.strip() for name in reader.fieldnames]:
+            raise UdnImportError("CSV import needs a header row with at least a user_id column")
+        for record in reader:
+            fields = {
+                key.strip(): value.strip()
+                for key, value in record.items()
+                if key and value is not None and value.strip() != ""
+            }
+            yield reader.line_num, fields
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(payload.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, "Expected a JSON object"
+                continue
+            yield line_number, record
+    else:
+        raise UdnImportError(f"Unknown import format: {fmt} (expected one of {', '.join(IMPORT_FORMATS)})")
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+def _existing(db: Session, column, values: set, *criteria) -> dict:
+    """Map each of ``values`` that already exists to its holder's user_id."""
+    found = {}
+    ordered = list(values)
+    for start in range(0, len(ordered), LOOKUP_CHUNK_SIZE):
+        chunk = ordered[start:start + LOOKUP_CHUNK_SIZE]
+        stmt = select(column, UdnAssignment.user_id).where(column.in_(chunk), *criteria)
+        found.update(tuple(row) for row in db.execute(stmt))
+    return found
+
+
+def import_udn_assignments(
+    db: Session,
+    payload: str,
+    fmt: str,
+    atomic: bool = False,
+    allocator: UdnAllocator | None = None,
+) -> ImportReport:
+    """Validate, allocate and insert UDN assignments from a CSV/NDJSON file.
+
+    Rows that fail validation or conflict with existing assignments (same
+    active user, same MAC or same UDN ID) are reported and skipped; the
+    rest are inserted. The caller commits.
+
+    Args:
+        db: Database session
+        payload: File content
+        fmt: "csv" or "ndjson"
+        atomic: Insert nothing if any row fails
+        allocator: Allocator to take IDs from (defaults to the full pool)
+
+    Returns:
+        Per-row results in input order
+
+    Raises:
+        UdnImportError: If the file can't be parsed or is too large
+        UdnPoolExhausted: If there aren't enough free UDN IDs
+    """
+    report = ImportReport()
+    valid: list[tuple[ImportRowResult, UdnAssignmentCreate]] = []
+    seen_users: dict[int, int] = {}
+    seen_macs: dict[str, int] = {}
+    seen_udns: dict[int, int] = {}
+
+    for line, record in parse_rows(payload, fmt):
+        if len(report.results) >= MAX_IMPORT_ROWS:
+            raise UdnImportError(f"Import is limited to {MAX_IMPORT_ROWS} rows")
+        result = ImportRowResult(line=line, status=FAILED)
+        report.results.append(result)
+        if isinstance(record, str):
+            result.error = record
+            continue
+        try:
+            data = UdnAssignmentCreate.model_validate(record)
+        except ValidationError as e:
+            result.user_id = record.get("user_id") if isinstance(record.get("user_id"), int) else None
+            result.error = _validation_message(e)
+            continue
+        result.user_id = data.user_id
+        result.mac_address = data.mac_address
+
+        duplicate = (
+            ("user_id", seen_users.get(data.user_id)),
+            ("MAC address", seen_macs.get(data.mac_address) if data.mac_address else None),
+            ("UDN ID", seen_udns.get(data.udn_id) if data.udn_id is not None else None),
+        )
+        first_seen = next(((label, other) for label, other in duplicate if other is not None), None)
+        if first_seen:
+            result.error = f"Duplicate {first_seen[0]} (first seen on line {first_seen[1]})"
+            continue
+        seen_users[data.user_id] = line
+        if data.mac_address:
+            seen_macs[data.mac_address] = line
+        if data.udn_id is not None:
+            seen_udns[data.udn_id] = line
+        valid.append((result, data))
+
+    # Conflicts with existing rows, a few queries for the whole file
+    active_users = _existing(
+        db, UdnAssignment.user_id, set(seen_users), UdnAssignment.is_active == True  # noqa: E712
+    )
+    used_macs = _existing(db, UdnAssignment.mac_address, set(seen_macs))
+    used_udns = _existing(db, UdnAssignment.udn_id, set(seen_udns))
+
+    accepted: list[tuple[ImportRowResult, UdnAssignmentCreate]] = []
+    for result, data in valid:
+        if data.user_id in active_users:
+            result.error = f"User {data.user_id} already has a UDN assignment"
+        elif data.mac_address and data.mac_address in used_macs:
+            result.error = f"MAC address '{data.mac_address}' is already assigned to User {used_macs[data.mac_address]}"
+        elif data.udn_id is not None and data.udn_id in used_udns:
+            result.error = f"UDN ID {data.udn_id} is already assigned to User {used_udns[data.udn_id]}"
+        else:
+            accepted.append((result, data))
+
+    failed = len(report.results) - len(accepted)
+    if atomic and failed:
+        for result, _ in accepted:
+            result.status = SKIPPED
+            result.error = f"Import aborted: {failed} rows failed"
+        logger.warning(f"⚠️  UDN import aborted: {failed} of {len(report.results)} rows failed")
+        return report
+    if not accepted:
+        return report
+
+    allocator = allocator or UdnAllocator(db)
+    allocator.ensure_initialized()
+    for _, data in accepted:
+        if data.udn_id is not None:
+            allocator.claim(data.udn_id)
+    auto_ids = iter(allocator.allocate_many(sum(1 for _, data in accepted if data.udn_id is None)))
+
+    rows = []
+    for result, data in accepted:
+        result.udn_id = data.udn_id if data.udn_id is not None else next(auto_ids)
+        result.status = CREATED
+        rows.append({**data.model_dump(exclude={"udn_id"}), "udn_id": result.udn_id})
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(insert(UdnAssignment), rows[start:start + INSERT_BATCH_SIZE])
+
+    logger.info(f"✅ Imported {len(rows)} UDN assignments ({failed} rows failed)")
+    return report
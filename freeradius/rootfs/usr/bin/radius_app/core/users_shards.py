@@ -0,0 +1,170 @@
+"""Sharded users-format include files.
+
+Large users-format files (``users``, ``users-mac-bypass``) can be split into
+N shard files under ``<name>.d/``. Entries are placed by a stable hash of
+their key (MAC address or user), and the top-level file becomes an index of
+``$INCLUDE`` lines. A regeneration only rewrites and re-validates the shards
+whose content actually changed.
+"""
+
+import hashlib
+import logging
+import time
+import zlib
+from collections.abc import Iterable
+from itertools import chain
+from pathlib import Path
+
+from radius_app.core.config_validator import safe_write_config_chunks, safe_write_config_file
+
+logger = logging.getLogger(__name__)
+
+SHARD_FILE_PREFIX = "shard-"
+
+# Digests of files written by this process, keyed by path
+_written_digests: dict[str, str] = {}
+
+
+def shard_for(key: str, shard_count: int) -> int:
+    """Get the shard index for an entry key.
+    
+    Args:
+        key: Entry key (MAC address or user identifier)
+        shard_count: Number of shards
+        
+    Returns:
+        Shard index in range(shard_count)
+    """
+    return zlib.crc32(key.strip().lower().encode()) % shard_count
+
+
+def shard_dir(base_path: Path) -> Path:
+    """Get the directory holding the shards of a users-format file."""
+    return base_path.with_name(f"{base_path.name}.d")
+
+
+def _shard_name(index: int) -> str:
+    return f"{SHARD_FILE_PREFIX}{index:03d}"
+
+
+def _digest(chunks: Iterable[str]) -> str:
+    sha = hashlib.sha256()
+    for chunk in chunks:
+        sha.update(chunk.encode())
+    return sha.hexdigest()
+
+
+def _current_digest(path: Path) -> str | None:
+    """Get the digest of a file as last written, reading it if not known."""
+    digest = _written_digests.get(str(path))
+    if digest is None and path.exists():
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        _written_digests[str(path)] = digest
+    return digest
+
+
+def forget_written_digests(paths: Iterable[Path]) -> None:
+    """Forget the recorded digests of files whose staged write was discarded."""
+    for path in paths:
+        _written_digests.pop(str(path), None)
+
+
+def write_sharded_users_file(
+    base_path: Path,
+    entries: Iterable[tuple[str, str]],
+    shard_count: int,
+    title: str,
+    footer: str = "",
+) -> dict[str, float]:
+    """Write a users-format file as an include index plus N shard files.
+    
+    Shard content has no timestamp, so a shard whose entries didn't change
+    produces identical bytes and is skipped entirely.
+    
+    Args:
+        base_path: Path of the top-level file (e.g. raddb/users)
+        entries: (key, rendered entry) pairs in output order
+        shard_count: Number of shards
+        title: Header title written to the index and each shard
+        footer: Text written after the includes (e.g. a DEFAULT entry)
+        
+    Returns:
+        Seconds spent writing each rewritten shard, keyed by shard name
+        
+    Raises:
+        ConfigValidationError: If a shard fails validation - it is NOT written
+    """
+    buckets: list[list[str]] = [[] for _ in range(shard_count)]
+    for key, fragment in entries:
+        buckets[shard_for(key, shard_count)].append(fragment)
+    
+    directory = shard_dir(base_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    
+    timings: dict[str, float] = {}
+    for index, fragments in enumerate(buckets):
+        shard_path = directory / _shard_name(index)
+        header = (
+            f"# {title} - shard {index + 1}/{shard_count}\n"
+            f"# Entries: {len(fragments)}\n"
+            "# DO NOT EDIT MANUALLY - Changes will be overwritten\n\n"
+        )
+        digest = _digest(chain([header], fragments))
+        if digest == _current_digest(shard_path):
+            continue
+        
+        start = time.perf_counter()
+        safe_write_config_chunks(shard_path, chain([header], fragments), file_type="users")
+        timings[shard_path.name] = time.perf_counter() - start
+        _written_digests[str(shard_path)] = digest
+    
+    # Remove shards left over from a larger shard count
+    for stale_path in directory.glob(f"{SHARD_FILE_PREFIX}*"):
+        suffix = stale_path.name[len(SHARD_FILE_PREFIX):]
+        if not suffix.isdigit() or int(suffix) >= shard_count:
+            stale_path.unlink()
+            _written_digests.pop(str(stale_path), None)
+    
+    # Include paths are relative to the directory of the including file
+    index_content = f"# {title}\n"
+    index_content += f"# Sharded into {shard_count} files under {directory.name}/\n"
+    index_content += "# DO NOT EDIT MANUALLY - Changes will be overwritten\n\n"
+    for index in range(shard_count):
+        index_content += f"$INCLUDE {directory.name}/{_shard_name(index)}\n"
+    if footer:
+        index_content += f"\n{footer}"
+    
+    index_digest = _digest([index_content])
+    if index_digest != _current_digest(base_path):
+        # Includes can't resolve in the validator's temp raddb - shards are
+        # validated individually above, the index gets the basic syntax check
+        safe_write_config_file(base_path, index_content, file_type="include")
+        _written_digests[str(base_path)] = index_digest
+    
+    if timings:
+        logger.info(
+            f"✅ Rewrote {len(timings)}/{shard_count} shards of {base_path.name} "
+            f"in {sum(timings.values()) * 1000:.1f} ms"
+        )
+    else:
+        logger.debug(f"No shard of {base_path.name} changed")
+    return timings
+
+
+def remove_shards(base_path: Path) -> None:
+    """Remove the shard directory of a users-format file (single-file mode).
+    
+    Args:
+        base_path: Path of the top-level file
+    """
+    _written_digests.pop(str(base_path), None)
+    directory = shard_dir(base_path)
+    if not directory.exists():
+        return
+    for shard_path in directory.glob(f"{SHARD_FILE_PREFIX}*"):
+        shard_path.unlink()
+        _written_digests.pop(str(shard_path), None)
+    try:
+        directory.rmdir()
+    except OSError:
+        pass
@@ -1,13 +1,17 @@
 """Database connection and session management - shared with portal."""
 
+import importlib.util
 import logging
-from collections.abc import Generator
+import threading
+import time
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 
-from radius_app.config import get_settings
+from radius_app.config import get_database_async_enabled, get_portal_pool_settings, get_settings
 from radius_app.db.models import Base
 
 logger = logging.getLogger(__name__)
@@ -16,6 +20,35 @@ logger = logging.getLogger(__name__)
 _engine = None
 _SessionLocal = None
 
+# Async engine for API handlers; False once we know it's unavailable
+_async_engine = None
+_AsyncSessionLocal = None
+
+# Backend name -> (async drivername, driver module)
+_ASYNC_DRIVERS = {
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+    "mysql": ("mysql+aiomysql", "aiomysql"),
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+}
+
+# Portal database engines, one pooled engine per URL
+_portal_engines: dict[str, Engine] = {}
+_portal_engines_lock = threading.Lock()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            self.wait_count = getattr(self, "wait_count", 0) + 1
+            self.wait_total = getattr(self, "wait_total", 0.0) + waited
+            self.wait_max = max(getattr(self, "wait_max", 0.0), waited)
+
 
 def create_database_engine():
     """Create SQLAlchemy engine with database-specific configuration.
@@ -151,3 +184,281 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def async_database_url(db_url: str) -> str | None:
+    """Map a database URL to its async driver equivalent.
+    
+    postgresql -> postgresql+asyncpg, mysql -> mysql+aiomysql,
+    sqlite -> sqlite+aiosqlite.
+    
+    Args:
+        db_url: Sync database URL (DATABASE_URL)
+        
+    Returns:
+        Async database URL, or None if the driver (or greenlet, which
+        SQLAlchemy's asyncio support needs) is not installed
+    """
+    url = make_url(db_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return None
+    drivername, module = driver
+    if importlib.util.find_spec(module) is None or importlib.util.find_spec("greenlet") is None:
+        return None
+    
+    query = dict(url.query)
+    if drivername == "postgresql+asyncpg" and "sslmode" in query:
+        # asyncpg spells libpq's sslmode as ssl
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername=drivername, query=query).render_as_string(hide_password=False)
+
+
+def create_async_database_engine():
+    """Create the async engine used by API handlers, if possible.
+    
+    Uses the same database as get_engine() through asyncpg, aiomysql or
+    aiosqlite. Disabled by RADIUS_DATABASE_ASYNC=false.
+    
+    Returns:
+        AsyncEngine, or None when async is disabled, the driver is missing,
+        or the database is in-memory SQLite (which can't be shared)
+    """
+    if not get_database_async_enabled():
+        logger.info("Async database sessions disabled (RADIUS_DATABASE_ASYNC)")
+        return None
+    
+    db_url = get_settings().database_url
+    url = make_url(db_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return None
+    
+    async_url = async_database_url(db_url)
+    if async_url is None:
+        logger.info("Async database driver not installed - API handlers use sync sessions")
+        return None
+    
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    engine_kwargs = {"echo": False}
+    if url.get_backend_name() != "sqlite":
+        engine_kwargs.update({
+            "pool_pre_ping": True,
+            "pool_size": 5,
+            "max_overflow": 10,
+            "pool_recycle": 3600,
+        })
+    if db_url.startswith("mysql") and "charset" not in db_url:
+        engine_kwargs["connect_args"] = {"charset": "utf8mb4"}
+    
+    try:
+        engine = create_async_engine(async_url, **engine_kwargs)
+    except Exception as e:
+        logger.warning(f"⚠️  Could not create async database engine ({e}) - using sync sessions")
+        return None
+    
+    if url.get_backend_name() == "sqlite":
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_sqlite_pragma(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+    
+    logger.info(f"✅ Async database engine created: {engine.url.drivername}")
+    return engine
+
+
+def get_async_engine():
+    """Get or create the async database engine.
+    
+    Returns:
+        AsyncEngine (cached after first call), or None if unavailable
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_database_engine() or False
+    return _async_engine or None
+
+
+def get_async_session_local():
+    """Get or create the async session factory.
+    
+    Returns:
+        async_sessionmaker (cached after first call), or None if there is
+        no async engine
+    """
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        engine = get_async_engine()
+        if engine is None:
+            return None
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=engine,
+            autoflush=False,
+            expire_on_commit=False,  # Responses are built after commit
+        )
+    return _AsyncSessionLocal
+
+
+class SyncSessionAdapter:
+    """AsyncSession-compatible wrapper around a sync Session.
+    
+    Used when no async engine is available so handlers written against
+    AsyncDbSession still work; queries run inline and block the event
+    loop exactly as they did with DbSession.
+    """
+    
+    def __init__(self, session: Session):
+        self.sync_session = session
+    
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
+    
+    async def execute(self, statement, params=None, **kwargs):
+        return self.sync_session.execute(statement, params, **kwargs)
+    
+    async def scalar(self, statement, params=None, **kwargs):
+        return self.sync_session.scalar(statement, params, **kwargs)
+    
+    async def scalars(self, statement, params=None, **kwargs):
+        return self.sync_session.scalars(statement, params, **kwargs)
+    
+    async def get(self, entity, ident, **kwargs):
+        return self.sync_session.get(entity, ident, **kwargs)
+    
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+    
+    async def commit(self) -> None:
+        self.sync_session.commit()
+    
+    async def rollback(self) -> None:
+        self.sync_session.rollback()
+    
+    async def close(self) -> None:
+        self.sync_session.close()
+
+
+async def get_async_db() -> AsyncGenerator:
+    """Get an async database session.
+    
+    Yields:
+        AsyncSession on the async engine, or a SyncSessionAdapter over a
+        regular session when async is unavailable
+    """
+    AsyncSessionLocal = get_async_session_local()
+    if AsyncSessionLocal is None:
+        db = get_session_local()()
+        try:
+            yield SyncSessionAdapter(db)
+        finally:
+            db.close()
+        return
+    
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+def get_portal_engine(db_url: str) -> Engine:
+    """Get the shared, pooled engine for a portal database URL.
+    
+    Engines are created once per URL and reused by every sync, so repeated
+    syncs share one connection pool instead of each leaking a new one.
+    When the portal shares the FreeRADIUS database, the main engine is
+    returned.
+    
+    Pool sizing comes from get_portal_pool_settings(); connections are
+    pre-pinged before use and recycled after the configured age.
+    
+    Args:
+        db_url: Portal database URL
+        
+    Returns:
+        SQLAlchemy engine
+    """
+    if db_url == get_settings().database_url:
+        return get_engine()
+    
+    with _portal_engines_lock:
+        engine = _portal_engines.get(db_url)
+        if engine is not None:
+            return engine
+        
+        url = make_url(db_url)
+        engine_kwargs = {"pool_pre_ping": True}
+        # In-memory SQLite can't be pooled; everything else gets a sized pool
+        if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+            pool_size, max_overflow, pool_recycle, pool_timeout = get_portal_pool_settings()
+            engine_kwargs.update({
+                "poolclass": TimedQueuePool,
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_recycle": pool_recycle,
+                "pool_timeout": pool_timeout,
+            })
+        if db_url.startswith("mysql") and "charset" not in db_url:
+            engine_kwargs["connect_args"] = {"charset": "utf8mb4"}
+        
+        engine = create_engine(db_url, **engine_kwargs)
+        _portal_engines[db_url] = engine
+        logger.info(f"✅ Portal database engine created: {engine.url.render_as_string(hide_password=True)}")
+        return engine
+
+
+def get_pool_stats() -> list[dict]:
+    """Connection pool statistics for the main and portal engines.
+    
+    Returns:
+        One dict per engine with pool class, size, checked-out and
+        overflow counts, and checkout wait times
+    """
+    engines = [("radius", _engine)] if _engine is not None else []
+    if _async_engine:
+        engines.append(("radius-async", _async_engine.sync_engine))
+    with _portal_engines_lock:
+        engines += [("portal", engine) for engine in _portal_engines.values()]
+    
+    stats = []
+    for role, engine in engines:
+        pool = engine.pool
+        is_queue = isinstance(pool, QueuePool)
+        wait_count = getattr(pool, "wait_count", 0)
+        stats.append({
+            "role": role,
+            "url": engine.url.render_as_string(hide_password=True),
+            "pool_class": type(pool).__name__,
+            "size": pool.size() if is_queue else None,
+            "checked_out": pool.checkedout() if is_queue else None,
+            "checked_in": pool.checkedin() if is_queue else None,
+            # QueuePool counts overflow from -pool_size until the pool fills
+            "overflow": max(pool.overflow(), 0) if is_queue else None,
+            "wait_count": wait_count,
+            "wait_avg_ms": round(getattr(pool, "wait_total", 0.0) / wait_count * 1000, 3) if wait_count else 0.0,
+            "wait_max_ms": round(getattr(pool, "wait_max", 0.0) * 1000, 3),
+        })
+    return stats
+
+
+def dispose_engines() -> None:
+    """Close pooled connections of portal engines and the main engine.
+    
+    Call on shutdown. Portal engines are dropped from the registry; the
+    main engine stays usable and reconnects on demand.
+    """
+    with _portal_engines_lock:
+        for engine in _portal_engines.values():
+            engine.dispose()
+        _portal_engines.clear()
+    if _engine is not None:
+        _engine.dispose()
+    logger.info("Database engines disposed")
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's pooled connections (call on shutdown)."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine:
+        await _async_engine.dispose()
+    _async_engine = None
+    _AsyncSessionLocal = None
@@ -480,6 +480,27 @@ def run_migrations():
                 logger.info("  ✅ Created table radius_authorization_profiles")
                 changes_made += 1
             
+            # Migration 9: (created_at, id) indexes for keyset pagination
+            from radius_app.db.models import RadiusClient, UdnAssignment
+            for model in (RadiusClient, UdnAssignment):
+                if not table_exists(session, model.__tablename__, is_mysql):
+                    continue
+                existing_indexes = {
+                    index["name"] for index in inspect(session.connection()).get_indexes(model.__tablename__)
+                }
+                for index in model.__table__.indexes:
+                    if index.name.endswith("_created_at_id") and index.name not in existing_indexes:
+                        index.create(session.connection())
+                        logger.info(f"  ✅ Created index {index.name}")
+                        changes_made += 1
+            
+            # Migration 10: High-water marks for incremental portal syncs
+            from radius_app.db.models import RadiusSyncState
+            if not table_exists(session, RadiusSyncState.__tablename__, is_mysql):
+                RadiusSyncState.__table__.create(session.connection(), checkfirst=True)
+                logger.info(f"  ✅ Created table {RadiusSyncState.__tablename__}")
+                changes_made += 1
+            
             # Commit all changes
             session.commit()
             
@@ -6,8 +6,8 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, JSON, String, Text
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, JSON, String, Text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
 class Base(DeclarativeBase):
@@ -18,6 +18,8 @@ class RadiusClient(Base):
     """RADIUS client configuration for Meraki networks."""
 
     __tablename__ = "radius_clients"
+    # Keyset pagination order (newest first)
+    __table_args__ = (Index("ix_radius_clients_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     
@@ -51,6 +53,14 @@ class RadiusClient(Base):
         onupdate=lambda: datetime.now(timezone.utc),
     )
     created_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    
+    # Extended NAD information (one-to-one; rows are removed by ON DELETE CASCADE)
+    extended: Mapped["RadiusNadExtended | None"] = relationship(
+        back_populates="client",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        uselist=False,
+    )
 
     def __repr__(self) -> str:
         return f"<RadiusClient {self.name} ({self.ipaddr})>"
@@ -64,6 +74,8 @@ class UdnAssignment(Base):
     """
 
     __tablename__ = "udn_assignments"
+    # Keyset pagination order (newest first)
+    __table_args__ = (Index("ix_udn_assignments_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     
@@ -112,6 +124,23 @@ class UdnAssignment(Base):
         return f"<UdnAssignment User {self.user_id} ({mac_str}) -> UDN {self.udn_id}>"
 
 
+class UdnFreeRange(Base):
+    """Free UDN ID interval used by the UDN allocator.
+
+    Rows are inclusive, non-overlapping ranges of unassigned UDN IDs keyed by
+    their first ID, so the primary key index finds the lowest free ID (or the
+    range containing a given ID) in O(log n).
+    """
+
+    __tablename__ = "udn_free_ranges"
+
+    start_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    end_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UdnFreeRange {self.start_id}-{self.end_id}>"
+
+
 class RadiusNadExtended(Base):
     """Extended NAD information and capabilities."""
 
@@ -159,6 +188,15 @@ class RadiusNadExtended(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    
+    # Relationships
+    client: Mapped["RadiusClient"] = relationship(back_populates="extended")
+    health: Mapped["RadiusNadHealth | None"] = relationship(
+        back_populates="nad",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        uselist=False,
+    )
 
     def __repr__(self) -> str:
         return f"<RadiusNadExtended client_id={self.radius_client_id}>"
@@ -199,6 +237,8 @@ class RadiusNadHealth(Base):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
     )
+    
+    nad: Mapped["RadiusNadExtended"] = relationship(back_populates="health")
 
     def __repr__(self) -> str:
         status = "reachable" if self.is_reachable else "unreachable"
@@ -658,6 +698,37 @@ class RadiusAuthLog(Base):
         return f"<RadiusAuthLog {self.username} {self.auth_result}>"
 
 
+class RadiusConfigChange(Base):
+    """Change-log entry for tables that feed generated FreeRADIUS config.
+
+    Rows are appended by database triggers (or ORM hooks when triggers are
+    unavailable) on every insert/update/delete of a watched table. The
+    DatabaseWatcher consumes them by cursor (``id``), which also captures
+    deletes and updates that don't move ``updated_at``.
+    """
+
+    __tablename__ = "radius_config_changes"
+    # Never hand out ids of pruned rows again - the watcher's cursor is an id
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    # Source of the change
+    table_name: Mapped[str] = mapped_column(String(64), nullable=False)
+    row_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    operation: Mapped[str] = mapped_column(String(10), nullable=False)  # INSERT, UPDATE, DELETE, NOTIFY
+
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<RadiusConfigChange #{self.id} {self.operation} {self.table_name}:{self.row_id}>"
+
+
 class RadiusEapConfig(Base):
     """Global EAP configuration settings."""
 
@@ -976,6 +1047,28 @@ class RadiusUserCertificate(Base):
         return f"<RadiusUserCertificate {self.subject_common_name} ({self.status})>"
 
 
+class RadiusSyncState(Base):
+    """High-water mark for an incremental sync from the portal.
+
+    ``cursor_at``/``cursor_id`` are the (updated_at, id) of the last source
+    row applied; the next sync resumes strictly after that pair.
+    """
+
+    __tablename__ = "radius_sync_state"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    cursor_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    cursor_id: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    def __repr__(self) -> str:
+        return f"<RadiusSyncState {self.name} @ {self.cursor_at} #{self.cursor_id}>"
+
+
 class DeviceRegistration(Base):
     """Device registration for Meraki IPSK with RADIUS authentication.
     
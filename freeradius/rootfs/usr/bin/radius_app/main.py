@@ -28,9 +28,15 @@ from radius_app.api import (
     unlang_policies_router,
 )
 from radius_app.config import get_settings
+from radius_app.core.change_feed import (
+    PostgresChangeListener,
+    install_change_triggers,
+    register_session_hooks,
+)
 from radius_app.core.db_watcher import DatabaseWatcher
 from radius_app.core.health_monitor import HealthMonitor
-from radius_app.db.database import init_db
+from radius_app.core.search_index import install_search_indexes, register_search_backend
+from radius_app.db.database import dispose_async_engine, dispose_engines, get_async_engine, init_db
 
 # Configure logging
 logging.basicConfig(
@@ -43,12 +49,17 @@ logger = logging.getLogger(__name__)
 _watcher_task: asyncio.Task | None = None
 # Health monitoring task
 _health_monitor_task: asyncio.Task | None = None
+# PostgreSQL LISTEN connection for change notifications
+_change_listener: PostgresChangeListener | None = None
+
+# Watcher wakes on change notifications; this is only the safety-net poll
+WATCHER_FALLBACK_POLL_INTERVAL = 30
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global _watcher_task, _health_monitor_task
+    global _watcher_task, _health_monitor_task, _change_listener
     
     # Startup
     logger.info("=" * 60)
@@ -98,11 +109,30 @@ async def lifespan(app: FastAPI):
         logger.warning(f"⚠️  Default data warning: {e}")
         logger.info("Continuing - default data may already exist")
     
+    # Set up the change feed that wakes the database watcher
+    logger.info("Setting up configuration change feed...")
+    try:
+        engine = get_engine()
+        install_change_triggers(engine)
+        search_backend = install_search_indexes(engine)
+        async_engine = get_async_engine()
+        if async_engine is not None and search_backend:
+            register_search_backend(async_engine.sync_engine, search_backend)
+        register_session_hooks()
+        if engine.dialect.name == "postgresql":
+            _change_listener = PostgresChangeListener(engine)
+            if not _change_listener.start():
+                _change_listener = None
+        logger.info("✅ Change feed ready")
+    except Exception as e:
+        logger.warning(f"⚠️  Change feed warning: {e}")
+        logger.info("Continuing - watcher will fall back to polling the change log")
+    
     # Start database watcher
     logger.info("Starting database watcher...")
-    watcher = DatabaseWatcher(poll_interval=5)
+    watcher = DatabaseWatcher(poll_interval=WATCHER_FALLBACK_POLL_INTERVAL)
     _watcher_task = asyncio.create_task(watcher.watch_loop())
-    logger.info("✅ Database watcher started (poll interval: 5s)")
+    logger.info(f"✅ Database watcher started (event-driven, fallback poll: {WATCHER_FALLBACK_POLL_INTERVAL}s)")
     
     # Start health monitor
     logger.info("Starting NAD health monitor...")
@@ -128,6 +158,10 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             logger.info("Database watcher stopped")
     
+    # Stop change listener
+    if _change_listener:
+        _change_listener.stop()
+    
     # Stop health monitor
     if _health_monitor_task:
         logger.info("Stopping health monitor...")
@@ -137,6 +171,10 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             logger.info("Health monitor stopped")
     
+    # Close pooled database connections
+    dispose_engines()
+    await dispose_async_engine()
+    
     logger.info("Shutdown complete")
 
 
@@ -153,7 +191,7 @@ app = FastAPI(
     - **RADIUS Client Management**: Create, read, update, and delete RADIUS clients with validation
     - **UDN Assignment Management**: Manage MAC address to UDN ID mappings for network segmentation
     - **Monitoring & Statistics**: Real-time stats, logs, and configuration file inspection
-    - **Automatic Configuration**: Changes are automatically synced to FreeRADIUS within 5 seconds
+    - **Automatic Configuration**: Changes are pushed to FreeRADIUS as soon as they are committed
     - **Security**: Bearer token authentication on all protected endpoints
     
     ## Authentication
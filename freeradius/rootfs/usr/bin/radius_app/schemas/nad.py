@@ -116,7 +116,8 @@ class NadListResponse(BaseModel):
     """Paginated list of NADs."""
     
     items: list[NadResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Matching NADs (None when count=none)")
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int] = Field(None, description="Total pages (None when count=none)")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
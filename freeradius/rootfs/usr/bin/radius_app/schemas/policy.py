@@ -227,6 +227,7 @@ class PolicyTestRequest(BaseModel):
     mac_address: Optional[str] = Field(None, description="MAC address")
     nas_identifier: Optional[str] = Field(None, description="NAS identifier")
     nas_ip: Optional[str] = Field(None, description="NAS IP address")
+    timestamp: Optional[datetime] = Field(None, description="Request time for time restrictions (default now)")
     additional_attributes: Optional[dict] = Field(None, description="Additional attributes")
 
 
@@ -238,3 +239,36 @@ class PolicyTestResponse(BaseModel):
     policy_name: Optional[str] = Field(None, description="Matched policy name")
     reply_attributes: List[ReplyAttribute] = Field(default_factory=list)
     reason: Optional[str] = Field(None, description="Match/no-match reason")
+    winning_policy_id: Optional[int] = Field(None, description="Profile that wins in priority order")
+    winning_policy_name: Optional[str] = Field(None, description="Name of the winning profile")
+    winning_unlang_policy_name: Optional[str] = Field(None, description="Unlang policy that decided, if any")
+
+
+class PolicySimulationRequest(BaseModel):
+    """Batch of simulated requests to evaluate against all active policies."""
+    
+    requests: List[PolicyTestRequest] = Field(..., min_length=1, max_length=10000)
+
+
+class PolicySimulationResult(BaseModel):
+    """Winning policy for one simulated request."""
+    
+    index: int = Field(..., description="Position in the submitted batch")
+    outcome: str = Field(..., description="accept, reject, apply_profile or no_match")
+    unlang_policy_id: Optional[int] = None
+    unlang_policy_name: Optional[str] = None
+    profile_id: Optional[int] = None
+    profile_name: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class PolicySimulationResponse(BaseModel):
+    """Results of a bulk what-if simulation."""
+    
+    total: int
+    results: List[PolicySimulationResult]
+    summary: dict[str, int] = Field(default_factory=dict, description="Request count per winning policy")
+    unsimulated_policies: List[str] = Field(
+        default_factory=list, description="Unlang policies skipped (SQL, module or custom conditions)"
+    )
+    errors: List[str] = Field(default_factory=list, description="Policies that failed to compile")
@@ -254,10 +254,11 @@ class UdnAssignmentListResponse(BaseModel):
     """Schema for paginated list of UDN assignments."""
     
     items: list[UdnAssignmentResponse] = Field(..., description="List of assignments")
-    total: int = Field(..., description="Total number of assignments")
+    total: Optional[int] = Field(None, description="Total number of assignments (None when count=none)")
     page: int = Field(..., description="Current page number (1-indexed)")
     page_size: int = Field(..., description="Number of items per page")
-    pages: int = Field(..., description="Total number of pages")
+    pages: Optional[int] = Field(None, description="Total number of pages (None when count=none)")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
 
 
 class AvailableUdnResponse(BaseModel):
@@ -429,7 +429,7 @@ echo "Testing FreeRADIUS configuration..."
 if radiusd -XC -d /config/raddb > /dev/null 2>&1; then
     echo "✅ Configuration test passed"
     echo "Starting radiusd in foreground with debug output..."
-    exec radiusd -f -X -l stdout -d /config/raddb
+    exec radiusd -f -P -X -l stdout -d /config/raddb
 else
     echo "❌ ERROR: Configuration test failed!"
     echo ""
@@ -409,7 +409,7 @@ log_info "  Log level: ${LOG_LEVEL}"
 
 if radiusd -XC -d ${CONFIG_DIR}/raddb > /dev/null 2>&1; then
     log_info "Configuration test passed"
-    exec radiusd -f -X -l stdout -d ${CONFIG_DIR}/raddb
+    exec radiusd -f -P -X -l stdout -d ${CONFIG_DIR}/raddb
 else
     log_error "Configuration test failed!"
     radiusd -XC -d ${CONFIG_DIR}/raddb
@@ -1,6 +1,7 @@
 """Pytest fixtures for FreeRADIUS tests."""
 
 import os
+from contextlib import contextmanager
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -72,6 +73,37 @@ def db() -> Session:
         Base.metadata.drop_all(bind=test_engine)
 
 
+@pytest.fixture
+def assert_max_queries():
+    """Fail if a block runs more SQL statements than expected.
+    
+    Catches N+1 regressions: the budget should not grow with row count.
+    
+    Usage::
+    
+        with assert_max_queries(3) as statements:
+            client.get("/api/nads", headers=headers)
+    """
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        statements: list[str] = []
+        
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if not statement.lstrip().upper().startswith(("PRAGMA", "SAVEPOINT", "RELEASE")):
+                statements.append(statement)
+        
+        event.listen(test_engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(test_engine, "before_cursor_execute", _record)
+        assert len(statements) <= limit, (
+            f"Expected at most {limit} queries, got {len(statements)}:\n" + "\n".join(statements)
+        )
+    
+    return _assert_max_queries
+
+
 @pytest.fixture
 def sample_radius_client(db: Session) -> RadiusClient:
     """Create sample RADIUS client in DB."""
@@ -153,7 +185,7 @@ def client(db: Session):
     """
     from fastapi.testclient import TestClient
     from radius_app.main import app
-    from radius_app.db.database import get_db
+    from radius_app.db.database import SyncSessionAdapter, get_async_db, get_db
     
     def get_db_override():
         """Override database dependency to use test database."""
@@ -162,8 +194,13 @@ def client(db: Session):
         finally:
             pass  # Don't close - managed by db fixture
     
-    # Override the database dependency
+    async def get_async_db_override():
+        """Async handlers see the same test session."""
+        yield SyncSessionAdapter(db)
+    
+    # Override the database dependencies
     app.dependency_overrides[get_db] = get_db_override
+    app.dependency_overrides[get_async_db] = get_async_db_override
     
     try:
         yield TestClient(app)
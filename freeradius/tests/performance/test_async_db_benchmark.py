@@ -0,0 +1,120 @@
+"""Benchmark for async vs sync database sessions under mixed slow-query load.
+
+Builds a small FastAPI app on a file-backed SQLite database with two sets of
+handlers: one using DbSession (sync queries on the event loop) and one using
+AsyncDbSession (aiosqlite). Each run fires a burst of concurrent requests,
+half of which execute a deliberately slow query (``sleep_ms``), and reports
+requests/sec. With sync sessions every slow query stalls every other request;
+with async sessions they overlap, so async must reach at least
+MIN_SPEEDUP times the sync throughput.
+
+Run with:
+    pytest tests/performance -m performance -s
+"""
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event, func, select, text
+
+from radius_app.api.deps import AsyncDbSession, DbSession
+from radius_app.db import database
+from radius_app.db.models import Base, UdnAssignment
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+httpx = pytest.importorskip("httpx")
+
+REQUESTS = int(os.environ.get("RADIUS_BENCHMARK_REQUESTS", "60"))
+SLOW_QUERY_MS = 50
+MIN_SPEEDUP = 2.0
+
+SLOW_SQL = text(f"SELECT sleep_ms({SLOW_QUERY_MS})")
+FAST_SQL = select(func.count(UdnAssignment.id))
+
+
+def _sleep_ms(ms):
+    time.sleep(ms / 1000)
+    return ms
+
+
+def _register_sleep(engine) -> None:
+    @event.listens_for(engine, "connect")
+    def add_sleep_function(dbapi_conn, connection_record):
+        dbapi_conn.create_function("sleep_ms", 1, _sleep_ms)
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync/slow")
+    async def sync_slow(db: DbSession):
+        return {"value": db.execute(SLOW_SQL).scalar()}
+
+    @app.get("/sync/fast")
+    async def sync_fast(db: DbSession):
+        return {"value": db.execute(FAST_SQL).scalar()}
+
+    @app.get("/async/slow")
+    async def async_slow(db: AsyncDbSession):
+        return {"value": (await db.execute(SLOW_SQL)).scalar()}
+
+    @app.get("/async/fast")
+    async def async_fast(db: AsyncDbSession):
+        return {"value": (await db.execute(FAST_SQL)).scalar()}
+
+    return app
+
+
+async def _burst(app: FastAPI, prefix: str) -> float:
+    """Fire REQUESTS concurrent requests (half slow) and return requests/sec."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        paths = [f"{prefix}/{'slow' if i % 2 else 'fast'}" for i in range(REQUESTS)]
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for path in paths))
+        elapsed = time.perf_counter() - start
+    assert all(response.status_code == 200 for response in responses)
+    return REQUESTS / elapsed
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_async_sessions_throughput(tmp_path, monkeypatch):
+    """Async sessions keep serving while slow queries run."""
+    db_url = f"sqlite:///{tmp_path}/bench.db"
+    monkeypatch.setattr(database, "get_settings", lambda: SimpleNamespace(database_url=db_url))
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_SessionLocal", None)
+    monkeypatch.setattr(database, "_async_engine", None)
+    monkeypatch.setattr(database, "_AsyncSessionLocal", None)
+
+    engine = database.get_engine()
+    async_engine = database.get_async_engine()
+    _register_sleep(engine)
+    _register_sleep(async_engine.sync_engine)
+    Base.metadata.create_all(engine)
+
+    app = _build_app()
+
+    async def run():
+        try:
+            sync_rps = await _burst(app, "/sync")
+            async_rps = await _burst(app, "/async")
+        finally:
+            await database.dispose_async_engine()
+        return sync_rps, async_rps
+
+    sync_rps, async_rps = asyncio.run(run())
+    engine.dispose()
+
+    print(
+        f"\n{REQUESTS} requests, half running a {SLOW_QUERY_MS}ms query: "
+        f"sync {sync_rps:.0f} req/s, async {async_rps:.0f} req/s "
+        f"({async_rps / sync_rps:.1f}x)"
+    )
+    assert async_rps >= MIN_SPEEDUP * sync_rps
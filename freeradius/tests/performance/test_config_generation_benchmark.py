@@ -0,0 +1,319 @@
+"""Benchmark for the whole config-generation pipeline with synthetic tenants.
+
+Seeds a tenant of a given size (NADs, UDN assignments, policies, MAC bypass
+lists) and times every generator: ConfigGenerator (clients, users,
+generate_all), PolicyGenerator, VirtualServerGenerator, SqlConfigGenerator,
+PskConfigGenerator's MAC bypass file and MacBypassPolicyGenerator. Each
+stage is timed cold (fresh generator) and the best of a few runs is kept.
+
+Two checks fail the build:
+
+- budget: each stage must stay within ``(1 + RADIUS_BENCHMARK_TOLERANCE)``
+  times its recorded baseline in baselines/config_generation.json
+  (default tolerance 1.0, i.e. 2x, plus a small absolute slack for
+  millisecond-scale stages). Record new baselines on the reference machine
+  with RADIUS_BENCHMARK_UPDATE=1.
+- scaling: cost per entity at the medium size must stay within
+  SCALING_LIMIT times the small size, which catches N+1 queries and
+  quadratic rendering regardless of machine speed.
+
+The large tenant is skipped unless RADIUS_BENCHMARK_LARGE=1 is set. Set
+RADIUS_BENCHMARK_DATABASE_URL to a PostgreSQL URL to seed and query a real
+server instead of in-memory SQLite.
+
+Benchmarks are deselected by default (pytest.ini); run them with:
+    pytest tests/performance -m performance -s
+"""
+
+import contextlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from radius_app.core.config_generator import ConfigGenerator
+from radius_app.core.mac_bypass_policy_generator import (
+    MacBypassPolicyConfig,
+    MacBypassPolicyGenerator,
+    create_default_profiles,
+)
+from radius_app.core.policy_generator import PolicyGenerator
+from radius_app.core.psk_config_generator import PskConfigGenerator
+from radius_app.core.sql_config_generator import SqlConfigGenerator
+from radius_app.core.virtual_server_generator import VirtualServerGenerator
+from radius_app.db.models import (
+    Base,
+    RadiusClient,
+    RadiusMacBypassConfig,
+    RadiusPolicy,
+    UdnAssignment,
+)
+
+BASELINE_FILE = Path(__file__).parent / "baselines" / "config_generation.json"
+REPEATS = int(os.environ.get("RADIUS_BENCHMARK_REPEATS", "3"))
+TOLERANCE = float(os.environ.get("RADIUS_BENCHMARK_TOLERANCE", "1.0"))
+# Absolute slack so millisecond-scale stages don't fail on scheduler noise
+MIN_SLACK_MS = 25.0
+SCALING_LIMIT = 3.0
+
+SETTINGS_MODULES = [
+    "radius_app.core.config_generator",
+    "radius_app.core.psk_config_generator",
+    "radius_app.core.policy_generator",
+    "radius_app.core.sql_config_generator",
+    "radius_app.core.sql_counter_generator",
+    "radius_app.core.virtual_server_generator",
+]
+
+
+@dataclass(frozen=True)
+class Tenant:
+    """Synthetic deployment size."""
+
+    name: str
+    nads: int
+    udn_assignments: int
+    policies: int
+    bypass_configs: int
+    macs_per_bypass: int
+
+    @property
+    def bypass_macs(self) -> int:
+        return self.bypass_configs * self.macs_per_bypass
+
+    @property
+    def entities(self) -> int:
+        return self.nads + self.udn_assignments + self.policies + self.bypass_macs
+
+
+SMALL = Tenant("small", nads=50, udn_assignments=1_000, policies=25, bypass_configs=10, macs_per_bypass=20)
+MEDIUM = Tenant("medium", nads=250, udn_assignments=10_000, policies=100, bypass_configs=50, macs_per_bypass=100)
+LARGE = Tenant("large", nads=2_000, udn_assignments=100_000, policies=500, bypass_configs=200, macs_per_bypass=500)
+
+TENANTS = [
+    SMALL,
+    MEDIUM,
+    pytest.param(
+        LARGE,
+        marks=pytest.mark.skipif(
+            not os.environ.get("RADIUS_BENCHMARK_LARGE"),
+            reason="set RADIUS_BENCHMARK_LARGE=1 to run the large tenant",
+        ),
+        id="large",
+    ),
+]
+
+
+def _mac(prefix: int, i: int) -> str:
+    return f"02:{prefix:02x}:{i >> 24 & 0xff:02x}:{i >> 16 & 0xff:02x}:{i >> 8 & 0xff:02x}:{i & 0xff:02x}"
+
+
+def seed_tenant(db: Session, tenant: Tenant) -> None:
+    """Bulk insert a tenant's NADs, assignments, policies and bypass lists."""
+    db.execute(insert(RadiusClient), [
+        {
+            "name": f"nad-{i}",
+            "ipaddr": f"10.{i >> 16 & 0xff}.{i >> 8 & 0xff}.{i & 0xff}" if i % 10 else f"10.200.{i >> 8 & 0xff}.0/24",
+            "secret": f"nad-secret-{i:06d}",
+            "nas_type": "other",
+            "network_id": f"N_{i % 20}",
+            "is_active": True,
+        }
+        for i in range(tenant.nads)
+    ])
+    db.execute(insert(UdnAssignment), [
+        {
+            "user_id": i,
+            "udn_id": 2 + i,
+            "user_name": f"Resident {i}",
+            "user_email": f"resident{i}@example.com",
+            "unit": str(100 + i % 900),
+            "mac_address": _mac(0, i) if i % 2 == 0 else None,
+            "is_active": True,
+        }
+        for i in range(tenant.udn_assignments)
+    ])
+    db.execute(insert(RadiusPolicy), [
+        {
+            "name": f"policy-{i}",
+            "group_name": f"group-{i % 10}",
+            "priority": i,
+            "policy_type": "user",
+            "vlan_id": 100 + i % 50,
+            "session_timeout": 3600,
+            "registered_group_policy": f"Registered-{i % 5}",
+            "reply_attributes": [{"attribute": "Reply-Message", "value": f"policy {i}"}],
+            "is_active": True,
+        }
+        for i in range(tenant.policies)
+    ])
+    db.execute(insert(RadiusMacBypassConfig), [
+        {
+            "name": f"bypass-{i}",
+            "mac_addresses": [_mac(1 + i % 200, j) for j in range(tenant.macs_per_bypass)],
+            "bypass_mode": "whitelist",
+            "is_active": True,
+        }
+        for i in range(tenant.bypass_configs)
+    ])
+    db.commit()
+
+
+@contextlib.contextmanager
+def patched_settings(config_dir: Path):
+    """Point every generator at ``config_dir``."""
+    settings = MagicMock()
+    settings.radius_config_path = str(config_dir)
+    settings.radius_clients_path = str(config_dir / "clients")
+    settings.radius_certs_path = str(config_dir / "certs")
+    settings.database_url = "postgresql://radius:radius-password@db:5432/radius"
+    for path in (config_dir / "clients", config_dir / "certs"):
+        path.mkdir(parents=True, exist_ok=True)
+    with contextlib.ExitStack() as stack:
+        for module in SETTINGS_MODULES:
+            stack.enter_context(patch(f"{module}.get_settings", return_value=settings))
+        yield settings
+
+
+def _mac_bypass_policies(db: Session, config_dir: Path) -> Path:
+    guest_id, registered_id = create_default_profiles(db)
+    config = MacBypassPolicyConfig(guest_profile_id=guest_id, registered_profile_id=registered_id)
+    return MacBypassPolicyGenerator().write_mac_bypass_policies(
+        db, config, config_dir / "policy.d" / "mac_bypass"
+    )
+
+
+# Stage name -> (callable, tenant dimension its cost should scale with;
+# None for output whose size doesn't depend on the tenant)
+STAGES = {
+    "clients": (lambda db, _: ConfigGenerator().generate_clients_conf(db), "nads"),
+    "users": (lambda db, _: ConfigGenerator().generate_users_file(db), "udn_assignments"),
+    "policies": (lambda db, _: PolicyGenerator().generate_policy_file(db), "policies"),
+    "mac_bypass_users": (lambda db, _: PskConfigGenerator().generate_mac_bypass_file(db), "bypass_macs"),
+    "sql_module": (lambda db, _: SqlConfigGenerator().write_sql_module_config(db), None),
+    "virtual_servers": (lambda db, _: VirtualServerGenerator().write_all_virtual_servers(db), None),
+    "mac_bypass_policies": (_mac_bypass_policies, None),
+    "generate_all": (lambda db, _: ConfigGenerator().generate_all(db), "entities"),
+}
+
+
+def measure_tenant(db: Session, config_dir: Path, tenant: Tenant) -> dict[str, float]:
+    """Seed ``tenant`` and return the best-of-REPEATS time per stage in ms."""
+    seed_tenant(db, tenant)
+    timings = {}
+    with patched_settings(config_dir):
+        for stage, (run, _) in STAGES.items():
+            best = float("inf")
+            for _ in range(REPEATS):
+                db.expire_all()
+                start = time.perf_counter()
+                run(db, config_dir)
+                best = min(best, time.perf_counter() - start)
+            timings[stage] = best * 1000
+    return timings
+
+
+def report(tenant: Tenant, timings: dict[str, float]) -> None:
+    """Print a per-stage table."""
+    print(f"\nconfig generation @ {tenant.name} tenant "
+          f"({tenant.nads:,} NADs, {tenant.udn_assignments:,} UDNs, "
+          f"{tenant.policies:,} policies, {tenant.bypass_macs:,} bypass MACs):")
+    for stage, ms in timings.items():
+        print(f"  {stage:<20} {ms:10.1f} ms")
+
+
+def _load_baselines() -> dict:
+    if BASELINE_FILE.exists():
+        return json.loads(BASELINE_FILE.read_text())
+    return {}
+
+
+def _save_baseline(tenant: Tenant, timings: dict[str, float]) -> None:
+    baselines = _load_baselines()
+    baselines[tenant.name] = {stage: round(ms, 1) for stage, ms in timings.items()}
+    BASELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture
+def bench_db(db: Session):
+    """SQLite test session, or a PostgreSQL one if RADIUS_BENCHMARK_DATABASE_URL is set."""
+    url = os.environ.get("RADIUS_BENCHMARK_DATABASE_URL")
+    if not url:
+        yield db
+        return
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def _reset(db: Session) -> None:
+    """Empty all tables between tenants in one test."""
+    db.rollback()
+    engine = db.get_bind()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+@pytest.mark.parametrize("tenant", TENANTS, ids=lambda t: t.name)
+def test_config_generation_within_budget(bench_db: Session, temp_config_dir, tenant: Tenant):
+    """Every generator stays within tolerance of its recorded baseline."""
+    timings = measure_tenant(bench_db, temp_config_dir, tenant)
+    report(tenant, timings)
+
+    users_file = (temp_config_dir / "users").read_text()
+    assert f"# Total assignments: {tenant.udn_assignments}" in users_file
+    assert bench_db.execute(select(RadiusClient.id)).scalars().all()
+
+    if os.environ.get("RADIUS_BENCHMARK_UPDATE"):
+        _save_baseline(tenant, timings)
+        pytest.skip(f"Recorded baseline for {tenant.name} tenant in {BASELINE_FILE.name}")
+
+    baseline = _load_baselines().get(tenant.name)
+    if not baseline:
+        pytest.skip(f"No baseline for {tenant.name} tenant (run with RADIUS_BENCHMARK_UPDATE=1)")
+
+    regressions = []
+    for stage, ms in timings.items():
+        expected = baseline.get(stage)
+        if expected is None:
+            continue
+        allowed = max(expected * (1 + TOLERANCE), expected + MIN_SLACK_MS)
+        if ms > allowed:
+            regressions.append(f"{stage}: {ms:.1f} ms > {allowed:.1f} ms (baseline {expected:.1f} ms)")
+    assert not regressions, "Config generation regressed:\n  " + "\n  ".join(regressions)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_config_generation_scales_linearly(bench_db: Session, temp_config_dir):
+    """Per-entity cost doesn't grow with tenant size (no N+1 or quadratic paths)."""
+    small = measure_tenant(bench_db, temp_config_dir / SMALL.name, SMALL)
+    _reset(bench_db)
+    medium = measure_tenant(bench_db, temp_config_dir / MEDIUM.name, MEDIUM)
+
+    problems = []
+    print("\nconfig generation scaling, small -> medium (time ratio / entity ratio):")
+    for stage, (_, dimension) in STAGES.items():
+        # Stages whose output doesn't depend on the tenant shouldn't slow down at all
+        growth = getattr(MEDIUM, dimension) / getattr(SMALL, dimension) if dimension else 1.0
+        ratio = medium[stage] / max(small[stage], 1.0) / growth
+        print(f"  {stage:<20} {small[stage]:8.1f} ms -> {medium[stage]:8.1f} ms  ({ratio:.2f})")
+        if ratio > SCALING_LIMIT:
+            problems.append(f"{stage}: per-entity cost grew {ratio:.1f}x (limit {SCALING_LIMIT}x)")
+    assert not problems, "Superlinear config generation:\n  " + "\n  ".join(problems)
@@ -0,0 +1,45 @@
+"""Benchmark for the in-process FreeRADIUS file parser.
+
+Parses a users file of 10k generated entries and reports the cost per entry.
+
+Run with:
+    pytest tests/performance -m performance -s
+"""
+
+import time
+
+import pytest
+
+from radius_app.core.config_generator import ConfigGenerator
+from radius_app.core.config_parser import parse_users_file
+from radius_app.db.models import UdnAssignment
+
+ENTRIES = 10_000
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_users_parser_per_entry_cost():
+    """Parsing a generated users file costs microseconds per entry."""
+    entries = []
+    for i in range(ENTRIES):
+        assignment = UdnAssignment(
+            id=i,
+            user_id=i,
+            udn_id=2 + i,
+            user_name=f"Resident {i}",
+            unit=str(100 + i % 900),
+            mac_address=f"02:00:00:{i >> 16 & 0xff:02x}:{i >> 8 & 0xff:02x}:{i & 0xff:02x}",
+        )
+        entries.append(ConfigGenerator._render_users_entry(assignment))
+    lines = "".join(entries).splitlines(True)
+
+    start = time.perf_counter()
+    parsed = parse_users_file(lines)
+    elapsed = time.perf_counter() - start
+
+    per_entry_us = elapsed / ENTRIES * 1_000_000
+    print(f"\nusers parser: {ENTRIES:,} entries in {elapsed * 1000:.1f} ms ({per_entry_us:.1f} µs/entry)")
+
+    assert parsed == ENTRIES
+    assert per_entry_us < 100
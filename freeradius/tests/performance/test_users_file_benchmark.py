@@ -0,0 +1,94 @@
+"""Benchmark for users file regeneration.
+
+Compares a cold render (every assignment rendered) with incremental
+regeneration after 1% of assignments change. The 100k case is skipped unless
+RADIUS_BENCHMARK_LARGE=1 is set.
+
+Run with:
+    pytest tests/performance -m performance -s
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from radius_app.core.config_generator import ConfigGenerator
+from radius_app.db.models import UdnAssignment
+
+SIZES = [
+    1_000,
+    10_000,
+    pytest.param(
+        100_000,
+        marks=pytest.mark.skipif(
+            not os.environ.get("RADIUS_BENCHMARK_LARGE"),
+            reason="set RADIUS_BENCHMARK_LARGE=1 to run the 100k benchmark",
+        ),
+    ),
+]
+
+
+def _seed_assignments(db: Session, count: int) -> None:
+    """Bulk insert active assignments, half with a MAC address."""
+    rows = [
+        {
+            "user_id": i,
+            "udn_id": 2 + i,
+            "user_name": f"Resident {i}",
+            "unit": str(100 + i % 900),
+            "mac_address": f"02:00:{i >> 24 & 0xff:02x}:{i >> 16 & 0xff:02x}:{i >> 8 & 0xff:02x}:{i & 0xff:02x}"
+            if i % 2 == 0 else None,
+            "is_active": True,
+        }
+        for i in range(count)
+    ]
+    db.execute(insert(UdnAssignment), rows)
+    db.commit()
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+@pytest.mark.parametrize("size", SIZES)
+def test_users_file_regeneration(db: Session, temp_config_dir, size: int):
+    """Incremental regeneration after a 1% change beats a cold render."""
+    _seed_assignments(db, size)
+
+    with patch("radius_app.core.config_generator.get_settings") as mock_settings:
+        mock_settings.return_value.radius_config_path = str(temp_config_dir)
+        mock_settings.return_value.radius_clients_path = str(temp_config_dir / "clients")
+        generator = ConfigGenerator()
+
+        start = time.perf_counter()
+        users_path = generator.generate_users_file(db)
+        cold_seconds = time.perf_counter() - start
+
+        changed = max(1, size // 100)
+        db.execute(
+            update(UdnAssignment)
+            .where(UdnAssignment.user_id < changed)
+            .values(unit="moved")
+        )
+        db.commit()
+
+        start = time.perf_counter()
+        generator.generate_users_file(db)
+        incremental_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        generator.generate_users_file(db)
+        unchanged_seconds = time.perf_counter() - start
+
+    print(
+        f"\nusers file @ {size:,} assignments: "
+        f"cold {cold_seconds * 1000:.1f} ms, "
+        f"1% changed {incremental_seconds * 1000:.1f} ms, "
+        f"unchanged {unchanged_seconds * 1000:.1f} ms "
+        f"({users_path.stat().st_size / 1024:.0f} KiB)"
+    )
+
+    assert f"# Total assignments: {size}" in users_path.read_text()
+    assert incremental_seconds < cold_seconds
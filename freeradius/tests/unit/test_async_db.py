@@ -0,0 +1,143 @@
+"""Unit tests for the optional async database session path."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from radius_app.db import database
+from radius_app.db.database import (
+    SyncSessionAdapter,
+    async_database_url,
+    dispose_async_engine,
+    get_async_db,
+    get_async_engine,
+)
+from radius_app.db.models import Base, RadiusClient, UdnAssignment
+
+
+HEADERS = {"Authorization": "Bearer test-token"}
+
+
+@pytest.fixture
+def async_settings(monkeypatch):
+    """Point the async engine at a database URL, resetting the cached engine."""
+    def _use(db_url):
+        monkeypatch.setattr(database, "get_settings", lambda: SimpleNamespace(database_url=db_url))
+    monkeypatch.setattr(database, "_async_engine", None)
+    monkeypatch.setattr(database, "_AsyncSessionLocal", None)
+    yield _use
+    asyncio.run(dispose_async_engine())
+
+
+@pytest.mark.unit
+class TestAsyncDatabaseUrl:
+    """Test mapping sync URLs to async drivers."""
+
+    @pytest.mark.parametrize("db_url, expected", [
+        ("postgresql://u:p@db:5432/radius?sslmode=require", "postgresql+asyncpg://u:p@db:5432/radius?ssl=require"),
+        ("postgresql+psycopg2://u:p@db/radius", "postgresql+asyncpg://u:p@db/radius"),
+        ("mysql+pymysql://u:p@db:3306/radius", "mysql+aiomysql://u:p@db:3306/radius"),
+        ("sqlite:////data/radius.db", "sqlite+aiosqlite:////data/radius.db"),
+    ])
+    def test_maps_to_async_driver(self, monkeypatch, db_url, expected):
+        """Each backend gets its async driver; credentials survive."""
+        monkeypatch.setattr(database.importlib.util, "find_spec", lambda name: object())
+        assert async_database_url(db_url) == expected
+
+    def test_missing_driver(self, monkeypatch):
+        """Without the driver installed there is no async URL."""
+        monkeypatch.setattr(database.importlib.util, "find_spec", lambda name: None)
+        assert async_database_url("postgresql://u:p@db/radius") is None
+
+
+@pytest.mark.unit
+class TestAsyncSessions:
+    """Test the async engine and its fallback."""
+
+    def test_disabled_falls_back_to_sync_session(self, async_settings, monkeypatch, tmp_path):
+        """RADIUS_DATABASE_ASYNC=false yields a sync session adapter."""
+        monkeypatch.setenv("RADIUS_DATABASE_ASYNC", "false")
+        async_settings(f"sqlite:///{tmp_path}/radius.db")
+        assert get_async_engine() is None
+
+        async def first_session():
+            generator = get_async_db()
+            session = await generator.__anext__()
+            await generator.aclose()
+            return session
+
+        assert isinstance(asyncio.run(first_session()), SyncSessionAdapter)
+
+    def test_in_memory_sqlite_has_no_async_engine(self, async_settings):
+        """A second engine can't see an in-memory database, so none is made."""
+        async_settings("sqlite:///:memory:")
+        assert get_async_engine() is None
+
+    def test_endpoints_on_aiosqlite(self, async_settings, tmp_path):
+        """Ported endpoints query through a real aiosqlite engine."""
+        pytest.importorskip("aiosqlite")
+        pytest.importorskip("greenlet")
+        async_settings(f"sqlite:///{tmp_path}/radius.db")
+        engine = get_async_engine()
+        assert engine.url.drivername == "sqlite+aiosqlite"
+
+        async def seed():
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with database.get_async_session_local()() as session:
+                base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+                session.add(RadiusClient(name="nad-1", ipaddr="10.0.0.1", secret="s3cret-value"))
+                session.add_all(
+                    UdnAssignment(user_id=i, udn_id=100 + i, created_at=base + timedelta(minutes=i))
+                    for i in range(1, 4)
+                )
+                await session.commit()
+
+        asyncio.run(seed())
+
+        from radius_app.main import app
+        client = TestClient(app)
+        page = client.get("/api/udn-assignments?page_size=2", headers=HEADERS).json()
+        assert [item["user_id"] for item in page["items"]] == [3, 2]
+        assert page["total"] == 3
+        assert client.get("/api/udn-assignments?cursor=bogus", headers=HEADERS).status_code == 400
+
+        stats = client.get("/api/stats", headers=HEADERS).json()
+        assert (stats["total_clients"], stats["total_assignments"]) == (1, 3)
+        nads = client.get("/api/nads", headers=HEADERS).json()
+        assert [item["name"] for item in nads["items"]] == ["nad-1"]
+
+    def test_api_works_without_greenlet(self, tmp_path):
+        """Without greenlet the API still imports and serves async endpoints."""
+        script = textwrap.dedent("""
+            import sys
+            sys.modules["greenlet"] = None  # Simulate greenlet not installed
+
+            from fastapi.testclient import TestClient
+            from radius_app.db.database import get_engine
+            from radius_app.db.models import Base
+            from radius_app.main import app
+
+            Base.metadata.create_all(get_engine())
+            response = TestClient(app).get("/api/nads", headers={"Authorization": "Bearer test-token"})
+            print(response.status_code, response.json()["items"])
+        """)
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp_path}/radius.db",
+            "PYTHONPATH": str(Path(database.__file__).parents[2]),
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=60
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "200 []"
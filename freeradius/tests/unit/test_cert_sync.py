@@ -0,0 +1,145 @@
+"""Unit tests for the incremental portal -> RADIUS certificate sync."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from radius_app.core import cert_sync
+from radius_app.core.cert_sync import SYNC_STATE_NAME, CertificateSyncService
+from radius_app.db.models import RadiusSyncState, RadiusUserCertificate
+
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def portal_engine():
+    """Portal database with minimal users and user_certificates tables."""
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(255))"))
+        conn.execute(text(
+            "CREATE TABLE user_certificates (id INTEGER PRIMARY KEY, user_id INTEGER, "
+            "subject_common_name VARCHAR(255), subject_distinguished_name VARCHAR(500), "
+            "certificate_fingerprint VARCHAR(100), serial_number VARCHAR(100), "
+            "valid_from DATETIME, valid_until DATETIME, status VARCHAR(20), certificate TEXT, "
+            "updated_at DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO users (id, email) VALUES (1, 'alice@example.com'), (2, 'bob@example.com')"
+        ))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def service(db, portal_engine, tmp_path, monkeypatch):
+    """Sync service wired to the test RADIUS database and portal."""
+    monkeypatch.setattr(cert_sync, "get_session_local", lambda: sessionmaker(bind=db.get_bind()))
+    monkeypatch.setattr(cert_sync, "get_portal_engine", lambda url: portal_engine)
+    sync = CertificateSyncService(certs_path=tmp_path / "users")
+    sync._reload_freeradius = AsyncMock(return_value=True)
+    return sync
+
+
+def add_cert(portal_engine, cert_id, user_id, status="active", updated=T0):
+    """Insert a portal certificate."""
+    with portal_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO user_certificates VALUES (:id, :user_id, :cn, :dn, :fp, :serial, "
+            ":valid_from, :valid_until, :status, :pem, :updated)"
+        ), {
+            "id": cert_id, "user_id": user_id, "cn": f"cert-{cert_id}", "dn": f"CN=cert-{cert_id}",
+            "fp": f"fp-{cert_id}", "serial": f"serial-{cert_id}", "valid_from": T0,
+            "valid_until": T0 + timedelta(days=365), "status": status,
+            "pem": f"-----PEM {cert_id}-----", "updated": updated,
+        })
+
+
+def set_status(portal_engine, cert_id, status, updated):
+    """Change a portal certificate's status."""
+    with portal_engine.begin() as conn:
+        conn.execute(text(
+            "UPDATE user_certificates SET status = :status, updated_at = :updated WHERE id = :id"
+        ), {"status": status, "updated": updated, "id": cert_id})
+
+
+@pytest.mark.unit
+class TestIncrementalCertSync:
+    """Test high-water-mark syncing, file writes and reloads."""
+
+    @pytest.mark.asyncio
+    async def test_first_sync_is_full(self, service, portal_engine, db):
+        """Every certificate is synced and each user's file holds their active PEMs."""
+        add_cert(portal_engine, 1, 1)
+        add_cert(portal_engine, 2, 1, updated=T0 + timedelta(minutes=1))
+        add_cert(portal_engine, 3, 2, status="revoked")
+
+        stats = await service.sync_certificates()
+
+        assert stats["success"] and stats["full_sync"]
+        assert (stats["certificates_added"], stats["users_changed"]) == (3, 1)
+        assert (service.certs_path / "alice_at_example_com.pem").read_text() == (
+            "-----PEM 1-----\n-----PEM 2-----\n"
+        )
+        assert not (service.certs_path / "bob_at_example_com.pem").exists()
+        service._reload_freeradius.assert_awaited_once()
+
+        state = db.get(RadiusSyncState, SYNC_STATE_NAME)
+        assert state.cursor_at.replace(tzinfo=timezone.utc) == T0 + timedelta(minutes=1)
+        assert state.cursor_id == 2
+
+    @pytest.mark.asyncio
+    async def test_unchanged_poll_does_nothing(self, service, portal_engine):
+        """A sync with no new changes writes nothing and doesn't reload."""
+        add_cert(portal_engine, 1, 1)
+        await service.sync_certificates()
+        service._reload_freeradius.reset_mock()
+
+        stats = await service.sync_certificates()
+
+        assert not stats["full_sync"]
+        assert (stats["certificates_added"], stats["certificates_updated"], stats["users_changed"]) == (0, 0, 0)
+        service._reload_freeradius.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_only_changes_after_mark_are_read(self, service, portal_engine, db):
+        """Revocations and new certificates after the mark are applied; older rows are skipped."""
+        add_cert(portal_engine, 1, 1)
+        add_cert(portal_engine, 2, 2, updated=T0 - timedelta(minutes=1))
+        await service.sync_certificates()
+
+        later = T0 + timedelta(hours=1)
+        set_status(portal_engine, 1, "revoked", later)
+        add_cert(portal_engine, 3, 2, updated=later + timedelta(seconds=1))
+
+        stats = await service.sync_certificates()
+
+        assert stats["total_synced"] == 2
+        assert (stats["certificates_added"], stats["certificates_revoked"]) == (1, 1)
+        assert not (service.certs_path / "alice_at_example_com.pem").exists()
+        assert (service.certs_path / "bob_at_example_com.pem").read_text() == (
+            "-----PEM 2-----\n-----PEM 3-----\n"
+        )
+        statuses = dict(db.execute(
+            select(RadiusUserCertificate.portal_certificate_id, RadiusUserCertificate.status)
+        ).tuples().all())
+        assert statuses == {1: "revoked", 2: "active", 3: "active"}
+
+    @pytest.mark.asyncio
+    async def test_batches_advance_the_mark(self, service, portal_engine, db, monkeypatch):
+        """Syncs larger than a batch walk every row once."""
+        monkeypatch.setattr(cert_sync, "BATCH_SIZE", 2)
+        for cert_id in range(1, 6):
+            add_cert(portal_engine, cert_id, 1 + cert_id % 2, updated=T0 + timedelta(minutes=cert_id))
+        await service.sync_certificates()
+
+        for cert_id in range(1, 6):
+            set_status(portal_engine, cert_id, "revoked", T0 + timedelta(hours=1, minutes=cert_id))
+        stats = await service.sync_certificates()
+
+        assert stats["certificates_revoked"] == 5
+        assert db.get(RadiusSyncState, SYNC_STATE_NAME).cursor_id == 5
@@ -0,0 +1,362 @@
+"""Unit tests for the configuration change feed and event-driven watcher."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from radius_app.core import change_feed
+from radius_app.core.change_feed import (
+    ChangeCursor,
+    ChangeNotifier,
+    get_latest_change_id,
+    install_change_triggers,
+    prune_changes,
+    record_changes,
+    register_session_hooks,
+)
+from radius_app.core.db_watcher import DatabaseWatcher
+from radius_app.db.models import RadiusClient, RadiusConfigChange, UdnAssignment
+
+
+@pytest.fixture
+def feed_state(monkeypatch):
+    """Isolate module-level change feed state between tests."""
+    monkeypatch.setattr(change_feed, "_triggers_active", False)
+    monkeypatch.setattr(change_feed, "_notifier", ChangeNotifier())
+    yield
+    for name, fn in (
+        ("after_flush", change_feed._on_after_flush),
+        ("after_commit", change_feed._on_after_commit),
+        ("after_soft_rollback", change_feed._on_after_rollback),
+    ):
+        if event.contains(Session, name, fn):
+            event.remove(Session, name, fn)
+
+
+@pytest.mark.unit
+class TestChangeLogTriggers:
+    """Test trigger-populated change log."""
+
+    def test_triggers_log_insert_update_delete(self, db, feed_state):
+        """Inserts, in-place updates and deletes are all recorded."""
+        assert install_change_triggers(db.get_bind()) is True
+        assert change_feed.triggers_active()
+
+        client = RadiusClient(name="nad-1", ipaddr="10.0.0.1", secret="s3cret-value")
+        db.add(client)
+        db.commit()
+
+        # Update that doesn't touch updated_at semantics still gets logged
+        client.secret = "rotated-secret"
+        db.commit()
+
+        db.delete(client)
+        db.commit()
+
+        operations = [
+            row.operation
+            for row in db.query(RadiusConfigChange).order_by(RadiusConfigChange.id)
+        ]
+        assert operations == ["INSERT", "UPDATE", "DELETE"]
+
+    def test_triggers_are_idempotent(self, db, feed_state):
+        """Installing twice doesn't fail or duplicate log rows."""
+        install_change_triggers(db.get_bind())
+        install_change_triggers(db.get_bind())
+
+        db.add(UdnAssignment(user_id=1, udn_id=100))
+        db.commit()
+
+        assert db.query(RadiusConfigChange).count() == 1
+
+    def test_read_changes_by_cursor(self, db, feed_state):
+        """Cursor reads only return tables changed after the cursor."""
+        install_change_triggers(db.get_bind())
+
+        db.add(RadiusClient(name="nad-1", ipaddr="10.0.0.1", secret="s3cret-value"))
+        db.commit()
+        cursor = ChangeCursor(position=get_latest_change_id(db))
+
+        db.add(UdnAssignment(user_id=1, udn_id=100))
+        db.commit()
+
+        changes = cursor.read(db)
+        assert {change.table_name for change in changes} == {"udn_assignments"}
+        cursor.advance({change.id for change in changes})
+
+        assert cursor.read(db) == []
+
+    def test_prune_keeps_recent_rows(self, db, feed_state):
+        """Consumed rows inside the retention window are kept."""
+        install_change_triggers(db.get_bind())
+        db.add(UdnAssignment(user_id=1, udn_id=100))
+        db.commit()
+        cursor = get_latest_change_id(db)
+
+        assert prune_changes(db, cursor) == 0
+        assert db.query(RadiusConfigChange).count() == 1
+
+
+def log_change(db, change_id, table="udn_assignments", row_id=None):
+    """Commit a change-log row with an explicit id (simulates commit order)."""
+    db.add(RadiusConfigChange(id=change_id, table_name=table, row_id=row_id, operation="UPDATE"))
+    db.commit()
+
+
+@pytest.mark.unit
+class TestChangeCursor:
+    """Test consuming the change log when commits land out of id order."""
+
+    def test_late_commit_below_cursor_is_read(self, db):
+        """A lower id committed after a higher one is still consumed."""
+        cursor = ChangeCursor(position=0)
+        log_change(db, 1)
+        log_change(db, 3, table="radius_clients")
+
+        changes = cursor.read(db)
+        assert [change.id for change in changes] == [1, 3]
+        assert cursor.advance({1, 3}, now=0) == 1
+        assert cursor.read(db) == []
+
+        log_change(db, 2, row_id=7)
+        changes = cursor.read(db)
+        assert [(change.id, change.row_id) for change in changes] == [(2, 7)]
+        assert cursor.advance({2}, now=1) == 3
+
+    def test_gap_never_filled_is_skipped(self, db):
+        """An id left by a rolled-back transaction stops holding the cursor back."""
+        cursor = ChangeCursor(position=0, gap_timeout=60)
+        log_change(db, 2)
+
+        assert cursor.advance({change.id for change in cursor.read(db)}, now=0) == 0
+        assert cursor.advance(set(), now=30) == 0
+        assert cursor.advance(set(), now=61) == 2
+
+    def test_prune_after_read(self, db):
+        """Rows the watcher just loaded in the same session can be pruned."""
+        old = datetime.now(timezone.utc) - timedelta(hours=2)
+        for change_id in (1, 2):
+            db.add(RadiusConfigChange(
+                id=change_id, table_name="udn_assignments", operation="UPDATE", changed_at=old
+            ))
+        db.commit()
+        cursor = ChangeCursor(position=0)
+        changes = cursor.read(db)  # Still referenced, as in the watcher
+        cursor.advance({change.id for change in changes})
+
+        assert prune_changes(db, cursor.position) == 1
+        assert [change.id for change in db.query(RadiusConfigChange)] == [2]
+
+    def test_ids_not_reused_after_prune(self, db):
+        """A change logged after a prune lands above the cursor."""
+        old = datetime.now(timezone.utc) - timedelta(hours=2)
+        db.add_all(
+            RadiusConfigChange(table_name="udn_assignments", operation="UPDATE", changed_at=old)
+            for _ in range(3)
+        )
+        db.commit()
+        cursor = ChangeCursor(position=0)
+        cursor.advance({change.id for change in cursor.read(db)})
+        prune_changes(db, cursor.position)
+        db.query(RadiusConfigChange).delete()  # Even if the log ends up empty
+        db.commit()
+
+        record_changes(db, ["radius_clients"])
+        db.commit()
+
+        assert [change.table_name for change in cursor.read(db)] == ["radius_clients"]
+
+
+@pytest.mark.unit
+class TestOrmChangeHooks:
+    """Test ORM hooks used when triggers are unavailable."""
+
+    def test_hooks_record_changes_without_triggers(self, db, feed_state):
+        """ORM commits write change rows and wake the notifier."""
+        register_session_hooks()
+        notifier = change_feed.get_change_notifier()
+
+        db.add(UdnAssignment(user_id=1, udn_id=100))
+        db.commit()
+
+        rows = db.query(RadiusConfigChange).all()
+        assert [(r.table_name, r.operation) for r in rows] == [("udn_assignments", "INSERT")]
+        assert notifier.notifications == 1
+
+    def test_hooks_ignore_unwatched_tables(self, db, feed_state):
+        """Commits that don't touch config tables don't wake the watcher."""
+        from radius_app.db.models import RadiusSession
+        from datetime import datetime, timezone
+
+        register_session_hooks()
+        notifier = change_feed.get_change_notifier()
+
+        db.add(RadiusSession(
+            session_id="abc",
+            username="user",
+            nas_ip="10.0.0.1",
+            session_start=datetime.now(timezone.utc),
+        ))
+        db.commit()
+
+        assert db.query(RadiusConfigChange).count() == 0
+        assert notifier.notifications == 0
+
+
+@pytest.mark.unit
+class TestChangeNotifier:
+    """Test watcher wake-up signalling."""
+
+    @pytest.mark.asyncio
+    async def test_notify_wakes_waiter(self):
+        """A notification wakes the watcher before the fallback timeout."""
+        notifier = ChangeNotifier()
+        waiter = asyncio.create_task(notifier.wait(30))
+        await asyncio.sleep(0)
+        notifier.notify()
+        assert await asyncio.wait_for(waiter, 1) is True
+
+    @pytest.mark.asyncio
+    async def test_notify_before_wait_is_not_lost(self):
+        """Notifications sent before the loop starts waiting are kept."""
+        notifier = ChangeNotifier()
+        notifier.notify()
+        assert await notifier.wait(0.01) is True
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out(self):
+        """Without notifications the wait falls back to polling."""
+        notifier = ChangeNotifier()
+        assert await notifier.wait(0.01) is False
+
+
+@pytest.mark.unit
+class TestDatabaseWatcherChangeFeed:
+    """Test DatabaseWatcher consuming the change log."""
+
+    @pytest.fixture
+    def watcher(self, db, temp_config_dir, feed_state):
+        """Watcher with mocked generators bound to the test session."""
+        install_change_triggers(db.get_bind())
+
+        settings = MagicMock()
+        settings.radius_config_path = str(temp_config_dir)
+        settings.radius_clients_path = str(temp_config_dir / "clients")
+        (temp_config_dir / "sites-enabled").mkdir()
+        (temp_config_dir / "sites-enabled" / "default").write_text("")
+
+        def get_db_override():
+            yield db
+
+        with patch("radius_app.core.db_watcher.ConfigGenerator"), \
+             patch("radius_app.core.db_watcher.PolicyGenerator"), \
+             patch("radius_app.core.db_watcher.RadSecConfigGenerator"), \
+             patch("radius_app.core.db_watcher.get_settings", return_value=settings), \
+             patch("radius_app.core.db_watcher.get_db", get_db_override), \
+             patch.object(DatabaseWatcher, "_validate_all_configs", return_value=True), \
+             patch.object(DatabaseWatcher, "_reload_radiusd", return_value=True):
+            watcher = DatabaseWatcher(poll_interval=1)
+            watcher._initialized = True
+            watcher.last_change_id = 0
+            yield watcher
+
+    @pytest.mark.asyncio
+    async def test_delete_triggers_regeneration(self, db, watcher):
+        """Deleting an assignment regenerates the users file."""
+        assignment = UdnAssignment(user_id=1, udn_id=100)
+        db.add(assignment)
+        db.commit()
+        await watcher.check_and_regenerate()
+
+        db.delete(assignment)
+        db.commit()
+        result = await watcher.check_and_regenerate()
+
+        assert result["users_regenerated"] is True
+        assert result["clients_regenerated"] is False
+        assert result["reloaded"] is True
+        assert watcher.last_change_id == get_latest_change_id(db)
+
+    @pytest.mark.asyncio
+    async def test_users_regeneration_passes_changed_ids(self, db, watcher):
+        """Only assignment ids from the change log are handed to the generator."""
+        db.add_all([UdnAssignment(user_id=1, udn_id=100), UdnAssignment(user_id=2, udn_id=101)])
+        db.commit()
+        await watcher.check_and_regenerate()
+
+        assignment = db.query(UdnAssignment).filter_by(udn_id=101).one()
+        assignment.unit = "204"
+        db.commit()
+        assignment_id = assignment.id
+        await watcher.check_and_regenerate()
+
+        generate = watcher.config_generator.generate_users_file
+        assert generate.call_args.kwargs["changed_ids"] == {assignment_id}
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_commit_regenerates(self, db, watcher):
+        """A change committed after a higher id still regenerates its file."""
+        log_change(db, 1, table="radius_clients")
+        log_change(db, 3, table="radius_clients")
+        await watcher.check_and_regenerate()
+        assert watcher.last_change_id == 1
+
+        log_change(db, 2, row_id=42)
+        result = await watcher.check_and_regenerate()
+
+        assert result["users_regenerated"] is True
+        assert result["clients_regenerated"] is False
+        generate = watcher.config_generator.generate_users_file
+        assert generate.call_args.kwargs["changed_ids"] == {42}
+        assert watcher.last_change_id == 3
+
+    @pytest.mark.asyncio
+    async def test_invalid_config_is_retried(self, db, watcher):
+        """A cycle that fails validation doesn't reload or consume its changes."""
+        log_change(db, 1, table="radius_clients")
+
+        with patch.object(watcher, "_validate_all_configs", return_value=False):
+            result = await watcher.check_and_regenerate()
+
+        assert result["validation_failed"] is True
+        assert result["reloaded"] is False
+        assert watcher.last_change_id == 0
+
+        result = await watcher.check_and_regenerate()
+        assert result["clients_regenerated"] is True
+        assert watcher.last_change_id == 1
+
+    @pytest.mark.asyncio
+    async def test_no_changes_no_regeneration(self, db, watcher):
+        """An empty change log doesn't regenerate or reload."""
+        result = await watcher.check_and_regenerate()
+
+        assert not any(result.values())
+        watcher.config_generator.generate_users_file.assert_not_called()
+
+
+@pytest.mark.unit
+class TestNotifyEndpoint:
+    """Test POST /api/config/notify."""
+
+    def test_notify_records_changes_without_triggers(self, client, db, feed_state):
+        """Without triggers the notify call records the changed tables."""
+        response = client.post(
+            "/api/config/notify",
+            json={"tables": ["udn_assignments", "not_a_config_table"]},
+            headers={"Authorization": "Bearer test-token"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"accepted": True, "recorded": 1}
+        assert change_feed.get_change_notifier().notifications == 1
+        assert [change.table_name for change in ChangeCursor().read(db)] == ["udn_assignments"]
+
+    def test_notify_requires_auth(self, client, feed_state):
+        """Notify endpoint requires the API token."""
+        response = client.post("/api/config/notify", json={"tables": []})
+        assert response.status_code == 401
@@ -0,0 +1,201 @@
+"""Unit tests for bulk CoA resolution, rate limiting and NDJSON streaming."""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from radius_app.core.coa_bulk import (
+    BulkCoARunner,
+    SessionSelector,
+    TokenBucket,
+    mac_variants,
+    resolve_bulk_plan,
+)
+from radius_app.db.models import (
+    DeviceRegistration,
+    RadiusClient,
+    RadiusClientExtended,
+    RadiusSession,
+)
+
+
+class FakeCoAClient:
+    """Records requests and tracks per-NAD concurrency."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = {}
+        self.peak = {}
+
+    async def _record(self, nad_ip, **kwargs):
+        self.calls.append((nad_ip, kwargs))
+        self.in_flight[nad_ip] = self.in_flight.get(nad_ip, 0) + 1
+        self.peak[nad_ip] = max(self.peak.get(nad_ip, 0), self.in_flight[nad_ip])
+        await asyncio.sleep(self.delay)
+        self.in_flight[nad_ip] -= 1
+        return {"success": kwargs.get("user_name") != "fails", "nad_ip": nad_ip}
+
+    async def send_disconnect_request(self, nad_ip, nad_port, shared_secret, **kwargs):
+        return await self._record(nad_ip, action="disconnect", port=nad_port, **kwargs)
+
+    async def send_coa_request(self, nad_ip, nad_port, shared_secret, **kwargs):
+        return await self._record(nad_ip, action="coa", port=nad_port, **kwargs)
+
+
+@pytest.fixture
+def sessions_db(db):
+    """Two CoA-enabled NADs (one by CIDR), one with CoA disabled, and sessions."""
+    nad_a = RadiusClient(name="ap-a", ipaddr="10.0.0.1", secret="secret-a-123", network_id="N_1")
+    nad_b = RadiusClient(name="ap-b", ipaddr="10.1.0.0/24", secret="secret-b-123", network_id="N_2")
+    nad_off = RadiusClient(name="ap-off", ipaddr="10.2.0.1", secret="secret-c-123", network_id="N_1")
+    db.add_all([nad_a, nad_b, nad_off])
+    db.flush()
+    db.add_all([
+        RadiusClientExtended(radius_client_id=nad_a.id, coa_enabled=True, coa_port=4799),
+        RadiusClientExtended(radius_client_id=nad_off.id, coa_enabled=False),
+    ])
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        ("s1", "alice", "10.0.0.1", "AA-BB-CC-00-00-01"),
+        ("s2", "bob", "10.0.0.1", "AA-BB-CC-00-00-02"),
+        ("s3", "carol", "10.1.0.17", "aa:bb:cc:00:00:03"),
+        ("s4", "dave", "10.2.0.1", "AA-BB-CC-00-00-04"),
+        ("s5", "erin", "192.0.2.9", "AA-BB-CC-00-00-05"),
+    ]
+    for session_id, user, nas_ip, mac in rows:
+        db.add(RadiusSession(
+            session_id=session_id, username=user, nas_ip=nas_ip,
+            calling_station_id=mac, session_start=now,
+        ))
+    db.add(RadiusSession(
+        session_id="old", username="alice", nas_ip="10.0.0.1",
+        calling_station_id="AA-BB-CC-00-00-01", session_start=now, is_active=False,
+    ))
+    db.add_all([
+        DeviceRegistration(mac_address="aa:bb:cc:00:00:01", psk="x" * 12, group_policy="Staff"),
+        DeviceRegistration(mac_address="aa:bb:cc:00:00:03", psk="x" * 12, group_policy="Staff"),
+    ])
+    db.commit()
+    return {"a": nad_a.id, "b": nad_b.id, "off": nad_off.id}
+
+
+@pytest.mark.unit
+class TestResolveBulkPlan:
+    """Test selector resolution."""
+
+    def test_mac_variants(self):
+        """All common Calling-Station-Id spellings are generated."""
+        variants = mac_variants("AA:bb:CC:00:00:01")
+        assert "aa:bb:cc:00:00:01" in variants
+        assert "AA-BB-CC-00-00-01" in variants
+        assert "aabbcc000001" in variants
+        assert mac_variants("not-a-mac") == []
+
+    def test_group_policy_selector(self, db, sessions_db):
+        """Group policy resolves to registered MACs in any case/format."""
+        plan = resolve_bulk_plan(db, SessionSelector(group_policy="Staff"))
+
+        grouped = {nad_id: [t.session_id for t in targets] for nad_id, (_, targets) in plan.by_nad.items()}
+        assert grouped == {sessions_db["a"]: ["s1"], sessions_db["b"]: ["s3"]}
+        endpoint_a = plan.by_nad[sessions_db["a"]][0]
+        assert (endpoint_a.ip, endpoint_a.port) == ("10.0.0.1", 4799)
+        assert plan.by_nad[sessions_db["b"]][0].port == 3799
+
+    def test_unreachable_sessions_reported(self, db, sessions_db):
+        """Sessions on unknown or CoA-disabled NADs are listed as unresolved."""
+        plan = resolve_bulk_plan(db, SessionSelector(user_names=["dave", "erin", "bob"]))
+
+        assert plan.session_count == 1
+        reasons = sorted(reason for _, reason in plan.unresolved)
+        assert reasons == ["CoA is not enabled for NAD ap-off", "No active NAD for 192.0.2.9"]
+
+    def test_network_selector(self, db, sessions_db):
+        """Network filter keeps only sessions on that network's NADs."""
+        plan = resolve_bulk_plan(db, SessionSelector(network_id="N_1"))
+
+        assert list(plan.by_nad) == [sessions_db["a"]]
+        assert plan.session_count == 2
+        assert [t.session_id for t, _ in plan.unresolved] == ["s4"]
+
+    def test_mac_selector(self, db, sessions_db):
+        """Explicit MAC lists match regardless of separator."""
+        plan = resolve_bulk_plan(db, SessionSelector(macs=["aabbcc000002", "AA:BB:CC:00:00:03"]))
+
+        sessions = sorted(t.session_id for _, targets in plan.by_nad.values() for t in targets)
+        assert sessions == ["s2", "s3"]
+
+
+@pytest.mark.unit
+class TestBulkRunner:
+    """Test fan-out limits."""
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_limits_rate(self):
+        """After the burst, tokens arrive at the configured rate."""
+        bucket = TokenBucket(rate=100, burst=1)
+        started = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        assert time.monotonic() - started >= 0.045
+
+    @pytest.mark.asyncio
+    async def test_per_nad_concurrency_cap(self, db, sessions_db):
+        """No NAD sees more than per_nad_concurrency requests at once."""
+        now = datetime.now(timezone.utc)
+        db.add_all([
+            RadiusSession(session_id=f"bulk-{i}", username=f"user-{i}", nas_ip="10.0.0.1", session_start=now)
+            for i in range(30)
+        ])
+        db.commit()
+        plan = resolve_bulk_plan(db, SessionSelector(nad_ids=[sessions_db["a"]]))
+        fake = FakeCoAClient(delay=0.005)
+        runner = BulkCoARunner(coa_client=fake, per_nad_concurrency=4, per_nad_rate=1000)
+
+        events = [event async for event in runner.run(plan, "disconnect")]
+
+        assert fake.peak["10.0.0.1"] <= 4
+        assert events[-1]["type"] == "summary"
+        assert events[-1]["succeeded"] == 32
+
+
+@pytest.mark.unit
+class TestBulkEndpoint:
+    """Test POST /api/coa/bulk."""
+
+    def test_streams_ndjson(self, client, db, sessions_db):
+        """Plan, per-session results and summary are streamed line by line."""
+        fake = FakeCoAClient()
+        with patch("radius_app.core.coa_bulk.CoAClient", return_value=fake):
+            response = client.post(
+                "/api/coa/bulk",
+                json={
+                    "selector": {"group_policy": "Staff"},
+                    "new_group_policy": "Staff-Restricted",
+                },
+                headers={"Authorization": "Bearer test-token"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert events[0] == {
+            "type": "plan", "action": "coa", "sessions": 2, "nads": 2, "unresolved": 0, "dry_run": False,
+        }
+        assert sorted(e["session_id"] for e in events[1:-1]) == ["s1", "s3"]
+        assert events[-1]["succeeded"] == 2
+        assert fake.calls[0][1]["attributes"]["Filter-Id"] == "Staff-Restricted"
+
+    def test_empty_selector_rejected(self, client):
+        """A selector without filters would target everything and is refused."""
+        response = client.post(
+            "/api/coa/bulk",
+            json={"selector": {}, "action": "disconnect"},
+            headers={"Authorization": "Bearer test-token"},
+        )
+        assert response.status_code == 400
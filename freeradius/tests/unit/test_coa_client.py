@@ -0,0 +1,245 @@
+"""Unit tests for the in-process RFC 5176 CoA/Disconnect client."""
+
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import struct
+
+import pytest
+
+from radius_app.core import radius_packet
+from radius_app.core.coa_config_generator import CoAClient
+from radius_app.core.radius_client import RadiusTimeoutError, RadiusUdpClient
+
+SECRET = "coa-secret"
+
+
+def request_authenticator_valid(packet: bytes, secret: str) -> bool:
+    """Check an RFC 5176 Request Authenticator."""
+    expected = hashlib.md5(packet[:4] + bytes(16) + packet[20:] + secret.encode()).digest()
+    return expected == packet[4:20]
+
+
+def message_authenticator_valid(packet: bytes, secret: str) -> bool:
+    """Check a request's Message-Authenticator (computed with a zero authenticator)."""
+    offset = 20
+    for attr_type, value in radius_packet.decode_attributes(packet[20:]):
+        if attr_type == radius_packet.ATTR_MESSAGE_AUTHENTICATOR:
+            signed = packet[:4] + bytes(16) + packet[20:offset + 2] + bytes(16) + packet[offset + 18:]
+            return hmac.new(secret.encode(), signed, hashlib.md5).digest() == value
+        offset += len(value) + 2
+    return False
+
+
+class CoAResponder(asyncio.DatagramProtocol):
+    """NAD stub: validates requests and answers ACK (or NAK / nothing)."""
+
+    def __init__(self, secret=SECRET, nak_cause=None, drop_first=0):
+        self.secret = secret
+        self.nak_cause = nak_cause
+        self.drop_first = drop_first
+        self.received = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.received.append(data)
+        if len(self.received) <= self.drop_first:
+            return
+        assert request_authenticator_valid(data, self.secret)
+        assert message_authenticator_valid(data, self.secret)
+        code = data[0] + (2 if self.nak_cause else 1)
+        body = b""
+        if self.nak_cause:
+            body = radius_packet.encode_named_attribute("Error-Cause", self.nak_cause)
+        header = struct.pack("!BBH", code, data[1], 20 + len(body))
+        authenticator = hashlib.md5(header + data[4:20] + body + self.secret.encode()).digest()
+        self.transport.sendto(header + authenticator + body, addr)
+
+
+@contextlib.asynccontextmanager
+async def nad_stubs():
+    """Start NAD stubs on ephemeral localhost ports."""
+    transports = []
+
+    async def start(**kwargs):
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_datagram_endpoint(
+            lambda: CoAResponder(**kwargs), local_addr=("127.0.0.1", 0)
+        )
+        transports.append(transport)
+        return protocol, transport.get_extra_info("sockname")[1]
+
+    try:
+        yield start
+    finally:
+        for transport in transports:
+            transport.close()
+
+
+@pytest.mark.unit
+class TestRequestEncoding:
+    """Test RFC 5176 packet construction."""
+
+    def test_request_and_message_authenticators(self):
+        """Both authenticators are valid for the shared secret."""
+        packet = radius_packet.build_request(
+            radius_packet.DISCONNECT_REQUEST, 5, SECRET, [("User-Name", "alice")]
+        )
+
+        assert packet[0] == radius_packet.DISCONNECT_REQUEST
+        assert request_authenticator_valid(packet, SECRET)
+        assert message_authenticator_valid(packet, SECRET)
+        assert not request_authenticator_valid(packet, "other")
+
+    def test_vendor_specific_attributes(self):
+        """VSAs are wrapped in type 26 and lists repeat the attribute."""
+        encoded = radius_packet.encode_named_attribute(
+            "Cisco-AVPair", ["url-redirect=", "air-group-policy-name=staff"]
+        )
+        decoded = radius_packet.decode_named_attributes(encoded)
+
+        assert encoded[0] == radius_packet.ATTR_VENDOR_SPECIFIC
+        assert decoded == [
+            ("Cisco-AVPair", "url-redirect="),
+            ("Cisco-AVPair", "air-group-policy-name=staff"),
+        ]
+
+    def test_tagged_and_enumerated_values(self):
+        """Tunnel attributes use RFC 2868 tags and named values."""
+        encoded = radius_packet.encode_named_attribute("Tunnel-Type", "VLAN")
+
+        assert encoded == bytes([64, 6, 0, 0, 0, 13])
+        assert radius_packet.decode_named_attributes(encoded) == [("Tunnel-Type", 13)]
+
+    def test_unknown_attribute_rejected(self):
+        """Attributes outside the dictionary raise a packet error."""
+        with pytest.raises(radius_packet.RadiusPacketError):
+            radius_packet.encode_named_attribute("Not-An-Attribute", "x")
+
+
+@pytest.mark.unit
+class TestRadiusUdpClient:
+    """Test the shared asyncio UDP transport."""
+
+    @pytest.mark.asyncio
+    async def test_disconnect_ack(self):
+        """A Disconnect-ACK reports success."""
+        async with nad_stubs() as start_stub:
+            _, port = await start_stub()
+            client = CoAClient(radius_client=RadiusUdpClient(timeout=1))
+            try:
+                result = await client.send_disconnect_request(
+                    "127.0.0.1", port, SECRET, user_name="alice", calling_station_id="aa-bb-cc-dd-ee-ff"
+                )
+            finally:
+                client.radius_client.close()
+
+            assert result["success"] is True
+            assert result["response"] == "Disconnect-ACK"
+            assert result["attempts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_nak_reports_error_cause(self):
+        """A CoA-NAK surfaces its Error-Cause."""
+        async with nad_stubs() as start_stub:
+            _, port = await start_stub(nak_cause=503)
+            client = CoAClient(radius_client=RadiusUdpClient(timeout=1))
+            try:
+                result = await client.send_coa_request(
+                    "127.0.0.1", port, SECRET, user_name="alice",
+                    attributes={"Filter-Id": "guest", "Cisco-AVPair": ["url-redirect="]},
+                )
+            finally:
+                client.radius_client.close()
+
+            assert result["success"] is False
+            assert result["error_cause"] == 503
+            assert "Session Context Not Found" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_retransmits_identical_packet(self):
+        """Lost requests are retransmitted with the same id and authenticator."""
+        async with nad_stubs() as start_stub:
+            responder, port = await start_stub(drop_first=1)
+            radius_client = RadiusUdpClient(timeout=0.1, retries=2)
+            try:
+                response = await radius_client.send(
+                    "127.0.0.1", port, SECRET, radius_packet.DISCONNECT_REQUEST, [("User-Name", "bob")]
+                )
+            finally:
+                radius_client.close()
+
+            assert response.attempts == 2
+            assert responder.received[0] == responder.received[1]
+
+    @pytest.mark.asyncio
+    async def test_timeout_after_retries(self):
+        """A NAD that never answers raises after the retry budget."""
+        async with nad_stubs() as start_stub:
+            responder, port = await start_stub(drop_first=100)
+            radius_client = RadiusUdpClient(timeout=0.05, retries=2)
+            try:
+                with pytest.raises(RadiusTimeoutError):
+                    await radius_client.send(
+                        "127.0.0.1", port, SECRET, radius_packet.COA_REQUEST, [("User-Name", "bob")]
+                    )
+            finally:
+                radius_client.close()
+
+            assert len(responder.received) == 3
+
+    @pytest.mark.asyncio
+    async def test_close_fails_in_flight_request(self):
+        """Closing the client cancels a pending send without a KeyError."""
+        async with nad_stubs() as start_stub:
+            responder, port = await start_stub(drop_first=100)
+            radius_client = RadiusUdpClient(timeout=1, retries=0)
+            send = asyncio.create_task(radius_client.send(
+                "127.0.0.1", port, SECRET, radius_packet.COA_REQUEST, [("User-Name", "bob")]
+            ))
+            while not responder.received:
+                await asyncio.sleep(0.01)
+
+            radius_client.close()
+
+            with pytest.raises(asyncio.CancelledError):
+                await send
+            assert radius_client._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_wrong_secret_response_ignored(self):
+        """Responses signed with another secret don't complete the request."""
+        async with nad_stubs() as start_stub:
+            _, port = await start_stub(secret="not-the-secret")
+            client = CoAClient(radius_client=RadiusUdpClient(timeout=0.05, retries=0))
+            try:
+                result = await client.send_disconnect_request("127.0.0.1", port, SECRET, user_name="bob")
+            finally:
+                client.radius_client.close()
+
+            assert result["success"] is False
+            assert result["error"] == "Timeout waiting for NAD response"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_socket(self):
+        """Hundreds of concurrent disconnects are matched to their replies."""
+        async with nad_stubs() as start_stub:
+            responders = [await start_stub() for _ in range(2)]
+            client = CoAClient(radius_client=RadiusUdpClient(timeout=2))
+            try:
+                results = await asyncio.gather(*(
+                    client.send_disconnect_request(
+                        "127.0.0.1", responders[i % 2][1], SECRET, user_name=f"user-{i}"
+                    )
+                    for i in range(300)
+                ))
+                sockets = len(client.radius_client._transports)
+            finally:
+                client.radius_client.close()
+
+            assert all(result["success"] for result in results)
+            assert sum(len(r[0].received) for r in responders) == 300
+            assert sockets == 1
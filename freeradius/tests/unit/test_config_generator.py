@@ -147,3 +147,104 @@ class TestConfigGenerator:
             content = result_path.read_text()
             # Inactive MAC should not appear in content
             assert "11:22:33:44:55:66" not in content or "inactive" in content.lower()
+
+
+@pytest.mark.unit
+class TestIncrementalUsersFile:
+    """Test fragment-cached users file regeneration."""
+    
+    @pytest.fixture
+    def generator(self, temp_config_dir):
+        """Config generator writing into the temp config directory."""
+        with patch('radius_app.core.config_generator.get_settings') as mock_settings:
+            mock_settings.return_value.radius_config_path = str(temp_config_dir)
+            mock_settings.return_value.radius_clients_path = str(temp_config_dir / "clients")
+            yield ConfigGenerator()
+    
+    @staticmethod
+    def _add_assignments(db: Session, count: int) -> list[UdnAssignment]:
+        assignments = [
+            UdnAssignment(
+                user_id=i,
+                user_name=f"User {i}",
+                mac_address=f"aa:bb:cc:00:00:{i:02x}",
+                udn_id=100 + i,
+            )
+            for i in range(count)
+        ]
+        db.add_all(assignments)
+        db.commit()
+        return assignments
+    
+    def test_only_changed_entries_are_rendered(self, db: Session, generator):
+        """Unchanged assignments are served from the fragment cache."""
+        assignments = self._add_assignments(db, 5)
+        generator.generate_users_file(db)
+        
+        assignments[2].user_name = "Renamed"
+        db.commit()
+        
+        with patch.object(
+            ConfigGenerator, "_render_users_entry", wraps=ConfigGenerator._render_users_entry
+        ) as render:
+            result_path = generator.generate_users_file(db)
+        
+        assert render.call_count == 1
+        content = result_path.read_text()
+        assert "User ID: 2 - Renamed" in content
+        assert "User ID: 2 - User 2" not in content
+        assert content.count("Cisco-AVPair") == 5
+    
+    def test_incremental_output_matches_full_render(self, db: Session, generator):
+        """Spliced output is identical to a cold render apart from the timestamp."""
+        assignments = self._add_assignments(db, 6)
+        generator.generate_users_file(db)
+        
+        db.delete(assignments[0])
+        assignments[3].is_active = False
+        db.add(UdnAssignment(user_id=99, udn_id=102_000))
+        db.commit()
+        incremental = generator.generate_users_file(db).read_text()
+        
+        generator.invalidate_users_fragments()
+        full = generator.generate_users_file(db).read_text()
+        
+        def strip_timestamp(text: str) -> list[str]:
+            return [line for line in text.splitlines() if not line.startswith("# Timestamp:")]
+        
+        assert strip_timestamp(incremental) == strip_timestamp(full)
+        assert "# Total assignments: 5" in full
+        assert "aa:bb:cc:00:00:00" not in full
+        assert "aa:bb:cc:00:00:03" not in full
+    
+    def test_changed_ids_force_rerender(self, db: Session, generator):
+        """Ids reported by the change log are re-rendered even with an unchanged updated_at."""
+        self._add_assignments(db, 3)
+        generator.generate_users_file(db)
+        first_id = db.query(UdnAssignment).order_by(UdnAssignment.udn_id).first().id
+        
+        with patch.object(
+            ConfigGenerator, "_render_users_entry", wraps=ConfigGenerator._render_users_entry
+        ) as render:
+            generator.generate_users_file(db, changed_ids={first_id})
+        
+        assert render.call_count == 1
+    
+    def test_invalid_output_leaves_existing_file(self, db: Session, generator, temp_config_dir):
+        """A file failing validation never replaces the live users file."""
+        from radius_app.core.config_validator import ConfigValidationError
+        
+        self._add_assignments(db, 2)
+        users_path = generator.generate_users_file(db)
+        original = users_path.read_text()
+        
+        db.add(UdnAssignment(
+            user_id=50, user_name='Broken "quote', mac_address="aa:bb:cc:00:00:50", udn_id=500
+        ))
+        db.commit()
+        
+        with pytest.raises(ConfigValidationError):
+            generator.generate_users_file(db)
+        
+        assert users_path.read_text() == original
+        assert not (temp_config_dir / ".users.tmp").exists()
@@ -0,0 +1,196 @@
+"""Unit tests for the in-process FreeRADIUS file parser.
+
+The fuzz corpus is generated with the same fixtures and records used by
+test_freeradius_file_format.py, so it tracks what the generators emit.
+"""
+
+import random
+
+import pytest
+
+from radius_app.core.config_parser import (
+    ConfigSyntaxError,
+    parse_config_sections,
+    parse_users_file,
+    tokenize_line,
+)
+from radius_app.db.models import RadiusMacBypassConfig, RadiusPolicy
+from tests.unit.test_freeradius_file_format import (  # noqa: F401 - fixtures
+    db_session,
+    policy_generator,
+    psk_generator,
+)
+
+CLIENTS_CONF = """# Auto-generated RADIUS clients configuration
+# Client: Office NAD
+client office_nad {
+    ipaddr = 192.168.1.0/24
+    secret = "s3cret \\"quoted\\" value"
+    nas_type = other
+    shortname = office
+    require_message_authenticator = yes
+}
+
+$INCLUDE ${confdir}/clients.d/
+"""
+
+
+@pytest.fixture
+def generated_corpus(policy_generator, psk_generator, db_session):
+    """Users-format files rendered from the file-format test records."""
+    db_session.add_all([
+        RadiusPolicy(
+            name="test-policy",
+            description="Test policy description",
+            priority=100,
+            match_username="test.*",
+            match_mac_address="aa:bb:cc:.*",
+            vlan_id=100,
+            session_timeout=3600,
+            splash_url="/splash",
+            registered_group_policy="registered",
+            unregistered_group_policy="guests",
+            psk_validation_required=True,
+            is_active=True,
+            created_by="test",
+        ),
+        RadiusPolicy(name="high-priority", priority=10, is_active=True, created_by="test"),
+        RadiusMacBypassConfig(
+            name="test-bypass",
+            mac_addresses=["aa:bb:cc:dd:ee:ff", "11-22-33-44-55-66"],
+            bypass_mode="whitelist",
+            is_active=True,
+            created_by="test",
+        ),
+    ])
+    db_session.commit()
+
+    return [
+        policy_generator.generate_policy_file(db_session).read_text(),
+        psk_generator.generate_mac_bypass_file(db_session).read_text(),
+    ]
+
+
+@pytest.mark.unit
+class TestTokenizer:
+    """Test line tokenization."""
+
+    def test_tokens_and_columns(self):
+        """Tokens carry their kind and 1-based column; comments are dropped."""
+        tokens = tokenize_line('aa:bb:cc Cleartext-Password := "x, y" # note', 1)
+        assert tokens == [
+            ("word", "aa:bb:cc", 1),
+            ("word", "Cleartext-Password", 10),
+            ("op", ":=", 29),
+            ("string", '"x, y"', 32),
+        ]
+
+    def test_unterminated_string(self):
+        """Unterminated strings are reported at the opening quote."""
+        with pytest.raises(ConfigSyntaxError) as exc:
+            tokenize_line('    Reply-Message := "oops', 7)
+        assert (exc.value.line, exc.value.column) == (7, 22)
+
+
+@pytest.mark.unit
+class TestUsersParser:
+    """Test the users-file grammar."""
+
+    def test_valid_entries(self):
+        """Names, check items, comma-separated reply items and includes parse."""
+        content = (
+            "# comment\n"
+            '"aa:bb:cc:dd:ee:ff" Auth-Type := Accept\n'
+            '    Reply-Message := "MAC Bypass: printers"\n'
+            "\n"
+            'DEFAULT User-Name =~ "test.*", Cleartext-Password != ""\n'
+            "    Tunnel-Type := VLAN,\n"
+            "    # comments may sit between continued items\n"
+            "    Tunnel-Private-Group-Id := 100\n"
+            "$INCLUDE users.d/shard-000\n"
+            "DEFAULT Auth-Type := Reject\n"
+        )
+        assert parse_users_file(content.splitlines(True)) == 3
+
+    @pytest.mark.parametrize("content, line, column, message", [
+        ("    Reply-Message := \"x\"\n", 1, 5, "outside of an entry"),
+        ("DEFAULT Auth-Type := Accept\n    A := 1\n    B := 2\n", 3, 5, "missing ','"),
+        ("DEFAULT Auth-Type := Accept\n    A := 1,\nnext Auth-Type := Accept\n", 3, 1, "after ','"),
+        ("DEFAULT Auth-Type := Accept\n    A := 1,\n", 3, 1, "after ','"),
+        ("DEFAULT Cleartext-Password != \n", 1, 31, "expected value"),
+        ("DEFAULT Auth-Type Accept\n", 1, 19, "expected operator"),
+        ("DEFAULT Auth-Type := Accept,\n", 1, 28, "can't continue"),
+        ("DEFAULT A := 1 B := 2\n", 1, 16, "expected ','"),
+        ("$INCLUDE\n", 1, 1, "needs a file name"),
+    ])
+    def test_users_errors_have_positions(self, content, line, column, message):
+        """Errors report the line and column of the offending token."""
+        with pytest.raises(ConfigSyntaxError) as exc:
+            parse_users_file(content.splitlines(True))
+        assert (exc.value.line, exc.value.column) == (line, column)
+        assert message in exc.value.message
+
+    def test_generated_files_parse(self, generated_corpus):
+        """Everything the generators emit for the format fixtures parses."""
+        for content in generated_corpus:
+            assert parse_users_file(content.splitlines(True)) > 0
+
+
+@pytest.mark.unit
+class TestConfigSectionParser:
+    """Test the clients.conf grammar."""
+
+    def test_valid_clients_conf(self):
+        """Client sections with assignments and includes parse."""
+        assert parse_config_sections(CLIENTS_CONF.splitlines(True)) == 1
+
+    @pytest.mark.parametrize("content, line, column, message", [
+        ("client a {\n    ipaddr = 10.0.0.1\n", 1, 1, "never closed"),
+        ("}\n", 1, 1, "unexpected '}'"),
+        ("client a {\n    ipaddr 10.0.0.1\n}\n", 2, 12, "expected '='"),
+        ("client a {\n    secret =\n}\n", 2, 13, "expected value"),
+        ("client a {\n    secret == x\n}\n", 2, 12, "unexpected operator"),
+    ])
+    def test_section_errors_have_positions(self, content, line, column, message):
+        """Errors report the line and column of the offending token."""
+        with pytest.raises(ConfigSyntaxError) as exc:
+            parse_config_sections(content.splitlines(True))
+        assert (exc.value.line, exc.value.column) == (line, column)
+        assert message in exc.value.message
+
+
+def _mutate(content: str, rng: random.Random) -> str:
+    """Apply one random syntax-level mutation."""
+    mutation = rng.choice(("delete", "insert", "swap_lines", "drop_line"))
+    if mutation == "delete":
+        i = rng.randrange(len(content))
+        return content[:i] + content[i + 1:]
+    if mutation == "insert":
+        i = rng.randrange(len(content))
+        return content[:i] + rng.choice('",{}=#\n \t:') + content[i:]
+    lines = content.splitlines(True)
+    i = rng.randrange(len(lines))
+    if mutation == "drop_line":
+        return "".join(lines[:i] + lines[i + 1:])
+    j = rng.randrange(len(lines))
+    lines[i], lines[j] = lines[j], lines[i]
+    return "".join(lines)
+
+
+@pytest.mark.unit
+class TestParserFuzz:
+    """Mutated corpus files either parse or fail with a positioned error."""
+
+    @pytest.mark.parametrize("parser", [parse_users_file, parse_config_sections])
+    def test_mutations_never_crash(self, generated_corpus, parser):
+        """The parser only ever raises ConfigSyntaxError, with in-range positions."""
+        rng = random.Random(5176)
+        corpus = generated_corpus + [CLIENTS_CONF]
+        for _ in range(300):
+            mutated = _mutate(rng.choice(corpus), rng)
+            lines = mutated.splitlines(True)
+            try:
+                parser(lines)
+            except ConfigSyntaxError as e:
+                assert 1 <= e.line <= len(lines) + 1
+                assert e.column >= 1
@@ -0,0 +1,78 @@
+"""Unit tests for the shared portal database engine registry."""
+
+import pytest
+from sqlalchemy import text
+
+from radius_app.db import database
+from radius_app.db.database import (
+    TimedQueuePool,
+    dispose_engines,
+    get_engine,
+    get_pool_stats,
+    get_portal_engine,
+)
+
+
+@pytest.fixture
+def portal_url(tmp_path):
+    """File-backed SQLite portal database URL."""
+    yield f"sqlite:///{tmp_path}/portal.db"
+    dispose_engines()
+
+
+@pytest.mark.unit
+class TestPortalEngineRegistry:
+    """Test engine reuse, pooling and disposal."""
+
+    def test_engine_reused_per_url(self, portal_url, tmp_path):
+        """The same URL always yields the same engine; other URLs get their own."""
+        engine = get_portal_engine(portal_url)
+        assert get_portal_engine(portal_url) is engine
+        assert get_portal_engine(f"sqlite:///{tmp_path}/other.db") is not engine
+        assert isinstance(engine.pool, TimedQueuePool)
+
+    def test_main_database_url_shares_main_engine(self):
+        """A portal that shares the FreeRADIUS database reuses the main engine."""
+        assert get_portal_engine(database.get_settings().database_url) is get_engine()
+
+    def test_pool_settings_from_environment(self, portal_url, monkeypatch):
+        """Pool size, overflow, recycle and timeout are configurable."""
+        monkeypatch.setenv("RADIUS_PORTAL_POOL_SIZE", "3")
+        monkeypatch.setenv("RADIUS_PORTAL_POOL_MAX_OVERFLOW", "1")
+        monkeypatch.setenv("RADIUS_PORTAL_POOL_RECYCLE_SECONDS", "120")
+        monkeypatch.setenv("RADIUS_PORTAL_POOL_TIMEOUT_SECONDS", "bogus")
+
+        pool = get_portal_engine(portal_url).pool
+
+        assert pool.size() == 3
+        assert pool._max_overflow == 1
+        assert pool._recycle == 120
+        assert pool._timeout == 30
+
+    def test_stats_track_checkouts(self, portal_url):
+        """Checked-out connections and wait times show up in the stats."""
+        engine = get_portal_engine(portal_url)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            portal = next(s for s in get_pool_stats() if s["role"] == "portal")
+            assert portal["checked_out"] == 1
+            assert portal["wait_count"] == 1
+            assert "portal.db" in portal["url"]
+
+        portal = next(s for s in get_pool_stats() if s["role"] == "portal")
+        assert portal["checked_out"] == 0
+        assert portal["checked_in"] == 1
+
+    def test_dispose_clears_registry(self, portal_url):
+        """Disposed engines are dropped and recreated on next use."""
+        engine = get_portal_engine(portal_url)
+        dispose_engines()
+        assert not any(s["role"] == "portal" for s in get_pool_stats())
+        assert get_portal_engine(portal_url) is not engine
+
+    def test_pool_stats_endpoint(self, client, portal_url):
+        """The monitoring API reports pool statistics."""
+        get_portal_engine(portal_url)
+        response = client.get("/api/stats/db-pools", headers={"Authorization": "Bearer test-token"})
+        assert response.status_code == 200
+        assert "portal" in {pool["role"] for pool in response.json()}
@@ -0,0 +1,183 @@
+"""Unit tests for the in-process Access-Request load generator and histogram."""
+
+import asyncio
+import contextlib
+import hashlib
+import struct
+
+import pytest
+
+from radius_app.core import radius_packet
+from radius_app.core.load_generator import (
+    CLOSED_LOOP,
+    OPEN_LOOP,
+    AccessRequestLoadGenerator,
+    LatencyHistogram,
+)
+from radius_app.core.performance_tester import PerformanceTester
+
+SECRET = "testing123"
+
+
+def reveal_password(hidden: bytes, secret: str, authenticator: bytes) -> str:
+    """Undo RFC 2865 User-Password hiding the way a server does."""
+    clear = b""
+    previous = authenticator
+    for start in range(0, len(hidden), 16):
+        key = hashlib.md5(secret.encode() + previous).digest()
+        block = hidden[start:start + 16]
+        clear += bytes(a ^ b for a, b in zip(block, key))
+        previous = block
+    return clear.rstrip(b"\x00").decode()
+
+
+class AuthResponder(asyncio.DatagramProtocol):
+    """RADIUS server stub: accepts users whose password is "good"."""
+
+    def __init__(self, delay=0.0, drop_users=()):
+        self.delay = delay
+        self.drop_users = set(drop_users)
+        self.passwords = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        attributes = dict(radius_packet.decode_attributes(data[20:]))
+        user = attributes[radius_packet.ATTR_USER_NAME].decode()
+        password = reveal_password(attributes[radius_packet.ATTR_USER_PASSWORD], SECRET, data[4:20])
+        self.passwords.append(password)
+        if user in self.drop_users:
+            return
+        code = radius_packet.ACCESS_ACCEPT if password == "good" else radius_packet.ACCESS_REJECT
+        header = struct.pack("!BBH", code, data[1], 20)
+        reply = header + hashlib.md5(header + data[4:20] + SECRET.encode()).digest()
+        asyncio.get_running_loop().call_later(self.delay, self.transport.sendto, reply, addr)
+
+
+@contextlib.asynccontextmanager
+async def auth_server(**kwargs):
+    """Run an AuthResponder on an ephemeral localhost port."""
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: AuthResponder(**kwargs), local_addr=("127.0.0.1", 0)
+    )
+    try:
+        yield protocol, transport.get_extra_info("sockname")[1]
+    finally:
+        transport.close()
+
+
+@pytest.mark.unit
+class TestLatencyHistogram:
+    """Test HDR-style bucketing and percentiles."""
+
+    def test_percentiles_within_relative_error(self):
+        """Percentiles of 1..10000 ms are accurate to the bucket precision."""
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+
+        for percent, expected in [(50, 5000), (95, 9500), (99, 9900), (99.9, 9990)]:
+            assert histogram.percentile(percent) == pytest.approx(expected, rel=0.01)
+        assert histogram.percentile(100) == 10000
+        assert histogram.mean_ms == pytest.approx(5000.5)
+
+    def test_small_values_are_exact(self):
+        """Sub-millisecond values below the linear range keep microsecond resolution."""
+        histogram = LatencyHistogram()
+        for latency in (0.05, 0.1, 0.2):
+            histogram.record(latency)
+
+        assert histogram.percentile(0) == 0.05
+        assert histogram.percentile(50) == 0.1
+        assert [b["count"] for b in histogram.buckets()] == [1, 1, 1]
+
+    def test_merge(self):
+        """Merged histograms report percentiles over both sample sets."""
+        fast, slow = LatencyHistogram(), LatencyHistogram()
+        fast.record(1.0, count=90)
+        slow.record(100.0, count=10)
+        fast.merge(slow)
+
+        assert fast.total_count == 100
+        assert fast.percentile(90) == pytest.approx(1.0, rel=0.01)
+        assert fast.percentile(95) == 100.0
+
+
+@pytest.mark.unit
+class TestPasswordHiding:
+    """Test RFC 2865 User-Password encoding."""
+
+    @pytest.mark.parametrize("password", ["", "good", "exactly16chars!!", "a-password-longer-than-16"])
+    def test_round_trip(self, password):
+        """Hidden passwords are padded to 16-octet blocks and recoverable."""
+        authenticator = bytes(range(16))
+        hidden = radius_packet.hide_user_password(password, SECRET, authenticator)
+
+        assert len(hidden) % 16 == 0 and hidden
+        assert password.encode() not in hidden or not password
+        assert reveal_password(hidden, SECRET, authenticator) == password
+
+    def test_too_long(self):
+        """Passwords over 128 octets are rejected."""
+        with pytest.raises(radius_packet.RadiusPacketError):
+            radius_packet.hide_user_password("x" * 129, SECRET, bytes(16))
+
+
+@pytest.mark.unit
+class TestLoadGenerator:
+    """Test closed- and open-loop runs against a local server stub."""
+
+    @pytest.mark.asyncio
+    async def test_closed_loop_outcomes(self):
+        """Accepts, rejects and timeouts are counted separately."""
+        users = [
+            {"username": "alice", "password": "good"},
+            {"username": "bob", "password": "bad"},
+            {"username": "carol", "password": "good"},
+            {"username": "lost", "password": "good"},
+        ]
+        async with auth_server(drop_users={"lost"}) as (server, port):
+            generator = AccessRequestLoadGenerator("127.0.0.1", port, SECRET, timeout=0.2)
+            report = await generator.run(users, mode=CLOSED_LOOP, concurrency=8, total_requests=40)
+
+        assert dict(report.outcomes) == {"accept": 20, "reject": 10, "timeout": 10}
+        assert report.histogram.total_count == 30
+        assert sum(row["completed"] for row in report.throughput()) == 40
+        assert set(server.passwords) == {"good", "bad"}
+
+    @pytest.mark.asyncio
+    async def test_open_loop_holds_rate(self):
+        """Open-loop sends on schedule even when responses are slow."""
+        users = [{"username": "alice", "password": "good"}]
+        async with auth_server(delay=0.05) as (_, port):
+            generator = AccessRequestLoadGenerator("127.0.0.1", port, SECRET, timeout=1)
+            report = await generator.run(users, mode=OPEN_LOOP, rate=200, concurrency=64, total_requests=40)
+
+        # 40 requests at 200/s take ~0.2s to issue; closed-loop with one
+        # worker would need 40 * 50ms = 2s
+        assert report.outcomes["accept"] == 40
+        assert report.elapsed_time < 1.0
+        assert report.histogram.percentile(50) >= 50
+
+    @pytest.mark.asyncio
+    async def test_open_loop_requires_rate(self):
+        """Open-loop without a rate is refused."""
+        generator = AccessRequestLoadGenerator("127.0.0.1", 1812, SECRET)
+        with pytest.raises(ValueError, match="rate"):
+            await generator.run([{"username": "a", "password": "b"}], mode=OPEN_LOOP)
+
+    @pytest.mark.asyncio
+    async def test_tester_result_has_real_percentiles(self):
+        """PerformanceTester.run_load_test reports histogram-based metrics."""
+        users = [{"username": f"user{i}", "password": "good"} for i in range(20)]
+        async with auth_server() as (_, port):
+            tester = PerformanceTester()
+            result = await tester.run_load_test(users, "127.0.0.1", port, SECRET, concurrency=4)
+
+        assert result.engine == "inprocess"
+        assert result.successful_requests == result.total_requests == 20
+        assert 0 < result.p50_latency_ms <= result.p99_latency_ms <= result.max_latency_ms
+        assert sum(bucket["count"] for bucket in result.histogram) == 20
+        assert result.error is None
@@ -2,10 +2,10 @@
 
 import pytest
 from datetime import datetime, timezone
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
 
-from radius_app.db.models import Base, RadiusClient, RadiusNadExtended, RadiusNadHealth
+from radius_app.db.models import Base, RadiusClient, RadiusNadExtended, RadiusNadHealth, UdnAssignment
 from radius_app.schemas.nad import NadCreate, NadUpdate, NadCapabilities
 
 
@@ -369,3 +369,78 @@ class TestHealthStatus:
         # Weighted average (70% old, 30% new)
         new_avg = old_avg * 0.7 + new_latency * 0.3
         assert new_avg == 23.0
+
+
+def add_nads(db, count, with_health=True):
+    """Insert NADs with extended info and (optionally) health rows."""
+    for i in range(count):
+        client = RadiusClient(
+            name=f"nad-{i}", ipaddr=f"10.0.0.{i + 1}", secret="s3cret-value",
+            network_id=f"N_{i % 2}",
+        )
+        client.extended = RadiusNadExtended(vendor="Cisco Meraki", location=f"Floor {i}")
+        if with_health:
+            client.extended.health = RadiusNadHealth(is_reachable=True, request_count=i)
+        db.add(client)
+    db.commit()
+
+
+class TestNadQueryCounts:
+    """Test that NAD reads don't issue a query per NAD."""
+    
+    HEADERS = {"Authorization": "Bearer test-token"}
+    
+    @pytest.mark.parametrize("count", [1, 10])
+    def test_list_nads_constant_queries(self, client, db, assert_max_queries, count):
+        """Count, page and two eager loads regardless of page size."""
+        add_nads(db, count)
+        db.expire_all()
+        
+        with assert_max_queries(4):
+            response = client.get("/api/nads", headers=self.HEADERS)
+        
+        items = response.json()["items"]
+        assert len(items) == count
+        assert all(item["health_status"]["is_reachable"] for item in items)
+        assert {item["location"] for item in items} == {f"Floor {i}" for i in range(count)}
+    
+    def test_get_nad_single_query(self, client, db, assert_max_queries):
+        """A NAD and its extended and health rows load in one query."""
+        add_nads(db, 1)
+        nad_id = db.execute(select(RadiusClient.id)).scalar_one()
+        db.expire_all()
+        
+        with assert_max_queries(1):
+            response = client.get(f"/api/nads/{nad_id}", headers=self.HEADERS)
+        
+        assert response.json()["vendor"] == "Cisco Meraki"
+        assert response.json()["health_status"]["request_count"] == 0
+    
+    def test_client_stats_grouped_count(self, client, db, assert_max_queries):
+        """Assignment counts per client come from one GROUP BY."""
+        add_nads(db, 6, with_health=False)
+        for i in range(5):
+            db.add(UdnAssignment(user_id=i + 1, udn_id=i + 2, network_id="N_0" if i < 3 else "N_1"))
+        db.add(RadiusClient(name="no-network", ipaddr="10.0.1.1", secret="s3cret-value"))
+        db.commit()
+        db.expire_all()
+        
+        with assert_max_queries(2):
+            response = client.get("/api/stats/clients", headers=self.HEADERS)
+        
+        counts = {row["client_name"]: row["assignments_count"] for row in response.json()}
+        assert counts["nad-0"] == counts["nad-2"] == 3
+        assert counts["nad-1"] == 2
+        assert counts["no-network"] == 0
+    
+    def test_delete_client_removes_extended_and_health(self, db):
+        """Deleting a client through the ORM removes its dependent rows."""
+        add_nads(db, 1)
+        nad = db.execute(select(RadiusClient)).scalar_one()
+        assert nad.extended.health.nad is nad.extended
+        
+        db.delete(nad)
+        db.commit()
+        
+        assert db.execute(select(RadiusNadExtended)).first() is None
+        assert db.execute(select(RadiusNadHealth)).first() is None
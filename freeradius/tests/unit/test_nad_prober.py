@@ -0,0 +1,205 @@
+"""Unit tests for the asyncio NAD prober and batched health sweeps."""
+
+import asyncio
+import hashlib
+import struct
+
+import pytest
+from sqlalchemy import event
+
+from radius_app.core import radius_packet
+from radius_app.core.health_monitor import HealthMonitor
+from radius_app.core.nad_prober import (
+    NadProber,
+    ProbeResult,
+    ProbeTarget,
+    normalize_probe_address,
+    probe_status_server,
+    probe_tcp,
+)
+from radius_app.db.models import RadiusClient, RadiusNadExtended, RadiusNadHealth
+
+SECRET = "testing123"
+
+
+def make_response(request: bytes, secret: str, code: int = radius_packet.ACCESS_ACCEPT) -> bytes:
+    """Build a signed response the way a RADIUS server would."""
+    header = struct.pack("!BBH", code, request[1], radius_packet.HEADER_LENGTH)
+    authenticator = hashlib.md5(header + request[4:20] + secret.encode()).digest()
+    return header + authenticator
+
+
+class StatusServerResponder(asyncio.DatagramProtocol):
+    """UDP server answering Status-Server requests."""
+
+    def __init__(self, secret: str):
+        self.secret = secret
+        self.requests = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.requests.append(data)
+        self.transport.sendto(make_response(data, self.secret), addr)
+
+
+@pytest.mark.unit
+class TestRadiusPacket:
+    """Test Status-Server encoding and response verification."""
+
+    def test_status_server_has_message_authenticator(self):
+        """Status-Server carries a valid Message-Authenticator (RFC 5997)."""
+        import hmac
+
+        packet = radius_packet.build_status_server(7, SECRET)
+        code, identifier, length, _ = radius_packet.parse_header(packet)
+        attributes = radius_packet.decode_attributes(packet[20:length])
+
+        assert (code, identifier, length) == (radius_packet.STATUS_SERVER, 7, len(packet))
+        assert attributes[-1][0] == radius_packet.ATTR_MESSAGE_AUTHENTICATOR
+        zeroed = packet[:-16] + bytes(16)
+        assert hmac.new(SECRET.encode(), zeroed, hashlib.md5).digest() == attributes[-1][1]
+
+    def test_verify_response(self):
+        """Only responses signed with the right secret and id verify."""
+        request = radius_packet.build_status_server(9, SECRET)
+
+        assert radius_packet.verify_response(make_response(request, SECRET), request, SECRET)
+        assert not radius_packet.verify_response(make_response(request, "wrong"), request, SECRET)
+        assert not radius_packet.verify_response(b"\x02\x09", request, SECRET)
+
+    def test_attribute_length_limit(self):
+        """Over-long attribute values are rejected."""
+        with pytest.raises(radius_packet.RadiusPacketError):
+            radius_packet.encode_attribute(radius_packet.ATTR_USER_NAME, "x" * 254)
+
+
+@pytest.mark.unit
+class TestProbes:
+    """Test individual probes."""
+
+    @pytest.mark.parametrize("value,expected", [
+        ("10.0.0.1/32", "10.0.0.1"),
+        ("::1", "::1"),
+        ("", None),
+        ("invalid-ip", None),
+    ])
+    def test_normalize_probe_address(self, value, expected):
+        """CIDR suffixes are stripped and invalid addresses rejected."""
+        assert normalize_probe_address(value) == expected
+
+    @pytest.mark.asyncio
+    async def test_tcp_probe_open_port(self):
+        """An accepting listener is reachable."""
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reachable, latency = await probe_tcp("127.0.0.1", port, timeout=1)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        assert reachable is True
+        assert latency >= 0
+
+    @pytest.mark.asyncio
+    async def test_status_server_probe(self):
+        """A server answering Status-Server with the right secret is reachable."""
+        loop = asyncio.get_running_loop()
+        transport, responder = await loop.create_datagram_endpoint(
+            lambda: StatusServerResponder(SECRET), local_addr=("127.0.0.1", 0)
+        )
+        port = transport.get_extra_info("sockname")[1]
+        try:
+            ok = await probe_status_server("127.0.0.1", SECRET, port, timeout=1)
+            wrong_secret = await probe_status_server("127.0.0.1", "other", port, timeout=0.2)
+        finally:
+            transport.close()
+
+        assert ok[0] is True
+        assert wrong_secret == (False, None)
+        assert responder.requests[0][0] == radius_packet.STATUS_SERVER
+
+    @pytest.mark.asyncio
+    async def test_probe_many_bounds_concurrency(self):
+        """No more than ``concurrency`` probes are in flight."""
+        prober = NadProber(concurrency=3)
+        in_flight = 0
+        peak = 0
+
+        async def fake_probe(target):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return ProbeResult(target.client_id, True, 1.0)
+
+        prober.probe = fake_probe
+        results = await prober.probe_many([ProbeTarget(i, "10.0.0.1") for i in range(20)])
+
+        assert [r.client_id for r in results] == list(range(20))
+        assert peak == 3
+
+
+class FakeProber(NadProber):
+    """Prober that marks every NAD reachable without network access."""
+
+    def __init__(self):
+        super().__init__(concurrency=8)
+        self.probed = []
+
+    async def probe(self, target):
+        self.probed.append(target.client_id)
+        return ProbeResult(target.client_id, True, 5.0)
+
+
+@pytest.mark.unit
+class TestHealthSweep:
+    """Test batched database access in HealthMonitor sweeps."""
+
+    def _add_nads(self, db, count):
+        for i in range(count):
+            db.add(RadiusClient(name=f"nad-{i}", ipaddr=f"10.0.0.{i + 1}", secret="s3cret-value"))
+        db.commit()
+
+    @pytest.mark.asyncio
+    async def test_sweep_uses_constant_number_of_statements(self, db):
+        """Statement count doesn't grow with the number of NADs."""
+        self._add_nads(db, 25)
+        monitor = HealthMonitor(check_interval=60, prober=FakeProber())
+        statements = []
+        engine = db.get_bind()
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            assert await monitor.check_all_nads(db) == 25
+            first_sweep = len(statements)
+            statements.clear()
+            assert await monitor.check_all_nads(db) == 25
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert db.query(RadiusNadExtended).count() == 25
+        assert db.query(RadiusNadHealth).filter_by(is_reachable=True).count() == 25
+        assert first_sweep <= 5
+        assert len(statements) <= 3
+
+    @pytest.mark.asyncio
+    async def test_due_only_spreads_first_probes(self, db):
+        """Due-only sweeps probe each NAD once per interval, not all at once."""
+        self._add_nads(db, 40)
+        prober = FakeProber()
+        monitor = HealthMonitor(check_interval=60, prober=prober)
+
+        await monitor.check_all_nads(db, due_only=True)
+        first = len(prober.probed)
+        await monitor.check_all_nads(db, due_only=True)
+
+        assert first < 40
+        assert len(prober.probed) == len(set(prober.probed))
+        assert set(monitor._next_due) == {c.id for c in db.query(RadiusClient)}
@@ -0,0 +1,221 @@
+"""Unit tests for keyset pagination and indexed search on list endpoints."""
+
+import weakref
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, text
+
+from radius_app.core import search_index
+from radius_app.core.pagination import (
+    InvalidCursor,
+    after_cursor,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    order_newest_first,
+)
+from radius_app.core.search_index import FTS5, install_search_indexes, search_clause
+from radius_app.db.models import RadiusClient, RadiusNadExtended, UdnAssignment
+
+
+HEADERS = {"Authorization": "Bearer test-token"}
+BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def search_indexes(db, monkeypatch):
+    """Install FTS5 search tables on the shared test engine, then remove them."""
+    monkeypatch.setattr(search_index, "_backends", weakref.WeakKeyDictionary())
+    engine = db.get_bind()
+    yield install_search_indexes(engine)
+    with engine.begin() as conn:
+        for table in search_index.SEARCH_COLUMNS:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}_search"))
+
+
+def add_assignments(db, count, same_timestamp=0):
+    """Insert assignments; the last ``same_timestamp`` rows share a created_at."""
+    for i in range(count):
+        offset = min(i, count - same_timestamp)
+        db.add(UdnAssignment(
+            user_id=i + 1,
+            udn_id=i + 2,
+            user_name=f"Resident {i:03d}",
+            user_email=f"resident{i:03d}@example.com",
+            unit=f"{100 + i}",
+            created_at=BASE_TIME + timedelta(minutes=offset),
+        ))
+    db.commit()
+
+
+@pytest.mark.unit
+class TestCursor:
+    """Test cursor encoding."""
+
+    def test_round_trip(self):
+        """A cursor decodes to the row it was built from."""
+        created_at = datetime(2026, 3, 4, 5, 6, 7, 890000, tzinfo=timezone.utc)
+        cursor = encode_cursor(created_at, 42)
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (created_at, 42)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "", "WyJ4IiwxXQ", encode_cursor(BASE_TIME, 1)[:-3]])
+    def test_rejects_malformed(self, cursor):
+        """Garbage tokens raise InvalidCursor."""
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor)
+
+
+@pytest.mark.unit
+class TestKeysetPages:
+    """Test walking a table page by page."""
+
+    def test_pages_cover_every_row_once(self, db):
+        """Ties on created_at are broken by id so no row is skipped or repeated."""
+        add_assignments(db, 23, same_timestamp=6)
+        query = order_newest_first(select(UdnAssignment), UdnAssignment.created_at, UdnAssignment.id)
+
+        seen, cursor = [], None
+        while True:
+            page_query = query if cursor is None else after_cursor(
+                query, UdnAssignment.created_at, UdnAssignment.id, cursor
+            )
+            rows, cursor = fetch_page(db, page_query, 5, lambda row: encode_cursor(row.created_at, row.id))
+            seen.extend(row.id for row in rows)
+            if cursor is None:
+                break
+
+        expected = db.execute(query.with_only_columns(UdnAssignment.id)).scalars().all()
+        assert seen == expected
+        assert len(set(seen)) == 23
+
+    def test_count_modes(self, db):
+        """Exact and (off PostgreSQL) estimated counts match; none skips counting."""
+        add_assignments(db, 7)
+        query = select(UdnAssignment).where(UdnAssignment.user_id > 2)
+        assert count_rows(db, query, "exact") == 5
+        assert count_rows(db, query, "estimated") == 5
+        assert count_rows(db, query, "none") is None
+
+
+@pytest.mark.unit
+class TestSearchIndex:
+    """Test FTS5-backed substring search."""
+
+    def test_install_is_idempotent(self, db, search_indexes):
+        """Installing twice keeps one index and the FTS5 backend."""
+        assert search_indexes == FTS5
+        assert install_search_indexes(db.get_bind()) == FTS5
+
+    def test_substring_match_tracks_writes(self, db, search_indexes):
+        """Inserts, updates and deletes are reflected in search results."""
+        add_assignments(db, 3)
+
+        def matches(term):
+            return sorted(db.execute(
+                select(UdnAssignment.user_id).where(search_clause(db, UdnAssignment, term))
+            ).scalars())
+
+        assert matches("RESIDENT001") == [2]
+        assert matches("example.com") == [1, 2, 3]
+
+        row = db.execute(select(UdnAssignment).where(UdnAssignment.user_id == 3)).scalar_one()
+        row.user_email = "moved@elsewhere.org"
+        db.commit()
+        assert matches("example.com") == [1, 2]
+        assert matches("elsewhere") == [3]
+
+        db.delete(row)
+        db.commit()
+        assert matches("elsewhere") == []
+
+    def test_short_terms_fall_back_to_ilike(self, db, search_indexes):
+        """Terms shorter than a trigram still match."""
+        add_assignments(db, 3)
+        rows = db.execute(select(UdnAssignment).where(search_clause(db, UdnAssignment, "02"))).scalars().all()
+        assert [row.user_id for row in rows] == [3]
+
+    def test_rows_before_install_are_indexed(self, db, monkeypatch):
+        """Existing rows are indexed when the search table is first created."""
+        add_assignments(db, 2)
+        monkeypatch.setattr(search_index, "_backends", weakref.WeakKeyDictionary())
+        try:
+            install_search_indexes(db.get_bind())
+            rows = db.execute(
+                select(UdnAssignment).where(search_clause(db, UdnAssignment, "resident000"))
+            ).scalars().all()
+            assert [row.user_id for row in rows] == [1]
+        finally:
+            with db.get_bind().begin() as conn:
+                for table in search_index.SEARCH_COLUMNS:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {table}_search"))
+
+
+@pytest.mark.unit
+class TestListEndpoints:
+    """Test cursor pagination through the API."""
+
+    def test_udn_assignments_cursor_walk(self, client, db):
+        """next_cursor pages through every assignment, newest first."""
+        add_assignments(db, 12, same_timestamp=4)
+
+        first = client.get("/api/udn-assignments?page_size=5", headers=HEADERS).json()
+        assert first["total"] == 12
+        assert first["pages"] == 3
+        ids = [item["id"] for item in first["items"]]
+
+        cursor = first["next_cursor"]
+        while cursor:
+            body = client.get(
+                f"/api/udn-assignments?page_size=5&count=none&cursor={cursor}", headers=HEADERS
+            ).json()
+            assert body["total"] is None
+            ids.extend(item["id"] for item in body["items"])
+            cursor = body["next_cursor"]
+
+        assert len(ids) == len(set(ids)) == 12
+        offset_ids = []
+        for page in (1, 2, 3):
+            body = client.get(f"/api/udn-assignments?page_size=5&page={page}", headers=HEADERS).json()
+            offset_ids.extend(item["id"] for item in body["items"])
+        assert ids == offset_ids
+
+    def test_udn_assignments_invalid_cursor(self, client, db):
+        """A malformed cursor is a 400, not a 500."""
+        response = client.get("/api/udn-assignments?cursor=bogus", headers=HEADERS)
+        assert response.status_code == 400
+
+    def test_udn_assignments_indexed_search(self, client, db, search_indexes):
+        """Search uses the FTS5 index and still filters correctly."""
+        add_assignments(db, 5)
+        body = client.get("/api/udn-assignments?search=resident003", headers=HEADERS).json()
+        assert body["total"] == 1
+        assert body["items"][0]["user_id"] == 4
+
+    def test_nads_cursor_and_search(self, client, db, search_indexes):
+        """NAD listing pages by cursor and searches name, vendor and location."""
+        for i in range(4):
+            nad = RadiusClient(
+                name=f"nad-{i}", ipaddr=f"10.0.0.{i + 1}", secret="s3cret-value",
+                created_at=BASE_TIME + timedelta(minutes=i),
+            )
+            db.add(nad)
+            db.flush()
+            db.add(RadiusNadExtended(
+                radius_client_id=nad.id, vendor="Cisco Meraki" if i % 2 else "Aruba",
+                location=f"Building {i}",
+            ))
+        db.commit()
+
+        first = client.get("/api/nads?page_size=3", headers=HEADERS).json()
+        assert [item["name"] for item in first["items"]] == ["nad-3", "nad-2", "nad-1"]
+        second = client.get(f"/api/nads?page_size=3&cursor={first['next_cursor']}", headers=HEADERS).json()
+        assert [item["name"] for item in second["items"]] == ["nad-0"]
+        assert second["next_cursor"] is None
+
+        meraki = client.get("/api/nads?search=meraki", headers=HEADERS).json()
+        assert sorted(item["name"] for item in meraki["items"]) == ["nad-1", "nad-3"]
+        building = client.get("/api/nads?search=building 2", headers=HEADERS).json()
+        assert [item["name"] for item in building["items"]] == ["nad-2"]
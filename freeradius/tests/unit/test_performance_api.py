@@ -1,11 +1,12 @@
 """Unit tests for performance testing API endpoints."""
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from radius_app.core.performance_tester import PerformanceTestResult
 from radius_app.db.models import Base, RadiusClient
 from radius_app.main import app
 
@@ -90,6 +91,26 @@ def mock_performance_tester():
             output="Test output",
             error=None
         )
+        tester.run_load_test = AsyncMock(return_value=PerformanceTestResult(
+            total_requests=100,
+            successful_requests=100,
+            failed_requests=0,
+            elapsed_time=2.5,
+            requests_per_second=40.0,
+            average_latency_ms=25.0,
+            p50_latency_ms=24.0,
+            p95_latency_ms=41.0,
+            p99_latency_ms=58.0,
+            latencies=[],
+            output="",
+            engine="inprocess",
+            mode="closed",
+            p999_latency_ms=61.0,
+            max_latency_ms=62.5,
+            outcomes={"accept": 100},
+            throughput=[{"second": 0, "completed": 40, "accept": 40}],
+            histogram=[{"le_ms": 24.0, "count": 50}, {"le_ms": 62.5, "count": 50}],
+        ))
         tester.benchmark_configuration.return_value = {
             "results": [],
             "average": tester.run_performance_test.return_value,
@@ -236,13 +257,48 @@ class TestPerformanceAPI:
             response = test_client.post(
                 "/api/v1/performance/test",
                 headers=admin_headers,
-                json={"num_users": 100}
+                json={"num_users": 100, "engine": "radclient"}
             )
             
             assert response.status_code == 503
             data = response.json()
             assert "radclient" in data["detail"].lower()
     
+    def test_run_performance_test_inprocess_without_radclient(
+        self, test_client, admin_headers, mock_performance_tester, mock_test_user_generator
+    ):
+        """The in-process engine works without radclient and returns real percentiles."""
+        mock_performance_tester.radclient_available = False
+        
+        response = test_client.post(
+            "/api/v1/performance/test",
+            headers=admin_headers,
+            json={"num_users": 100, "mode": "open", "rate": 500, "concurrency": 64, "iterations": 2}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["engine"] == "inprocess"
+        assert data["p99_latency_ms"] == 58.0
+        assert data["outcomes"] == {"accept": 100}
+        assert data["throughput"][0]["completed"] == 40
+        kwargs = mock_performance_tester.run_load_test.await_args.kwargs
+        assert (kwargs["mode"], kwargs["rate"], kwargs["concurrency"]) == ("open", 500, 64)
+        assert kwargs["total_requests"] == 200
+        mock_performance_tester.run_performance_test.assert_not_called()
+    
+    def test_run_performance_test_open_loop_requires_rate(
+        self, test_client, admin_headers, mock_performance_tester, mock_test_user_generator
+    ):
+        """Open-loop mode without a rate is rejected."""
+        response = test_client.post(
+            "/api/v1/performance/test",
+            headers=admin_headers,
+            json={"num_users": 10, "mode": "open"}
+        )
+        
+        assert response.status_code == 400
+    
     def test_run_performance_test_client_not_found(
         self, test_client, admin_headers, mock_performance_tester, mock_test_user_generator, db_session
     ):
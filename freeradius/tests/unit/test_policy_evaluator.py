@@ -0,0 +1,169 @@
+"""Unit tests for the compiled policy evaluator and simulation endpoints."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from radius_app.core.policy_evaluator import (
+    APPLY_PROFILE,
+    NO_MATCH,
+    REJECT,
+    PolicyRequest,
+    get_policy_set,
+)
+from radius_app.db.models import RadiusPolicy, RadiusUnlangPolicy
+
+
+HEADERS = {"Authorization": "Bearer test-token"}
+
+# A Monday
+MONDAY_NOON = datetime(2026, 1, 5, 12, 0, tzinfo=timezone.utc)
+
+
+def add_profile(db, name, priority=100, **kwargs):
+    """Insert an authorization profile."""
+    profile = RadiusPolicy(name=name, priority=priority, **kwargs)
+    db.add(profile)
+    db.commit()
+    return profile
+
+
+def add_unlang(db, name, priority=100, **kwargs):
+    """Insert an unlang policy."""
+    policy = RadiusUnlangPolicy(name=name, priority=priority, **kwargs)
+    db.add(policy)
+    db.commit()
+    return policy
+
+
+@pytest.mark.unit
+class TestPolicyEvaluator:
+    """Test ordering, conditions, time restrictions and caching."""
+
+    def test_lowest_priority_profile_wins(self, db):
+        """Overlapping profiles resolve in priority order, not insertion order."""
+        add_profile(db, "catch-all", priority=500, match_username=".*")
+        add_profile(db, "guests", priority=10, match_username="guest-", reply_attributes=[
+            {"attribute": "Filter-Id", "operator": ":=", "value": "guest"},
+        ])
+
+        policy_set = get_policy_set(db)
+        guest, staff = policy_set.evaluate_batch([
+            PolicyRequest(username="guest-42"), PolicyRequest(username="alice"),
+        ])
+
+        assert (guest.outcome, guest.profile_name) == (APPLY_PROFILE, "guests")
+        assert guest.reply_attributes == [{"attribute": "Filter-Id", "operator": ":=", "value": "guest"}]
+        assert staff.profile_name == "catch-all"
+
+    def test_time_restrictions(self, db):
+        """Profiles only match inside their days and hours, in their timezone."""
+        add_profile(db, "office-hours", priority=10, match_username=".*", time_restrictions={
+            "days_of_week": [0, 1, 2, 3, 4], "time_start": "09:00", "time_end": "17:00",
+            "timezone": "America/New_York",
+        })
+        add_profile(db, "night", priority=20, match_username=".*", time_restrictions={
+            "time_start": "22:00:00", "time_end": "06:00:00",
+        })
+        policy_set = get_policy_set(db)
+
+        def winner(when):
+            return policy_set.evaluate(PolicyRequest(username="alice", timestamp=when)).profile_name
+
+        # 12:00 UTC is 07:00 in New York: before office hours
+        assert winner(MONDAY_NOON) is None
+        assert winner(MONDAY_NOON.replace(hour=15)) == "office-hours"
+        assert winner(MONDAY_NOON.replace(hour=23)) == "night"
+        assert winner(MONDAY_NOON.replace(hour=3)) == "night"
+        # Saturday afternoon
+        assert winner(datetime(2026, 1, 10, 15, 0, tzinfo=timezone.utc)) is None
+
+    def test_unlang_policies_run_before_profiles(self, db):
+        """Unlang rejects and profile assignments take precedence, skipping unsimulatable ones."""
+        iot = add_profile(db, "iot", priority=50, match_username="^$")
+        add_profile(db, "default", priority=100, match_username=".*")
+        add_unlang(db, "sql-check", priority=1, condition_type="sql_lookup", action_type="reject")
+        add_unlang(db, "block-lab", priority=5, condition_attribute="NAS-Identifier",
+                   condition_operator="==", condition_value="lab-ap", action_type="reject",
+                   reject_reason="Lab closed")
+        add_unlang(db, "iot-macs", priority=10, condition_attribute="Calling-Station-Id",
+                   condition_operator="=~", condition_value="^AA:BB", action_type="apply_profile",
+                   authorization_profile_id=iot.id, additional_conditions=[
+                       {"attribute": "NAS-Identifier", "operator": "exists", "value": None},
+                   ])
+        add_unlang(db, "noop", priority=20, condition_operator="exists",
+                   condition_attribute="User-Name", action_type="continue")
+
+        policy_set = get_policy_set(db)
+        lab, iot_device, no_nas, other = policy_set.evaluate_batch([
+            PolicyRequest(username="a", nas_identifier="lab-ap", mac_address="AA:BB:00:00:00:01"),
+            PolicyRequest(username="b", nas_identifier="ap-1", mac_address="AA:BB:00:00:00:02"),
+            PolicyRequest(username="c", mac_address="AA:BB:00:00:00:03"),
+            PolicyRequest(username="d", nas_identifier="ap-1", mac_address="CC:00:00:00:00:04"),
+        ])
+
+        assert (lab.outcome, lab.unlang_policy_name, lab.reason) == (REJECT, "block-lab", "Lab closed")
+        assert (iot_device.unlang_policy_name, iot_device.profile_name) == ("iot-macs", "iot")
+        assert (no_nas.unlang_policy_name, no_nas.profile_name) == (None, "default")
+        assert (other.unlang_policy_name, other.profile_name) == (None, "default")
+        assert policy_set.unsimulated == ["sql-check"]
+
+    def test_bad_patterns_are_reported_not_raised(self, db):
+        """A profile with an invalid regex never matches and shows up in errors."""
+        add_profile(db, "broken", priority=1, match_username="([")
+        policy_set = get_policy_set(db)
+        assert policy_set.evaluate(PolicyRequest(username="x")).outcome == NO_MATCH
+        assert "broken" in policy_set.errors[0]
+
+    def test_cache_invalidated_on_change(self, db):
+        """The compiled set is reused until a policy is added or edited."""
+        profile = add_profile(db, "first", match_username="a")
+        policy_set = get_policy_set(db)
+        assert get_policy_set(db) is policy_set
+
+        profile.match_username = "b"
+        db.commit()
+        updated = get_policy_set(db)
+        assert updated is not policy_set
+        assert updated.evaluate(PolicyRequest(username="b")).profile_name == "first"
+
+        add_profile(db, "second", match_username="c")
+        assert len(get_policy_set(db).profiles) == 2
+
+
+@pytest.mark.unit
+class TestPolicySimulationApi:
+    """Test the single-policy test and bulk simulation endpoints."""
+
+    def test_test_policy_reports_winner(self, client, db):
+        """A matching profile shadowed by a higher-priority one says so."""
+        add_profile(db, "first", priority=1, match_username=".*")
+        shadowed = add_profile(db, "shadowed", priority=2, match_username="alice", reply_attributes=[
+            {"attribute": "Filter-Id", "operator": ":=", "value": "staff"},
+        ])
+
+        response = client.post(
+            f"/api/policies/{shadowed.id}/test", json={"username": "alice"}, headers=HEADERS
+        )
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["matches"] is True
+        assert body["reply_attributes"][0]["value"] == "staff"
+        assert body["winning_policy_name"] == "first"
+
+    def test_simulate_batch(self, client, db):
+        """Thousands of requests come back with a winner each and a summary."""
+        add_profile(db, "guests", priority=10, match_username="guest-")
+        add_profile(db, "staff", priority=20, match_username="staff-")
+        requests = [{"username": f"guest-{i}"} for i in range(1500)]
+        requests += [{"username": f"staff-{i}"} for i in range(1000)]
+        requests.append({"username": "nobody"})
+
+        response = client.post("/api/policies/simulate", json={"requests": requests}, headers=HEADERS)
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["total"] == 2501
+        assert body["summary"] == {"guests": 1500, "staff": 1000, NO_MATCH: 1}
+        assert body["results"][-1]["outcome"] == NO_MATCH
@@ -0,0 +1,203 @@
+"""Unit tests for the set-based PSK -> radcheck/radreply sync."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from radius_app.core.radcheck_sync import diff_rows, sync_psk_users
+from radius_app.db.models import UdnAssignment
+
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def decrypt(encrypted):
+    """Test 'decryption': strip the enc: prefix, fail on anything else."""
+    return encrypted[4:] if encrypted.startswith("enc:") else None
+
+
+@pytest.fixture
+def rad_tables(db):
+    """radcheck/radreply tables on the test engine."""
+    for name in ("radcheck", "radreply"):
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "username VARCHAR(64) NOT NULL, attribute VARCHAR(64) NOT NULL, "
+            "op CHAR(2) NOT NULL, value VARCHAR(253) NOT NULL)"
+        ))
+    db.commit()
+    yield db
+    db.execute(text("DROP TABLE radcheck"))
+    db.execute(text("DROP TABLE radreply"))
+    db.commit()
+
+
+@pytest.fixture
+def portal():
+    """Portal database with a minimal users table."""
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(255), ipsk_id VARCHAR(255), "
+            "ipsk_passphrase_encrypted TEXT, ssid_name VARCHAR(255), is_active BOOLEAN, updated_at DATETIME)"
+        ))
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+def add_user(portal, user_id, passphrase="enc:secret", ipsk_id=None, ssid="Resident", active=True, updated=T0):
+    """Insert a portal user."""
+    portal.execute(text(
+        "INSERT INTO users VALUES (:id, :email, :ipsk_id, :psk, :ssid, :active, :updated)"
+    ), {
+        "id": user_id, "email": f"user{user_id}@example.com", "ipsk_id": ipsk_id,
+        "psk": passphrase, "ssid": ssid, "active": active, "updated": updated,
+    })
+    portal.commit()
+
+
+def rows(db, table):
+    """All (username, attribute, op, value) rows in a table, sorted."""
+    return sorted(tuple(row) for row in db.execute(text(f"SELECT username, attribute, op, value FROM {table}")))
+
+
+@pytest.mark.unit
+class TestDiffRows:
+    """Test the row diff."""
+
+    def test_unchanged_rows_produce_no_writes(self):
+        """Identical current and desired rows need nothing."""
+        current = [(1, "a", "Cleartext-Password", ":=", "x"), (2, "a", "Reply-Message", ":=", "hi")]
+        diff = diff_rows(current, [row[1:] for row in current])
+        assert (diff.inserts, diff.updates, diff.deletes) == ([], [], [])
+
+    def test_changed_value_is_updated_in_place(self):
+        """A new value for the same attribute reuses the existing row."""
+        diff = diff_rows([(7, "a", "Cleartext-Password", ":=", "old")], [("a", "Cleartext-Password", ":=", "new")])
+        assert diff.updates == [(7, ":=", "new")]
+        assert diff.inserts == [] and diff.deletes == []
+
+    def test_duplicates_and_extras_are_deleted(self):
+        """Duplicate rows collapse and unwanted rows go away."""
+        current = [
+            (1, "a", "Cleartext-Password", ":=", "x"),
+            (2, "a", "Cleartext-Password", ":=", "x"),
+            (3, "a", "Reply-Message", ":=", "old"),
+        ]
+        diff = diff_rows(current, [("a", "Cleartext-Password", ":=", "x"), ("b", "Cleartext-Password", ":=", "y")])
+        assert sorted(diff.deletes) == [2, 3]
+        assert diff.inserts == [("b", "Cleartext-Password", ":=", "y")]
+
+
+@pytest.mark.unit
+class TestSyncPskUsers:
+    """Test syncing against real tables."""
+
+    def test_full_sync_writes_expected_rows(self, rad_tables, portal):
+        """Passwords go to radcheck; UDN and SSID go to radreply."""
+        db = rad_tables
+        add_user(portal, 1)
+        add_user(portal, 2, ipsk_id="ipsk-2", ssid=None)
+        db.add(UdnAssignment(user_id=1, udn_id=100))
+        db.commit()
+
+        stats = sync_psk_users(db, portal, decrypt)
+
+        assert stats["users_synced"] == 2
+        assert rows(db, "radcheck") == [
+            ("ipsk-2", "Cleartext-Password", ":=", "secret"),
+            ("user1@example.com", "Cleartext-Password", ":=", "secret"),
+        ]
+        assert rows(db, "radreply") == [
+            ("user1@example.com", "Cisco-AVPair", ":=", "udn:private-group-id=100"),
+            ("user1@example.com", "Reply-Message", ":=", "SSID: Resident"),
+        ]
+
+    def test_resync_only_writes_changes(self, rad_tables, portal, assert_max_queries):
+        """A second sync of unchanged data issues no writes."""
+        db = rad_tables
+        for user_id in range(1, 21):
+            add_user(portal, user_id)
+        sync_psk_users(db, portal, decrypt)
+
+        with assert_max_queries(3) as statements:
+            stats = sync_psk_users(db, portal, decrypt)
+
+        assert (stats["inserted"], stats["updated"], stats["deleted"]) == (0, 0, 0)
+        assert not any(s.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")) for s in statements)
+
+    def test_leaves_foreign_rows_and_undecryptable_users(self, rad_tables, portal):
+        """Rows not owned by a portal user, or whose PSK can't be read, survive."""
+        db = rad_tables
+        db.execute(text(
+            "INSERT INTO radcheck (username, attribute, op, value) VALUES "
+            "('manual', 'Cleartext-Password', ':=', 'keep'), "
+            "('user2@example.com', 'Cleartext-Password', ':=', 'previous')"
+        ))
+        db.commit()
+        add_user(portal, 1)
+        add_user(portal, 2, passphrase="garbled")
+
+        stats = sync_psk_users(db, portal, decrypt)
+
+        assert stats["errors"] == ["User user2@example.com: Could not decrypt passphrase"]
+        assert ("manual", "Cleartext-Password", ":=", "keep") in rows(db, "radcheck")
+        assert ("user2@example.com", "Cleartext-Password", ":=", "previous") in rows(db, "radcheck")
+
+    def test_incremental_sync(self, rad_tables, portal):
+        """Only users changed since the cursor are touched, including deactivations."""
+        db = rad_tables
+        add_user(portal, 1)
+        add_user(portal, 2)
+        add_user(portal, 3)
+        sync_psk_users(db, portal, decrypt)
+
+        # User 1 rotates their PSK, user 2 is deactivated, user 3 is untouched
+        # except for a UDN assignment on the RADIUS side
+        later = T0 + timedelta(hours=1)
+        portal.execute(text(
+            "UPDATE users SET ipsk_passphrase_encrypted = 'enc:rotated', updated_at = :t WHERE id = 1"
+        ), {"t": later})
+        portal.execute(text("UPDATE users SET is_active = 0, updated_at = :t WHERE id = 2"), {"t": later})
+        portal.commit()
+        db.add(UdnAssignment(user_id=3, udn_id=300, updated_at=later))
+        db.commit()
+
+        stats = sync_psk_users(db, portal, decrypt, since=T0 + timedelta(minutes=30))
+
+        assert stats["users_synced"] == 2
+        assert (stats["inserted"], stats["updated"], stats["deleted"]) == (1, 1, 2)
+        assert rows(db, "radcheck") == [
+            ("user1@example.com", "Cleartext-Password", ":=", "rotated"),
+            ("user3@example.com", "Cleartext-Password", ":=", "secret"),
+        ]
+        assert ("user3@example.com", "Cisco-AVPair", ":=", "udn:private-group-id=300") in rows(db, "radreply")
+
+    def test_cursor_follows_portal_timestamps(self, rad_tables, portal):
+        """The cursor is the newest updated_at seen, and late commits just behind it are read."""
+        db = rad_tables
+        add_user(portal, 1, updated=T0 + timedelta(hours=1))
+        stats = sync_psk_users(db, portal, decrypt)
+        assert datetime.fromisoformat(stats["cursor"]) == T0 + timedelta(hours=1)
+
+        # Committed after the sync, stamped just before the cursor
+        add_user(portal, 2, updated=T0 + timedelta(hours=1, seconds=-2))
+        stats = sync_psk_users(db, portal, decrypt, since=datetime.fromisoformat(stats["cursor"]))
+
+        assert "user2@example.com" in [row[0] for row in rows(db, "radcheck")]
+        assert datetime.fromisoformat(stats["cursor"]) == T0 + timedelta(hours=1)
+
+    def test_username_switch_clears_email_rows(self, rad_tables, portal):
+        """When a user gains an iPSK ID, rows under their email are removed."""
+        db = rad_tables
+        add_user(portal, 1)
+        sync_psk_users(db, portal, decrypt)
+        portal.execute(text("UPDATE users SET ipsk_id = 'ipsk-1' WHERE id = 1"))
+        portal.commit()
+
+        sync_psk_users(db, portal, decrypt)
+
+        assert [row[0] for row in rows(db, "radcheck")] == ["ipsk-1"]
+        assert {row[0] for row in rows(db, "radreply")} == {"ipsk-1"}
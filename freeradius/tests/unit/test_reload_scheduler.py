@@ -0,0 +1,159 @@
+"""Unit tests for the debounced radiusd reload scheduler."""
+
+import asyncio
+import signal
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from radius_app.core import reload_scheduler
+from radius_app.core.reload_scheduler import ReloadScheduler
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    """Scheduler with short timings and a counting signal stub."""
+    scheduler = ReloadScheduler(
+        debounce_seconds=0.05,
+        max_delay_seconds=0.2,
+        pid_file=tmp_path / "radiusd.pid",
+    )
+    scheduler.signals = 0
+
+    def fake_signal():
+        scheduler.signals += 1
+        return True
+
+    scheduler._signal_radiusd = fake_signal
+    return scheduler
+
+
+@pytest.mark.unit
+class TestReloadCoalescing:
+    """Test debounce, max delay and single-flight behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_coalesced_into_one_reload(self, scheduler):
+        """Requests inside the debounce window share one SIGHUP."""
+        futures = [scheduler.request_reload(f"caller-{i}") for i in range(10)]
+
+        assert await asyncio.gather(*futures) == [True] * 10
+        assert scheduler.signals == 1
+        metrics = scheduler.get_metrics()
+        assert metrics["requested"] == 10
+        assert metrics["executed"] == 1
+        assert metrics["coalesced"] == 9
+        assert metrics["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_max_delay_bounds_continuous_requests(self, scheduler):
+        """A steady stream of requests can't postpone the reload forever."""
+        first = scheduler.request_reload("stream")
+        started = time.monotonic()
+        while not first.done():
+            scheduler.request_reload("stream")
+            await asyncio.sleep(0.02)
+
+        assert time.monotonic() - started < 0.5
+        assert scheduler.signals == 1
+
+    @pytest.mark.asyncio
+    async def test_requests_during_reload_get_trailing_reload(self, scheduler):
+        """Only one reload runs at a time; later requests get a second one."""
+        release = threading.Event()
+        active = []
+        overlap = []
+
+        def slow_signal():
+            overlap.append(bool(active))
+            active.append(1)
+            release.wait(1)
+            active.pop()
+            scheduler.signals += 1
+            return True
+
+        scheduler._signal_radiusd = slow_signal
+        first = scheduler.request_reload("first")
+        while not scheduler.running:
+            await asyncio.sleep(0.01)
+
+        second = scheduler.request_reload("second")
+        release.set()
+
+        assert await first is True
+        assert await second is True
+        assert scheduler.signals == 2
+        assert overlap == [False, False]
+
+    @pytest.mark.asyncio
+    async def test_failed_reload_is_reported(self, scheduler):
+        """Signal failures resolve waiters with False and count as failed."""
+        scheduler._signal_radiusd = lambda: False
+
+        assert await scheduler.reload("test") is False
+        assert scheduler.metrics.failed == 1
+
+
+@pytest.mark.unit
+class TestPidTracking:
+    """Test radiusd pid resolution."""
+
+    def test_signals_pid_from_pidfile(self, tmp_path):
+        """The pid in the pidfile receives SIGHUP."""
+        pid_file = tmp_path / "radiusd.pid"
+        pid_file.write_text("4242\n")
+        scheduler = ReloadScheduler(pid_file=pid_file)
+
+        with patch.object(reload_scheduler, "_is_radiusd", return_value=True), \
+             patch.object(reload_scheduler.os, "kill") as kill:
+            assert scheduler._signal_radiusd() is True
+
+        kill.assert_called_once_with(4242, signal.SIGHUP)
+
+    def test_stale_pidfile_falls_back_to_proc_scan(self, tmp_path):
+        """A pidfile pointing at a dead process isn't signalled."""
+        pid_file = tmp_path / "radiusd.pid"
+        pid_file.write_text("4242\n")
+        scheduler = ReloadScheduler(pid_file=pid_file)
+
+        with patch.object(reload_scheduler, "_is_radiusd", return_value=False), \
+             patch.object(reload_scheduler, "_find_radiusd_pid", return_value=777), \
+             patch.object(reload_scheduler.os, "kill") as kill:
+            assert scheduler._signal_radiusd() is True
+
+        kill.assert_called_once_with(777, signal.SIGHUP)
+
+    def test_no_radiusd_process(self, tmp_path):
+        """Without a pidfile or process the reload fails without signalling."""
+        scheduler = ReloadScheduler(pid_file=tmp_path / "missing.pid")
+
+        with patch.object(reload_scheduler, "_find_radiusd_pid", return_value=None), \
+             patch.object(reload_scheduler.os, "kill") as kill:
+            assert scheduler._signal_radiusd() is False
+
+        kill.assert_not_called()
+
+
+@pytest.mark.unit
+class TestReloadMetricsEndpoint:
+    """Test GET /api/reload/metrics."""
+
+    def test_metrics_endpoint(self, client, monkeypatch):
+        """Metrics expose requested vs. executed counters."""
+        scheduler = ReloadScheduler(debounce_seconds=0.1, max_delay_seconds=1)
+        scheduler.metrics.requested = 5
+        scheduler.metrics.executed = 2
+        monkeypatch.setattr(reload_scheduler, "_scheduler", scheduler)
+
+        response = client.get(
+            "/api/reload/metrics",
+            headers={"Authorization": "Bearer test-token"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["requested"] == 5
+        assert data["executed"] == 2
+        assert data["debounce_seconds"] == 0.1
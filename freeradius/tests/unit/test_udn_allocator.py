@@ -0,0 +1,173 @@
+"""Unit tests for the persistent UDN free-range allocator."""
+
+import pytest
+from sqlalchemy import event, select
+
+from radius_app.core.udn_allocator import UDN_MAX, UDN_MIN, UdnAllocator, UdnPoolExhausted
+from radius_app.db.models import UdnAssignment, UdnFreeRange
+
+
+SENTINEL = (UDN_MAX + 1, UDN_MAX)
+
+
+def free_ranges(db):
+    """Current free list as (start, end) tuples, sentinel excluded."""
+    return [tuple(row) for row in db.execute(
+        select(UdnFreeRange.start_id, UdnFreeRange.end_id)
+        .where(UdnFreeRange.start_id <= UDN_MAX)
+        .order_by(UdnFreeRange.start_id)
+    )]
+
+
+def assign(db, *udn_ids):
+    """Insert assignments directly, bypassing the allocator."""
+    for udn_id in udn_ids:
+        db.add(UdnAssignment(user_id=udn_id, udn_id=udn_id))
+    db.flush()
+
+
+@pytest.mark.unit
+class TestUdnAllocator:
+    """Test allocation, claiming and releasing."""
+
+    def test_builds_free_list_from_assignments(self, db):
+        """The free list is derived once from existing assignments."""
+        assign(db, 2, 3, 7)
+
+        allocator = UdnAllocator(db)
+        assert allocator.peek() == 4
+        assert free_ranges(db) == [(4, 6), (8, UDN_MAX)]
+        assert allocator.free_count() == (UDN_MAX - UDN_MIN + 1) - 3
+
+    def test_allocate_lowest_first(self, db):
+        """Gaps are filled before the open-ended tail."""
+        assign(db, 2, 4)
+        allocator = UdnAllocator(db)
+
+        assert [allocator.allocate() for _ in range(3)] == [3, 5, 6]
+        assert free_ranges(db) == [(7, UDN_MAX)]
+
+    def test_allocate_many_spans_ranges(self, db):
+        """Batch allocation takes whole ranges and crosses gaps."""
+        assign(db, 5, 6, 10)
+        allocator = UdnAllocator(db)
+
+        assert allocator.allocate_many(7) == [2, 3, 4, 7, 8, 9, 11]
+        assert free_ranges(db) == [(12, UDN_MAX)]
+
+    def test_allocation_is_constant_queries(self, db):
+        """Allocating doesn't load assigned IDs, however many there are."""
+        db.execute(UdnAssignment.__table__.insert(), [
+            {"user_id": i, "udn_id": i, "is_active": True} for i in range(UDN_MIN, 5002)
+        ])
+        allocator = UdnAllocator(db)
+        allocator.ensure_initialized()
+
+        statements = []
+        engine = db.get_bind()
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            assert allocator.allocate() == 5002
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert len(statements) <= 5
+
+    def test_skips_ids_assigned_outside_allocator(self, db):
+        """IDs inserted behind the allocator's back are detected and skipped."""
+        allocator = UdnAllocator(db)
+        allocator.ensure_initialized()
+        assign(db, 2, 3)
+
+        assert allocator.allocate() == 4
+        assert allocator.peek() == 5
+
+    def test_claim_splits_range(self, db):
+        """Claiming an ID inside a range splits it."""
+        allocator = UdnAllocator(db)
+
+        assert allocator.claim(1000) is True
+        assert allocator.claim(1000) is False
+        assert free_ranges(db) == [(2, 999), (1001, UDN_MAX)]
+
+    def test_release_merges_neighbours(self, db):
+        """Released IDs rejoin adjacent ranges."""
+        assign(db, 2, 3, 4)
+        allocator = UdnAllocator(db)
+        allocator.ensure_initialized()
+
+        allocator.release(3)
+        assert free_ranges(db) == [(3, 3), (5, UDN_MAX)]
+        allocator.release(4)
+        assert free_ranges(db) == [(3, UDN_MAX)]
+        allocator.release(2)
+        assert free_ranges(db) == [(2, UDN_MAX)]
+        allocator.release(2)
+        assert free_ranges(db) == [(2, UDN_MAX)]
+
+    def test_exhausted_pool(self, db):
+        """A pool with no free IDs raises UdnPoolExhausted."""
+        allocator = UdnAllocator(db, min_id=2, max_id=4)
+
+        assert allocator.allocate_many(3) == [2, 3, 4]
+        with pytest.raises(UdnPoolExhausted):
+            allocator.allocate()
+        with pytest.raises(UdnPoolExhausted):
+            allocator.peek()
+        assert allocator.free_count() == 0
+
+        allocator.release(4)
+        assert allocator.allocate() == 4
+
+    def test_empty_locked_read_is_retried(self, db, monkeypatch):
+        """A locked read emptied by a concurrent delete isn't exhaustion."""
+        allocator = UdnAllocator(db, min_id=2, max_id=4)
+        allocator.ensure_initialized()
+        execute = db.execute
+        skipped = []
+
+        def execute_losing_first_lock(statement, *args, **kwargs):
+            result = execute(statement, *args, **kwargs)
+            if getattr(statement, "_for_update_arg", None) is not None and not skipped:
+                # PostgreSQL skips a locked row deleted by the holder
+                skipped.append(result.all())
+            return result
+
+        monkeypatch.setattr(db, "execute", execute_losing_first_lock)
+
+        assert allocator.allocate_many(2) == [2, 3]
+        assert skipped == [[(2, 4)]]
+
+
+@pytest.mark.unit
+class TestUdnAssignmentApiAllocation:
+    """Test that the API keeps the free list in step with assignments."""
+
+    HEADERS = {"Authorization": "Bearer test-token"}
+
+    def test_create_update_delete_round_trip(self, client, db):
+        """Auto-assign, move and hard-delete all update the free list."""
+        first = client.post("/api/udn-assignments", json={"user_id": 1}, headers=self.HEADERS)
+        second = client.post("/api/udn-assignments", json={"user_id": 2, "udn_id": 3}, headers=self.HEADERS)
+        assert (first.status_code, second.status_code) == (201, 201)
+        assert first.json()["udn_id"] == 2
+
+        third = client.post("/api/udn-assignments", json={"user_id": 3}, headers=self.HEADERS)
+        assert third.json()["udn_id"] == 4
+
+        moved = client.put(
+            f"/api/udn-assignments/{second.json()['id']}", json={"udn_id": 50}, headers=self.HEADERS
+        )
+        assert moved.status_code == 200
+        deleted = client.delete(
+            f"/api/udn-assignments/{first.json()['id']}?hard_delete=true", headers=self.HEADERS
+        )
+        assert deleted.status_code == 204
+
+        db.expire_all()
+        assert free_ranges(db) == [(2, 3), (5, 49), (51, UDN_MAX)]
+        available = client.get("/api/udn-assignments/available-udn", headers=self.HEADERS)
+        assert available.json()["udn_id"] == 2
@@ -0,0 +1,179 @@
+"""Unit tests for bulk UDN assignment import."""
+
+import json
+import time
+
+import pytest
+from sqlalchemy import event, func, select
+
+from radius_app.core.udn_allocator import UdnAllocator, UdnPoolExhausted
+from radius_app.core.udn_bulk_import import (
+    UdnImportError,
+    detect_format,
+    import_udn_assignments,
+    parse_rows,
+)
+from radius_app.db.models import UdnAssignment
+
+HEADERS = {"Authorization": "Bearer test-token"}
+
+
+def stream_lines(response):
+    """Decode an NDJSON response."""
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+@pytest.mark.unit
+class TestParsing:
+    """Test CSV/NDJSON parsing."""
+
+    def test_csv_blank_cells_are_missing(self):
+        """Empty CSV cells don't become empty strings."""
+        rows = list(parse_rows("user_id,mac_address,unit\n1,,101\n2,AA-BB-CC-DD-EE-02,\n", "csv"))
+
+        assert rows == [(2, {"user_id": "1", "unit": "101"}), (3, {"user_id": "2", "mac_address": "AA-BB-CC-DD-EE-02"})]
+
+    def test_csv_requires_user_id_header(self):
+        """CSV without a user_id column is rejected as a whole."""
+        with pytest.raises(UdnImportError):
+            list(parse_rows("name,unit\nalice,101\n", "csv"))
+
+    def test_ndjson_bad_lines_are_row_errors(self):
+        """Malformed NDJSON lines are reported per line."""
+        rows = list(parse_rows('{"user_id": 1}\n\nnot json\n[1]\n', "ndjson"))
+
+        assert rows[0] == (1, {"user_id": 1})
+        assert rows[1][0] == 3 and rows[1][1].startswith("Invalid JSON")
+        assert rows[2] == (4, "Expected a JSON object")
+
+    @pytest.mark.parametrize("content_type, expected", [
+        ("text/csv; charset=utf-8", "csv"),
+        ("application/x-ndjson", "ndjson"),
+        ("application/jsonl", "ndjson"),
+        ("application/octet-stream", None),
+    ])
+    def test_detect_format(self, content_type, expected):
+        """Format is inferred from Content-Type."""
+        assert detect_format(content_type) == expected
+
+
+@pytest.mark.unit
+class TestImport:
+    """Test validation, conflict detection and allocation."""
+
+    def test_mixed_rows(self, db):
+        """Good rows are inserted, bad and conflicting rows are reported."""
+        db.add(UdnAssignment(user_id=100, udn_id=2, mac_address="aa:bb:cc:dd:ee:ff"))
+        db.commit()
+        payload = (
+            "user_id,mac_address,udn_id,unit\n"
+            "1,AA-BB-CC-DD-EE-01,,101\n"       # auto -> 3
+            "2,,50,102\n"                      # explicit
+            "3,aa:bb:cc:dd:ee:ff,,103\n"       # MAC taken
+            "100,,,104\n"                      # user already assigned
+            "1,,,105\n"                        # duplicate in file
+            "x,,,106\n"                        # invalid user_id
+            "4,,,107\n"                        # auto -> 4
+        )
+
+        report = import_udn_assignments(db, payload, "csv")
+        db.commit()
+
+        statuses = [(r.line, r.status, r.udn_id) for r in report.results]
+        assert statuses == [
+            (2, "created", 3), (3, "created", 50), (4, "failed", None), (5, "failed", None),
+            (6, "failed", None), (7, "failed", None), (8, "created", 4),
+        ]
+        assert "already assigned to User 100" in report.results[2].error
+        assert "first seen on line 2" in report.results[4].error
+        assert report.results[5].error.startswith("user_id")
+        assert report.summary() == {"rows": 7, "created": 3, "failed": 4, "skipped": 0}
+
+        saved = db.execute(select(UdnAssignment).where(UdnAssignment.user_id == 1)).scalar_one()
+        assert (saved.udn_id, saved.mac_address, saved.unit) == (3, "aa:bb:cc:dd:ee:01", "101")
+        assert UdnAllocator(db).peek() == 5
+
+    def test_atomic_import_skips_everything(self, db):
+        """With atomic=True one bad row stops the whole import."""
+        payload = '{"user_id": 1}\n{"user_id": 2, "mac_address": "zz"}\n'
+
+        report = import_udn_assignments(db, payload, "ndjson", atomic=True)
+
+        assert [r.status for r in report.results] == ["skipped", "failed"]
+        assert db.execute(select(func.count(UdnAssignment.id))).scalar() == 0
+
+    def test_pool_exhaustion(self, db):
+        """Imports larger than the free pool raise before inserting."""
+        payload = "\n".join(json.dumps({"user_id": i}) for i in range(5))
+
+        with pytest.raises(UdnPoolExhausted):
+            import_udn_assignments(db, payload, "ndjson", allocator=UdnAllocator(db, min_id=2, max_id=4))
+
+    def test_ten_thousand_rows(self, db):
+        """A 10k-user import runs set-wise: query count doesn't grow per row."""
+        payload = "user_id,unit\n" + "".join(f"{i},{i % 500}\n" for i in range(10_000))
+        statements = []
+        engine = db.get_bind()
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        started = time.perf_counter()
+        try:
+            report = import_udn_assignments(db, payload, "csv")
+            db.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        elapsed = time.perf_counter() - started
+
+        assert report.created == 10_000
+        assert db.execute(select(func.max(UdnAssignment.udn_id))).scalar() == 10_001
+        # Lookups are chunked by 500 and inserts batched by 1000
+        assert len(statements) < 100
+        assert elapsed < 30
+
+
+@pytest.mark.unit
+class TestImportApi:
+    """Test the streaming import endpoint."""
+
+    def test_csv_import_streams_results(self, client, db):
+        """Each row gets a result line followed by a summary."""
+        response = client.post(
+            "/api/udn-assignments/import",
+            content="user_id,user_name\n1,Alice\n2,Bob\n1,Again\n",
+            headers={**HEADERS, "Content-Type": "text/csv"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = stream_lines(response)
+        assert [line["status"] for line in lines[:-1]] == ["created", "created", "failed"]
+        assert lines[-1]["type"] == "summary"
+        assert (lines[-1]["created"], lines[-1]["failed"]) == (2, 1)
+
+        listed = client.get("/api/udn-assignments", headers=HEADERS).json()
+        assert listed["total"] == 2
+
+    def test_format_query_parameter(self, client):
+        """?format overrides an unhelpful Content-Type."""
+        response = client.post(
+            "/api/udn-assignments/import?format=ndjson",
+            content='{"user_id": 7, "udn_id": 700}\n',
+            headers={**HEADERS, "Content-Type": "text/plain"},
+        )
+
+        assert stream_lines(response)[0] == {
+            "type": "result", "line": 1, "status": "created", "user_id": 7, "udn_id": 700,
+        }
+
+    def test_unknown_format(self, client):
+        """Bodies of unknown type are refused."""
+        response = client.post(
+            "/api/udn-assignments/import",
+            content="whatever",
+            headers={**HEADERS, "Content-Type": "text/plain"},
+        )
+
+        assert response.status_code == 400
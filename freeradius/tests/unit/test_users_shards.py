@@ -0,0 +1,141 @@
+"""Unit tests for sharded users-format include files."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from radius_app.core import users_shards
+from radius_app.core.config_generator import ConfigGenerator
+from radius_app.core.psk_config_generator import PskConfigGenerator
+from radius_app.core.users_shards import shard_dir, shard_for, write_sharded_users_file
+from radius_app.db.models import RadiusMacBypassConfig, UdnAssignment
+
+
+@pytest.fixture(autouse=True)
+def clear_digests(monkeypatch):
+    """Isolate the written-digest cache between tests."""
+    monkeypatch.setattr(users_shards, "_written_digests", {})
+
+
+def _entry(mac: str) -> tuple[str, str]:
+    return mac, f'{mac} Cleartext-Password := ""\n    Reply-Message := "hi"\n\n'
+
+
+@pytest.mark.unit
+class TestWriteShardedUsersFile:
+    """Test the shard writer."""
+
+    def test_writes_index_and_shards(self, tmp_path):
+        """Entries land in their hash shard and the index includes every shard."""
+        base = tmp_path / "users"
+        macs = [f"aa:bb:cc:dd:ee:{i:02x}" for i in range(20)]
+
+        timings = write_sharded_users_file(
+            base, [_entry(mac) for mac in macs], 4, title="Test users", footer="DEFAULT Auth-Type := Reject\n"
+        )
+
+        assert sorted(timings) == ["shard-000", "shard-001", "shard-002", "shard-003"]
+        index = base.read_text()
+        assert [line for line in index.splitlines() if line.startswith("$INCLUDE")] == [
+            f"$INCLUDE users.d/shard-{i:03d}" for i in range(4)
+        ]
+        assert index.rstrip().endswith("DEFAULT Auth-Type := Reject")
+        for mac in macs:
+            shard = shard_dir(base) / f"shard-{shard_for(mac, 4):03d}"
+            assert mac in shard.read_text()
+
+    def test_only_dirty_shards_are_rewritten(self, tmp_path):
+        """Changing one entry rewrites only the shard that holds it."""
+        base = tmp_path / "users"
+        entries = [_entry(f"aa:bb:cc:dd:ee:{i:02x}") for i in range(20)]
+        write_sharded_users_file(base, entries, 4, title="Test users")
+
+        assert write_sharded_users_file(base, entries, 4, title="Test users") == {}
+
+        new_mac = "11:22:33:44:55:66"
+        timings = write_sharded_users_file(base, entries + [_entry(new_mac)], 4, title="Test users")
+        assert list(timings) == [f"shard-{shard_for(new_mac, 4):03d}"]
+
+    def test_unchanged_shards_detected_from_disk(self, tmp_path, monkeypatch):
+        """A fresh process compares against the files already on disk."""
+        base = tmp_path / "users"
+        entries = [_entry(f"aa:bb:cc:dd:ee:{i:02x}") for i in range(8)]
+        write_sharded_users_file(base, entries, 2, title="Test users")
+
+        monkeypatch.setattr(users_shards, "_written_digests", {})
+        assert write_sharded_users_file(base, entries, 2, title="Test users") == {}
+
+    def test_shrinking_shard_count_removes_extra_shards(self, tmp_path):
+        """Shards beyond the new count are deleted."""
+        base = tmp_path / "users"
+        entries = [_entry(f"aa:bb:cc:dd:ee:{i:02x}") for i in range(8)]
+        write_sharded_users_file(base, entries, 4, title="Test users")
+        write_sharded_users_file(base, entries, 2, title="Test users")
+
+        assert sorted(p.name for p in shard_dir(base).iterdir()) == ["shard-000", "shard-001"]
+
+
+@pytest.mark.unit
+class TestShardedGenerators:
+    """Test generators in shard mode."""
+
+    @pytest.fixture
+    def settings(self, temp_config_dir, monkeypatch):
+        """Patch generator settings to the temp config dir with 4 shards."""
+        monkeypatch.setenv("RADIUS_USERS_SHARDS", "4")
+        with patch("radius_app.core.config_generator.get_settings") as cfg_settings, \
+             patch("radius_app.core.psk_config_generator.get_settings") as psk_settings:
+            for mock_settings in (cfg_settings, psk_settings):
+                mock_settings.return_value.radius_config_path = str(temp_config_dir)
+                mock_settings.return_value.radius_clients_path = str(temp_config_dir / "clients")
+            yield temp_config_dir
+
+    def test_users_file_sharded(self, db: Session, settings):
+        """UDN entries are split into shards and the default reject stays last."""
+        db.add_all([
+            UdnAssignment(user_id=i, mac_address=f"aa:bb:cc:00:00:{i:02x}", udn_id=100 + i)
+            for i in range(10)
+        ])
+        db.commit()
+
+        generator = ConfigGenerator()
+        users_path = generator.generate_users_file(db)
+
+        assert "$INCLUDE users.d/shard-000" in users_path.read_text()
+        assert "DEFAULT Auth-Type := Reject" in users_path.read_text()
+        shards = "".join(p.read_text() for p in sorted(shard_dir(users_path).iterdir()))
+        assert shards.count("Cisco-AVPair") == 10
+
+        assignment = db.query(UdnAssignment).filter_by(udn_id=103).one()
+        assignment.unit = "12B"
+        db.commit()
+        generator.generate_users_file(db)
+        assert list(generator.last_shard_timings) == [
+            f"shard-{shard_for('aa:bb:cc:00:00:03', 4):03d}"
+        ]
+
+    def test_switching_back_to_single_file(self, db: Session, settings, monkeypatch):
+        """Single-file mode removes the shard directory."""
+        db.add(UdnAssignment(user_id=1, mac_address="aa:bb:cc:00:00:01", udn_id=100))
+        db.commit()
+        users_path = ConfigGenerator().generate_users_file(db)
+        assert shard_dir(users_path).exists()
+
+        monkeypatch.setenv("RADIUS_USERS_SHARDS", "0")
+        ConfigGenerator().generate_users_file(db)
+
+        assert not shard_dir(users_path).exists()
+        assert "aa:bb:cc:00:00:01" in users_path.read_text()
+
+    def test_mac_bypass_sharded(self, db: Session, settings):
+        """Each bypassed MAC goes to its own hash shard."""
+        macs = ["aa:bb:cc:dd:ee:01", "aa:bb:cc:dd:ee:02", "aa:bb:cc:dd:ee:03"]
+        db.add(RadiusMacBypassConfig(name="printers", mac_addresses=macs, bypass_mode="whitelist"))
+        db.commit()
+
+        bypass_path = PskConfigGenerator().generate_mac_bypass_file(db)
+
+        for mac in macs:
+            shard = shard_dir(bypass_path) / f"shard-{shard_for(mac, 4):03d}"
+            assert f'"{mac}" Auth-Type := Accept' in shard.read_text()
@@ -0,0 +1,171 @@
+"""Unit tests for batched config validation sessions."""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from radius_app.core.config_validator import (
+    ConfigValidationError,
+    ConfigValidator,
+    ConfigWriteBatch,
+    safe_write_config_chunks,
+    safe_write_config_file,
+)
+
+OK = "Configuration appears to be OK"
+
+
+def _completed(returncode: int = 0, stdout: str = OK, stderr: str = "") -> subprocess.CompletedProcess:
+    return subprocess.CompletedProcess(args=["radiusd"], returncode=returncode, stdout=stdout, stderr=stderr)
+
+
+@pytest.fixture
+def validator():
+    """Validator that believes radiusd is installed."""
+    with patch.object(ConfigValidator, "_check_radiusd_available", return_value=True):
+        yield ConfigValidator()
+
+
+@pytest.mark.unit
+class TestValidationSession:
+    """Test one-parser-run validation of several files."""
+
+    def test_all_files_validated_with_one_run(self, validator, tmp_path):
+        """Every staged file lands in one shadow raddb and radiusd runs once."""
+        users = tmp_path / "users"
+        users.write_text('aa:bb Cleartext-Password := ""\n')
+        staged = {}
+
+        def fake_run(cmd, **kwargs):
+            raddb = cmd[cmd.index("-d") + 1]
+            staged.update({p.name: p.read_text() for p in Path(raddb).iterdir()})
+            return _completed()
+
+        session = validator.session()
+        session.add_file("users", users)
+        session.add_content("clients.conf", "client a {\n}\n", file_type="clients")
+        session.add_content("policies", "# policies\n", file_type="policy")
+
+        with patch("radius_app.core.config_validator.subprocess.run", side_effect=fake_run):
+            assert session.errors() == {}
+
+        assert validator.parser_runs == 1
+        assert {"users", "clients.conf", "policies"} <= set(staged)
+        assert "$INCLUDE" in staged["radiusd.conf"] and "clients.conf" in staged["radiusd.conf"]
+
+    def test_unchanged_content_is_not_reparsed(self, validator):
+        """Verdicts are cached by content hash."""
+        with patch("radius_app.core.config_validator.subprocess.run", return_value=_completed()) as run:
+            assert validator.validate_users_file("# users\n") == (True, None)
+            assert validator.validate_users_file("# users\n") == (True, None)
+            session = validator.session()
+            session.add_content("users", "# users\n")
+            assert session.errors() == {}
+
+        assert run.call_count == 1
+        assert validator.parser_runs == 1
+
+    def test_write_validation_is_reused_by_batch(self, validator, tmp_path):
+        """A file validated on write costs nothing in the watcher's batch."""
+        target = tmp_path / "users"
+        with patch("radius_app.core.config_validator.subprocess.run", return_value=_completed()):
+            validator.validate_before_write(target, "# users\n", "users")
+            target.write_text("# users\n")
+
+            session = validator.session()
+            session.add_file("users", target)
+            assert session.errors() == {}
+
+        assert validator.parser_runs == 1
+
+    def test_failure_attributed_to_named_file(self, validator):
+        """The file named in the parser output fails; the others are re-checked."""
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            raddb = cmd[cmd.index("-d") + 1]
+            calls.append(raddb)
+            if len(calls) == 1:
+                return _completed(1, stdout="", stderr=f"{raddb}/policies[3]: Parse error")
+            return _completed()
+
+        session = validator.session()
+        session.add_content("users", "# users\n")
+        session.add_content("policies", "broken\n", file_type="policy")
+
+        with patch("radius_app.core.config_validator.subprocess.run", side_effect=fake_run):
+            errors = session.errors()
+
+        assert list(errors) == ["policies"]
+        assert "Parse error" in errors["policies"]
+        assert validator.parser_runs == 2
+
+    def test_invalid_verdict_raises_on_write(self, validator, tmp_path):
+        """Cached failures still block writes."""
+        failed = _completed(1, stdout="", stderr="users[1]: syntax error")
+        with patch("radius_app.core.config_validator.subprocess.run", return_value=failed):
+            for _ in range(2):
+                with pytest.raises(ConfigValidationError):
+                    validator.validate_before_write(tmp_path / "users", "bad\n", "users")
+
+        assert validator.parser_runs == 1
+
+    def test_basic_check_without_radiusd(self):
+        """Without radiusd files get the basic syntax check and no process is spawned."""
+        with patch.object(ConfigValidator, "_check_radiusd_available", return_value=False):
+            validator = ConfigValidator()
+
+        session = validator.session()
+        session.add_content("users", 'ok Reply-Message := "hi"\n')
+        session.add_content("clients.conf", "client a {\n", file_type="clients")
+
+        assert list(session.errors()) == ["clients.conf"]
+        assert validator.parser_runs == 0
+
+
+@pytest.mark.unit
+class TestConfigWriteBatch:
+    """Test staging a regeneration and validating it with one parser run."""
+
+    @pytest.fixture(autouse=True)
+    def global_validator(self, validator):
+        with patch("radius_app.core.config_validator.get_validator", return_value=validator):
+            yield
+
+    def test_staged_files_validated_once_then_applied(self, validator, tmp_path):
+        """Nothing is live until the batch is applied, and radiusd runs once."""
+        with patch("radius_app.core.config_validator.subprocess.run", return_value=_completed()):
+            with ConfigWriteBatch() as batch:
+                safe_write_config_file(tmp_path / "clients.conf", "client a {\n}\n", "clients")
+                safe_write_config_file(tmp_path / "policies", "# policies\n", "policy")
+                safe_write_config_chunks(tmp_path / "users", ["# users\n", "# more\n"])
+                safe_write_config_chunks(tmp_path / "users-psk", ["# psk\n"])
+
+            assert not (tmp_path / "users").exists()
+            batch.validate()
+
+        assert validator.parser_runs == 1
+        assert sorted(p.name for p in batch.apply()) == ["clients.conf", "policies", "users", "users-psk"]
+        assert (tmp_path / "users").read_text() == "# users\n# more\n"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["clients.conf", "policies", "users", "users-psk"]
+
+    def test_invalid_batch_leaves_live_files(self, validator, tmp_path):
+        """One bad file keeps every live file as it was."""
+        (tmp_path / "users").write_text("# old users\n")
+        discarded = []
+        failed = _completed(1, stdout="", stderr="policies[1]: Parse error")
+
+        with patch("radius_app.core.config_validator.subprocess.run", return_value=failed):
+            with ConfigWriteBatch(on_discard=discarded.extend) as batch:
+                safe_write_config_file(tmp_path / "users", "# new users\n", "users")
+                safe_write_config_file(tmp_path / "policies", "broken\n", "policy")
+
+            with pytest.raises(ConfigValidationError):
+                batch.validate()
+        batch.discard()
+
+        assert (tmp_path / "users").read_text() == "# old users\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["users"]
+        assert sorted(p.name for p in discarded) == ["policies", "users"]
@@ -8,10 +8,13 @@ from cryptography.fernet import Fernet
 from fastapi import APIRouter, HTTPException, Request, status
 from pydantic import BaseModel
 
-from app.api.deps import AdminUser, DbSession, HAClient
+from app.api.deps import AdminUser, AsyncDbSession, DbSession, HAClient
 from app.config import get_settings, reload_settings
 from app.core.db_settings import DatabaseSettingsManager
 from app.core.invite_codes import InviteCodeManager
+from app.core.ipsk_mirror import ipsk_mirror
+from app.core.meraki_throttle import get_throttle_stats
+from app.core.stats_rollup import RollupStats
 from app.core.security import hash_password
 from app.db.models import Registration, SplashAccess, User
 from app.schemas.auth import OAuthSettings
@@ -869,7 +872,7 @@ async def deactivate_invite_code(
 @router.get("/dashboard")
 async def get_dashboard_stats(
     admin: AdminUser,
-    db: DbSession,
+    db: AsyncDbSession,
     ha_client: HAClient,
 ) -> dict:
     """Get dashboard statistics and recent activity.
@@ -882,39 +885,47 @@ async def get_dashboard_stats(
     Returns:
         Dashboard data with stats and recent activity
     """
-    # Get IPSK stats
+    # Get IPSK stats (from the local mirror once it has synced)
     meraki_api_status = "unknown"
     meraki_error_message = None
     
-    try:
-        ipsks = await ha_client.list_ipsks()
-        total_ipsks = len(ipsks)
-        active_ipsks = sum(1 for i in ipsks if i.get("status") == "active")
-        expired_ipsks = sum(1 for i in ipsks if i.get("status") == "expired")
-        revoked_ipsks = sum(1 for i in ipsks if i.get("status") == "revoked")
-        online_now = sum(1 for i in ipsks if i.get("connected_clients", 0) > 0)
-        meraki_api_status = "online"
-    except Exception as e:
-        logger.warning(f"Failed to fetch IPSK stats: {e}")
-        total_ipsks = active_ipsks = expired_ipsks = revoked_ipsks = online_now = 0
-        meraki_api_status = "offline"
-        meraki_error_message = str(e)
+    if ipsk_mirror.ready:
+        counts = await ipsk_mirror.stats(db)
+        total_ipsks = counts["total"]
+        active_ipsks = counts["active"]
+        expired_ipsks = counts["expired"]
+        revoked_ipsks = counts["revoked"]
+        online_now = counts["online"]
+        meraki_status = ipsk_mirror.meraki_status()
+        meraki_api_status = meraki_status["status"]
+        meraki_error_message = meraki_status["error"]
+        ipsk_freshness = ipsk_mirror.freshness()
+    else:
+        try:
+            ipsks = await ha_client.list_ipsks()
+            total_ipsks = len(ipsks)
+            active_ipsks = sum(1 for i in ipsks if i.get("status") == "active")
+            expired_ipsks = sum(1 for i in ipsks if i.get("status") == "expired")
+            revoked_ipsks = sum(1 for i in ipsks if i.get("status") == "revoked")
+            online_now = sum(1 for i in ipsks if i.get("connected_clients", 0) > 0)
+            meraki_api_status = "online"
+        except Exception as e:
+            logger.warning(f"Failed to fetch IPSK stats: {e}")
+            total_ipsks = active_ipsks = expired_ipsks = revoked_ipsks = online_now = 0
+            meraki_api_status = "offline"
+            meraki_error_message = str(e)
+        ipsk_freshness = ipsk_mirror.freshness(source="live")
+
+    from sqlalchemy import select
 
-    # Get registration stats
+    # Get registration stats (rolled-up hours plus the open hour)
     today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-    registrations_today = (
-        db.query(Registration)
-        .filter(Registration.created_at >= today_start)
-        .count()
-    )
+    registrations_today = (await RollupStats(db).counts(today_start))["registrations"]
 
     # Get recent registrations
-    recent_registrations = (
-        db.query(Registration)
-        .order_by(Registration.created_at.desc())
-        .limit(10)
-        .all()
-    )
+    recent_registrations = (await db.execute(
+        select(Registration).order_by(Registration.created_at.desc()).limit(10)
+    )).scalars().all()
 
     return {
         "stats": {
@@ -929,6 +940,7 @@ async def get_dashboard_stats(
             "status": meraki_api_status,
             "error": meraki_error_message,
         },
+        "ipsk_freshness": ipsk_freshness,
         "recent_activity": [
             {
                 "type": "registration",
@@ -1463,6 +1475,7 @@ async def configure_ssid_for_wpn(
                         passphrase=default_psk,
                         group_policy_id=guest_policy_id,  # Use guest policy if configured, None otherwise
                     )
+                    await ipsk_mirror.record(created_ipsk)
                     default_ipsk_created = True
                     
                     if guest_policy_id:
@@ -2160,35 +2173,57 @@ class UserResponse(BaseModel):
 @router.get("/users")
 async def list_users(
     admin: AdminUser,
-    db: DbSession,
+    db: AsyncDbSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
+    include_total: bool = True,
 ) -> dict:
     """List all users (admin only).
 
+    Users are sorted newest first. Pass the returned ``next_cursor`` back as
+    ``cursor`` to page through large lists without an OFFSET scan.
+
     Args:
         admin: Authenticated admin
         db: Database session
-        skip: Pagination offset
+        skip: Pagination offset (ignored when cursor is set)
         limit: Max results to return
+        cursor: Keyset cursor from a previous response
+        include_total: Whether to count all users
 
     Returns:
         List of users
     """
     _ = admin
-    from sqlalchemy import select, func
+    from sqlalchemy import select, func, tuple_
+
+    from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
 
     # Get total count
-    total = db.execute(select(func.count(User.id))).scalar_one()
+    total = (await db.execute(select(func.count(User.id)))).scalar_one() if include_total else None
 
-    # Get users
-    users = db.execute(
-        select(User).order_by(User.created_at.desc()).offset(skip).limit(limit)
-    ).scalars().all()
+    # Get users (one extra row tells us whether another page exists)
+    query = select(User).order_by(User.created_at.desc(), User.id.desc())
+    if cursor:
+        try:
+            created_at, user_id = decode_cursor(cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+        query = query.where(tuple_(User.created_at, User.id) < tuple_(created_at, user_id))
+    else:
+        query = query.offset(skip)
+    users = list((await db.execute(query.limit(limit + 1))).scalars().all())
+
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
 
     return {
         "success": True,
         "total": total,
+        "next_cursor": next_cursor,
         "users": [
             UserResponse(
                 id=u.id,
@@ -2572,6 +2607,7 @@ async def approve_user(
                 associated_unit=user.unit,
                 associated_area_id=user.area_id,
             )
+            await ipsk_mirror.record(ipsk_result)
             
             # Update user with IPSK info
             user.ipsk_id = ipsk_result.get("id")
@@ -2767,10 +2803,13 @@ async def get_splash_logs(
 @router.get("/splash-logs/stats")
 async def get_splash_stats(
     admin: AdminUser,
-    db: DbSession,
+    db: AsyncDbSession,
 ) -> dict:
     """Get splash portal access statistics (admin only).
 
+    Served from the hourly/daily rollups; only activity after the last
+    compacted hour is counted live.
+
     Args:
         admin: Authenticated admin
         db: Database session
@@ -2779,63 +2818,70 @@ async def get_splash_stats(
         Splash access statistics
     """
     _ = admin
-    from sqlalchemy import select, func
-    from datetime import timedelta
-
-    now = datetime.now(timezone.utc)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_ago = now - timedelta(days=7)
 
-    # Total accesses
-    total = db.execute(select(func.count(SplashAccess.id))).scalar_one()
+    stats = RollupStats(db)
+    today_start = stats.now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_ago = stats.now - timedelta(days=7)
 
-    # Today's accesses
-    today_count = db.execute(
-        select(func.count(SplashAccess.id)).where(
-            SplashAccess.accessed_at >= today_start
-        )
-    ).scalar_one()
+    totals = await stats.counts()
+    today = await stats.counts(today_start)
+    week = await stats.counts(week_ago)
 
-    # This week's accesses
-    week_count = db.execute(
-        select(func.count(SplashAccess.id)).where(
-            SplashAccess.accessed_at >= week_ago
-        )
-    ).scalar_one()
-
-    # Unique devices (by MAC)
-    unique_macs = db.execute(
-        select(func.count(func.distinct(SplashAccess.client_mac)))
-    ).scalar_one()
-
-    # Granted access count
-    granted_count = db.execute(
-        select(func.count(SplashAccess.id)).where(
-            SplashAccess.access_granted.is_(True)
-        )
-    ).scalar_one()
-
-    # Registered count
-    registered_count = db.execute(
-        select(func.count(SplashAccess.id)).where(
-            SplashAccess.registered.is_(True)
-        )
-    ).scalar_one()
+    total = totals["splash_accesses"]
+    registered_count = totals["splash_registered"]
 
     return {
         "success": True,
         "stats": {
             "total_accesses": total,
-            "today_accesses": today_count,
-            "week_accesses": week_count,
-            "unique_devices": unique_macs,
-            "access_granted": granted_count,
+            "today_accesses": today["splash_accesses"],
+            "week_accesses": week["splash_accesses"],
+            "unique_devices": totals["splash_new_devices"],
+            "access_granted": totals["splash_granted"],
             "registered": registered_count,
             "conversion_rate": round(registered_count / total * 100, 1) if total > 0 else 0,
         },
     }
 
 
+@router.get("/splash-logs/timeseries")
+async def get_splash_timeseries(
+    admin: AdminUser,
+    db: AsyncDbSession,
+    period: str = "day",
+    buckets: int = 30,
+) -> dict:
+    """Get splash access and registration counts per hour or day (admin only).
+
+    Args:
+        admin: Authenticated admin
+        db: Database session
+        period: Bucket size, "hour" or "day"
+        buckets: Number of buckets ending with the current one (1-366)
+
+    Returns:
+        Oldest-first list of buckets
+    """
+    _ = admin
+
+    if period not in ("hour", "day"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="period must be 'hour' or 'day'",
+        )
+    if not 1 <= buckets <= 366:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="buckets must be between 1 and 366",
+        )
+
+    return {
+        "success": True,
+        "period": period,
+        "buckets": await RollupStats(db).timeseries(period, buckets),
+    }
+
+
 # ============================================================================
 # User Device Management
 # ============================================================================
@@ -2936,6 +2982,7 @@ async def update_user_ipsk(
             ipsk_id=user.ipsk_id,
             passphrase=new_passphrase,
         )
+        await ipsk_mirror.update(user.ipsk_id, passphrase=new_passphrase)
 
         logger.info(f"Admin {admin.get('sub')} updated IPSK for user: {user.email}")
 
@@ -2994,6 +3041,29 @@ async def reset_user_password(
 # Meraki Network Devices
 # ============================================================================
 
+@router.get("/meraki/stats")
+async def get_meraki_client_stats(
+    admin: AdminUser,
+    ha_client: HAClient,
+) -> dict:
+    """Get Meraki SDK executor, rate limiter, coalescing and cache metrics.
+
+    Args:
+        admin: Authenticated admin
+        ha_client: Home Assistant client
+
+    Returns:
+        Executor queue depth, token bucket and cache statistics
+    """
+    _ = admin
+    stats = get_throttle_stats()
+    single_flight = getattr(ha_client, "_single_flight", None)
+    cache = getattr(ha_client, "_cache", None)
+    stats["coalesced_reads"] = single_flight.shared if single_flight else None
+    stats["cache"] = dict(cache.stats) if cache else None
+    return stats
+
+
 @router.get("/meraki/networks/{network_id}/devices")
 async def get_network_devices(
     network_id: str,
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 
 from app.config import get_settings
 from app.api.deps import DbSession, HAClient
+from app.core.ipsk_mirror import ipsk_mirror
 from app.core.oauth import get_oauth_user_info, oauth
 from app.core.security import (
     create_access_token,
@@ -438,6 +439,7 @@ async def create_user_ipsk(
             associated_user=user.name,
             associated_unit=user.unit,
         )
+        await ipsk_mirror.record(ipsk_result)
         
         # Get SSID name from result or use default
         ssid_name = ipsk_result.get("ssid_name", settings.standalone_ssid_name or "WiFi")
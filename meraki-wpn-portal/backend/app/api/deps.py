@@ -5,11 +5,12 @@ from typing import Annotated, Protocol, runtime_checkable
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
 from app.core.security import verify_token
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.db.models import User
 
 logger = logging.getLogger(__name__)
@@ -287,6 +288,8 @@ async def require_user(
 
 # Type aliases for dependency injection
 DbSession = Annotated[Session, Depends(get_db)]
+# AsyncSession, or a SyncSessionAdapter when no async driver is available
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db)]
 HAClient = Annotated[BaseClient, Depends(get_ha_client)]
 AdminUser = Annotated[dict, Depends(verify_admin_token)]
 CurrentUser = Annotated[User, Depends(require_user)]
\ No newline at end of file
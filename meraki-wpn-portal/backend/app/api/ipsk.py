@@ -7,8 +7,9 @@ import logging
 import qrcode
 from fastapi import APIRouter, HTTPException, status
 
-from app.api.deps import AdminUser, HAClient
+from app.api.deps import AdminUser, AsyncDbSession, HAClient
 from app.config import get_settings
+from app.core.ipsk_mirror import ipsk_mirror
 from app.schemas.ipsk import (
     IPSKCreate,
     IPSKResponse,
@@ -132,6 +133,7 @@ async def create_ipsk(
             associated_unit=data.associated_unit,
         )
 
+        await ipsk_mirror.record(result)
         logger.info(f"Created IPSK: {data.name}")
 
         return IPSKResponse(
@@ -232,6 +234,7 @@ async def update_ipsk(
             associated_area_id=data.associated_area_id,
         )
 
+        await ipsk_mirror.record(result)
         logger.info(f"Updated IPSK: {ipsk_id}")
 
         return IPSKResponse(
@@ -271,6 +274,7 @@ async def delete_ipsk(
     """
     try:
         await ha_client.delete_ipsk(ipsk_id)
+        await ipsk_mirror.forget(ipsk_id)
         logger.info(f"Deleted IPSK: {ipsk_id}")
     except Exception as e:
         logger.exception(f"Failed to delete IPSK {ipsk_id}: {e}")
@@ -295,6 +299,7 @@ async def revoke_ipsk(
     """
     try:
         await ha_client.revoke_ipsk(ipsk_id)
+        await ipsk_mirror.update(ipsk_id, status="revoked")
         logger.info(f"Revoked IPSK: {ipsk_id}")
     except Exception as e:
         logger.exception(f"Failed to revoke IPSK {ipsk_id}: {e}")
@@ -352,17 +357,33 @@ async def reveal_ipsk_passphrase(
 @router.get("/stats", response_model=IPSKStatsResponse)
 async def get_ipsk_stats(
     admin: AdminUser,
+    db: AsyncDbSession,
     ha_client: HAClient,
 ) -> IPSKStatsResponse:
     """Get IPSK statistics.
 
+    Served from the local IPSK mirror once it has synced.
+
     Args:
         admin: Authenticated admin user
+        db: Database session
         ha_client: Home Assistant client
 
     Returns:
         IPSK statistics
     """
+    if ipsk_mirror.ready:
+        counts = await ipsk_mirror.stats(db)
+        return IPSKStatsResponse(
+            total_ipsks=counts["total"],
+            active_ipsks=counts["active"],
+            expired_ipsks=counts["expired"],
+            revoked_ipsks=counts["revoked"],
+            online_devices=counts["online"],
+            registrations_today=0,  # Would need to query registration DB
+            freshness=ipsk_mirror.freshness(),
+        )
+
     try:
         ipsks = await ha_client.list_ipsks()
 
@@ -379,6 +400,7 @@ async def get_ipsk_stats(
             revoked_ipsks=revoked,
             online_devices=online,
             registrations_today=0,  # Would need to query registration DB
+            freshness=ipsk_mirror.freshness(source="live"),
         )
 
     except Exception as e:
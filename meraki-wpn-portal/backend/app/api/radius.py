@@ -14,6 +14,7 @@ from pydantic import BaseModel, Field
 from app.api.deps import AdminUser, DbSession
 from app.config import get_settings
 from app.core.radius_certificates import RadSecCertificateManager
+from app.core.radius_notify import notify_radius_config_changed
 from app.core.udn_manager import InvalidMacAddress, UdnError, UdnManager, normalize_mac_address
 from app.db.models import RadiusClient, UdnAssignment
 
@@ -719,6 +720,7 @@ async def create_radius_client(
     db.add(client)
     db.commit()
     db.refresh(client)
+    notify_radius_config_changed("radius_clients")
     
     # Sync with FreeRADIUS server
     try:
@@ -887,22 +889,9 @@ async def bulk_create_nads_from_devices(
             # Commit all successful creations
             db.commit()
             
-            # Sync with FreeRADIUS server (best effort)
-            if result.created and settings.radius_api_url and settings.radius_api_token:
-                try:
-                    async with httpx.AsyncClient(timeout=30.0) as http_client:
-                        for created_nad in result.created:
-                            try:
-                                await http_client.post(
-                                    f"{settings.radius_api_url}/api/reload",
-                                    json={"force": True},
-                                    headers={"Authorization": f"Bearer {settings.radius_api_token}"}
-                                )
-                                break  # Only need to reload once
-                            except Exception as e:
-                                logger.warning(f"Failed to trigger RADIUS reload: {e}")
-                except Exception as e:
-                    logger.warning(f"Failed to sync with RADIUS server: {e}")
+            # Wake the FreeRADIUS watcher once for the whole batch (best effort)
+            if result.created:
+                notify_radius_config_changed("radius_clients")
             
             logger.info(
                 f"Bulk NAD creation completed: {len(result.created)} created, "
@@ -948,6 +937,7 @@ async def delete_radius_client(
     
     client.is_active = False
     db.commit()
+    notify_radius_config_changed("radius_clients")
     
     logger.info(f"Deleted RADIUS client: {client.name}")
 
@@ -1541,6 +1531,7 @@ async def automated_meraki_radsec_setup(
             )
             db.add(client)
             db.commit()
+            notify_radius_config_changed("radius_clients")
             
             results["steps_completed"].append(
                 f"Added network as RADIUS client (shared secret generated)"
@@ -1854,9 +1845,9 @@ async def reload_freeradius_config(
     """
     Trigger FreeRADIUS configuration reload.
     
-    With shared database architecture, FreeRADIUS automatically watches
-    for database changes every 5 seconds. This endpoint allows manual
-    triggering of an immediate reload if needed.
+    With shared database architecture, FreeRADIUS consumes a database
+    change log and regenerates config as soon as portal writes commit.
+    This endpoint allows manual triggering of an immediate reload if needed.
     
     Args:
         reload_request: Reload options
@@ -15,6 +15,7 @@ from app.api.deps import DbSession, HAClient
 from app.config import get_settings
 from app.core.certificate_manager import CertificateManager
 from app.core.invite_codes import InviteCodeManager
+from app.core.ipsk_mirror import ipsk_mirror
 from app.core.security import (
     decrypt_passphrase,
     encrypt_passphrase,
@@ -863,6 +864,7 @@ async def register_for_wifi(
                 associated_unit=data.unit,
                 associated_area_id=data.area_id,
             )
+            await ipsk_mirror.record(ipsk_result)
 
             # Get SSID name from result or use default
             ssid_name = ipsk_result.get("ssid_name", "Resident-WiFi")
@@ -1104,11 +1106,12 @@ async def get_my_network(
         except Exception as e:
             logger.warning(f"Could not decrypt passphrase for {email}: {e}")
 
-    # Get IPSK status from Meraki
+    # Get IPSK status (local mirror, falling back to Meraki)
+    freshness = None
     try:
-        ipsk_data = await ha_client.get_ipsk(user.ipsk_id)
+        ipsk_data, freshness = await ipsk_mirror.lookup(db, ha_client, user.ipsk_id)
         ipsk_status = ipsk_data.get("status", "active")
-        connected_clients = ipsk_data.get("connected_clients", 0)
+        connected_clients = ipsk_data.get("connected_clients") or 0
     except Exception as e:
         logger.warning(f"Could not get IPSK status from Meraki for {email}: {e}")
         ipsk_status = "unknown"
@@ -1128,6 +1131,7 @@ async def get_my_network(
         status=ipsk_status,
         connected_devices=connected_clients,
         qr_code=qr_code,
+        freshness=freshness,
     )
 
 
@@ -1209,9 +1213,9 @@ async def get_wifi_config(
             detail="IPSK not found",
         )
 
-    # Get IPSK details from Meraki
+    # Get IPSK details (local mirror, falling back to Meraki)
     try:
-        ipsk = await ha_client.get_ipsk(ipsk_id)
+        ipsk, freshness = await ipsk_mirror.lookup(db, ha_client, ipsk_id)
         if not ipsk:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1240,6 +1244,7 @@ async def get_wifi_config(
             "qr_code": config_data["qr_code"],
             "wifi_string": config_data["wifi_string"],
             "has_mobileconfig": True,
+            "freshness": freshness,
         }
 
     except HTTPException:
@@ -1291,9 +1296,11 @@ async def download_mobileconfig(
             detail="IPSK not found",
         )
 
-    # Get IPSK details
+    # Get IPSK details (local mirror, falling back to Meraki)
     try:
-        ipsk = await ha_client.get_ipsk(ipsk_id, reveal=True)
+        ipsk, _ = await ipsk_mirror.lookup(db, ha_client, ipsk_id)
+        if ipsk and not ipsk.get("passphrase"):
+            ipsk = await ha_client.get_ipsk(ipsk_id, reveal=True)
         if not ipsk:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
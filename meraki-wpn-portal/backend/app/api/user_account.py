@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import DbSession, HAClient, require_user
 from app.config import get_settings
+from app.core.ipsk_mirror import ipsk_mirror
 from app.core.security import (
     decrypt_passphrase,
     encrypt_passphrase,
@@ -168,6 +169,7 @@ async def change_psk(
     # Update in Meraki/HA
     try:
         await ha_client.update_ipsk_passphrase(current_user.ipsk_id, passphrase)
+        await ipsk_mirror.update(current_user.ipsk_id, passphrase=passphrase)
     except Exception as e:
         logger.error(f"Failed to update iPSK in Meraki: {e}")
         raise HTTPException(
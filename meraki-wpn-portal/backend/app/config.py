@@ -162,6 +162,18 @@ class Settings(BaseSettings):
     # Meraki Dashboard API (for standalone mode)
     meraki_api_key: str = ""
     meraki_org_id: str = ""
+    # Cache Dashboard reads (TTL + stale-while-revalidate); path enables SQLite persistence
+    meraki_cache_enabled: bool = True
+    meraki_cache_path: str = ""
+    meraki_cache_max_entries: int = 512
+    meraki_cache_stale_seconds: int = 300
+    # Dedicated SDK thread pool and up-front pacing to Meraki's 10 req/s org budget
+    meraki_executor_workers: int = 8
+    meraki_rate_limit: float = 10.0
+    meraki_rate_burst: int = 10
+    # Dashboard transport: "sdk" (meraki SDK in threads) or "httpx" (native async client)
+    meraki_client_backend: str = "sdk"
+    meraki_base_url: str = "https://api.meraki.com/api/v1"
 
     # Home Assistant Connection (for homeassistant mode)
     ha_url: str = "http://supervisor/core"
@@ -247,6 +259,16 @@ class Settings(BaseSettings):
     ipsk_expiration_warning_days: str = "7,3,1"
     ipsk_expiration_email_enabled: bool = False
 
+    # Local IPSK mirror (dashboards and user pages read it instead of Meraki)
+    ipsk_mirror_enabled: bool = True
+    ipsk_mirror_interval_seconds: int = 300
+    ipsk_mirror_stale_seconds: int = 900
+
+    # Dashboard/splash statistics rollups (hourly and daily buckets)
+    stats_rollup_enabled: bool = True
+    stats_rollup_interval_minutes: int = 15
+    stats_rollup_recompute_hours: int = 24
+
     # Admin Settings
     admin_notification_email: str = ""
 
@@ -264,6 +286,8 @@ class Settings(BaseSettings):
 
     # Database (auto-detected based on deployment mode)
     database_url: str = ""
+    # Use an async driver (asyncpg, aiomysql, aiosqlite) for ported endpoints when installed
+    database_async: bool = True
 
     # Security
     # Note: Uses APP_SIGNING_KEY env var to avoid Docker BuildKit secret detection warnings
@@ -438,6 +462,8 @@ def reload_settings() -> Settings:
     # These are infrastructure/security settings that shouldn't be changeable via UI
     SYSTEM_ONLY_SETTINGS = {
         'database_url',          # Can't store DB config in the DB itself
+        'database_async',        # Chosen with the database URL
+        'meraki_cache_path',     # Filesystem location of the Meraki response cache
         'secret_key',            # Security critical - JWT signing key
         'run_mode',              # Deployment mode (standalone vs HA)
         'is_standalone',         # Derived from run_mode
@@ -0,0 +1,477 @@
+"""Local mirror of Meraki Identity PSKs.
+
+Dashboards and per-user pages read IPSK state from the ``ipsk_mirror``
+table instead of waiting on the Meraki API for every request. The mirror
+follows the client's default network/SSID listing and is kept in sync by:
+
+- a full sync on startup (and after the client is reconfigured)
+- a periodic reconcile that diffs Meraki's list against the table and only
+  writes rows that were added, changed or removed
+- write-through of portal-initiated creates, updates and deletes
+
+Readers get a freshness indicator with every answer. IPSKs not (yet) in
+the mirror are looked up live and written through.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler  # type: ignore[import-untyped]
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.security import decrypt_passphrase, encrypt_passphrase
+from app.db.database import get_session_local
+from app.db.models import IPSKMirrorEntry
+
+logger = logging.getLogger(__name__)
+
+# Mirrored columns covered by the row fingerprint (the passphrase is
+# compared separately so its hash never lands in the table)
+_HASHED = (
+    "name",
+    "network_id",
+    "ssid_number",
+    "ssid_name",
+    "status",
+    "group_policy_id",
+    "group_policy_name",
+    "connected_clients",
+    "associated_user",
+    "associated_unit",
+    "expires_at",
+    "meraki_created_at",
+)
+
+# Fields Meraki's list doesn't return but portal writes do; a reconcile
+# keeps the mirrored value instead of clearing it
+_KEEP_IF_MISSING = ("ssid_name", "passphrase", "associated_user", "associated_unit")
+
+
+def _as_text(value: Any) -> str | None:
+    if value is None:
+        return None
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _fields(ipsk: dict) -> dict[str, Any]:
+    """Mirror columns from a client IPSK dict (None where not provided)."""
+    ssid_number = ipsk.get("ssid_number")
+    return {
+        "name": ipsk.get("name"),
+        "network_id": ipsk.get("network_id"),
+        "ssid_number": int(ssid_number) if ssid_number is not None else None,
+        "ssid_name": ipsk.get("ssid_name"),
+        "status": ipsk.get("status"),
+        "group_policy_id": _as_text(ipsk.get("group_policy_id") or ipsk.get("groupPolicyId")),
+        "group_policy_name": ipsk.get("group_policy_name"),
+        "passphrase": ipsk.get("passphrase"),
+        "connected_clients": ipsk.get("connected_clients"),
+        "associated_user": ipsk.get("associated_user"),
+        "associated_unit": ipsk.get("associated_unit"),
+        "expires_at": _as_text(ipsk.get("expires_at") or ipsk.get("expiresAt")),
+        "meraki_created_at": _as_text(ipsk.get("created_at") or ipsk.get("createdAt")),
+    }
+
+
+def _fingerprint(values: dict[str, Any]) -> str:
+    payload = json.dumps([values.get(key) for key in _HASHED], default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _row_values(row: IPSKMirrorEntry) -> dict[str, Any]:
+    return {key: getattr(row, key) for key in _HASHED}
+
+
+def _cipher_available() -> bool:
+    try:
+        encrypt_passphrase("")
+    except Exception:
+        return False
+    return True
+
+
+def _passphrase_changed(row: IPSKMirrorEntry, passphrase: str | None) -> bool:
+    if not passphrase:
+        return False
+    if not row.passphrase_encrypted:
+        # Changed unless it can't be stored anyway
+        return _cipher_available()
+    try:
+        return decrypt_passphrase(row.passphrase_encrypted) != passphrase
+    except Exception:
+        return True
+
+
+def _assign(row: IPSKMirrorEntry, fields: dict[str, Any]) -> None:
+    """Set the given fields on a row and refresh its fingerprint."""
+    for key, value in fields.items():
+        if key == "passphrase":
+            if value:
+                try:
+                    row.passphrase_encrypted = encrypt_passphrase(value)
+                except Exception as e:
+                    # No usable encryption key: mirror everything but the passphrase
+                    logger.debug(f"Not mirroring passphrase for {row.ipsk_id}: {e}")
+        else:
+            setattr(row, key, value)
+    row.fingerprint = _fingerprint(_row_values(row))
+
+
+def _new_entry(ipsk_id: str, fields: dict[str, Any]) -> IPSKMirrorEntry:
+    row = IPSKMirrorEntry(ipsk_id=ipsk_id)
+    _assign(row, {
+        **fields,
+        "name": fields.get("name") or "",
+        "status": fields.get("status") or "active",
+        "connected_clients": fields.get("connected_clients") or 0,
+    })
+    return row
+
+
+def _to_dict(row: IPSKMirrorEntry) -> dict[str, Any]:
+    """Mirror row in the client's IPSK dict shape."""
+    passphrase = None
+    if row.passphrase_encrypted:
+        try:
+            passphrase = decrypt_passphrase(row.passphrase_encrypted)
+        except Exception as e:
+            logger.debug(f"Could not decrypt mirrored passphrase for {row.ipsk_id}: {e}")
+    return {
+        "id": row.ipsk_id,
+        "name": row.name,
+        "network_id": row.network_id,
+        "ssid_number": row.ssid_number,
+        "ssid_name": row.ssid_name,
+        "status": row.status,
+        "group_policy_id": row.group_policy_id,
+        "group_policy_name": row.group_policy_name,
+        "passphrase": passphrase,
+        "connected_clients": row.connected_clients,
+        "associated_user": row.associated_user,
+        "associated_unit": row.associated_unit,
+        "expires_at": row.expires_at,
+        "created_at": row.meraki_created_at,
+    }
+
+
+class IPSKMirror:
+    """Keeps the ``ipsk_mirror`` table in step with Meraki and serves reads from it."""
+
+    def __init__(self):
+        """Initialize the mirror."""
+        self.scheduler = AsyncIOScheduler()
+        self._get_client: Callable[[], Any] | None = None
+        self.synced_at: datetime | None = None
+        self.last_error: str | None = None
+        self.last_result: dict[str, int] | None = None
+
+    # =========================================================================
+    # Reconciler
+    # =========================================================================
+
+    async def start(self, get_client: Callable[[], Any]):
+        """Start the reconciler.
+
+        Args:
+            get_client: Returns the current Meraki/HA client (it is replaced
+                when settings change, so it's looked up on every run)
+        """
+        settings = get_settings()
+
+        if not settings.ipsk_mirror_enabled:
+            logger.info("IPSK mirror is disabled")
+            return
+
+        self._get_client = get_client
+        self.synced_at = self._load_synced_at()
+
+        interval = settings.ipsk_mirror_interval_seconds
+        logger.info(f"Starting IPSK mirror (reconcile interval: {interval}s)")
+        # Fresh scheduler per start: it binds to the running event loop
+        self.scheduler = AsyncIOScheduler()
+        self.scheduler.add_job(
+            self.reconcile, "interval", seconds=interval, id="ipsk_mirror_reconcile"
+        )
+        self.scheduler.start()
+
+        # Full sync in the background so startup doesn't wait on Meraki
+        self.request_full_sync()
+
+    def request_full_sync(self):
+        """Queue a full sync (e.g. after the client was reconfigured)."""
+        if self.scheduler.running:
+            self.scheduler.add_job(
+                self.reconcile,
+                kwargs={"full": True},
+                id="ipsk_mirror_full_sync",
+                replace_existing=True,
+            )
+
+    async def reconcile(self, full: bool = False) -> dict[str, int] | None:
+        """Fetch IPSKs from the client and apply the differences to the mirror.
+
+        Args:
+            full: Rewrite every row instead of only the changed ones
+
+        Returns:
+            Counts of added/updated/removed/unchanged rows, or None if
+            Meraki couldn't be reached (the mirror is left as it was)
+        """
+        client = self._get_client() if self._get_client else None
+        if client is None:
+            return None
+
+        try:
+            ipsks = await client.list_ipsks()
+        except Exception as e:
+            self.last_error = str(e)
+            logger.warning(f"IPSK mirror sync failed, serving last known state: {e}")
+            return None
+
+        # The diff and its writes are blocking - keep them off the event loop
+        result = await asyncio.to_thread(self._apply_in_session, ipsks, full)
+
+        self.synced_at = datetime.now(timezone.utc)
+        self.last_error = None
+        self.last_result = result
+        logger.info(
+            f"IPSK mirror {'full sync' if full else 'reconcile'}: "
+            + ", ".join(f"{count} {key}" for key, count in result.items())
+        )
+        return result
+
+    def apply(self, db: Session, ipsks: list[dict], full: bool = False) -> dict[str, int]:
+        """Diff a Meraki IPSK listing against the mirror and commit the changes.
+
+        Args:
+            db: Database session
+            ipsks: IPSKs as returned by ``list_ipsks``
+            full: Rewrite every row instead of only the changed ones
+
+        Returns:
+            Counts of added/updated/removed/unchanged rows
+        """
+        now = datetime.now(timezone.utc)
+        rows = {row.ipsk_id: row for row in db.scalars(select(IPSKMirrorEntry))}
+        result = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        seen: set[str] = set()
+
+        for ipsk in ipsks:
+            ipsk_id = str(ipsk.get("id") or "")
+            if not ipsk_id or ipsk_id in seen:
+                continue
+            seen.add(ipsk_id)
+            fields = _fields(ipsk)
+
+            row = rows.get(ipsk_id)
+            if row is None:
+                row = _new_entry(ipsk_id, fields)
+                row.synced_at = now
+                db.add(row)
+                result["added"] += 1
+                continue
+
+            for key in _KEEP_IF_MISSING:
+                if fields[key] is None:
+                    del fields[key]
+            fields["name"] = fields["name"] or row.name
+            fields["status"] = fields["status"] or row.status
+            fields["connected_clients"] = fields["connected_clients"] or 0
+            changed = (
+                _fingerprint({**_row_values(row), **fields}) != row.fingerprint
+                or _passphrase_changed(row, fields.get("passphrase"))
+            )
+            if changed or full:
+                _assign(row, fields)
+                row.synced_at = now
+                result["updated"] += 1
+            else:
+                result["unchanged"] += 1
+
+        for ipsk_id, row in rows.items():
+            if ipsk_id not in seen:
+                db.delete(row)
+                result["removed"] += 1
+
+        db.commit()
+        return result
+
+    def _apply_in_session(self, ipsks: list[dict], full: bool) -> dict[str, int]:
+        with get_session_local()() as db:
+            return self.apply(db, ipsks, full=full)
+
+    def _load_synced_at(self) -> datetime | None:
+        """Time of the newest mirrored row, so a restart serves it as stale."""
+        try:
+            with get_session_local()() as db:
+                synced_at = db.scalar(select(func.max(IPSKMirrorEntry.synced_at)))
+        except Exception as e:
+            logger.debug(f"Could not read IPSK mirror state: {e}")
+            return None
+        if synced_at is not None and synced_at.tzinfo is None:
+            synced_at = synced_at.replace(tzinfo=timezone.utc)
+        return synced_at
+
+    async def stop(self):
+        """Stop the reconciler."""
+        if self.scheduler.running:
+            self.scheduler.shutdown()
+            logger.info("IPSK mirror stopped")
+
+    # =========================================================================
+    # Write-through
+    # =========================================================================
+
+    async def record(self, ipsk: dict | None) -> None:
+        """Write a created or updated IPSK into the mirror.
+
+        Only the fields present in ``ipsk`` are changed, so partial update
+        results are safe to pass. Failures are logged, never raised: the
+        next reconcile repairs the mirror.
+
+        Args:
+            ipsk: IPSK dict as returned by the client
+        """
+        if not ipsk or not ipsk.get("id") or not get_settings().ipsk_mirror_enabled:
+            return
+        await asyncio.to_thread(self._record, ipsk)
+
+    async def update(self, ipsk_id: str, **fields: Any) -> None:
+        """Write changed fields of a mirrored IPSK (e.g. ``status``, ``passphrase``)."""
+        await self.record({"id": ipsk_id, **fields})
+
+    async def forget(self, ipsk_id: str) -> None:
+        """Remove a deleted IPSK from the mirror."""
+        if not get_settings().ipsk_mirror_enabled:
+            return
+        await asyncio.to_thread(self._forget, ipsk_id)
+
+    def _record(self, ipsk: dict) -> None:
+        ipsk_id = str(ipsk["id"])
+        fields = {key: value for key, value in _fields(ipsk).items() if value is not None}
+        try:
+            with get_session_local()() as db:
+                row = db.scalar(select(IPSKMirrorEntry).where(IPSKMirrorEntry.ipsk_id == ipsk_id))
+                if row is not None:
+                    _assign(row, fields)
+                elif fields.get("name"):
+                    db.add(_new_entry(ipsk_id, fields))
+                else:
+                    return
+                db.commit()
+        except Exception as e:
+            logger.warning(f"IPSK mirror write-through failed for {ipsk_id}: {e}")
+
+    def _forget(self, ipsk_id: str) -> None:
+        try:
+            with get_session_local()() as db:
+                row = db.scalar(select(IPSKMirrorEntry).where(IPSKMirrorEntry.ipsk_id == ipsk_id))
+                if row is not None:
+                    db.delete(row)
+                    db.commit()
+        except Exception as e:
+            logger.warning(f"IPSK mirror write-through failed for {ipsk_id}: {e}")
+
+    # =========================================================================
+    # Reads
+    # =========================================================================
+
+    @property
+    def ready(self) -> bool:
+        """Whether reads should be served from the mirror."""
+        return get_settings().ipsk_mirror_enabled and self.synced_at is not None
+
+    def freshness(self, source: str = "mirror") -> dict[str, Any]:
+        """Freshness indicator for data served from the mirror or fetched live.
+
+        Args:
+            source: "mirror" or "live"
+
+        Returns:
+            Source, last sync time, its age in seconds and whether it is stale
+        """
+        if source != "mirror":
+            return {
+                "source": source,
+                "synced_at": datetime.now(timezone.utc).isoformat(),
+                "age_seconds": 0,
+                "stale": False,
+            }
+        age = (
+            int((datetime.now(timezone.utc) - self.synced_at).total_seconds())
+            if self.synced_at
+            else None
+        )
+        return {
+            "source": source,
+            "synced_at": self.synced_at.isoformat() if self.synced_at else None,
+            "age_seconds": age,
+            "stale": age is None or age > get_settings().ipsk_mirror_stale_seconds,
+        }
+
+    def meraki_status(self) -> dict[str, Any]:
+        """Meraki reachability as seen by the last reconcile."""
+        return {
+            "status": "offline" if self.last_error else "online",
+            "error": self.last_error,
+        }
+
+    async def stats(self, db) -> dict[str, int]:
+        """IPSK counts by status from the mirror.
+
+        Args:
+            db: Async database session
+
+        Returns:
+            total, active, expired, revoked and online (IPSKs with clients)
+        """
+        online = func.sum(case((IPSKMirrorEntry.connected_clients > 0, 1), else_=0))
+        rows = (await db.execute(
+            select(IPSKMirrorEntry.status, func.count(IPSKMirrorEntry.id), online)
+            .group_by(IPSKMirrorEntry.status)
+        )).all()
+        counts = {status: count for status, count, _ in rows}
+        return {
+            "total": sum(counts.values()),
+            "active": counts.get("active", 0),
+            "expired": counts.get("expired", 0),
+            "revoked": counts.get("revoked", 0),
+            "online": sum(row[2] or 0 for row in rows),
+        }
+
+    def get(self, db: Session, ipsk_id: str) -> dict | None:
+        """Mirrored IPSK, or None if it isn't mirrored."""
+        row = db.scalar(select(IPSKMirrorEntry).where(IPSKMirrorEntry.ipsk_id == ipsk_id))
+        return _to_dict(row) if row is not None else None
+
+    async def lookup(self, db: Session, ha_client, ipsk_id: str, **kwargs) -> tuple[dict, dict]:
+        """IPSK from the mirror, falling back to the client.
+
+        Args:
+            db: Database session
+            ha_client: Meraki/HA client used on a mirror miss
+            ipsk_id: IPSK identifier
+            **kwargs: Passed to ``ha_client.get_ipsk`` on a miss
+
+        Returns:
+            The IPSK dict and its freshness indicator
+        """
+        if self.ready:
+            ipsk = self.get(db, ipsk_id)
+            if ipsk is not None:
+                return ipsk, self.freshness()
+
+        ipsk = await ha_client.get_ipsk(ipsk_id, **kwargs)
+        await self.record(ipsk)
+        return ipsk, self.freshness(source="live")
+
+
+# Global instance
+ipsk_mirror = IPSKMirror()
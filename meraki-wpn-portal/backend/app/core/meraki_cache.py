@@ -0,0 +1,362 @@
+"""Response cache for Meraki Dashboard API reads.
+
+Dashboard reads (networks, SSIDs, group policies, IPSK lists) are requested
+on nearly every admin page load but change rarely, and each call counts
+against Meraki's per-organization rate limit. This module caches them:
+
+- Per-method TTLs (``DEFAULT_TTLS``). Within the TTL the cached value is
+  returned without an API call.
+- Stale-while-revalidate: for ``stale_seconds`` after the TTL the stale value
+  is returned immediately while a single background task refreshes it.
+- Writes made through the same client invalidate the affected reads
+  (see ``invalidates``), and a refresh started before an invalidation never
+  overwrites it.
+- Storage is pluggable: an in-process LRU, optionally backed by a SQLite
+  file so the cache survives restarts.
+"""
+
+import asyncio
+import copy
+import functools
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached read stays fresh, per client method
+DEFAULT_TTLS: dict[str, float] = {
+    "get_organizations": 600,
+    "get_networks": 300,
+    "get_network": 300,
+    "get_ssids": 120,
+    "get_ssid": 120,
+    "get_group_policies": 300,
+    "_fetch_ipsks": 30,
+}
+
+
+class CacheStore(Protocol):
+    """Storage backend for cached responses."""
+
+    def get(self, key: str) -> tuple[float, Any] | None:
+        """Return ``(stored_at, value)`` or None."""
+        ...
+
+    def set(self, key: str, stored_at: float, value: Any) -> None:
+        """Store a value."""
+        ...
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every key starting with ``prefix``."""
+        ...
+
+    def clear(self) -> None:
+        """Remove everything."""
+        ...
+
+
+class MemoryCacheStore:
+    """In-process LRU store."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[float, Any] | None:
+        """Return ``(stored_at, value)`` or None, marking the key recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, stored_at: float, value: Any) -> None:
+        """Store a value, evicting the least recently used beyond ``max_entries``."""
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every key starting with ``prefix``."""
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove everything."""
+        self._entries.clear()
+
+
+class SqliteCacheStore:
+    """SQLite file store; values are stored as JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meraki_cache "
+                "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+
+    def get(self, key: str) -> tuple[float, Any] | None:
+        """Return ``(stored_at, value)`` or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, value FROM meraki_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, key: str, stored_at: float, value: Any) -> None:
+        """Store a value as JSON, replacing any previous one."""
+        payload = json.dumps(value, default=str)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meraki_cache (key, stored_at, value) VALUES (?, ?, ?)",
+                (key, stored_at, payload),
+            )
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every key starting with ``prefix``."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM meraki_cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            )
+
+    def clear(self) -> None:
+        """Remove everything."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM meraki_cache")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """TTL + stale-while-revalidate cache for client read methods.
+
+    Parameters
+    ----------
+    ttls : dict[str, float] | None
+        Fresh lifetime per method name (defaults to ``DEFAULT_TTLS``);
+        methods without a TTL aren't cached
+    stale_seconds : float
+        How long past its TTL a value may be served while it is refreshed
+    max_entries : int
+        Size of the in-process LRU
+    persistent : CacheStore | None
+        Optional second-level store (e.g. ``SqliteCacheStore``)
+    scope : str
+        Key prefix separating clients (e.g. per API key) in a shared store
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        stale_seconds: float = 300,
+        max_entries: int = 512,
+        persistent: CacheStore | None = None,
+        scope: str = "",
+    ):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.stale_seconds = stale_seconds
+        self.scope = scope
+        self._memory = MemoryCacheStore(max_entries)
+        self._persistent = persistent
+        self._epoch = 0
+        self._generations: dict[str, int] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "invalidations": 0}
+
+    def _prefix(self, method: str) -> str:
+        return f"{self.scope}:{method}:"
+
+    def _key(self, method: str, args: tuple, kwargs: dict) -> str:
+        return self._prefix(method) + json.dumps([args, kwargs], sort_keys=True, default=str)
+
+    def _generation(self, method: str) -> tuple[int, int]:
+        return self._epoch, self._generations.get(method, 0)
+
+    def _load(self, key: str) -> tuple[float, Any] | None:
+        entry = self._memory.get(key)
+        if entry is None and self._persistent is not None:
+            entry = self._persistent.get(key)
+            if entry is not None:
+                self._memory.set(key, *entry)
+        return entry
+
+    def _store(self, method: str, key: str, generation: tuple[int, int], value: Any) -> None:
+        # An invalidation while the fetch was in flight makes the result suspect
+        if self._generation(method) != generation:
+            return
+        stored_at = time.time()
+        self._memory.set(key, stored_at, copy.deepcopy(value))
+        if self._persistent is not None:
+            try:
+                self._persistent.set(key, stored_at, value)
+            except Exception as e:
+                logger.warning(f"Could not persist Meraki cache entry: {e}")
+
+    async def get_or_fetch(
+        self,
+        method: str,
+        args: tuple,
+        kwargs: dict,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return a cached value for ``method(*args, **kwargs)`` or fetch it.
+
+        Parameters
+        ----------
+        method : str
+            Client method name (selects the TTL and invalidation group)
+        args, kwargs
+            Call arguments, used as the cache key
+        fetch : Callable[[], Awaitable[Any]]
+            Performs the real API call
+
+        Returns
+        -------
+        Any
+            A copy of the cached or freshly fetched value
+        """
+        ttl = self.ttls.get(method)
+        if not ttl:
+            return await fetch()
+
+        key = self._key(method, args, kwargs)
+        entry = self._load(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.time() - stored_at
+            if age < ttl:
+                self.stats["hits"] += 1
+                return copy.deepcopy(value)
+            if age < ttl + self.stale_seconds:
+                self.stats["stale_hits"] += 1
+                self._schedule_refresh(method, key, fetch)
+                return copy.deepcopy(value)
+
+        self.stats["misses"] += 1
+        generation = self._generation(method)
+        value = await fetch()
+        self._store(method, key, generation, value)
+        return value
+
+    def _schedule_refresh(self, method: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        generation = self._generation(method)
+
+        async def refresh() -> None:
+            try:
+                self._store(method, key, generation, await fetch())
+                self.stats["refreshes"] += 1
+            except Exception as e:
+                logger.warning(f"Background refresh of {method} failed, serving stale data: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.get_running_loop().create_task(refresh())
+
+    def invalidate(self, *methods: str) -> None:
+        """Drop cached values for the given methods (all methods when none given)."""
+        self.stats["invalidations"] += 1
+        if not methods:
+            self._epoch += 1
+            self._memory.delete_prefix(f"{self.scope}:")
+            if self._persistent is not None:
+                self._persistent.delete_prefix(f"{self.scope}:")
+            return
+        for method in methods:
+            self._generations[method] = self._generations.get(method, 0) + 1
+            self._memory.delete_prefix(self._prefix(method))
+            if self._persistent is not None:
+                self._persistent.delete_prefix(self._prefix(method))
+
+    async def close(self) -> None:
+        """Cancel pending refreshes and close the persistent store."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+        close = getattr(self._persistent, "close", None)
+        if close:
+            close()
+
+
+def cache_scope(api_key: str) -> str:
+    """Short, non-reversible identifier for an API key."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def build_response_cache(settings, api_key: str) -> ResponseCache | None:
+    """Create the response cache configured in settings.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings
+    api_key : str
+        Dashboard API key; entries are scoped to a hash of it
+
+    Returns
+    -------
+    ResponseCache | None
+        None when caching is disabled
+    """
+    if not settings.meraki_cache_enabled:
+        return None
+    persistent = None
+    if settings.meraki_cache_path:
+        try:
+            persistent = SqliteCacheStore(settings.meraki_cache_path)
+        except sqlite3.Error as e:
+            logger.warning(f"Meraki cache persistence disabled ({settings.meraki_cache_path}): {e}")
+    return ResponseCache(
+        stale_seconds=settings.meraki_cache_stale_seconds,
+        max_entries=settings.meraki_cache_max_entries,
+        persistent=persistent,
+        scope=cache_scope(api_key),
+    )
+
+
+def cached(func):
+    """Serve a client read method through the client's ``_cache``."""
+    method = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        cache: ResponseCache | None = getattr(self, "_cache", None)
+        if cache is None:
+            return await func(self, *args, **kwargs)
+        return await cache.get_or_fetch(method, args, kwargs, lambda: func(self, *args, **kwargs))
+
+    return wrapper
+
+
+def invalidates(*methods: str):
+    """Invalidate cached reads after a client write method runs (even if it fails)."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                cache: ResponseCache | None = getattr(self, "_cache", None)
+                if cache is not None:
+                    cache.invalidate(*methods)
+
+        return wrapper
+
+    return decorator
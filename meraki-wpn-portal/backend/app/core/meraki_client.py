@@ -1,6 +1,6 @@
 """Meraki Dashboard API client for standalone mode using official Meraki SDK."""
 
-import asyncio
+import json
 import logging
 from datetime import UTC, datetime, timedelta
 from functools import partial
@@ -9,6 +9,8 @@ from typing import Any, Optional
 import meraki  # type: ignore[import-untyped]
 
 from app.config import get_settings
+from app.core.meraki_cache import ResponseCache, build_response_cache, cache_scope, cached, invalidates
+from app.core.meraki_throttle import SingleFlight, get_meraki_executor, get_token_bucket
 from app.core.security import generate_passphrase
 
 logger = logging.getLogger(__name__)
@@ -27,24 +29,35 @@ class MerakiDashboardClient:
     - Better error messages
     - Type hints and auto-completion
     - Maintained by Cisco/Meraki
+
+    Read methods are served through a ``ResponseCache`` (TTL with
+    stale-while-revalidate); writes through this client invalidate the
+    reads they affect. SDK calls run on a dedicated thread pool, paced by a
+    token bucket per API key, and identical concurrent reads are coalesced.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: ResponseCache | None = None):
         """Initialize the Meraki Dashboard client.
 
         Args:
             api_key: Meraki Dashboard API key
+            cache: Response cache (defaults to the one configured in settings)
         """
+        settings = get_settings()
         self.api_key = api_key
         self._dashboard: meraki.DashboardAPI | None = None
         self._connected = False
+        self._cache = cache if cache is not None else build_response_cache(settings, api_key)
+        self._executor_workers = settings.meraki_executor_workers
+        self._limiter = get_token_bucket(
+            cache_scope(api_key), settings.meraki_rate_limit, settings.meraki_rate_burst
+        )
+        self._single_flight = SingleFlight()
 
     async def connect(self) -> None:
         """Initialize the Meraki SDK client."""
         # Run SDK initialization in executor since it's synchronous
-        loop = asyncio.get_running_loop()
-        self._dashboard = await loop.run_in_executor(
-            None,
+        self._dashboard = await get_meraki_executor(self._executor_workers).run(
             partial(
                 meraki.DashboardAPI,
                 api_key=self.api_key,
@@ -61,6 +74,9 @@ class MerakiDashboardClient:
         """Close the Meraki SDK client."""
         self._dashboard = None
         self._connected = False
+        if self._cache is not None:
+            await self._cache.close()
+            self._cache = None
         logger.info("Meraki Dashboard SDK client disconnected")
 
     @property
@@ -69,7 +85,10 @@ class MerakiDashboardClient:
         return self._connected and self._dashboard is not None
 
     async def _run_sync(self, func, *args, **kwargs):
-        """Run a synchronous SDK method in an executor.
+        """Run a synchronous SDK method on the Meraki executor.
+
+        Waits for a rate-limit token first so bursts are paced before they
+        reach Meraki.
 
         Parameters
         ----------
@@ -93,32 +112,56 @@ class MerakiDashboardClient:
         if not self._dashboard:
             raise MerakiClientError("Client not connected")
 
-        loop = asyncio.get_running_loop()
+        await self._limiter.acquire()
         try:
-            return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+            return await get_meraki_executor(self._executor_workers).run(partial(func, *args, **kwargs))
         except meraki.APIError as e:
             raise MerakiClientError(f"API error: {e}") from e
         except Exception as e:
             raise MerakiClientError(f"Request failed: {e}") from e
 
+    async def _run_read(self, func, *args, **kwargs):
+        """Run a read-only SDK method, sharing the call with identical concurrent reads.
+
+        Parameters
+        ----------
+        func : callable
+            SDK getter
+        *args
+            Positional arguments
+        **kwargs
+            Keyword arguments
+
+        Returns
+        -------
+        Any
+            A private copy of the SDK result
+        """
+        name = getattr(func, "__qualname__", None) or repr(func)
+        key = f"{name}:{json.dumps([args, kwargs], sort_keys=True, default=str)}"
+        return await self._single_flight.do(key, partial(self._run_sync, func, *args, **kwargs))
+
     # =========================================================================
     # Organization & Network
     # =========================================================================
 
+    @cached
     async def get_organizations(self) -> list[dict]:
         """Get all organizations the API key has access to."""
-        return await self._run_sync(self._dashboard.organizations.getOrganizations)
+        return await self._run_read(self._dashboard.organizations.getOrganizations)
 
+    @cached
     async def get_networks(self, organization_id: str) -> list[dict]:
         """Get all networks in an organization."""
-        return await self._run_sync(
+        return await self._run_read(
             self._dashboard.organizations.getOrganizationNetworks,
             organization_id
         )
 
+    @cached
     async def get_network(self, network_id: str) -> dict:
         """Get network details."""
-        return await self._run_sync(self._dashboard.networks.getNetwork, network_id)
+        return await self._run_read(self._dashboard.networks.getNetwork, network_id)
 
     async def get_network_devices(self, network_id: str) -> list[dict]:
         """Get all devices in a network (APs, switches, MXs, etc).
@@ -129,7 +172,7 @@ class MerakiDashboardClient:
         Returns:
             List of device dictionaries with keys: serial, name, model, lanIp, mac, tags, networkId
         """
-        return await self._run_sync(
+        return await self._run_read(
             self._dashboard.networks.getNetworkDevices,
             network_id
         )
@@ -138,16 +181,18 @@ class MerakiDashboardClient:
     # SSID Management
     # =========================================================================
 
+    @cached
     async def get_ssids(self, network_id: str) -> list[dict]:
         """Get all SSIDs for a network."""
-        return await self._run_sync(
+        return await self._run_read(
             self._dashboard.wireless.getNetworkWirelessSsids,
             network_id
         )
 
+    @cached
     async def get_ssid(self, network_id: str, ssid_number: int) -> dict:
         """Get SSID details."""
-        return await self._run_sync(
+        return await self._run_read(
             self._dashboard.wireless.getNetworkWirelessSsid,
             network_id,
             str(ssid_number)
@@ -206,6 +251,7 @@ class MerakiDashboardClient:
             "raw_config": ssid,
         }
 
+    @invalidates("get_ssids", "get_ssid")
     async def configure_ssid_for_wpn(
         self,
         network_id: str,
@@ -362,6 +408,7 @@ class MerakiDashboardClient:
             ),
         }
 
+    @invalidates("get_ssids", "get_ssid")
     async def configure_splash_page(
         self,
         network_id: str,
@@ -436,9 +483,10 @@ class MerakiDashboardClient:
     # Group Policy Management
     # =========================================================================
 
+    @cached
     async def get_group_policies(self, network_id: str) -> list[dict]:
         """Get all group policies for a network."""
-        policies = await self._run_sync(
+        policies = await self._run_read(
             self._dashboard.networks.getNetworkGroupPolicies,
             network_id
         )
@@ -453,6 +501,7 @@ class MerakiDashboardClient:
             for p in policies
         ]
 
+    @invalidates("get_group_policies", "_fetch_ipsks")
     async def create_group_policy(
         self,
         network_id: str,
@@ -509,6 +558,7 @@ class MerakiDashboardClient:
             "name": result.get("name"),
         }
 
+    @invalidates("get_group_policies", "_fetch_ipsks")
     async def update_group_policy(
         self,
         network_id: str,
@@ -585,7 +635,7 @@ class MerakiDashboardClient:
         See Meraki API docs: get-organization-nac-authorization-policies
         """
         try:
-            policies = await self._run_sync(
+            policies = await self._run_read(
                 self._dashboard.organizations.getOrganizationNacAuthorizationPolicies,
                 organization_id
             )
@@ -735,7 +785,31 @@ class MerakiDashboardClient:
             logger.warning("No network_id configured")
             return []
 
-        ipsks = await self._run_sync(
+        ipsks = await self._fetch_ipsks(network_id, ssid_num)
+
+        # Filter by status if requested
+        if status:
+            ipsks = [i for i in ipsks if i.get("status") == status]
+
+        return ipsks
+
+    @cached
+    async def _fetch_ipsks(self, network_id: str, ssid_num: int) -> list[dict]:
+        """Fetch and normalize the IPSKs of one SSID (cached; see ``list_ipsks``).
+
+        Parameters
+        ----------
+        network_id : str
+            Meraki network ID
+        ssid_num : int
+            SSID number (0-14)
+
+        Returns
+        -------
+        list[dict]
+            IPSK dictionaries with computed status and normalized fields
+        """
+        ipsks = await self._run_read(
             self._dashboard.wireless.getNetworkWirelessSsidIdentityPsks,
             network_id,
             str(ssid_num)
@@ -771,10 +845,6 @@ class MerakiDashboardClient:
             else:
                 ipsk["group_policy_name"] = None
 
-        # Filter by status if requested
-        if status:
-            ipsks = [i for i in ipsks if i.get("status") == status]
-
         return ipsks
 
     def _compute_ipsk_status(self, ipsk: dict) -> str:
@@ -791,6 +861,7 @@ class MerakiDashboardClient:
                 pass
         return "active"
 
+    @invalidates("_fetch_ipsks")
     async def create_ipsk(
         self,
         name: str,
@@ -917,7 +988,7 @@ class MerakiDashboardClient:
             else settings.default_ssid_number
         )
 
-        result = await self._run_sync(
+        result = await self._run_read(
             self._dashboard.wireless.getNetworkWirelessSsidIdentityPsk,
             network_id,
             str(ssid_num),
@@ -937,6 +1008,7 @@ class MerakiDashboardClient:
 
         return result
 
+    @invalidates("_fetch_ipsks")
     async def update_ipsk(
         self,
         ipsk_id: str,
@@ -1022,6 +1094,7 @@ class MerakiDashboardClient:
         await self.delete_ipsk(ipsk_id, network_id, ssid_number)
         logger.info(f"Revoked IPSK: {ipsk_id}")
 
+    @invalidates("_fetch_ipsks")
     async def delete_ipsk(
         self,
         ipsk_id: str,
@@ -1120,13 +1193,10 @@ class MerakiDashboardClient:
                         })
 
                 # Get group policies
-                policies = await self._run_sync(
-                    self._dashboard.networks.getNetworkGroupPolicies,
-                    target_network
-                )
+                policies = await self.get_group_policies(target_network)
                 for policy in policies:
                     result["group_policies"].append({
-                        "id": policy["groupPolicyId"],
+                        "id": policy["id"],
                         "name": policy["name"],
                     })
             else:
@@ -1183,7 +1253,7 @@ class MerakiDashboardClient:
         dict
             Current splash settings
         """
-        result = await self._run_sync(
+        result = await self._run_read(
             self._dashboard.wireless.getNetworkWirelessSsidSplashSettings,
             network_id,
             str(ssid_number),
@@ -1249,7 +1319,7 @@ class MerakiDashboardClient:
             List of uploaded CA certificates
         """
         try:
-            certs = await self._run_sync(
+            certs = await self._run_read(
                 self._dashboard.organizations.getOrganizationCertificatesRadSecServerCaCertificates,
                 organization_id,
             )
@@ -1384,7 +1454,7 @@ class MerakiDashboardClient:
             if certificate_authority_ids:
                 kwargs['certificateAuthorityIds'] = certificate_authority_ids
             
-            result = await self._run_sync(
+            result = await self._run_read(
                 self._dashboard.wireless.getOrganizationWirelessDevicesRadsecCertificatesAuthorities,
                 organization_id,
                 **kwargs
@@ -1501,6 +1571,7 @@ class MerakiDashboardClient:
             logger.error(f"Failed to trust RadSec device CA: {e}")
             raise MerakiClientError(f"Failed to trust device CA: {e}") from e
 
+    @invalidates("get_ssids", "get_ssid")
     async def configure_network_radsec(
         self,
         network_id: str,
@@ -0,0 +1,359 @@
+"""Native async Meraki Dashboard API client using httpx.
+
+``MerakiDashboardClient`` wraps the synchronous ``meraki`` SDK in worker
+threads. This client talks to the Dashboard REST API directly over a
+persistent httpx connection pool (HTTP/2 when ``h2`` is installed), so no
+threads are parked while requests are in flight.
+
+It subclasses ``MerakiDashboardClient`` and replaces only the transport:
+``self._dashboard`` is an async stand-in whose ``organizations``,
+``networks`` and ``wireless`` sections expose the SDK method names the
+parent uses, each mapped to its REST endpoint. All normalization, caching,
+invalidation, coalescing and rate limiting is inherited.
+
+Transport behaviour:
+
+- Link-header pagination (``rel=next``) for list endpoints, also exposed as
+  async generators (``paginate``, ``iter_ipsks``, ``iter_network_devices``)
+  for callers that want to stream large lists.
+- 429 responses are retried, honouring ``Retry-After`` and otherwise
+  backing off exponentially. Transport errors and 502/503/504 are only
+  retried for idempotent methods, since a POST may already have been applied.
+- Responses are requested gzip-compressed.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from app.core.meraki_cache import ResponseCache
+from app.core.meraki_client import MerakiClientError, MerakiDashboardClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://api.meraki.com/api/v1"
+
+# Statuses worth retrying; a 429 was never processed, so any method retries it
+RETRY_STATUSES = {429, 502, 503, 504}
+RETRY_STATUSES_UNSAFE = {429}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+MAX_RETRIES = 4
+MAX_BACKOFF_SECONDS = 30.0
+
+# Page size requested from paginated endpoints
+PER_PAGE = 1000
+
+
+@dataclass(frozen=True)
+class _Endpoint:
+    """REST endpoint behind an SDK method name."""
+
+    method: str
+    path: str
+    paginated: bool = False
+
+
+# SDK method name -> endpoint, per SDK section. Path placeholders are
+# filled from the positional arguments in order; keyword arguments become
+# query parameters (GET) or the JSON body. Every GET follows Link headers;
+# ``paginated`` endpoints also ask for the largest page size.
+ENDPOINTS: dict[str, dict[str, _Endpoint]] = {
+    "organizations": {
+        "getOrganizations": _Endpoint("GET", "/organizations", paginated=True),
+        "getOrganizationNetworks": _Endpoint("GET", "/organizations/{}/networks", paginated=True),
+        "getOrganizationNacAuthorizationPolicies": _Endpoint(
+            "GET", "/organizations/{}/nac/authorization/policies"
+        ),
+        "createOrganizationNacAuthorizationPolicy": _Endpoint(
+            "POST", "/organizations/{}/nac/authorization/policies"
+        ),
+        "getOrganizationCertificatesRadSecServerCaCertificates": _Endpoint(
+            "GET", "/organizations/{}/certificates/radSec/serverCaCertificates"
+        ),
+        "createOrganizationCertificatesRadSecServerCaCertificate": _Endpoint(
+            "POST", "/organizations/{}/certificates/radSec/serverCaCertificates"
+        ),
+        "deleteOrganizationCertificatesRadSecServerCaCertificate": _Endpoint(
+            "DELETE", "/organizations/{}/certificates/radSec/serverCaCertificates/{}"
+        ),
+    },
+    "networks": {
+        "getNetwork": _Endpoint("GET", "/networks/{}"),
+        "getNetworkDevices": _Endpoint("GET", "/networks/{}/devices"),
+        "getNetworkGroupPolicies": _Endpoint("GET", "/networks/{}/groupPolicies"),
+        "createNetworkGroupPolicy": _Endpoint("POST", "/networks/{}/groupPolicies"),
+        "updateNetworkGroupPolicy": _Endpoint("PUT", "/networks/{}/groupPolicies/{}"),
+    },
+    "wireless": {
+        "getNetworkWirelessSsids": _Endpoint("GET", "/networks/{}/wireless/ssids"),
+        "getNetworkWirelessSsid": _Endpoint("GET", "/networks/{}/wireless/ssids/{}"),
+        "updateNetworkWirelessSsid": _Endpoint("PUT", "/networks/{}/wireless/ssids/{}"),
+        "getNetworkWirelessSsidSplashSettings": _Endpoint(
+            "GET", "/networks/{}/wireless/ssids/{}/splash/settings"
+        ),
+        "updateNetworkWirelessSsidSplashSettings": _Endpoint(
+            "PUT", "/networks/{}/wireless/ssids/{}/splash/settings"
+        ),
+        "getNetworkWirelessSsidIdentityPsks": _Endpoint(
+            "GET", "/networks/{}/wireless/ssids/{}/identityPsks"
+        ),
+        "createNetworkWirelessSsidIdentityPsk": _Endpoint(
+            "POST", "/networks/{}/wireless/ssids/{}/identityPsks"
+        ),
+        "getNetworkWirelessSsidIdentityPsk": _Endpoint(
+            "GET", "/networks/{}/wireless/ssids/{}/identityPsks/{}"
+        ),
+        "updateNetworkWirelessSsidIdentityPsk": _Endpoint(
+            "PUT", "/networks/{}/wireless/ssids/{}/identityPsks/{}"
+        ),
+        "deleteNetworkWirelessSsidIdentityPsk": _Endpoint(
+            "DELETE", "/networks/{}/wireless/ssids/{}/identityPsks/{}"
+        ),
+        "getOrganizationWirelessDevicesRadsecCertificatesAuthorities": _Endpoint(
+            "GET", "/organizations/{}/wireless/devices/radsec/certificates/authorities"
+        ),
+        "createOrganizationWirelessDevicesRadsecCertificatesAuthority": _Endpoint(
+            "POST", "/organizations/{}/wireless/devices/radsec/certificates/authorities"
+        ),
+        "updateOrganizationWirelessDevicesRadsecCertificatesAuthorities": _Endpoint(
+            "PUT", "/organizations/{}/wireless/devices/radsec/certificates/authorities"
+        ),
+    },
+}
+
+
+class _BoundEndpoint:
+    """Async callable standing in for one SDK method."""
+
+    def __init__(self, client: "MerakiHttpClient", qualname: str, endpoint: _Endpoint):
+        self._client = client
+        self._endpoint = endpoint
+        self.__qualname__ = qualname
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        endpoint = self._endpoint
+        path = endpoint.path.format(*(str(arg) for arg in args))
+        if endpoint.method != "GET":
+            return await self._client._request(endpoint.method, path, json=kwargs or None)
+
+        if endpoint.paginated:
+            kwargs.setdefault("perPage", PER_PAGE)
+        items: list = []
+        async for page in self._client.iter_pages(path, **kwargs):
+            if not isinstance(page, list):
+                return page
+            items.extend(page)
+        return items
+
+
+class _Section:
+    """SDK section (``organizations``, ``networks``, ``wireless``)."""
+
+    def __init__(self, client: "MerakiHttpClient", name: str):
+        self._client = client
+        self._name = name
+
+    def __getattr__(self, method: str) -> _BoundEndpoint:
+        endpoint = ENDPOINTS[self._name].get(method)
+        if endpoint is None:
+            raise AttributeError(f"{self._name}.{method} is not supported by the HTTP client")
+        return _BoundEndpoint(self._client, f"{self._name}.{method}", endpoint)
+
+
+class _AsyncDashboard:
+    """Async replacement for ``meraki.DashboardAPI``."""
+
+    def __init__(self, client: "MerakiHttpClient"):
+        for section in ENDPOINTS:
+            setattr(self, section, _Section(client, section))
+
+
+class MerakiHttpClient(MerakiDashboardClient):
+    """Meraki Dashboard client speaking REST over a pooled httpx connection.
+
+    Parameters
+    ----------
+    api_key : str
+        Meraki Dashboard API key
+    cache : ResponseCache | None
+        Response cache (defaults to the one configured in settings)
+    base_url : str
+        Dashboard API base URL
+    transport : httpx.AsyncBaseTransport | None
+        Custom transport (tests use ``httpx.ASGITransport``)
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        cache: ResponseCache | None = None,
+        base_url: str = DEFAULT_BASE_URL,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        super().__init__(api_key, cache=cache)
+        self.base_url = base_url.rstrip("/")
+        self._transport = transport
+        self._http: httpx.AsyncClient | None = None
+
+    async def connect(self) -> None:
+        """Open the HTTP connection pool."""
+        http2 = importlib.util.find_spec("h2") is not None and self._transport is None
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip",
+                "User-Agent": "MerakiWPNPortal",
+            },
+            http2=http2,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            transport=self._transport,
+        )
+        self._dashboard = _AsyncDashboard(self)
+        self._connected = True
+        logger.info(f"Meraki Dashboard HTTP client initialized (HTTP/{'2' if http2 else '1.1'})")
+
+    async def disconnect(self) -> None:
+        """Close the HTTP connection pool."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        await super().disconnect()
+
+    async def _run_sync(self, func, *args, **kwargs):
+        """Call an endpoint (the SDK-shaped name is kept so inherited methods work).
+
+        Parameters
+        ----------
+        func : callable
+            Bound endpoint from ``self._dashboard``
+        *args
+            Path parameters
+        **kwargs
+            Query parameters or JSON body
+
+        Returns
+        -------
+        Any
+            Decoded JSON response
+
+        Raises
+        ------
+        MerakiClientError
+            If the request fails
+        """
+        if not self._dashboard:
+            raise MerakiClientError("Client not connected")
+        return await func(*args, **kwargs)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        json: dict | None = None,
+    ) -> Any:
+        """Send one request and decode its JSON body."""
+        response = await self._send(method, path, params=params, json=json)
+        if response.status_code == 204 or not response.content:
+            return None
+        return response.json()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        json: dict | None = None,
+    ) -> httpx.Response:
+        """Send a request with pacing, retries and error mapping."""
+        if self._http is None:
+            raise MerakiClientError("Client not connected")
+
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_statuses = RETRY_STATUSES if idempotent else RETRY_STATUSES_UNSAFE
+        attempt = 0
+        while True:
+            await self._limiter.acquire()
+            try:
+                response = await self._http.request(method, url, params=params, json=json)
+            except httpx.TransportError as e:
+                if not idempotent or attempt == MAX_RETRIES:
+                    raise MerakiClientError(f"Request failed: {e}") from e
+                delay = self._backoff(attempt, None)
+            else:
+                if response.status_code not in retry_statuses or attempt == MAX_RETRIES:
+                    if response.is_error:
+                        raise MerakiClientError(
+                            f"API error: {response.status_code} {self._error_detail(response)}"
+                        )
+                    return response
+                delay = self._backoff(attempt, response.headers.get("Retry-After"))
+                logger.debug(f"Meraki API {response.status_code} on {method} {url}, retrying in {delay:.1f}s")
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: str | None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_BACKOFF_SECONDS)
+            except ValueError:
+                pass
+        return min(0.5 * 2 ** attempt, MAX_BACKOFF_SECONDS)
+
+    @staticmethod
+    def _error_detail(response: httpx.Response) -> str:
+        try:
+            errors = response.json().get("errors")
+        except (ValueError, AttributeError):
+            errors = None
+        return "; ".join(errors) if errors else response.reason_phrase
+
+    async def iter_pages(self, path: str, **params: Any) -> AsyncIterator[Any]:
+        """Yield each page of an endpoint, following ``Link: rel=next``.
+
+        Parameters
+        ----------
+        path : str
+            Endpoint path relative to the base URL
+        **params
+            Query parameters for the first page (e.g. ``perPage``)
+
+        Yields
+        ------
+        Any
+            Decoded JSON body of one page
+        """
+        url: str | None = path
+        query: dict | None = params or None
+        while url:
+            response = await self._send("GET", url, params=query)
+            yield response.json() if response.content else None
+            url = response.links.get("next", {}).get("url")
+            # The next link carries its own query string
+            query = None
+
+    async def paginate(self, path: str, **params: Any) -> AsyncIterator[dict]:
+        """Yield items from every page of a list endpoint."""
+        async for page in self.iter_pages(path, **params):
+            for item in page or []:
+                yield item
+
+    async def iter_ipsks(self, network_id: str, ssid_number: int) -> AsyncIterator[dict]:
+        """Stream raw Identity PSKs for an SSID page by page."""
+        async for ipsk in self.paginate(f"/networks/{network_id}/wireless/ssids/{ssid_number}/identityPsks"):
+            yield ipsk
+
+    async def iter_network_devices(self, network_id: str) -> AsyncIterator[dict]:
+        """Stream the devices in a network."""
+        async for device in self.paginate(f"/networks/{network_id}/devices"):
+            yield device
@@ -0,0 +1,212 @@
+"""Concurrency controls for Meraki Dashboard SDK calls.
+
+The Meraki SDK is synchronous, and ``wait_on_rate_limit=True`` makes it
+sleep inside the calling thread when Meraki answers 429. Running those calls
+on the default asyncio executor lets a throttled burst park every shared
+worker thread. This module provides:
+
+- ``MerakiExecutor``: a dedicated, sized thread pool for SDK calls with
+  queue-depth and wait-time metrics.
+- ``TokenBucket``: paces calls to Meraki's per-organization budget
+  (10 req/s) before they're sent, instead of reacting to 429s.
+- ``SingleFlight``: concurrent identical reads share one upstream call.
+
+The executor and token buckets are process-wide, so short-lived clients
+(e.g. connection tests) share them with the main client.
+"""
+
+import asyncio
+import copy
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+# Meraki's documented per-organization budget
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 10
+
+_executor: "MerakiExecutor | None" = None
+_buckets: dict[str, "TokenBucket"] = {}
+_lock = threading.Lock()
+
+
+class MerakiExecutor:
+    """Thread pool dedicated to blocking SDK calls.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of worker threads
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="meraki-sdk")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+
+    def _call(self, submitted_at: float, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.total_wait_seconds += time.monotonic() - submitted_at
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    async def run(self, func: Callable[[], Any]) -> Any:
+        """Run ``func`` on the pool and await its result."""
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self._call, time.monotonic(), func)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, utilization and average queue wait."""
+        with self._lock:
+            started = self.completed + self.active
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "max_queue_depth": self.max_queue_depth,
+                "avg_wait_ms": round(self.total_wait_seconds / started * 1000, 2) if started else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting, cancelling calls not yet started."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class TokenBucket:
+    """Async token bucket pacing calls to ``rate`` per second.
+
+    Callers reserve a token immediately (the balance may go negative) and
+    sleep off any debt, so waiters are served in arrival order without a
+    lock.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second
+    burst : int
+        Bucket capacity
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self.acquired = 0
+        self.throttled = 0
+        self.total_delay_seconds = 0.0
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait for it."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        self.acquired += 1
+        if self._tokens >= 0:
+            return 0.0
+        delay = -self._tokens / self.rate
+        self.throttled += 1
+        self.total_delay_seconds += delay
+        return delay
+
+    async def acquire(self) -> None:
+        """Wait until a call may be sent."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict[str, Any]:
+        """Tokens handed out, how many had to wait and the total wait."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "total_delay_seconds": round(self.total_delay_seconds, 3),
+        }
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent identical requests.
+
+    The call runs in its own task, so a cancelled caller (e.g. a client
+    disconnect) stops waiting without cancelling the fetch for the others.
+    Every caller, including the first, gets its own deep copy of the result
+    so callers can't see each other's mutations.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` unless a call with the same key is already running."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Callers re-raise it; mark it retrieved in case all of them left
+            task.exception()
+
+
+def get_meraki_executor(max_workers: int = 8) -> MerakiExecutor:
+    """Process-wide SDK executor (created on first use)."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = MerakiExecutor(max_workers)
+        return _executor
+
+
+def get_token_bucket(key: str, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST) -> TokenBucket:
+    """Process-wide token bucket for one API key / organization."""
+    with _lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate, burst)
+        return bucket
+
+
+def get_throttle_stats() -> dict[str, Any]:
+    """Executor and rate limiter metrics."""
+    with _lock:
+        return {
+            "executor": _executor.stats() if _executor else None,
+            "rate_limiters": {key: bucket.stats() for key, bucket in _buckets.items()},
+        }
+
+
+def shutdown_meraki_executor() -> None:
+    """Stop the SDK executor (it is recreated on next use)."""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -0,0 +1,51 @@
+"""Keyset (cursor) pagination helpers for admin list endpoints.
+
+Lists are sorted newest first on (``created_at``, ``id``). A cursor encodes
+the sort key of the last row returned, so the next page is a range scan on
+the matching composite index instead of an OFFSET that walks every
+earlier row.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor can't be decoded."""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Build an opaque, URL-safe cursor for the last row of a page.
+
+    Args:
+        created_at: Sort timestamp of the last row
+        row_id: Primary key of the last row
+
+    Returns:
+        Cursor token
+    """
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Cursor token
+
+    Returns:
+        (created_at, id) of the last row already returned
+
+    Raises:
+        InvalidCursor: If the token is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(row_id, int):
+            raise ValueError("cursor id must be an integer")
+        return datetime.fromisoformat(created_at), row_id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid pagination cursor: {e}") from e
@@ -0,0 +1,77 @@
+"""Wake the FreeRADIUS config watcher after portal writes.
+
+The FreeRADIUS API consumes a change log filled by database triggers. On
+PostgreSQL the trigger also issues NOTIFY, so nothing else is needed. On
+MariaDB/SQLite the portal pings ``POST /api/config/notify`` so config changes
+reach radiusd immediately instead of on the watcher's fallback poll.
+"""
+
+import asyncio
+import logging
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_TIMEOUT_SECONDS = 2.0
+
+# Keep references to in-flight notifications so they aren't garbage collected
+_pending_tasks: set[asyncio.Task] = set()
+
+
+def _notify_target() -> tuple[str, dict[str, str]] | None:
+    """Get the notify URL and headers, or None if notification is not needed."""
+    settings = get_settings()
+    if settings.database_url.startswith("postgresql"):
+        return None  # Database triggers issue NOTIFY directly
+    if not settings.radius_api_url or not settings.radius_api_token:
+        return None
+    return (
+        f"{settings.radius_api_url}/api/config/notify",
+        {"Authorization": f"Bearer {settings.radius_api_token}"},
+    )
+
+
+async def _post_notification(url: str, headers: dict[str, str], tables: list[str]) -> None:
+    try:
+        async with httpx.AsyncClient(timeout=NOTIFY_TIMEOUT_SECONDS) as client:
+            response = await client.post(url, json={"tables": tables}, headers=headers)
+            response.raise_for_status()
+    except Exception as e:
+        logger.warning(f"RADIUS change notification failed (watcher will poll): {e}")
+
+
+def notify_radius_config_changed(*tables: str) -> None:
+    """Tell the FreeRADIUS watcher that configuration tables changed.
+
+    Best effort and non-blocking when called from the event loop; the
+    watcher's fallback poll picks the change up if the notification is lost.
+
+    Args:
+        tables: Changed table names (e.g. "udn_assignments", "radius_clients")
+    """
+    target = _notify_target()
+    if target is None:
+        return
+    url, headers = target
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is not None:
+        task = loop.create_task(_post_notification(url, headers, list(tables)))
+        _pending_tasks.add(task)
+        task.add_done_callback(_pending_tasks.discard)
+        return
+
+    try:
+        response = httpx.post(
+            url, json={"tables": list(tables)}, headers=headers, timeout=NOTIFY_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+    except Exception as e:
+        logger.warning(f"RADIUS change notification failed (watcher will poll): {e}")
@@ -0,0 +1,467 @@
+"""Hourly and daily rollups of splash portal and registration activity.
+
+The admin statistics used to count ``splash_access`` and ``registrations``
+on every request, including a COUNT(DISTINCT client_mac) over the whole
+access log. Instead, a scheduled compaction job folds every closed hour
+into ``stats_rollups`` rows (plus one row per day) and records each
+device's first splash access in ``splash_devices``, so unique devices can
+be summed per bucket.
+
+Readers (``RollupStats``) sum a handful of rollup rows and count only the
+still-open tail (everything after the last rolled-up hour) live, so
+results are exact without waiting for the next compaction. Each run also
+recomputes a trailing window of closed hours to pick up rows that changed
+after they were first rolled up.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler  # type: ignore[import-untyped]
+from sqlalchemy import case, exists, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.config import get_settings
+from app.db.database import get_session_local
+from app.db.models import Registration, SplashAccess, SplashDevice, StatsRollup
+
+logger = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+COUNTERS = (
+    "splash_accesses",
+    "splash_granted",
+    "splash_registered",
+    "splash_new_devices",
+    "registrations",
+)
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+_IN_CHUNK = 500
+
+
+def _aware(value: datetime) -> datetime:
+    """Treat naive timestamps (SQLite) as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _hour(value: datetime) -> datetime:
+    return _aware(value).astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _day(value: datetime) -> datetime:
+    return _hour(value).replace(hour=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floor = _hour(value)
+    return floor if floor == _aware(value) else floor + HOUR
+
+
+def _zeros() -> dict[str, int]:
+    return dict.fromkeys(COUNTERS, 0)
+
+
+def _add(total: dict[str, int], other: dict[str, int]) -> None:
+    for key in COUNTERS:
+        total[key] += other.get(key) or 0
+
+
+# =============================================================================
+# Compaction
+# =============================================================================
+
+
+def compact(db: Session, now: datetime | None = None, recompute_hours: int = 24) -> int:
+    """Roll up every closed hour that is new or may have changed.
+
+    Args:
+        db: Database session
+        now: Current time (defaults to now, UTC)
+        recompute_hours: Closed hours re-aggregated on every run
+
+    Returns:
+        Number of hourly buckets written
+    """
+    open_hour = _hour(now or datetime.now(timezone.utc))
+
+    last = db.scalar(select(func.max(StatsRollup.bucket_start)).where(StatsRollup.period == "hour"))
+    if last is not None:
+        start = min(_aware(last), open_hour - timedelta(hours=recompute_hours))
+    else:
+        # First run: backfill from the oldest recorded activity
+        firsts = [
+            db.scalar(select(func.min(SplashAccess.accessed_at))),
+            db.scalar(select(func.min(Registration.created_at))),
+        ]
+        firsts = [_hour(value) for value in firsts if value is not None]
+        start = min(firsts, default=open_hour)
+
+    if start >= open_hour:
+        return 0
+
+    # A day at a time keeps memory bounded during a backfill
+    written = 0
+    chunk_start = start
+    while chunk_start < open_hour:
+        chunk_end = min(_day(chunk_start) + DAY, open_hour)
+        written += _compact_hours(db, chunk_start, chunk_end)
+        _compact_day(db, _day(chunk_start))
+        db.commit()
+        chunk_start = chunk_end
+
+    return written
+
+
+def _compact_hours(db: Session, start: datetime, end: datetime) -> int:
+    """Re-aggregate the hourly buckets in [start, end)."""
+    buckets: dict[datetime, dict[str, int]] = {}
+    bucket = start
+    while bucket < end:
+        buckets[bucket] = _zeros()
+        bucket += HOUR
+
+    first_seen: dict[str, datetime] = {}
+    accesses = db.execute(
+        select(
+            SplashAccess.accessed_at,
+            SplashAccess.client_mac,
+            SplashAccess.access_granted,
+            SplashAccess.registered,
+        ).where(SplashAccess.accessed_at >= start, SplashAccess.accessed_at < end)
+    )
+    for accessed_at, client_mac, granted, registered in accesses:
+        counters = buckets[_hour(accessed_at)]
+        counters["splash_accesses"] += 1
+        counters["splash_granted"] += 1 if granted else 0
+        counters["splash_registered"] += 1 if registered else 0
+        if client_mac:
+            seen = _aware(accessed_at)
+            if client_mac not in first_seen or seen < first_seen[client_mac]:
+                first_seen[client_mac] = seen
+
+    _record_devices(db, first_seen)
+
+    for seen in db.scalars(
+        select(SplashDevice.first_seen_at).where(
+            SplashDevice.first_seen_at >= start, SplashDevice.first_seen_at < end
+        )
+    ):
+        buckets[_hour(seen)]["splash_new_devices"] += 1
+
+    for created_at in db.scalars(
+        select(Registration.created_at).where(
+            Registration.created_at >= start, Registration.created_at < end
+        )
+    ):
+        buckets[_hour(created_at)]["registrations"] += 1
+
+    _write_buckets(db, "hour", buckets)
+    return len(buckets)
+
+
+def _record_devices(db: Session, first_seen: dict[str, datetime]) -> None:
+    """Add devices seen for the first time; move first_seen_at back if needed."""
+    macs = list(first_seen)
+    for i in range(0, len(macs), _IN_CHUNK):
+        chunk = macs[i:i + _IN_CHUNK]
+        known = {
+            device.client_mac: device
+            for device in db.scalars(select(SplashDevice).where(SplashDevice.client_mac.in_(chunk)))
+        }
+        for mac in chunk:
+            device = known.get(mac)
+            if device is None:
+                db.add(SplashDevice(client_mac=mac, first_seen_at=first_seen[mac]))
+            elif _aware(device.first_seen_at) > first_seen[mac]:
+                device.first_seen_at = first_seen[mac]
+    db.flush()
+
+
+def _compact_day(db: Session, day: datetime) -> None:
+    """Sum a day's hourly buckets into its daily bucket."""
+    totals = db.execute(
+        select(*(func.coalesce(func.sum(getattr(StatsRollup, key)), 0) for key in COUNTERS)).where(
+            StatsRollup.period == "hour",
+            StatsRollup.bucket_start >= day,
+            StatsRollup.bucket_start < day + DAY,
+        )
+    ).one()
+    _write_buckets(db, "day", {day: dict(zip(COUNTERS, totals, strict=True))})
+
+
+def _write_buckets(db: Session, period: str, buckets: dict[datetime, dict[str, int]]) -> None:
+    if not buckets:
+        return
+    starts = sorted(buckets)
+    existing = {
+        _aware(row.bucket_start): row
+        for row in db.scalars(
+            select(StatsRollup).where(
+                StatsRollup.period == period,
+                StatsRollup.bucket_start >= starts[0],
+                StatsRollup.bucket_start <= starts[-1],
+            )
+        )
+    }
+    now = datetime.now(timezone.utc)
+    for bucket_start, counters in buckets.items():
+        row = existing.get(bucket_start)
+        if row is None:
+            row = StatsRollup(period=period, bucket_start=bucket_start)
+            db.add(row)
+        for key, value in counters.items():
+            setattr(row, key, value)
+        row.computed_at = now
+    db.flush()
+
+
+class StatsRollupJob:
+    """Background service running the rollup compaction."""
+
+    def __init__(self):
+        """Initialize the rollup job."""
+        self.scheduler = AsyncIOScheduler()
+        self.last_run: datetime | None = None
+
+    async def start(self):
+        """Start the compaction schedule (first run immediately)."""
+        settings = get_settings()
+
+        if not settings.stats_rollup_enabled:
+            logger.info("Stats rollups are disabled")
+            return
+
+        interval = settings.stats_rollup_interval_minutes
+        logger.info(f"Starting stats rollup job (interval: {interval}m)")
+        # Fresh scheduler per start: it binds to the running event loop
+        self.scheduler = AsyncIOScheduler()
+        self.scheduler.add_job(
+            self.run,
+            "interval",
+            minutes=interval,
+            id="stats_rollup_compaction",
+            next_run_time=datetime.now(timezone.utc),
+        )
+        self.scheduler.start()
+
+    async def run(self):
+        """Run one compaction in a worker thread."""
+        try:
+            written = await asyncio.to_thread(self._compact)
+        except Exception as e:
+            logger.error(f"Stats rollup compaction failed: {e}")
+            return
+        self.last_run = datetime.now(timezone.utc)
+        logger.debug(f"Stats rollup compaction wrote {written} hourly buckets")
+
+    def _compact(self) -> int:
+        SessionLocal = get_session_local()
+        with SessionLocal() as db:
+            return compact(db, recompute_hours=get_settings().stats_rollup_recompute_hours)
+
+    async def stop(self):
+        """Stop the compaction schedule."""
+        if self.scheduler.running:
+            self.scheduler.shutdown()
+            logger.info("Stats rollup job stopped")
+
+
+# =============================================================================
+# Reads
+# =============================================================================
+
+
+class RollupStats:
+    """Activity statistics read from the rollups plus a live open tail.
+
+    Args:
+        db: Async database session (``AsyncSession`` or ``SyncSessionAdapter``)
+        now: Current time (defaults to now, UTC)
+    """
+
+    def __init__(self, db, now: datetime | None = None):
+        self.db = db
+        self.now = now or datetime.now(timezone.utc)
+        self._rolled: datetime | None = None
+        self._rolled_loaded = False
+
+    async def rolled_through(self) -> datetime | None:
+        """End of the last rolled-up hour (None before the first compaction)."""
+        if not self._rolled_loaded:
+            last = (await self.db.execute(
+                select(func.max(StatsRollup.bucket_start)).where(StatsRollup.period == "hour")
+            )).scalar_one()
+            self._rolled = _aware(last) + HOUR if last is not None else None
+            self._rolled_loaded = True
+        return self._rolled
+
+    async def counts(self, since: datetime | None = None) -> dict[str, int]:
+        """Activity counters from ``since`` (or all time) until now.
+
+        Args:
+            since: Window start; None for all time
+
+        Returns:
+            Totals for every counter in ``COUNTERS``. ``splash_new_devices``
+            over all time is the number of unique devices.
+        """
+        rolled = await self.rolled_through()
+        if rolled is None:
+            return await self._live(since, None)
+
+        totals = _zeros()
+        if since is None:
+            # Whole days from daily rows, the rest of the last day from hourly rows
+            _add(totals, await self._sum("day", None, _day(rolled)))
+            _add(totals, await self._sum("hour", _day(rolled), rolled))
+        else:
+            first_hour = _ceil_hour(since)
+            if first_hour >= rolled:
+                return await self._live(since, None)
+            if _aware(since) < first_hour:
+                _add(totals, await self._live(since, first_hour))
+            _add(totals, await self._sum("hour", first_hour, rolled))
+        _add(totals, await self._live(rolled, None))
+        return totals
+
+    async def timeseries(self, period: str, buckets: int) -> list[dict[str, Any]]:
+        """Per-hour or per-day counters for the most recent buckets.
+
+        Args:
+            period: "hour" or "day"
+            buckets: Number of buckets, ending with the current one
+
+        Returns:
+            Oldest-first list of buckets with counters and conversion rate
+        """
+        floor, step = (_hour, HOUR) if period == "hour" else (_day, DAY)
+        start = floor(self.now) - step * (buckets - 1)
+        series = {start + step * i: _zeros() for i in range(buckets)}
+
+        def fold(bucket_start: datetime, counters: dict[str, int]) -> None:
+            target = series.get(floor(bucket_start))
+            if target is not None:
+                _add(target, counters)
+
+        rolled = await self.rolled_through()
+        live_from = start
+        if rolled is not None and rolled > start:
+            if period == "day":
+                cut = max(start, _day(rolled))
+                rows = await self._rows("day", start, cut) + await self._rows("hour", cut, rolled)
+            else:
+                rows = await self._rows("hour", start, rolled)
+            for row in rows:
+                fold(_aware(row.bucket_start), {key: getattr(row, key) for key in COUNTERS})
+            live_from = rolled
+
+        accesses = await self.db.execute(
+            select(SplashAccess.accessed_at, SplashAccess.access_granted, SplashAccess.registered)
+            .where(SplashAccess.accessed_at >= live_from)
+        )
+        for accessed_at, granted, registered in accesses.all():
+            fold(_aware(accessed_at), {
+                "splash_accesses": 1,
+                "splash_granted": 1 if granted else 0,
+                "splash_registered": 1 if registered else 0,
+            })
+        registrations = await self.db.execute(
+            select(Registration.created_at).where(Registration.created_at >= live_from)
+        )
+        for (created_at,) in registrations.all():
+            fold(_aware(created_at), {"registrations": 1})
+
+        return [
+            {
+                "bucket_start": bucket_start.isoformat(),
+                **counters,
+                "conversion_rate": _conversion_rate(counters),
+            }
+            for bucket_start, counters in series.items()
+        ]
+
+    async def _rows(self, period: str, start: datetime, end: datetime) -> list[StatsRollup]:
+        if start >= end:
+            return []
+        return list((await self.db.execute(
+            select(StatsRollup).where(
+                StatsRollup.period == period,
+                StatsRollup.bucket_start >= start,
+                StatsRollup.bucket_start < end,
+            )
+        )).scalars().all())
+
+    async def _sum(self, period: str, start: datetime | None, end: datetime) -> dict[str, int]:
+        query = select(*(func.coalesce(func.sum(getattr(StatsRollup, key)), 0) for key in COUNTERS)).where(
+            StatsRollup.period == period,
+            StatsRollup.bucket_start < end,
+        )
+        if start is not None:
+            query = query.where(StatsRollup.bucket_start >= start)
+        return dict(zip(COUNTERS, (await self.db.execute(query)).one(), strict=True))
+
+    async def _live(self, start: datetime | None, end: datetime | None) -> dict[str, int]:
+        """Count the base tables directly over a (short) window."""
+
+        def window(column):
+            conditions = []
+            if start is not None:
+                conditions.append(column >= start)
+            if end is not None:
+                conditions.append(column < end)
+            return conditions
+
+        accessed = window(SplashAccess.accessed_at)
+        accesses, granted, registered = (await self.db.execute(
+            select(
+                func.count(SplashAccess.id),
+                func.coalesce(func.sum(case((SplashAccess.access_granted.is_(True), 1), else_=0)), 0),
+                func.coalesce(func.sum(case((SplashAccess.registered.is_(True), 1), else_=0)), 0),
+            ).where(*accessed)
+        )).one()
+
+        # New devices: first seen in this window per splash_devices, plus
+        # devices not rolled up yet whose first access falls in the window
+        earlier = aliased(SplashAccess)
+        unrolled = [
+            *accessed,
+            SplashAccess.client_mac.is_not(None),
+            ~exists().where(SplashDevice.client_mac == SplashAccess.client_mac),
+        ]
+        if start is not None:
+            unrolled.append(~exists().where(
+                earlier.client_mac == SplashAccess.client_mac,
+                earlier.accessed_at < start,
+            ))
+        new_devices = (await self.db.execute(
+            select(func.count(func.distinct(SplashAccess.client_mac))).where(*unrolled)
+        )).scalar_one()
+        new_devices += (await self.db.execute(
+            select(func.count(SplashDevice.client_mac)).where(*window(SplashDevice.first_seen_at))
+        )).scalar_one()
+
+        registrations = (await self.db.execute(
+            select(func.count(Registration.id)).where(*window(Registration.created_at))
+        )).scalar_one()
+
+        return {
+            "splash_accesses": accesses,
+            "splash_granted": granted,
+            "splash_registered": registered,
+            "splash_new_devices": new_devices,
+            "registrations": registrations,
+        }
+
+
+def _conversion_rate(counters: dict[str, int]) -> float:
+    accesses = counters["splash_accesses"]
+    return round(counters["splash_registered"] / accesses * 100, 1) if accesses > 0 else 0
+
+
+# Global instance
+stats_rollup_job = StatsRollupJob()
@@ -13,9 +13,10 @@ import logging
 import re
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.radius_notify import notify_radius_config_changed
 from app.db.models import UdnAssignment, User
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,8 @@ logger = logging.getLogger(__name__)
 # UDN ID constants
 UDN_MIN_ID = 2  # ID 1 is reserved
 UDN_MAX_ID = 16777200
+# Retries when a concurrently assigned UDN ID trips the unique index
+UDN_ALLOCATION_ATTEMPTS = 3
 UDN_VSA_ATTRIBUTE = "Cisco-AVPair"
 UDN_VSA_FORMAT = "udn:private-group-id={udn_id}"
 
@@ -124,9 +127,16 @@ class UdnManager:
         self.db = db
         logger.info("UDN Manager initialized")
 
+    def _allocator(self):
+        from app.core.udn_allocator import UdnAllocator
+        return UdnAllocator(self.db)
+
     def get_next_available_udn_id(self) -> int:
         """
-        Find the next available UDN ID.
+        Find the next available UDN ID (without reserving it).
+
+        Uses the persistent free-range table, so this is an indexed lookup
+        rather than a scan of the whole pool.
 
         Returns:
             Available UDN ID
@@ -134,19 +144,9 @@ class UdnManager:
         Raises:
             UdnPoolExhausted: If no IDs available
         """
-        # Get all assigned IDs
-        stmt = select(UdnAssignment.udn_id).order_by(UdnAssignment.udn_id)
-        assigned_ids = set(self.db.execute(stmt).scalars().all())
-        
-        # Find first available ID
-        for udn_id in range(UDN_MIN_ID, UDN_MAX_ID + 1):
-            if udn_id not in assigned_ids:
-                logger.debug(f"Next available UDN ID: {udn_id}")
-                return udn_id
-        
-        raise UdnPoolExhausted(
-            f"No available UDN IDs (all {UDN_MAX_ID - UDN_MIN_ID + 1} IDs assigned)"
-        )
+        udn_id = self._allocator().peek()
+        logger.debug(f"Next available UDN ID: {udn_id}")
+        return udn_id
 
     def get_udn_pool_status(self) -> dict[str, int | float]:
         """
@@ -229,6 +229,7 @@ class UdnManager:
             if mac_normalized and existing.mac_address != mac_normalized:
                 existing.mac_address = mac_normalized
                 self.db.commit()
+                notify_radius_config_changed("udn_assignments")
                 logger.info(f"Updated MAC address for user {user_id}: {mac_normalized}")
             return existing
         
@@ -247,28 +248,42 @@ class UdnManager:
                 raise UdnError(
                     f"UDN ID {udn_id} already assigned to User {conflict.user_id}"
                 )
-        else:
-            udn_id = self.get_next_available_udn_id()
-        
-        # Create assignment (UDN assigned to USER, not MAC)
-        assignment = UdnAssignment(
-            udn_id=udn_id,
-            user_id=user_id,  # Required - UDN assigned to user
-            mac_address=mac_normalized,  # Optional - for tracking only
-            registration_id=registration_id,
-            ipsk_id=ipsk_id,
-            user_name=user_name,
-            user_email=user_email,
-            unit=unit,
-            network_id=network_id,
-            ssid_number=ssid_number,
-            note=note,
-            is_active=True,
-        )
         
-        self.db.add(assignment)
+        allocator = self._allocator()
+        for attempt in range(1, UDN_ALLOCATION_ATTEMPTS + 1):
+            try:
+                with self.db.begin_nested():
+                    if specific_udn_id is None:
+                        udn_id = allocator.allocate()
+                    else:
+                        allocator.claim(udn_id)
+                    # Create assignment (UDN assigned to USER, not MAC)
+                    assignment = UdnAssignment(
+                        udn_id=udn_id,
+                        user_id=user_id,  # Required - UDN assigned to user
+                        mac_address=mac_normalized,  # Optional - for tracking only
+                        registration_id=registration_id,
+                        ipsk_id=ipsk_id,
+                        user_name=user_name,
+                        user_email=user_email,
+                        unit=unit,
+                        network_id=network_id,
+                        ssid_number=ssid_number,
+                        note=note,
+                        is_active=True,
+                    )
+                    self.db.add(assignment)
+                break
+            except IntegrityError:
+                # Another transaction took the ID between allocation and insert
+                if specific_udn_id is not None or attempt == UDN_ALLOCATION_ATTEMPTS:
+                    self.db.rollback()
+                    raise UdnError(f"UDN ID {udn_id} already assigned")
+                logger.warning(f"⚠️  UDN ID {udn_id} taken concurrently, retrying")
+        
         self.db.commit()
         self.db.refresh(assignment)
+        notify_radius_config_changed("udn_assignments")
         
         mac_str = f"MAC {mac_normalized}" if mac_normalized else "no MAC"
         logger.info(
@@ -278,6 +293,56 @@ class UdnManager:
         
         return assignment
     
+    def bulk_assign_udn_ids(self, users: list[dict]) -> list[UdnAssignment]:
+        """
+        Assign UDN IDs to many users in one transaction (bulk onboarding).
+
+        IDs are taken from the free list in one batch, lowest first, and the
+        RADIUS config is regenerated once at the end.
+
+        Args:
+            users: Dicts with a required 'user_id' and optional
+                assign_udn_id() keyword fields (mac_address, user_name,
+                user_email, unit, network_id, ssid_number, note, ...)
+
+        Returns:
+            Assignments in input order; users that already had an active
+            assignment get their existing one
+
+        Raises:
+            InvalidMacAddress: If a MAC address is invalid
+            UdnPoolExhausted: If fewer IDs are free than users need one
+        """
+        user_ids = [entry["user_id"] for entry in users]
+        existing = {
+            assignment.user_id: assignment
+            for assignment in self.db.query(UdnAssignment).filter(
+                UdnAssignment.user_id.in_(user_ids),
+                UdnAssignment.is_active == True  # noqa: E712
+            )
+        }
+        pending = [entry for entry in users if entry["user_id"] not in existing]
+        if not pending:
+            return [existing[user_id] for user_id in user_ids]
+        
+        try:
+            udn_ids = self._allocator().allocate_many(len(pending))
+            for entry, udn_id in zip(pending, udn_ids):
+                fields = dict(entry)
+                if fields.get("mac_address"):
+                    fields["mac_address"] = normalize_mac_address(fields["mac_address"])
+                assignment = UdnAssignment(udn_id=udn_id, is_active=True, **fields)
+                self.db.add(assignment)
+                existing[entry["user_id"]] = assignment
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        notify_radius_config_changed("udn_assignments")
+        
+        logger.info(f"✅ Bulk assigned {len(pending)} UDN IDs ({udn_ids[0]}-{udn_ids[-1]})")
+        return [existing[user_id] for user_id in user_ids]
+    
     def get_udn_by_user_id(self, user_id: int) -> Optional[UdnAssignment]:
         """Get UDN assignment for a user.
         
@@ -423,6 +488,7 @@ class UdnManager:
         
         assignment.is_active = False
         self.db.commit()
+        notify_radius_config_changed("udn_assignments")
         
         logger.info(f"Revoked UDN ID {assignment.udn_id} for MAC {mac_normalized}")
         return True
@@ -8,10 +8,12 @@ Supports multiple database types:
 Database type is auto-detected from the DATABASE_URL connection string.
 """
 
+import importlib.util
 import logging
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -24,6 +26,17 @@ logger = logging.getLogger(__name__)
 _engine = None
 _SessionLocal = None
 
+# Async engine for ported endpoints; False once we know it's unavailable
+_async_engine = None
+_AsyncSessionLocal = None
+
+# Backend name -> (async drivername, driver module)
+_ASYNC_DRIVERS = {
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+    "mysql": ("mysql+aiomysql", "aiomysql"),
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+}
+
 
 def create_database_engine():
     """Create SQLAlchemy engine with database-specific configuration.
@@ -239,3 +252,190 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def async_database_url(db_url: str) -> str | None:
+    """Map a database URL to its async driver equivalent.
+    
+    postgresql -> postgresql+asyncpg, mysql -> mysql+aiomysql,
+    sqlite -> sqlite+aiosqlite.
+    
+    Parameters
+    ----------
+    db_url : str
+        Sync database URL (DATABASE_URL)
+    
+    Returns
+    -------
+        Async database URL, or None if the driver (or greenlet) is not installed
+    """
+    url = make_url(db_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return None
+    drivername, module = driver
+    if importlib.util.find_spec(module) is None or importlib.util.find_spec("greenlet") is None:
+        return None
+    
+    query = dict(url.query)
+    if drivername == "postgresql+asyncpg" and "sslmode" in query:
+        # asyncpg spells libpq's sslmode as ssl
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername=drivername, query=query).render_as_string(hide_password=False)
+
+
+def create_async_database_engine():
+    """Create the async engine used by ported endpoints, if possible.
+    
+    Returns
+    -------
+        AsyncEngine on the same database as get_engine(), or None when
+        DATABASE_ASYNC is off, the driver is missing, or the database is
+        in-memory SQLite (which a second engine can't see)
+    """
+    settings = get_settings()
+    if not settings.database_async:
+        logger.info("Async database sessions disabled (DATABASE_ASYNC)")
+        return None
+    
+    db_url = settings.database_url
+    url = make_url(db_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return None
+    
+    async_url = async_database_url(db_url)
+    if async_url is None:
+        logger.info("Async database driver not installed - endpoints use sync sessions")
+        return None
+    
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    engine_kwargs = {"echo": False}
+    if url.get_backend_name() != "sqlite":
+        engine_kwargs.update({
+            "pool_pre_ping": True,
+            "pool_size": 10,
+            "max_overflow": 20,
+            "pool_recycle": 3600,
+        })
+    if db_url.startswith("mysql") and "charset" not in db_url:
+        engine_kwargs["connect_args"] = {"charset": "utf8mb4"}
+    
+    try:
+        engine = create_async_engine(async_url, **engine_kwargs)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not create async database engine ({e}) - using sync sessions")
+        return None
+    
+    if url.get_backend_name() == "sqlite":
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_sqlite_pragma(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+    
+    logger.info(f"✅ Async database engine created: {engine.url.drivername}")
+    return engine
+
+
+def get_async_engine():
+    """Get or create the async database engine.
+    
+    Returns
+    -------
+        AsyncEngine (cached after first call), or None if unavailable
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_database_engine() or False
+    return _async_engine or None
+
+
+def get_async_session_local():
+    """Get or create the async session factory.
+    
+    Returns
+    -------
+        async_sessionmaker (cached after first call), or None if there is
+        no async engine
+    """
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        engine = get_async_engine()
+        if engine is None:
+            return None
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=engine,
+            autoflush=False,
+            expire_on_commit=False,  # Responses are built after commit
+        )
+    return _AsyncSessionLocal
+
+
+class SyncSessionAdapter:
+    """AsyncSession-compatible wrapper around a sync Session.
+    
+    Used when no async engine is available so endpoints written against
+    AsyncDbSession still work; queries run inline and block the event
+    loop exactly as they did with DbSession.
+    """
+    
+    def __init__(self, session: Session):
+        self.sync_session = session
+    
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
+    
+    async def execute(self, statement, params=None, **kwargs):
+        return self.sync_session.execute(statement, params, **kwargs)
+    
+    async def scalar(self, statement, params=None, **kwargs):
+        return self.sync_session.scalar(statement, params, **kwargs)
+    
+    async def scalars(self, statement, params=None, **kwargs):
+        return self.sync_session.scalars(statement, params, **kwargs)
+    
+    async def get(self, entity, ident, **kwargs):
+        return self.sync_session.get(entity, ident, **kwargs)
+    
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+    
+    async def commit(self) -> None:
+        self.sync_session.commit()
+    
+    async def rollback(self) -> None:
+        self.sync_session.rollback()
+    
+    async def close(self) -> None:
+        self.sync_session.close()
+
+
+async def get_async_db() -> AsyncGenerator:
+    """Get an async database session.
+
+    Yields:
+        AsyncSession on the async engine, or a SyncSessionAdapter over a
+        regular session when async is unavailable
+    """
+    AsyncSessionLocal = get_async_session_local()
+    if AsyncSessionLocal is None:
+        db = get_session_local()()
+        try:
+            yield SyncSessionAdapter(db)
+        finally:
+            db.close()
+        return
+    
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's pooled connections (call on shutdown)."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine:
+        await _async_engine.dispose()
+    _async_engine = None
+    _AsyncSessionLocal = None
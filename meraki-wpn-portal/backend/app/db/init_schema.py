@@ -400,6 +400,43 @@ def apply_migrations(engine, inspector) -> None:
         # Migration 10: Add new EAP settings to portal_settings
         # Settings will be created on first use via seed_default_settings
         
+        # Migration 11: (created_at, id) index for keyset pagination of users
+        if 'users' in inspector.get_table_names():
+            indexes = {index['name'] for index in inspector.get_indexes('users')}
+            if 'idx_users_created_at_id' not in indexes:
+                logger.info("Creating users (created_at, id) index...")
+                session.execute(text("CREATE INDEX idx_users_created_at_id ON users(created_at, id)"))
+                session.commit()
+                logger.info("idx_users_created_at_id index created")
+        
+        # Migration 12: updated_at on user_certificates for incremental RADIUS sync
+        if 'user_certificates' in inspector.get_table_names():
+            columns = {col['name'] for col in inspector.get_columns('user_certificates')}
+            if 'updated_at' not in columns:
+                logger.info("Adding user_certificates.updated_at...")
+                session.execute(text("ALTER TABLE user_certificates ADD COLUMN updated_at TIMESTAMP"))
+                session.execute(text(
+                    "UPDATE user_certificates SET updated_at = COALESCE(revoked_at, issued_at) "
+                    "WHERE updated_at IS NULL"
+                ))
+                session.commit()
+            indexes = {index['name'] for index in inspector.get_indexes('user_certificates')}
+            if 'idx_user_certificates_updated_at_id' not in indexes:
+                session.execute(text(
+                    "CREATE INDEX idx_user_certificates_updated_at_id ON user_certificates(updated_at, id)"
+                ))
+                session.commit()
+                logger.info("idx_user_certificates_updated_at_id index created")
+        
+        # Migration 13: created_at index on registrations for the stats rollups
+        if 'registrations' in inspector.get_table_names():
+            indexes = {index['name'] for index in inspector.get_indexes('registrations')}
+            if 'idx_registrations_created_at' not in indexes:
+                logger.info("Creating registrations created_at index...")
+                session.execute(text("CREATE INDEX idx_registrations_created_at ON registrations(created_at)"))
+                session.commit()
+                logger.info("idx_registrations_created_at index created")
+        
         logger.info("All migrations completed successfully")
 
 
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -20,6 +20,8 @@ class User(Base):
     """
 
     __tablename__ = "users"
+    # Keyset pagination order for the admin user list (newest first)
+    __table_args__ = (Index("idx_users_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -106,6 +108,8 @@ class Registration(Base):
     """Registration request model for tracking registrations."""
 
     __tablename__ = "registrations"
+    # Range scans for the live tail of the stats rollups
+    __table_args__ = (Index("idx_registrations_created_at", "created_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -225,6 +229,54 @@ class SplashAccess(Base):
         return f"<SplashAccess {self.client_mac} @ {self.accessed_at}>"
 
 
+class SplashDevice(Base):
+    """First time each device (by MAC) reached the splash portal.
+
+    Maintained by the stats rollup job so unique-device counts can be summed
+    across rollup buckets instead of running COUNT(DISTINCT) over splash_access.
+    """
+
+    __tablename__ = "splash_devices"
+
+    client_mac: Mapped[str] = mapped_column(String(50), primary_key=True)
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<SplashDevice {self.client_mac} first seen {self.first_seen_at}>"
+
+
+class StatsRollup(Base):
+    """Hourly and daily activity counters for the admin dashboards.
+
+    Written by the stats rollup job (app.core.stats_rollup) for closed hours;
+    readers add the still-open hour live.
+    """
+
+    __tablename__ = "stats_rollups"
+    __table_args__ = (
+        UniqueConstraint("period", "bucket_start", name="uq_stats_rollups_period_bucket"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    period: Mapped[str] = mapped_column(String(10), nullable=False)  # hour, day
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    splash_accesses: Mapped[int] = mapped_column(Integer, default=0)
+    splash_granted: Mapped[int] = mapped_column(Integer, default=0)
+    splash_registered: Mapped[int] = mapped_column(Integer, default=0)
+    # Devices whose first splash access falls in this bucket
+    splash_new_devices: Mapped[int] = mapped_column(Integer, default=0)
+    registrations: Mapped[int] = mapped_column(Integer, default=0)
+
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    def __repr__(self) -> str:
+        return f"<StatsRollup {self.period} {self.bucket_start}>"
+
+
 class PortalSetting(Base):
     """Portal settings stored in database for dynamic reload without restart."""
 
@@ -353,6 +405,23 @@ class UdnAssignment(Base):
         return f"<UdnAssignment User {self.user_id} ({mac_str}) -> UDN {self.udn_id}>"
 
 
+class UdnFreeRange(Base):
+    """Free UDN ID interval used by the UDN allocator.
+
+    Rows are inclusive, non-overlapping ranges of unassigned UDN IDs keyed by
+    their first ID, so the primary key index finds the lowest free ID (or the
+    range containing a given ID) in O(log n).
+    """
+
+    __tablename__ = "udn_free_ranges"
+
+    start_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    end_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UdnFreeRange {self.start_id}-{self.end_id}>"
+
+
 class RadiusAuthLog(Base):
     """RADIUS authentication attempt logs."""
 
@@ -484,6 +553,44 @@ class IPSKExpirationLog(Base):
         return f"<IPSKExpirationLog {self.ipsk_id} - {self.action} @ {self.performed_at}>"
 
 
+class IPSKMirrorEntry(Base):
+    """Local copy of one Meraki Identity PSK.
+
+    Kept in sync by the IPSK mirror reconciler (app.core.ipsk_mirror) so
+    dashboards and per-user pages don't wait on the Meraki API.
+    """
+
+    __tablename__ = "ipsk_mirror"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    ipsk_id: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    network_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    ssid_number: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    ssid_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default="active", index=True)
+    group_policy_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    group_policy_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Encrypted with the same key as User.ipsk_passphrase_encrypted
+    passphrase_encrypted: Mapped[str | None] = mapped_column(Text, nullable=True)
+    connected_clients: Mapped[int] = mapped_column(Integer, default=0)
+    associated_user: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    associated_unit: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Timestamps as reported by Meraki (ISO 8601 strings)
+    expires_at: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    meraki_created_at: Mapped[str | None] = mapped_column(String(50), nullable=True)
+
+    # Hash of the mirrored fields, so reconciliation only rewrites changed rows
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    synced_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    def __repr__(self) -> str:
+        return f"<IPSKMirrorEntry {self.ipsk_id} ({self.status})>"
+
+
 class WifiQRToken(Base):
     """Shareable QR code tokens for WiFi credentials."""
 
@@ -592,6 +699,8 @@ class UserCertificate(Base):
     """User certificates for EAP-TLS authentication."""
 
     __tablename__ = "user_certificates"
+    # Incremental sync to FreeRADIUS walks certificates by (updated_at, id)
+    __table_args__ = (Index("idx_user_certificates_updated_at_id", "updated_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     
@@ -652,6 +761,11 @@ class UserCertificate(Base):
         default=lambda: datetime.now(timezone.utc),
     )
     downloaded_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
 
     def __repr__(self) -> str:
         return f"<UserCertificate {self.subject_common_name} ({self.status})>"
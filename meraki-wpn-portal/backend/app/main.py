@@ -28,6 +28,10 @@ from app.api import (
 )
 from app.api.deps import DbSession
 from app.config import get_settings, reload_settings
+from app.core.ipsk_mirror import ipsk_mirror
+from app.core.meraki_throttle import shutdown_meraki_executor
+from app.core.stats_rollup import stats_rollup_job
+from app.db.database import dispose_async_engine
 from app.db.init_schema import init_db
 from app.db.models import PortalSetting
 
@@ -54,6 +58,13 @@ def get_client_for_mode(settings):
     
     if settings.is_standalone:
         if settings.meraki_api_key:
+            if settings.meraki_client_backend == "httpx":
+                from app.core.meraki_http_client import MerakiHttpClient
+                logger.info("Running in STANDALONE mode - direct Meraki Dashboard API (httpx)")
+                return MerakiHttpClient(
+                    api_key=settings.meraki_api_key,
+                    base_url=settings.meraki_base_url,
+                )
             from app.core.meraki_client import MerakiDashboardClient
             logger.info("Running in STANDALONE mode - direct Meraki Dashboard API")
             return MerakiDashboardClient(api_key=settings.meraki_api_key)
@@ -90,6 +101,7 @@ async def reinitialize_client(app: FastAPI):
     try:
         await app.state.ha_client.connect()
         logger.info("✅ Client reinitialized with updated settings")
+        ipsk_mirror.request_full_sync()
     except Exception as e:
         logger.error(f"❌ Failed to reinitialize client: {e}")
 
@@ -148,6 +160,12 @@ async def lifespan(app: FastAPI):
     from app.core.ipsk_monitor import ipsk_monitor
     await ipsk_monitor.start()
 
+    # Start the local IPSK mirror (full sync runs in the background)
+    await ipsk_mirror.start(lambda: app.state.ha_client)
+
+    # Start statistics rollup compaction
+    await stats_rollup_job.start()
+
     yield
 
     # Shutdown
@@ -155,10 +173,16 @@ async def lifespan(app: FastAPI):
     
     # Stop iPSK monitor
     await ipsk_monitor.stop()
+    await ipsk_mirror.stop()
+    await stats_rollup_job.stop()
     
     # Disconnect client
     if hasattr(app.state, "ha_client") and app.state.ha_client:
         await app.state.ha_client.disconnect()
+    shutdown_meraki_executor()
+    
+    # Close async database connections
+    await dispose_async_engine()
 
 
 # Create FastAPI application
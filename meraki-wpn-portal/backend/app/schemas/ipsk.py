@@ -92,6 +92,15 @@ class IPSKRevealResponse(BaseModel):
     wifi_config_string: str | None = Field(None, description="WiFi config string")
 
 
+class DataFreshness(BaseModel):
+    """How current IPSK data served from the local mirror is."""
+
+    source: str = Field(..., description="Where the data came from (mirror, live)")
+    synced_at: datetime | None = Field(None, description="Last successful sync with Meraki")
+    age_seconds: int | None = Field(None, description="Seconds since the last sync")
+    stale: bool = Field(False, description="Older than the configured staleness threshold")
+
+
 class IPSKStatsResponse(BaseModel):
     """Schema for IPSK statistics."""
 
@@ -101,3 +110,4 @@ class IPSKStatsResponse(BaseModel):
     revoked_ipsks: int = Field(..., description="Number of revoked IPSKs")
     online_devices: int = Field(..., description="Number of devices currently online")
     registrations_today: int = Field(0, description="Number of registrations today")
+    freshness: DataFreshness | None = Field(None, description="Freshness of the IPSK counts")
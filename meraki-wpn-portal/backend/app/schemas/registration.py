@@ -2,6 +2,8 @@
 
 from pydantic import BaseModel, EmailStr, Field
 
+from app.schemas.ipsk import DataFreshness
+
 
 class RegistrationRequest(BaseModel):
     """Public registration request schema."""
@@ -102,6 +104,7 @@ class MyNetworkResponse(BaseModel):
     status: str = Field(..., description="IPSK status")
     connected_devices: int = Field(0, description="Number of connected devices")
     qr_code: str | None = Field(None, description="Base64 encoded QR code image")
+    freshness: DataFreshness | None = Field(None, description="Freshness of the IPSK status")
 
     class Config:
         json_schema_extra = {
@@ -15,7 +15,7 @@ os.environ["HA_URL"] = "http://test-ha:8123"
 os.environ["HA_TOKEN"] = "test-token"
 os.environ["APP_SIGNING_KEY"] = "test-secret-key-for-testing-only"
 
-from app.db.database import get_db
+from app.db.database import SyncSessionAdapter, get_async_db, get_db
 from app.db.models import Base
 from app.main import app
 
@@ -53,7 +53,11 @@ def client(db: Session) -> Generator[TestClient, None, None]:
         finally:
             pass
 
+    async def override_get_async_db():
+        yield SyncSessionAdapter(db)
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     # Mock the HA client
     mock_ha_client = AsyncMock()
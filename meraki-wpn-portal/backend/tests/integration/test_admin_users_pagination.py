@@ -0,0 +1,72 @@
+"""Integration tests for keyset pagination of the admin user list."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.models import User
+
+HEADERS = {"Authorization": "Bearer test-token"}
+
+
+@pytest.fixture
+def users(db):
+    """Seven users; three share one created_at so the id breaks the tie."""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    created = [base, base + timedelta(minutes=1)] + [base + timedelta(minutes=2)] * 3 + [
+        base + timedelta(minutes=3),
+        base + timedelta(minutes=4),
+    ]
+    rows = [
+        User(name=f"User {i}", email=f"user{i}@example.com", created_at=created_at)
+        for i, created_at in enumerate(created)
+    ]
+    db.add_all(rows)
+    db.commit()
+    # Newest first, highest id first among equal timestamps
+    return [user.id for user in sorted(rows, key=lambda u: (u.created_at, u.id), reverse=True)]
+
+
+def page_through(client: TestClient, limit: int) -> list[int]:
+    """Follow next_cursor until the last page and return the user ids seen."""
+    seen: list[int] = []
+    cursor = None
+    for _ in range(20):
+        params = {"limit": limit, "include_total": False}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/admin/users", params=params, headers=HEADERS)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(user["id"] for user in data["users"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return seen
+    pytest.fail("cursor pagination did not terminate")
+
+
+@pytest.mark.integration
+class TestUserListCursor:
+    """Test paging through users with the keyset cursor."""
+
+    @pytest.mark.parametrize("limit", [1, 2, 3, 7])
+    def test_pages_have_no_duplicates_or_gaps(self, client, users, limit):
+        """Every user appears exactly once, in order, even across tied timestamps."""
+        assert page_through(client, limit) == users
+
+    def test_first_page_reports_total(self, client, users):
+        """The first page carries the total and a cursor for the next one."""
+        data = client.get("/api/admin/users", params={"limit": 3}, headers=HEADERS).json()
+
+        assert data["total"] == 7
+        assert [user["id"] for user in data["users"]] == users[:3]
+        assert data["next_cursor"]
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "WzEsMl0", "WyJub3QtYS1kYXRlIiwxXQ"])
+    def test_invalid_cursor_is_rejected(self, client, users, cursor):
+        """Malformed cursors return 400 instead of a server error."""
+        response = client.get("/api/admin/users", params={"cursor": cursor}, headers=HEADERS)
+
+        assert response.status_code == 400
+        assert "Invalid pagination cursor" in response.json()["detail"]
@@ -0,0 +1,67 @@
+"""Integration tests for admin endpoints on the real async session path."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import database
+from app.db.database import dispose_async_engine, get_async_db, get_async_engine
+from app.db.models import Base, SplashAccess, User
+from app.main import app
+
+HEADERS = {"Authorization": "Bearer test-token"}
+
+
+@pytest.fixture
+def async_db_url(tmp_path, monkeypatch):
+    """Point get_async_db at an aiosqlite engine on a seeded file database."""
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("greenlet")
+    db_url = f"sqlite:///{tmp_path / 'async.db'}"
+
+    engine = create_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all(
+            User(name=f"User {i}", email=f"user{i}@example.com", created_at=base + timedelta(minutes=i))
+            for i in range(3)
+        )
+        session.add_all([
+            SplashAccess(client_mac="aa:00", accessed_at=base),
+            SplashAccess(client_mac="aa:00", accessed_at=base, registered=True),
+            SplashAccess(client_mac="aa:01", accessed_at=base),
+        ])
+        session.commit()
+    engine.dispose()
+
+    monkeypatch.setattr(
+        database, "get_settings", lambda: SimpleNamespace(database_url=db_url, database_async=True)
+    )
+    monkeypatch.setattr(database, "_async_engine", None)
+    monkeypatch.setattr(database, "_AsyncSessionLocal", None)
+    yield db_url
+    asyncio.run(dispose_async_engine())
+
+
+@pytest.mark.integration
+class TestAsyncSessionPath:
+    """Test endpoints through get_async_db instead of the sync adapter."""
+
+    def test_admin_endpoints_on_aiosqlite(self, client, async_db_url):
+        """User list and splash stats query through a real AsyncSession."""
+        # The client fixture swaps in SyncSessionAdapter; use the real dependency
+        app.dependency_overrides.pop(get_async_db)
+
+        users = client.get("/api/admin/users", params={"limit": 2}, headers=HEADERS).json()
+        stats = client.get("/api/admin/splash-logs/stats", headers=HEADERS).json()["stats"]
+
+        assert get_async_engine().url.drivername == "sqlite+aiosqlite"
+        assert users["total"] == 3
+        assert [user["name"] for user in users["users"]] == ["User 2", "User 1"]
+        assert users["next_cursor"]
+        assert (stats["total_accesses"], stats["unique_devices"], stats["registered"]) == (3, 2, 1)
@@ -0,0 +1,97 @@
+"""
+Benchmark the httpx Meraki client against the SDK client.
+
+Both clients read from the local Dashboard stub (MockMerakiDashboardClient
+served over HTTP with simulated latency), with caching and rate limiting
+out of the way so only the transport is measured.
+
+Run with: pytest tests/performance -m performance -s
+"""
+
+import asyncio
+import statistics
+import time
+
+import meraki
+import pytest
+
+from app.core.meraki_client import MerakiDashboardClient
+from app.core.meraki_http_client import MerakiHttpClient
+from app.core.meraki_throttle import TokenBucket, shutdown_meraki_executor
+from tests.utils.meraki_stub import create_meraki_stub, serve_meraki_stub
+
+pytestmark = [
+    pytest.mark.performance,
+    pytest.mark.slow,
+]
+
+CONCURRENCY = 50
+ROUNDS = 5
+LATENCY = 0.05
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    """Dashboard stub with 50 ms simulated latency."""
+    with serve_meraki_stub(create_meraki_stub(latency=LATENCY)) as url:
+        yield url
+
+
+def _unthrottled(client):
+    client._cache = None
+    client._limiter = TokenBucket(rate=1_000_000, burst=1_000_000)
+    return client
+
+
+async def sdk_client(url):
+    client = _unthrottled(MerakiDashboardClient("key"))
+    client._dashboard = meraki.DashboardAPI(
+        api_key="key",
+        base_url=url,
+        print_console=False,
+        output_log=False,
+        suppress_logging=True,
+    )
+    client._connected = True
+    return client
+
+
+async def http_client(url):
+    client = _unthrottled(MerakiHttpClient("key", base_url=url))
+    await client.connect()
+    return client
+
+
+async def measure(client) -> list[float]:
+    """Time rounds of concurrent, distinct network reads (no coalescing)."""
+    durations = []
+    for round_number in range(ROUNDS):
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            client.get_network(f"N_{round_number}_{i}") for i in range(CONCURRENCY)
+        ))
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+@pytest.mark.performance
+class TestMerakiTransportBenchmark:
+    """Compare SDK threads with the native async client."""
+
+    async def test_concurrent_reads(self, stub_url):
+        """The async client handles a burst of reads without waiting on threads."""
+        results = {}
+        for name, factory in (("sdk", sdk_client), ("httpx", http_client)):
+            client = await factory(stub_url)
+            try:
+                results[name] = statistics.median(await measure(client))
+            finally:
+                await client.disconnect()
+        shutdown_meraki_executor()
+
+        for name, seconds in results.items():
+            print(f"\n{name}: {CONCURRENCY} concurrent reads in {seconds * 1000:.0f}ms "
+                  f"({CONCURRENCY / seconds:.0f} req/s)")
+
+        # The SDK path is bounded by its thread pool; the async client is not
+        assert results["httpx"] < results["sdk"]
@@ -0,0 +1,149 @@
+"""Tests for the local IPSK mirror."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import ipsk_mirror as mirror_module
+from app.core import security
+from app.core.ipsk_mirror import IPSKMirror
+from app.db.database import SyncSessionAdapter
+from app.db.models import Base, IPSKMirrorEntry
+
+
+def meraki_ipsk(ipsk_id, name, status="active", **extra):
+    """IPSK as returned by the client's list_ipsks."""
+    return {
+        "id": ipsk_id,
+        "name": name,
+        "status": status,
+        "network_id": "N_1",
+        "ssid_number": 1,
+        "group_policy_id": "101",
+        "passphrase": f"pass-{ipsk_id}",
+        **extra,
+    }
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """Mirror backed by its own SQLite database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'mirror.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(mirror_module, "get_session_local", lambda: factory)
+    monkeypatch.setattr(security, "_cipher", Fernet(Fernet.generate_key()))
+    return factory
+
+
+@pytest.fixture
+def client():
+    """Client whose IPSK listing can be changed between syncs."""
+    fake = AsyncMock()
+    fake.list_ipsks.return_value = [
+        meraki_ipsk("1", "unit-101"),
+        meraki_ipsk("2", "unit-102", connected_clients=2),
+        meraki_ipsk("3", "unit-103", status="expired"),
+    ]
+    return fake
+
+
+@pytest.fixture
+def mirror(client, session_factory):
+    """Mirror wired to the fake client."""
+    ipsk_mirror = IPSKMirror()
+    ipsk_mirror._get_client = lambda: client
+    return ipsk_mirror
+
+
+@pytest.mark.unit
+class TestReconcile:
+    """Test full syncs and delta reconciliation."""
+
+    async def test_delta_only_touches_changed_rows(self, mirror, client):
+        """After the full sync, a reconcile reports just the differences."""
+        assert await mirror.reconcile(full=True) == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0}
+        assert await mirror.reconcile() == {"added": 0, "updated": 0, "removed": 0, "unchanged": 3}
+
+        client.list_ipsks.return_value = [
+            meraki_ipsk("1", "unit-101-renamed"),
+            meraki_ipsk("2", "unit-102", connected_clients=2),
+            meraki_ipsk("4", "unit-104"),
+        ]
+        assert await mirror.reconcile() == {"added": 1, "updated": 1, "removed": 1, "unchanged": 1}
+
+    async def test_keeps_fields_meraki_does_not_list(self, mirror, client, session_factory):
+        """Write-through details survive a reconcile whose listing lacks them."""
+        await mirror.reconcile(full=True)
+        await mirror.record({"id": "1", "ssid_name": "Resident-WiFi", "associated_unit": "101"})
+        client.list_ipsks.return_value[0].pop("passphrase")
+
+        await mirror.reconcile()
+
+        with session_factory() as db:
+            ipsk = mirror.get(db, "1")
+        assert (ipsk["ssid_name"], ipsk["associated_unit"], ipsk["passphrase"]) == (
+            "Resident-WiFi", "101", "pass-1"
+        )
+
+    async def test_meraki_outage_keeps_last_state(self, mirror, client, session_factory):
+        """A failed sync leaves the mirror serving and marks Meraki offline."""
+        await mirror.reconcile(full=True)
+        client.list_ipsks.side_effect = RuntimeError("Meraki unavailable")
+        mirror.synced_at = datetime.now(timezone.utc) - timedelta(hours=1)
+
+        assert await mirror.reconcile() is None
+
+        with session_factory() as db:
+            assert mirror.get(db, "2")["connected_clients"] == 2
+        assert mirror.meraki_status() == {"status": "offline", "error": "Meraki unavailable"}
+        assert mirror.freshness()["stale"] is True
+
+
+@pytest.mark.unit
+class TestReads:
+    """Test serving reads from the mirror."""
+
+    async def test_stats(self, mirror, session_factory):
+        """Dashboard counts come from one grouped query."""
+        await mirror.reconcile(full=True)
+
+        with session_factory() as db:
+            counts = await mirror.stats(SyncSessionAdapter(db))
+
+        assert counts == {"total": 3, "active": 2, "expired": 1, "revoked": 0, "online": 1}
+
+    async def test_lookup_prefers_mirror(self, mirror, session_factory):
+        """Mirrored IPSKs are served without calling the client."""
+        await mirror.reconcile(full=True)
+        live_client = AsyncMock()
+
+        with session_factory() as db:
+            ipsk, freshness = await mirror.lookup(db, live_client, "1")
+
+        assert ipsk["passphrase"] == "pass-1"
+        assert freshness["source"] == "mirror" and freshness["stale"] is False
+        live_client.get_ipsk.assert_not_called()
+
+    async def test_lookup_miss_is_fetched_and_written_through(self, mirror, session_factory):
+        """An IPSK created elsewhere is fetched live once, then mirrored."""
+        await mirror.reconcile(full=True)
+        live_client = AsyncMock()
+        live_client.get_ipsk.return_value = meraki_ipsk("9", "unit-109")
+
+        with session_factory() as db:
+            _, freshness = await mirror.lookup(db, live_client, "9")
+            assert freshness["source"] == "live"
+            assert mirror.get(db, "9")["name"] == "unit-109"
+
+    async def test_forget_removes_entry(self, mirror, session_factory):
+        """Deleting through the portal removes the mirrored row."""
+        await mirror.reconcile(full=True)
+        await mirror.forget("1")
+
+        with session_factory() as db:
+            assert db.query(IPSKMirrorEntry).count() == 2
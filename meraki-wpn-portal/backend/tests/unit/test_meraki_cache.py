@@ -0,0 +1,176 @@
+"""Tests for the Meraki Dashboard response cache."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.config import Settings
+from app.core import meraki_cache
+from app.core.meraki_cache import ResponseCache, SqliteCacheStore
+from app.core.meraki_client import MerakiDashboardClient
+
+
+class Clock:
+    """Controllable replacement for time.time()."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the cache's clock."""
+    fake = Clock()
+    monkeypatch.setattr(meraki_cache.time, "time", fake)
+    return fake
+
+
+def counting_fetch(values):
+    """Fetch function returning successive values and counting calls."""
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return values[min(len(calls), len(values)) - 1]
+
+    return fetch, calls
+
+
+@pytest.fixture
+def client():
+    """Meraki client with a fake SDK and an in-memory cache."""
+    dashboard = SimpleNamespace(
+        wireless=MagicMock(),
+        networks=MagicMock(),
+        organizations=MagicMock(),
+    )
+    dashboard.wireless.getNetworkWirelessSsidIdentityPsks.return_value = [
+        {"id": "1", "name": "unit-101", "groupPolicyId": "101"},
+    ]
+    dashboard.networks.getNetworkGroupPolicies.return_value = [
+        {"groupPolicyId": "101", "name": "Residents"},
+    ]
+    dashboard.wireless.createNetworkWirelessSsidIdentityPsk.return_value = {"id": "2"}
+    dashboard.wireless.getNetworkWirelessSsid.return_value = {"name": "Resident"}
+
+    meraki_client = MerakiDashboardClient("key", cache=ResponseCache())
+    meraki_client._dashboard = dashboard
+    meraki_client._connected = True
+    return meraki_client
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test TTLs, stale-while-revalidate and invalidation."""
+
+    async def test_fresh_values_are_reused(self, clock):
+        """Within the TTL only the first call fetches."""
+        cache = ResponseCache(ttls={"get_networks": 60})
+        fetch, calls = counting_fetch([["net-1"]])
+
+        for _ in range(3):
+            assert await cache.get_or_fetch("get_networks", ("org",), {}, fetch) == ["net-1"]
+
+        assert len(calls) == 1
+        assert cache.stats["hits"] == 2
+
+    async def test_stale_value_served_while_refreshing(self, clock):
+        """Past the TTL the old value returns at once and one refresh runs."""
+        cache = ResponseCache(ttls={"get_networks": 60}, stale_seconds=300)
+        fetch, calls = counting_fetch([["old"], ["new"]])
+        await cache.get_or_fetch("get_networks", (), {}, fetch)
+
+        clock.now += 120
+        assert await cache.get_or_fetch("get_networks", (), {}, fetch) == ["old"]
+        assert await cache.get_or_fetch("get_networks", (), {}, fetch) == ["old"]
+        await asyncio.sleep(0)
+
+        assert len(calls) == 2
+        assert await cache.get_or_fetch("get_networks", (), {}, fetch) == ["new"]
+
+    async def test_expired_value_is_refetched(self, clock):
+        """Past TTL plus the stale window the caller waits for a fresh fetch."""
+        cache = ResponseCache(ttls={"get_networks": 60}, stale_seconds=30)
+        fetch, calls = counting_fetch([["old"], ["new"]])
+        await cache.get_or_fetch("get_networks", (), {}, fetch)
+
+        clock.now += 100
+        assert await cache.get_or_fetch("get_networks", (), {}, fetch) == ["new"]
+        assert len(calls) == 2
+
+    async def test_invalidation_beats_in_flight_refresh(self, clock):
+        """A refresh that started before an invalidation doesn't repopulate the cache."""
+        cache = ResponseCache(ttls={"list": 60})
+        release = asyncio.Event()
+
+        async def slow_fetch():
+            await release.wait()
+            return ["before-write"]
+
+        task = asyncio.create_task(cache.get_or_fetch("list", (), {}, slow_fetch))
+        await asyncio.sleep(0)
+        cache.invalidate("list")
+        release.set()
+        await task
+
+        fetch, calls = counting_fetch([["after-write"]])
+        assert await cache.get_or_fetch("list", (), {}, fetch) == ["after-write"]
+
+    async def test_callers_get_copies(self, clock):
+        """Mutating a returned value doesn't change the cached one."""
+        cache = ResponseCache(ttls={"get_ssids": 60})
+        fetch, _ = counting_fetch([[{"name": "Resident"}]])
+        (await cache.get_or_fetch("get_ssids", (), {}, fetch))[0]["name"] = "changed"
+        assert (await cache.get_or_fetch("get_ssids", (), {}, fetch))[0]["name"] == "Resident"
+
+    async def test_sqlite_persistence(self, clock, tmp_path):
+        """A new cache on the same file starts warm; other scopes don't see it."""
+        path = str(tmp_path / "meraki-cache.db")
+        first = ResponseCache(ttls={"get_networks": 60}, persistent=SqliteCacheStore(path), scope="a")
+        fetch, calls = counting_fetch([["net-1"]])
+        await first.get_or_fetch("get_networks", ("org",), {}, fetch)
+        await first.close()
+
+        second = ResponseCache(ttls={"get_networks": 60}, persistent=SqliteCacheStore(path), scope="a")
+        assert await second.get_or_fetch("get_networks", ("org",), {}, fetch) == ["net-1"]
+        other = ResponseCache(ttls={"get_networks": 60}, persistent=SqliteCacheStore(path), scope="b")
+        await other.get_or_fetch("get_networks", ("org",), {}, fetch)
+
+        assert len(calls) == 2
+
+
+@pytest.mark.unit
+class TestMerakiClientCaching:
+    """Test caching on the Meraki Dashboard client."""
+
+    async def test_list_ipsks_hits_api_once(self, client):
+        """Repeated listings reuse IPSKs and group policies; status filters share the entry."""
+        for status in (None, "active", None):
+            ipsks = await client.list_ipsks(network_id="N_1", ssid_number=1, status=status)
+            assert ipsks[0]["group_policy_name"] == "Residents"
+
+        assert client._dashboard.wireless.getNetworkWirelessSsidIdentityPsks.call_count == 1
+        assert client._dashboard.networks.getNetworkGroupPolicies.call_count == 1
+
+    async def test_writes_invalidate_ipsk_listing(self, client):
+        """Creating an IPSK makes the next listing go back to the API."""
+        await client.list_ipsks(network_id="N_1", ssid_number=1)
+        await client.create_ipsk("unit-102", "N_1", 1, passphrase="secret-passphrase")
+        await client.list_ipsks(network_id="N_1", ssid_number=1)
+
+        assert client._dashboard.wireless.getNetworkWirelessSsidIdentityPsks.call_count == 2
+        # Group policies weren't touched by the write
+        assert client._dashboard.networks.getNetworkGroupPolicies.call_count == 1
+
+    async def test_cache_disabled(self, monkeypatch):
+        """With caching off the client calls the API directly."""
+        monkeypatch.setattr(
+            "app.core.meraki_client.get_settings",
+            lambda: Settings(meraki_cache_enabled=False),
+        )
+        assert MerakiDashboardClient("key")._cache is None
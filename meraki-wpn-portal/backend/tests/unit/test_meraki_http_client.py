@@ -0,0 +1,126 @@
+"""Tests for the native async (httpx) Meraki Dashboard client."""
+
+import httpx
+import pytest
+
+from app.config import Settings
+from app.core import meraki_http_client, meraki_throttle
+from app.core.meraki_client import MerakiClientError
+from app.core.meraki_http_client import MerakiHttpClient
+from app.main import get_client_for_mode
+from tests.utils.meraki_stub import create_meraki_stub
+
+
+@pytest.fixture
+def stub():
+    """Dashboard stub with small pages so pagination is exercised."""
+    return create_meraki_stub(page_size=2)
+
+
+@pytest.fixture
+async def client(stub, monkeypatch):
+    """HTTP client wired to the stub in-process, with caching off."""
+    monkeypatch.setattr(meraki_throttle, "_buckets", {})
+    monkeypatch.setattr(meraki_http_client, "MAX_BACKOFF_SECONDS", 0.01)
+    http_client = MerakiHttpClient("key", base_url="http://stub", transport=httpx.ASGITransport(app=stub))
+    http_client._cache = None
+    await http_client.connect()
+    yield http_client
+    await http_client.disconnect()
+
+
+async def seed_ipsks(stub, count):
+    for i in range(count):
+        await stub.state.mock.create_ipsk(f"unit-{i}", "N_1", 1, group_policy_id="101")
+
+
+@pytest.mark.unit
+class TestMerakiHttpClient:
+    """Test pagination, retries and error mapping over the stub."""
+
+    async def test_list_ipsks_follows_link_pages(self, client, stub):
+        """Listing collects every page and keeps the inherited normalization."""
+        await seed_ipsks(stub, 5)
+
+        ipsks = await client.list_ipsks(network_id="N_1", ssid_number=1)
+
+        assert sorted(ipsk["name"] for ipsk in ipsks) == [f"unit-{i}" for i in range(5)]
+        assert all(ipsk["status"] == "active" and ipsk["group_policy_id"] == "101" for ipsk in ipsks)
+
+    async def test_iter_ipsks_streams_pages(self, client, stub):
+        """The streaming generator requests one page at a time."""
+        await seed_ipsks(stub, 5)
+        stub.state.requests = 0
+
+        names = [ipsk["name"] async for ipsk in client.iter_ipsks("N_1", 1)]
+
+        assert len(names) == 5
+        assert stub.state.requests == 3
+
+    async def test_retries_after_429(self, client, stub):
+        """A 429 is retried after Retry-After instead of failing the call."""
+        stub.state.fail_next = [(429, "0"), (503, None)]
+
+        ssids = await client.get_ssids("N_1")
+
+        assert ssids
+        assert stub.state.requests == 3
+
+    async def test_post_retries_only_429(self, client, stub):
+        """A POST is retried after a 429, but a 503 may have been applied and fails."""
+        stub.state.fail_next = [(429, "0")]
+        created = await client.create_ipsk("unit-1", "N_1", 1, passphrase="secret-passphrase")
+        assert stub.state.mock._ipsks[created["id"]]["name"] == "unit-1"
+
+        stub.state.requests = 0
+        stub.state.fail_next = [(503, None)]
+        with pytest.raises(MerakiClientError, match="503"):
+            await client.create_ipsk("unit-2", "N_1", 1, passphrase="secret-passphrase")
+        assert stub.state.requests == 1
+
+    async def test_transport_errors_retried_only_when_idempotent(self, client, monkeypatch):
+        """Connection failures are retried for GET but not for POST."""
+        calls = []
+
+        async def request(method, url, **kwargs):
+            calls.append(method)
+            raise httpx.ConnectError("Connection refused")
+
+        monkeypatch.setattr(client._http, "request", request)
+        with pytest.raises(MerakiClientError, match="Connection refused"):
+            await client.get_network("N_1")
+        assert len(calls) == meraki_http_client.MAX_RETRIES + 1
+
+        calls.clear()
+        with pytest.raises(MerakiClientError, match="Connection refused"):
+            await client.create_ipsk("unit-1", "N_1", 1, passphrase="secret-passphrase")
+        assert calls == ["POST"]
+
+    async def test_errors_map_to_client_error(self, client, stub):
+        """Non-retryable errors raise MerakiClientError with Meraki's message."""
+        stub.state.fail_next = [(400, None)]
+        with pytest.raises(MerakiClientError, match="400 Stub failure"):
+            await client.get_network("N_1")
+
+    async def test_create_and_delete_round_trip(self, client, stub):
+        """Writes send JSON bodies and 204 responses decode to None."""
+        created = await client.create_ipsk("unit-9", "N_1", 1, passphrase="secret-passphrase")
+        assert stub.state.mock._ipsks[created["id"]]["name"] == "unit-9"
+
+        await client.delete_ipsk(created["id"], network_id="N_1", ssid_number=1)
+        assert stub.state.mock._ipsks == {}
+
+
+@pytest.mark.unit
+class TestClientSelection:
+    """Test choosing the Dashboard transport."""
+
+    def test_httpx_backend_selected(self):
+        """Standalone mode returns the httpx client when configured."""
+        settings = Settings(run_mode="standalone", meraki_api_key="key", meraki_client_backend="httpx")
+        assert isinstance(get_client_for_mode(settings), MerakiHttpClient)
+
+    def test_sdk_backend_by_default(self):
+        """The SDK client stays the default."""
+        settings = Settings(run_mode="standalone", meraki_api_key="key")
+        assert not isinstance(get_client_for_mode(settings), MerakiHttpClient)
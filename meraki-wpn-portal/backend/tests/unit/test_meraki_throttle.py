@@ -0,0 +1,143 @@
+"""Tests for the Meraki SDK executor, rate limiter and request coalescing."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core import meraki_throttle
+from app.core.meraki_client import MerakiDashboardClient
+from app.core.meraki_throttle import MerakiExecutor, SingleFlight, TokenBucket
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test up-front pacing."""
+
+    def test_burst_then_paced(self):
+        """The bucket allows a burst, then spaces calls at the configured rate."""
+        bucket = TokenBucket(rate=10, burst=3)
+        delays = [bucket.reserve() for _ in range(5)]
+
+        assert delays[:3] == [0.0, 0.0, 0.0]
+        assert delays[3] == pytest.approx(0.1, abs=0.01)
+        assert delays[4] == pytest.approx(0.2, abs=0.01)
+        assert bucket.stats()["throttled"] == 2
+
+    async def test_acquire_waits(self):
+        """Acquiring past the burst sleeps off the debt."""
+        bucket = TokenBucket(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        assert time.monotonic() - start >= 0.035
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Test coalescing of identical concurrent calls."""
+
+    async def test_concurrent_calls_share_one_fetch(self):
+        """Ten identical calls fetch once and each get a private copy."""
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return [{"name": "net"}]
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(10)))
+
+        assert len(calls) == 1
+        assert flight.shared == 9
+        results[0][0]["name"] = "changed"
+        assert all(result == [{"name": "net"}] for result in results[1:])
+
+    async def test_errors_reach_every_caller(self):
+        """A failed call raises in every waiter and isn't remembered."""
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flight._inflight == {}
+
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        """A caller that goes away leaves the shared fetch running."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return {"name": "net"}
+
+        leader = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == {"name": "net"}
+        assert leader.cancelled()
+        assert flight._inflight == {}
+
+
+@pytest.mark.unit
+class TestMerakiExecutor:
+    """Test the dedicated SDK thread pool."""
+
+    async def test_queue_depth_metrics(self):
+        """Calls beyond the pool size queue up and are counted."""
+        executor = MerakiExecutor(max_workers=2)
+        release = threading.Event()
+        try:
+            tasks = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            stats = executor.stats()
+            assert (stats["active"], stats["queued"]) == (2, 3)
+
+            release.set()
+            await asyncio.gather(*tasks)
+            stats = executor.stats()
+            assert (stats["completed"], stats["max_queue_depth"]) == (5, 3)
+        finally:
+            release.set()
+            executor.shutdown()
+
+
+@pytest.mark.unit
+class TestMerakiClientThrottling:
+    """Test the client's use of the executor, limiter and coalescing."""
+
+    async def test_identical_reads_coalesce(self, monkeypatch):
+        """Concurrent dashboard loads share one SDK call."""
+        monkeypatch.setattr(meraki_throttle, "_buckets", {})
+        sdk_calls = []
+
+        def get_ssids(network_id):
+            sdk_calls.append(network_id)
+            time.sleep(0.02)
+            return [{"number": 0, "name": "Resident"}]
+
+        client = MerakiDashboardClient("key")
+        client._cache = None
+        client._dashboard = SimpleNamespace(wireless=MagicMock(getNetworkWirelessSsids=get_ssids))
+
+        results = await asyncio.gather(*(client.get_ssids("N_1") for _ in range(10)))
+
+        assert sdk_calls == ["N_1"]
+        assert all(result[0]["name"] == "Resident" for result in results)
+        stats = meraki_throttle.get_throttle_stats()
+        assert list(stats["rate_limiters"].values())[0]["acquired"] == 1
+        assert stats["executor"]["completed"] >= 1
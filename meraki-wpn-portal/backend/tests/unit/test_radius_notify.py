@@ -0,0 +1,155 @@
+"""Tests for waking the FreeRADIUS config watcher after portal writes."""
+
+import logging
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import radius_notify
+from app.core.radius_notify import notify_radius_config_changed
+from app.core.udn_manager import UdnManager
+from app.db.models import Base, UdnAssignment
+
+NOTIFY_URL = "http://radius:8000/api/config/notify"
+
+
+@pytest.fixture
+def notify_settings(monkeypatch):
+    """Portal on SQLite with a FreeRADIUS API configured."""
+    settings = SimpleNamespace(
+        database_url="sqlite:///./portal.db",
+        radius_api_url="http://radius:8000",
+        radius_api_token="radius-token",
+    )
+    monkeypatch.setattr(radius_notify, "get_settings", lambda: settings)
+    return settings
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """File database, so a second session can see what was committed."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'portal.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def record_posts(monkeypatch, respond):
+    """Replace httpx.post; ``respond(url, json)`` returns a response or raises."""
+    posts = []
+
+    def fake_post(url, json=None, headers=None, timeout=None):
+        posts.append((url, json, headers))
+        return respond(url, json)
+
+    monkeypatch.setattr(radius_notify.httpx, "post", fake_post)
+    return posts
+
+
+def ok(url, json):
+    return httpx.Response(200, json={"accepted": True}, request=httpx.Request("POST", url))
+
+
+def unreachable(url, json):
+    raise httpx.ConnectError("Connection refused")
+
+
+def server_error(url, json):
+    return httpx.Response(500, request=httpx.Request("POST", url))
+
+
+@pytest.mark.unit
+class TestNotifyTarget:
+    """Test when a notification is sent at all."""
+
+    def test_postgres_relies_on_triggers(self, notify_settings, monkeypatch):
+        """PostgreSQL triggers NOTIFY themselves, so nothing is posted."""
+        notify_settings.database_url = "postgresql://u:p@db/portal"
+        posts = record_posts(monkeypatch, ok)
+
+        notify_radius_config_changed("radius_clients")
+
+        assert posts == []
+
+    def test_posts_tables_with_token(self, notify_settings, monkeypatch):
+        """The notify call names the changed tables and authenticates."""
+        posts = record_posts(monkeypatch, ok)
+
+        notify_radius_config_changed("udn_assignments", "radius_clients")
+
+        assert posts == [(
+            NOTIFY_URL,
+            {"tables": ["udn_assignments", "radius_clients"]},
+            {"Authorization": "Bearer radius-token"},
+        )]
+
+
+@pytest.mark.unit
+class TestNotifyOnCommit:
+    """Test notifications sent by portal writes."""
+
+    def test_notified_once_after_commit(self, notify_settings, session_factory, monkeypatch):
+        """One notification per change, sent once the row is visible to RADIUS."""
+        visible = []
+
+        def respond(url, json):
+            with session_factory() as other:
+                visible.append(other.query(UdnAssignment).count())
+            return ok(url, json)
+
+        posts = record_posts(monkeypatch, respond)
+
+        with session_factory() as db:
+            manager = UdnManager(db)
+            manager.assign_udn_id(user_id=1, mac_address="aa:bb:cc:dd:ee:01")
+            manager.bulk_assign_udn_ids([{"user_id": 2}, {"user_id": 3}])
+
+        assert [json for _, json, _ in posts] == [{"tables": ["udn_assignments"]}] * 2
+        assert visible == [1, 3]
+
+    @pytest.mark.parametrize("respond", [unreachable, server_error])
+    def test_failure_is_logged_not_raised(
+        self, notify_settings, session_factory, monkeypatch, caplog, respond
+    ):
+        """A RADIUS API that is down or failing doesn't fail the portal write."""
+        record_posts(monkeypatch, respond)
+
+        with caplog.at_level(logging.WARNING, logger=radius_notify.__name__):
+            with session_factory() as db:
+                assignment = UdnManager(db).assign_udn_id(user_id=1)
+
+        assert assignment.udn_id is not None
+        assert "RADIUS change notification failed" in caplog.text
+
+
+@pytest.mark.unit
+class TestNotifyFromRequests:
+    """Test the async notification path taken inside API requests."""
+
+    def test_request_succeeds_when_radius_unreachable(self, client, notify_settings, monkeypatch, caplog):
+        """Creating a RADIUS client returns 201 and logs the lost notification."""
+        posted = []
+
+        async def post(self, url, **kwargs):
+            posted.append(url)
+            return unreachable(url, kwargs.get("json"))
+
+        monkeypatch.setattr(httpx.AsyncClient, "post", post)
+
+        with caplog.at_level(logging.WARNING, logger=radius_notify.__name__):
+            response = client.post(
+                "/api/admin/radius/clients",
+                json={"name": "nad-1", "ipaddr": "10.0.0.1", "secret": "s3cret-value"},
+                headers={"Authorization": "Bearer test-token"},
+            )
+            # The notification runs as a background task on the app's loop
+            deadline = time.monotonic() + 2
+            while radius_notify._pending_tasks and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert response.status_code == 201
+        assert posted.count(NOTIFY_URL) == 1
+        assert "RADIUS change notification failed" in caplog.text
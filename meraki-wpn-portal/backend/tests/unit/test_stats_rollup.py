@@ -0,0 +1,129 @@
+"""Tests for the statistics rollups."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.stats_rollup import RollupStats, compact
+from app.db.database import SyncSessionAdapter
+from app.db.models import Base, Registration, SplashAccess, StatsRollup
+
+NOW = datetime(2026, 3, 10, 14, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Session on its own SQLite database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+
+def add_access(db, mac, hours_ago, registered=False, granted=False):
+    db.add(SplashAccess(
+        client_mac=mac,
+        accessed_at=NOW - timedelta(hours=hours_ago),
+        registered=registered,
+        access_granted=granted,
+    ))
+
+
+def add_registration(db, hours_ago):
+    db.add(Registration(
+        name="Resident",
+        email="resident@example.com",
+        created_at=NOW - timedelta(hours=hours_ago),
+    ))
+
+
+@pytest.fixture
+def activity(db):
+    """Three days of splash accesses and registrations, including the open hour."""
+    add_access(db, "aa:00", 60, granted=True)
+    add_access(db, "aa:01", 50)
+    add_access(db, "aa:00", 30, registered=True, granted=True)
+    add_access(db, "aa:02", 5)
+    add_access(db, "aa:03", 0.2)
+    add_access(db, "aa:00", 0.1)
+    add_registration(db, 50)
+    add_registration(db, 5)
+    add_registration(db, 0.2)
+    db.commit()
+    return db
+
+
+@pytest.mark.unit
+class TestCompaction:
+    """Test rolling up closed hours."""
+
+    def test_backfills_closed_hours_and_days(self, activity):
+        """The first run covers every hour from the oldest activity."""
+        written = compact(activity, now=NOW)
+
+        assert written == 60
+        hours = activity.query(StatsRollup).filter_by(period="hour").all()
+        days = activity.query(StatsRollup).filter_by(period="day").all()
+        assert sum(row.splash_accesses for row in hours) == 4
+        assert [row.splash_accesses for row in sorted(days, key=lambda r: r.bucket_start)] == [2, 1, 1]
+        assert sum(row.splash_new_devices for row in days) == 3
+
+    def test_rerun_recomputes_window_only(self, activity):
+        """Later runs revisit the recompute window and pick up changed rows."""
+        compact(activity, now=NOW)
+        late = activity.query(SplashAccess).filter_by(client_mac="aa:02").one()
+        late.registered = True
+        activity.commit()
+
+        assert compact(activity, now=NOW, recompute_hours=24) == 24
+        assert activity.query(StatsRollup).filter_by(period="hour").count() == 60
+        assert sum(
+            row.splash_registered for row in activity.query(StatsRollup).filter_by(period="day")
+        ) == 2
+
+
+@pytest.mark.unit
+class TestRollupStats:
+    """Test reads combining rollups with the live tail."""
+
+    async def test_counts_match_base_tables(self, activity):
+        """Totals are identical before and after compaction."""
+        stats = RollupStats(SyncSessionAdapter(activity), now=NOW)
+        before = {
+            "all": await stats.counts(),
+            "today": await stats.counts(NOW.replace(hour=0, minute=0)),
+            "week": await stats.counts(NOW - timedelta(days=7)),
+            "partial": await stats.counts(NOW - timedelta(hours=5, minutes=20)),
+        }
+
+        compact(activity, now=NOW)
+        stats = RollupStats(SyncSessionAdapter(activity), now=NOW)
+
+        assert before["all"] == {
+            "splash_accesses": 6,
+            "splash_granted": 2,
+            "splash_registered": 1,
+            "splash_new_devices": 4,
+            "registrations": 3,
+        }
+        assert await stats.counts() == before["all"]
+        assert await stats.counts(NOW.replace(hour=0, minute=0)) == before["today"]
+        assert await stats.counts(NOW - timedelta(days=7)) == before["week"]
+        assert await stats.counts(NOW - timedelta(hours=5, minutes=20)) == before["partial"]
+        assert before["today"]["registrations"] == 2
+
+    async def test_timeseries(self, activity):
+        """Daily buckets fold rollup rows and the open tail."""
+        compact(activity, now=NOW - timedelta(hours=3))
+        stats = RollupStats(SyncSessionAdapter(activity), now=NOW)
+
+        series = await stats.timeseries("day", 4)
+
+        assert [bucket["bucket_start"][:10] for bucket in series] == [
+            "2026-03-07", "2026-03-08", "2026-03-09", "2026-03-10",
+        ]
+        assert [bucket["splash_accesses"] for bucket in series] == [0, 2, 1, 3]
+        assert [bucket["registrations"] for bucket in series] == [0, 1, 0, 2]
+        assert series[2]["conversion_rate"] == 100.0
@@ -445,3 +445,69 @@ class TestRadiusUsersFileGeneration:
         
         # Should NOT include revoked assignment
         assert "aa:bb:cc:dd:ee:02" not in users_file
+
+
+@pytest.mark.unit
+@pytest.mark.udn
+class TestUdnBatchAllocation:
+    """Test free-list allocation and bulk onboarding."""
+
+    def test_next_available_fills_gaps(self, udn_manager, db_session):
+        """Gaps left by existing rows are handed out before new IDs."""
+        db_session.add_all([
+            UdnAssignment(user_id=1, udn_id=2, is_active=True),
+            UdnAssignment(user_id=2, udn_id=4, is_active=True),
+        ])
+        db_session.commit()
+
+        assert udn_manager.get_next_available_udn_id() == 3
+        assert udn_manager.assign_udn_id(user_id=3).udn_id == 3
+        assert udn_manager.assign_udn_id(user_id=4).udn_id == 5
+
+    def test_bulk_assign(self, udn_manager):
+        """Bulk assignment allocates consecutive IDs and keeps existing ones."""
+        existing = udn_manager.assign_udn_id(user_id=1, specific_udn_id=3)
+
+        assignments = udn_manager.bulk_assign_udn_ids([
+            {"user_id": 1},
+            {"user_id": 2, "mac_address": "AA-BB-CC-DD-EE-02", "unit": "101"},
+            {"user_id": 3},
+            {"user_id": 4},
+        ])
+
+        assert [a.udn_id for a in assignments] == [3, 2, 4, 5]
+        assert assignments[0].id == existing.id
+        assert assignments[1].mac_address == "aa:bb:cc:dd:ee:02"
+        assert udn_manager.get_next_available_udn_id() == 6
+
+    def test_bulk_assign_pool_exhausted(self, db_session):
+        """A batch larger than the free pool assigns nothing."""
+        from app.core.udn_allocator import UdnAllocator
+
+        manager = UdnManager(db_session)
+        manager._allocator = lambda: UdnAllocator(db_session, min_id=2, max_id=3)
+
+        with pytest.raises(UdnPoolExhausted):
+            manager.bulk_assign_udn_ids([{"user_id": i} for i in range(3)])
+        assert db_session.query(UdnAssignment).count() == 0
+
+    def test_empty_locked_read_is_retried(self, db_session, monkeypatch):
+        """A locked read emptied by a concurrent delete isn't exhaustion."""
+        from app.core.udn_allocator import UdnAllocator
+
+        allocator = UdnAllocator(db_session, min_id=2, max_id=4)
+        allocator.ensure_initialized()
+        execute = db_session.execute
+        skipped = []
+
+        def execute_losing_first_lock(statement, *args, **kwargs):
+            result = execute(statement, *args, **kwargs)
+            if getattr(statement, "_for_update_arg", None) is not None and not skipped:
+                # PostgreSQL skips a locked row deleted by the holder
+                skipped.append(result.all())
+            return result
+
+        monkeypatch.setattr(db_session, "execute", execute_losing_first_lock)
+
+        assert allocator.peek() == 2
+        assert skipped == [[(2, 4)]]
@@ -0,0 +1,175 @@
+"""
+Local Meraki Dashboard API stub.
+
+Serves the REST endpoints the portal uses, backed by
+MockMerakiDashboardClient, so the SDK and httpx clients can be exercised
+and benchmarked against a real HTTP server without Meraki access.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+from app.core.mock_meraki_client import MockMerakiDashboardClient
+
+
+def _raw_ipsk(ipsk: dict) -> dict:
+    """Mock IPSK in Dashboard API shape."""
+    return {
+        "id": ipsk["id"],
+        "name": ipsk["name"],
+        "groupPolicyId": ipsk.get("group_policy_id"),
+        "passphrase": ipsk.get("passphrase"),
+        "expiresAt": ipsk.get("expires_at"),
+        "createdAt": ipsk.get("created_at"),
+    }
+
+
+def create_meraki_stub(
+    mock: MockMerakiDashboardClient | None = None,
+    latency: float = 0.0,
+    page_size: int = 100,
+) -> FastAPI:
+    """
+    Build the stub app.
+
+    Args:
+        mock: Backing mock client (a fresh one by default)
+        latency: Seconds added to every response, to mimic Dashboard round trips
+        page_size: Default page size for paginated lists
+
+    Returns:
+        FastAPI app; ``app.state.fail_next`` takes (status, retry_after)
+        tuples returned before serving real responses, and
+        ``app.state.requests`` counts served requests
+    """
+    mock = mock or MockMerakiDashboardClient()
+    app = FastAPI()
+    app.state.mock = mock
+    app.state.fail_next = []
+    app.state.requests = 0
+
+    @app.middleware("http")
+    async def simulate(request: Request, call_next):
+        app.state.requests += 1
+        if latency:
+            await asyncio.sleep(latency)
+        if app.state.fail_next:
+            status_code, retry_after = app.state.fail_next.pop(0)
+            headers = {"Retry-After": retry_after} if retry_after is not None else {}
+            return JSONResponse({"errors": ["Stub failure"]}, status_code=status_code, headers=headers)
+        return await call_next(request)
+
+    def paginate(request: Request, items: list[dict], key: str = "id") -> JSONResponse:
+        per_page = int(request.query_params.get("perPage", page_size))
+        after = request.query_params.get("startingAfter")
+        if after:
+            ids = [item[key] for item in items]
+            items = items[ids.index(after) + 1:] if after in ids else []
+        page = items[:per_page]
+        headers = {}
+        if len(items) > per_page:
+            next_url = request.url.include_query_params(perPage=per_page, startingAfter=page[-1][key])
+            headers["Link"] = f'<{next_url}>; rel=next'
+        return JSONResponse(page, headers=headers)
+
+    @app.get("/organizations")
+    async def organizations(request: Request):
+        return paginate(request, await mock.get_organizations())
+
+    @app.get("/organizations/{org_id}/networks")
+    async def networks(org_id: str, request: Request):
+        return paginate(request, await mock.get_networks(org_id))
+
+    @app.get("/networks/{network_id}")
+    async def network(network_id: str):
+        return await mock.get_network(network_id)
+
+    @app.get("/networks/{network_id}/devices")
+    async def devices(network_id: str):
+        return await mock.get_network_devices(network_id)
+
+    @app.get("/networks/{network_id}/groupPolicies")
+    async def group_policies(network_id: str):
+        return [
+            {"groupPolicyId": policy["id"], "name": policy["name"]}
+            for policy in await mock.get_group_policies(network_id)
+        ]
+
+    @app.get("/networks/{network_id}/wireless/ssids")
+    async def ssids(network_id: str):
+        return await mock.get_ssids(network_id)
+
+    @app.get("/networks/{network_id}/wireless/ssids/{number}")
+    async def ssid(network_id: str, number: int):
+        return await mock.get_ssid(network_id, number)
+
+    @app.get("/networks/{network_id}/wireless/ssids/{number}/identityPsks")
+    async def ipsks(network_id: str, number: int, request: Request):
+        found = await mock.list_ipsks(network_id=network_id, ssid_number=number)
+        return paginate(request, [_raw_ipsk(ipsk) for ipsk in found])
+
+    @app.post("/networks/{network_id}/wireless/ssids/{number}/identityPsks", status_code=201)
+    async def create_ipsk(network_id: str, number: int, request: Request):
+        body = await request.json()
+        created = await mock.create_ipsk(
+            name=body["name"],
+            network_id=network_id,
+            ssid_number=number,
+            passphrase=body.get("passphrase"),
+            group_policy_id=body.get("groupPolicyId"),
+        )
+        return _raw_ipsk(created)
+
+    @app.get("/networks/{network_id}/wireless/ssids/{number}/identityPsks/{ipsk_id}")
+    async def get_ipsk(network_id: str, number: int, ipsk_id: str):
+        ipsk = mock._ipsks.get(ipsk_id)
+        if ipsk is None:
+            return JSONResponse({"errors": ["Identity PSK not found"]}, status_code=404)
+        return _raw_ipsk(ipsk)
+
+    @app.delete("/networks/{network_id}/wireless/ssids/{number}/identityPsks/{ipsk_id}")
+    async def delete_ipsk(network_id: str, number: int, ipsk_id: str):
+        await mock.delete_ipsk(ipsk_id)
+        return Response(status_code=204)
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve_meraki_stub(app: FastAPI):
+    """
+    Serve the stub on a local port in a background thread.
+
+    Args:
+        app: App from create_meraki_stub
+
+    Yields:
+        Base URL of the running stub
+    """
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Meraki stub did not start")
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)